@@ -18,10 +18,13 @@ Features:
 import asyncio
 import os
 import sys
+import time
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Union, AsyncGenerator
 import json
+from dataclasses import asdict
+from enum import Enum
 
 # GraphQL imports
 import strawberry
@@ -39,6 +42,9 @@ from framework.core import (
     ProcessType, UniversityContext, AgentResponse
 )
 from framework.blockchain.integration import BlockchainIntegration
+from framework.agents.pool import AgentPool
+from framework.agents.streaming import AgentEventStream, AgentInteraction, interaction_updates
+from framework.database.event_log import EventLogPipeline
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -46,7 +52,7 @@ logger = logging.getLogger(__name__)
 
 # GraphQL Types and Enums
 @strawberry.enum
-class PersonaTypeEnum(strawberry.Enum):
+class PersonaTypeEnum(Enum):
     TRADITIONAL_STUDENT = "traditional_student"
     NON_TRADITIONAL_STUDENT = "non_traditional_student"
     INTERNATIONAL_STUDENT = "international_student"
@@ -62,7 +68,7 @@ class PersonaTypeEnum(strawberry.Enum):
     RESEARCHER = "researcher"
 
 @strawberry.enum
-class GovernanceFrameworkEnum(strawberry.Enum):
+class GovernanceFrameworkEnum(Enum):
     AACSB = "aacsb"
     HEFCE = "hefce"
     MIDDLE_STATES = "middle_states"
@@ -96,6 +102,16 @@ class AgentQueryResult:
     recommendations: Optional[List[str]] = None
     timestamp: datetime
 
+@strawberry.type
+class AgentQueryEvent:
+    event_type: str  # thought, action, compliance, token, error or final
+    sequence: int
+    content: Optional[str] = None  # Response text for token events, error message for error events
+    thought: Optional[AgentThought] = None
+    action: Optional[AgentAction] = None
+    result: Optional[AgentQueryResult] = None  # Complete result on the final event
+    timestamp: datetime
+
 @strawberry.type
 class CredentialInfo:
     id: int
@@ -197,29 +213,32 @@ class IsAuthenticated(BasePermission):
     message = "User must be authenticated"
     
     def has_permission(self, source: Any, info: Info, **kwargs) -> bool:
-        request = info.context["request"]
-        return hasattr(request, "user") and request.user is not None
+        return info.context.get("user") is not None
 
-class HasPermission(BasePermission):
-    def __init__(self, required_permission: str):
-        self.required_permission = required_permission
-        self.message = f"User must have '{required_permission}' permission"
-    
-    def has_permission(self, source: Any, info: Info, **kwargs) -> bool:
-        request = info.context["request"]
-        if not hasattr(request, "user") or request.user is None:
-            return False
+def HasPermission(required_permission: str) -> type:
+    """Permission class requiring the user to hold required_permission (strawberry instantiates it per field)"""
+    class RequiredPermission(BasePermission):
+        message = f"User must have '{required_permission}' permission"
         
-        user_permissions = request.user.get("permissions", [])
-        return self.required_permission in user_permissions
+        def has_permission(self, source: Any, info: Info, **kwargs) -> bool:
+            user = info.context.get("user")
+            if user is None:
+                return False
+            
+            user_permissions = user.get("permissions", [])
+            return required_permission in user_permissions
+    
+    return RequiredPermission
 
 # Extensions
 class AuthenticationExtension(Extension):
     """Extension to handle authentication for GraphQL requests"""
     
     def on_request_start(self):
-        """Extract user information from request"""
-        request = self.execution_context.context.get("request")
+        """Extract user information from request into the context"""
+        context = self.execution_context.context
+        request = context.get("request")
+        context["user"] = None
         if request:
             # Extract JWT token from Authorization header
             auth_header = request.headers.get("Authorization", "")
@@ -228,13 +247,9 @@ class AuthenticationExtension(Extension):
                 try:
                     # Decode token (reuse auth handler from REST API)
                     from api.server import auth_handler
-                    user_data = auth_handler.decode_token(token)
-                    request.user = user_data
+                    context["user"] = auth_handler.decode_token(token)
                 except Exception as e:
                     logger.warning(f"Invalid token: {e}")
-                    request.user = None
-            else:
-                request.user = None
 
 class LoggingExtension(Extension):
     """Extension to log GraphQL operations"""
@@ -253,6 +268,82 @@ class LoggingExtension(Extension):
 # Global variables
 university_framework: Optional[UniversityFramework] = None
 blockchain_integration: Optional[BlockchainIntegration] = None
+agent_pool: Optional[AgentPool] = None
+event_log: Optional[EventLogPipeline] = None
+
+# Conversions from framework agent types
+def to_graphql_thought(thought) -> AgentThought:
+    return AgentThought(
+        observation=thought.thought,
+        reasoning=thought.reasoning,
+        action_plan=", ".join(thought.relevant_context),
+        timestamp=thought.timestamp
+    )
+
+def to_graphql_action(action) -> AgentAction:
+    return AgentAction(
+        action=action.action_type,
+        input_data=json.dumps(action.parameters, default=str),
+        output_data=json.dumps(action.result if action.success else {"error": action.error}, default=str),
+        timestamp=action.timestamp
+    )
+
+def to_query_result(response: AgentResponse, collaborating_agents: List[str]) -> AgentQueryResult:
+    return AgentQueryResult(
+        success=True,
+        thoughts=[to_graphql_thought(t) for t in response.thoughts],
+        actions=[to_graphql_action(a) for a in response.actions],
+        final_response=response.final_response,
+        confidence=response.confidence,
+        collaborating_agents=collaborating_agents,
+        recommendations=response.metadata.get("recommendations"),
+        timestamp=datetime.utcnow()
+    )
+
+def prepare_agent_query(agent_type: str, query_input: AgentQueryInput) -> Dict[str, Any]:
+    """Validate an agent query and build the context passed to the agent"""
+    if not university_framework or not agent_pool:
+        raise Exception("University framework not available")
+    if agent_type not in agent_pool.agent_types:
+        raise Exception(f"Unknown agent type: {agent_type}")
+    
+    # Parse context if provided
+    context = {}
+    if query_input.context:
+        try:
+            context = json.loads(query_input.context)
+        except json.JSONDecodeError:
+            pass
+    
+    context["user_id"] = query_input.user_id
+    if query_input.user_type:
+        context["user_type"] = PersonaType(query_input.user_type.value).value
+    return context
+
+def log_agent_interaction(
+    agent_type: str,
+    context: Dict[str, Any],
+    message: str,
+    response: AgentResponse,
+    processing_time: float
+):
+    """Queue an agent interaction for analytics and monitoring"""
+    if not event_log:
+        return
+    
+    # Interactions are recorded against the registered system agent of each type
+    event_log.log_agent_interaction(
+        f"{agent_type}_001",
+        context.get("user_id"),
+        message,
+        response.final_response,
+        thoughts=[asdict(thought) for thought in response.thoughts],
+        actions=[asdict(action) for action in response.actions],
+        confidence=response.confidence,
+        processing_time=processing_time,
+        context_data=context
+    )
+    event_log.log_system_metric("agent_query_time", processing_time, "performance", agent_type)
 
 # Query resolvers
 @strawberry.type
@@ -432,74 +523,22 @@ class Mutation:
         query_input: AgentQueryInput
     ) -> AgentQueryResult:
         """Send a query to an AI agent"""
-        if not university_framework:
-            raise Exception("University framework not available")
+        context = prepare_agent_query(agent_type, query_input)
         
         try:
-            # Get the appropriate agent
-            if agent_type == "academic_advisor":
-                from framework.agents.academic_advisor import AcademicAdvisorAgent
-                agent = AcademicAdvisorAgent("academic_advisor", university_framework)
-            elif agent_type == "student_services":
-                from framework.agents.student_services import StudentServicesAgent
-                agent = StudentServicesAgent("student_services", university_framework)
-            else:
-                raise Exception(f"Unknown agent type: {agent_type}")
-            
-            # Parse context if provided
-            context = {}
-            if query_input.context:
-                try:
-                    context = json.loads(query_input.context)
-                except json.JSONDecodeError:
-                    pass
-            
-            # Convert persona type
-            user_type = None
-            if query_input.user_type:
-                user_type = PersonaType(query_input.user_type.value)
-            
-            # Process the query
-            response = await agent.process_query(
-                message=query_input.message,
-                context=context,
-                user_id=query_input.user_id,
-                user_type=user_type,
-                collaborative=query_input.collaborative
-            )
-            
-            # Convert thoughts to GraphQL format
-            thoughts = [
-                AgentThought(
-                    observation=t.get("observation", ""),
-                    reasoning=t.get("reasoning", ""),
-                    action_plan=t.get("action_plan", ""),
-                    timestamp=datetime.fromisoformat(t.get("timestamp", datetime.utcnow().isoformat()))
-                )
-                for t in response.thoughts
-            ]
-            
-            # Convert actions to GraphQL format
-            actions = [
-                AgentAction(
-                    action=a.get("action", ""),
-                    input_data=json.dumps(a.get("input", {})),
-                    output_data=json.dumps(a.get("output", {})),
-                    timestamp=datetime.fromisoformat(a.get("timestamp", datetime.utcnow().isoformat()))
+            started = time.perf_counter()
+            # Lease a warm agent; it is reset and returned to the pool afterwards
+            async with agent_pool.lease(agent_type) as agent:
+                response = await agent.process_query(
+                    query_input.message,
+                    context,
+                    collaborative=query_input.collaborative
                 )
-                for a in response.actions
-            ]
+                collaborating_agents = [collaborator.agent_id for collaborator in agent.collaborators]
             
-            return AgentQueryResult(
-                success=True,
-                thoughts=thoughts,
-                actions=actions,
-                final_response=response.final_response,
-                confidence=response.confidence,
-                collaborating_agents=response.collaborating_agents,
-                recommendations=response.recommendations,
-                timestamp=datetime.utcnow()
-            )
+            interaction_updates.publish(AgentInteraction(agent_type, response, collaborating_agents))
+            log_agent_interaction(agent_type, context, query_input.message, response, time.perf_counter() - started)
+            return to_query_result(response, collaborating_agents)
             
         except Exception as e:
             logger.error(f"Error processing agent query: {e}")
@@ -605,24 +644,50 @@ class Mutation:
 @strawberry.type
 class Subscription:
     @strawberry.subscription(permission_classes=[IsAuthenticated])
-    async def agent_interaction_updates(self) -> strawberry.AsyncGenerator[AgentQueryResult, None]:
+    async def agent_interaction_updates(self) -> AsyncGenerator[AgentQueryResult, None]:
         """Subscribe to real-time agent interaction updates"""
-        # This would connect to a message queue or pub/sub system in production
-        while True:
-            await asyncio.sleep(5)  # Simulate periodic updates
-            
-            # Mock update - in real implementation, yield actual updates
-            yield AgentQueryResult(
-                success=True,
-                thoughts=[],
-                actions=[],
-                final_response="Real-time update from agent system",
-                confidence=0.95,
-                timestamp=datetime.utcnow()
+        async with interaction_updates.subscribe() as updates:
+            async for interaction in updates:
+                yield to_query_result(interaction.response, interaction.collaborating_agents)
+    
+    @strawberry.subscription(permission_classes=[IsAuthenticated, HasPermission("agent_query")])
+    async def agent_query_stream(
+        self,
+        agent_type: str,
+        query_input: AgentQueryInput
+    ) -> AsyncGenerator[AgentQueryEvent, None]:
+        """Send a query to an AI agent and receive its steps as they are produced"""
+        context = prepare_agent_query(agent_type, query_input)
+        started = time.perf_counter()
+        
+        async with agent_pool.lease(agent_type) as agent:
+            stream = AgentEventStream(
+                agent.process_query_stream(query_input.message, context, collaborative=query_input.collaborative),
+                max_buffered=int(os.getenv('AGENT_STREAM_BUFFER', '32')),
+                send_timeout=float(os.getenv('AGENT_STREAM_SEND_TIMEOUT', '30'))
             )
+            sequence = 0
+            async for event in stream:
+                sequence += 1
+                update = AgentQueryEvent(event_type=event.event_type, sequence=sequence, timestamp=event.timestamp)
+                if event.event_type == "thought":
+                    update.thought = to_graphql_thought(event.data)
+                elif event.event_type == "action":
+                    update.action = to_graphql_action(event.data)
+                elif event.event_type in ("token", "error"):
+                    update.content = event.data
+                elif event.event_type == "compliance":
+                    update.content = json.dumps(event.data)
+                elif event.event_type == "final":
+                    collaborating_agents = [collaborator.agent_id for collaborator in agent.collaborators]
+                    update.result = to_query_result(event.data, collaborating_agents)
+                    interaction_updates.publish(AgentInteraction(agent_type, event.data, collaborating_agents))
+                    log_agent_interaction(agent_type, context, query_input.message, event.data,
+                                          time.perf_counter() - started)
+                yield update
     
     @strawberry.subscription(permission_classes=[IsAuthenticated])
-    async def blockchain_events(self) -> strawberry.AsyncGenerator[str, None]:
+    async def blockchain_events(self) -> AsyncGenerator[str, None]:
         """Subscribe to blockchain events"""
         # This would connect to blockchain event listeners in production
         while True:
@@ -644,20 +709,23 @@ schema = strawberry.Schema(
 graphql_app = GraphQLRouter(
     schema,
     path="/graphql",
-    graphiql=True,  # Enable GraphiQL interface
-    context_getter=lambda request: {"request": request}
+    graphiql=True  # Enable GraphiQL interface; the default context carries the request
 )
 
 # Initialize framework components (called from main app)
 async def initialize_graphql_components(
     university_fw: UniversityFramework,
-    blockchain_int: BlockchainIntegration
+    blockchain_int: BlockchainIntegration,
+    agents: Optional[AgentPool] = None,
+    events: Optional[EventLogPipeline] = None
 ):
     """Initialize GraphQL server components"""
-    global university_framework, blockchain_integration
+    global university_framework, blockchain_integration, agent_pool, event_log
     
     university_framework = university_fw
     blockchain_integration = blockchain_int
+    agent_pool = agents
+    event_log = events
     
     logger.info("GraphQL components initialized")
 
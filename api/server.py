@@ -19,20 +19,22 @@ Features:
 import asyncio
 import os
 import sys
+import time
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Union
 import json
 import jwt
+from dataclasses import asdict
 from functools import wraps
 
 # FastAPI and related imports
-from fastapi import FastAPI, HTTPException, Depends, status, Request, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Depends, status, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.openapi.utils import get_openapi
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 import uvicorn
 from pydantic import BaseModel, Field, validator
 from slowapi import Limiter, _rate_limit_exceeded_handler
@@ -45,9 +47,14 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from framework.core import (
     UniversityFramework, PersonaType, GovernanceFramework,
-    ProcessType, UniversityContext, AgentResponse
+    ProcessType, UniversityContext, AgentResponse, AgentEvent
 )
 from framework.blockchain.integration import BlockchainIntegration
+from framework.agents.pool import AgentPool, AgentPoolConfig, AgentPoolExhausted, default_agent_factories
+from framework.agents.streaming import AgentEventStream, AgentInteraction, AgentStreamTimeout, interaction_updates
+from framework.database.event_log import EventLogPipeline, EventLogConfig
+from framework.database import get_database_service
+from api.graphql_server import graphql_app, initialize_graphql_components
 
 # Configure logging
 logging.basicConfig(
@@ -260,15 +267,20 @@ app.add_middleware(
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
+# GraphQL API (GraphiQL interface at /graphql)
+app.include_router(graphql_app)
+
 # Global variables for framework and blockchain integration
 university_framework: Optional[UniversityFramework] = None
 blockchain_integration: Optional[BlockchainIntegration] = None
+agent_pool: Optional[AgentPool] = None
+event_log: Optional[EventLogPipeline] = None
 app_start_time = datetime.utcnow()
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize framework components on startup"""
-    global university_framework, blockchain_integration
+    global university_framework, blockchain_integration, agent_pool, event_log
     
     logger.info("Starting CollegiumAI API Server...")
     
@@ -288,6 +300,30 @@ async def startup_event():
         university_framework = UniversityFramework(university_context)
         logger.info("University framework initialized")
         
+        # Pre-build the agents that serve agent queries
+        agent_pool = AgentPool(
+            default_agent_factories(university_context),
+            AgentPoolConfig(
+                size_per_type=int(os.getenv('AGENT_POOL_SIZE', '4')),
+                acquire_timeout=float(os.getenv('AGENT_POOL_ACQUIRE_TIMEOUT', '30'))
+            )
+        )
+        await agent_pool.start()
+        
+        # Interaction, metric and audit logging is written behind the request path
+        database = await get_database_service()
+        event_log = EventLogPipeline(
+            # The in-memory fallback has no table storage, so events are not kept
+            database if hasattr(database, "copy_records") else None,
+            EventLogConfig(
+                batch_size=int(os.getenv('EVENT_LOG_BATCH_SIZE', '500')),
+                flush_interval=float(os.getenv('EVENT_LOG_FLUSH_INTERVAL', '0.5')),
+                spool_path=os.getenv('EVENT_LOG_SPOOL') or None,
+                max_spool_bytes=int(os.getenv('EVENT_LOG_SPOOL_MAX_BYTES', str(EventLogConfig.max_spool_bytes)))
+            )
+        )
+        await event_log.start()
+        
         # Initialize blockchain integration
         try:
             blockchain_integration = BlockchainIntegration()
@@ -297,6 +333,9 @@ async def startup_event():
             logger.warning(f"Blockchain integration failed: {e}")
             blockchain_integration = None
         
+        # GraphQL resolvers share the agent pool and event log with the REST endpoints
+        await initialize_graphql_components(university_framework, blockchain_integration, agent_pool, event_log)
+        
         logger.info("CollegiumAI API Server started successfully")
         
     except Exception as e:
@@ -310,6 +349,9 @@ async def shutdown_event():
     
     logger.info("Shutting down CollegiumAI API Server...")
     
+    if event_log:
+        await event_log.close()
+    
     if blockchain_integration:
         try:
             await blockchain_integration.close()
@@ -361,6 +403,12 @@ async def health_check(request: Request):
     else:
         services["university_framework"] = "unavailable"
     
+    # Check agent pool
+    services["agent_pool"] = "operational" if agent_pool else "unavailable"
+    
+    # Check event logging; "spooling" means events are waiting on disk for the database
+    services["event_log"] = event_log.get_status()["state"] if event_log else "unavailable"
+    
     # Check blockchain integration
     if blockchain_integration:
         try:
@@ -449,17 +497,13 @@ async def login(request: Request, credentials: Dict[str, str]):
     }
 
 # Agent endpoints
-@app.post("/api/v1/agents/{agent_type}/query", response_model=AgentQueryResponse, tags=["Agents"])
-@limiter.limit("20/minute")
-async def query_agent(
+def prepare_agent_query(
     agent_type: str,
     request_data: AgentQueryRequest,
-    request: Request,
-    background_tasks: BackgroundTasks,
-    current_user: Dict[str, Any] = Depends(get_current_user)
-):
-    """Send a query to a specific agent"""
-    if not university_framework:
+    current_user: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Validate an agent query and build the context passed to the agent"""
+    if not university_framework or not agent_pool:
         raise HTTPException(
             status_code=503,
             detail="University framework not available"
@@ -472,49 +516,64 @@ async def query_agent(
             detail="Agent query permission required"
         )
     
+    if agent_type not in agent_pool.agent_types:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown agent type: {agent_type}"
+        )
+    
+    user_type = request_data.user_type or PersonaType(current_user.get("user_type", "traditional_student"))
+    return {
+        **(request_data.context or {}),
+        "user_id": request_data.user_id or current_user.get("user_id"),
+        "user_type": user_type.value
+    }
+
+def format_sse(event: AgentEvent, event_id: int) -> str:
+    """Encode an agent event as one Server-Sent Events message"""
+    return f"id: {event_id}\nevent: {event.event_type}\ndata: {json.dumps(event.to_dict(), default=str)}\n\n"
+
+@app.post("/api/v1/agents/{agent_type}/query", response_model=AgentQueryResponse, tags=["Agents"])
+@limiter.limit("20/minute")
+async def query_agent(
+    agent_type: str,
+    request_data: AgentQueryRequest,
+    request: Request,
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """Send a query to a specific agent"""
+    context = prepare_agent_query(agent_type, request_data, current_user)
+    
     try:
-        # Get the appropriate agent
-        if agent_type == "academic_advisor":
-            from framework.agents.academic_advisor import AcademicAdvisorAgent
-            agent = AcademicAdvisorAgent("academic_advisor", university_framework)
-        elif agent_type == "student_services":
-            from framework.agents.student_services import StudentServicesAgent
-            agent = StudentServicesAgent("student_services", university_framework)
-        else:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Unknown agent type: {agent_type}"
+        started = time.perf_counter()
+        # Lease a warm agent; it is reset and returned to the pool afterwards
+        async with agent_pool.lease(agent_type) as agent:
+            response = await agent.process_query(
+                request_data.message,
+                context,
+                collaborative=request_data.collaborative
             )
+            collaborating_agents = [collaborator.agent_id for collaborator in agent.collaborators]
         
-        # Process the query
-        response = await agent.process_query(
-            message=request_data.message,
-            context=request_data.context,
-            user_id=request_data.user_id or current_user.get("user_id"),
-            user_type=request_data.user_type or PersonaType(current_user.get("user_type", "traditional_student")),
-            collaborative=request_data.collaborative
-        )
-        
-        # Log the interaction (background task)
-        background_tasks.add_task(
-            log_agent_interaction,
-            agent_type,
-            current_user.get("user_id"),
-            request_data.message,
-            response
-        )
+        interaction_updates.publish(AgentInteraction(agent_type, response, collaborating_agents))
+        log_agent_interaction(agent_type, context, request_data.message, response, time.perf_counter() - started)
         
         return AgentQueryResponse(
             success=True,
-            thoughts=response.thoughts,
-            actions=response.actions,
+            thoughts=[asdict(thought) for thought in response.thoughts],
+            actions=[asdict(action) for action in response.actions],
             final_response=response.final_response,
             confidence=response.confidence,
-            collaborating_agents=response.collaborating_agents,
-            recommendations=response.recommendations,
+            collaborating_agents=collaborating_agents,
+            recommendations=response.metadata.get("recommendations"),
             timestamp=datetime.utcnow()
         )
         
+    except AgentPoolExhausted as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e)
+        )
     except Exception as e:
         logger.error(f"Error processing agent query: {e}")
         raise HTTPException(
@@ -522,6 +581,69 @@ async def query_agent(
             detail=f"Agent query failed: {str(e)}"
         )
 
+@app.post("/api/v1/agents/{agent_type}/query/stream", tags=["Agents"])
+@limiter.limit("20/minute")
+async def stream_agent_query(
+    agent_type: str,
+    request_data: AgentQueryRequest,
+    request: Request,
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    Send a query to a specific agent and receive its thoughts, actions and
+    response tokens as Server-Sent Events while the query is processed
+    """
+    context = prepare_agent_query(agent_type, request_data, current_user)
+    
+    async def event_source():
+        event_id = 0
+        started = time.perf_counter()
+        try:
+            async with agent_pool.lease(agent_type) as agent:
+                stream = AgentEventStream(
+                    agent.process_query_stream(request_data.message, context, collaborative=request_data.collaborative),
+                    max_buffered=int(os.getenv('AGENT_STREAM_BUFFER', '32')),
+                    send_timeout=float(os.getenv('AGENT_STREAM_SEND_TIMEOUT', '30'))
+                )
+                async for event in stream:
+                    event_id += 1
+                    yield format_sse(event, event_id)
+                    if event.event_type == "final":
+                        response = event.data
+                        collaborating_agents = [collaborator.agent_id for collaborator in agent.collaborators]
+            
+            interaction_updates.publish(AgentInteraction(agent_type, response, collaborating_agents))
+            log_agent_interaction(agent_type, context, request_data.message, response, time.perf_counter() - started)
+        except AgentPoolExhausted as e:
+            yield format_sse(AgentEvent("error", str(e)), event_id + 1)
+        except AgentStreamTimeout as e:
+            logger.warning(f"Stopped agent stream for slow client: {e}")
+    
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/api/v1/agents/pool/status", tags=["Agents"])
+@limiter.limit("30/minute")
+async def get_agent_pool_status(
+    request: Request,
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """Get agent pool utilization and lease wait times"""
+    if not agent_pool:
+        raise HTTPException(
+            status_code=503,
+            detail="Agent pool not available"
+        )
+    
+    return {
+        "success": True,
+        "data": agent_pool.get_status(),
+        "timestamp": datetime.utcnow()
+    }
+
 @app.get("/api/v1/agents/{agent_type}/info", tags=["Agents"])
 @limiter.limit("30/minute")
 async def get_agent_info(
@@ -1024,30 +1146,31 @@ async def get_compliance_status(
             detail=f"Failed to get compliance status: {str(e)}"
         )
 
-# Background tasks
-async def log_agent_interaction(
+# Interaction logging
+def log_agent_interaction(
     agent_type: str,
-    user_id: str,
+    context: Dict[str, Any],
     message: str,
-    response: AgentResponse
+    response: AgentResponse,
+    processing_time: float
 ):
-    """Log agent interaction for analytics and monitoring"""
-    try:
-        log_data = {
-            "timestamp": datetime.utcnow().isoformat(),
-            "agent_type": agent_type,
-            "user_id": user_id,
-            "message_length": len(message),
-            "response_confidence": response.confidence,
-            "collaborating_agents": response.collaborating_agents,
-            "processing_time": 0  # Would be calculated in real implementation
-        }
-        
-        # In production, save to database or analytics service
-        logger.info(f"Agent interaction logged: {json.dumps(log_data)}")
-        
-    except Exception as e:
-        logger.error(f"Error logging agent interaction: {e}")
+    """Queue an agent interaction for analytics and monitoring"""
+    if not event_log:
+        return
+    
+    # Interactions are recorded against the registered system agent of each type
+    event_log.log_agent_interaction(
+        f"{agent_type}_001",
+        context.get("user_id"),
+        message,
+        response.final_response,
+        thoughts=[asdict(thought) for thought in response.thoughts],
+        actions=[asdict(action) for action in response.actions],
+        confidence=response.confidence,
+        processing_time=processing_time,
+        context_data=context
+    )
+    event_log.log_system_metric("agent_query_time", processing_time, "performance", agent_type)
 
 # Custom OpenAPI schema
 def custom_openapi():
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+CollegiumAI Agent Pool Load Test
+================================
+
+Drives a closed-loop load of agent queries the way the REST endpoint serves
+them, once constructing a new agent per request and once leasing warm agents
+from an ``AgentPool``, and reports request latency percentiles for both.
+Agent construction loads the reference tables synchronously on the event
+loop; ``load_ms`` simulates how long that fetch takes against real university
+systems (the in-tree tables are mock data and load instantly).
+
+Run with: python benchmarks/bench_agent_pool.py [requests] [clients] [pool_size] [load_ms]
+"""
+
+import asyncio
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add framework to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from framework.core import UniversityContext
+from framework.agents.academic_advisor import AcademicAdvisorAgent
+from framework.agents.student_services import StudentServicesAgent
+from framework.agents.pool import AgentPool, AgentPoolConfig, default_agent_factories
+
+QUERIES = {
+    "academic_advisor": "Which courses should I take next semester for my Computer Science degree?",
+    "student_services": "I am stressed about exams and need tutoring support"
+}
+
+
+def simulate_load_time(load_ms: float):
+    """Make reference table loading block for load_ms, like a synchronous catalog fetch"""
+    for agent_class in (AcademicAdvisorAgent, StudentServicesAgent):
+        load = agent_class._load_reference_tables
+
+        def slow_load(self, load=load):
+            time.sleep(load_ms / 1000)
+            return load(self)
+
+        agent_class._load_reference_tables = slow_load
+
+
+async def measure(serve, requests: int, clients: int):
+    """Closed loop: each client sends its next request as soon as the previous one returns"""
+    timings = []
+    counter = iter(range(requests))
+
+    async def client():
+        for i in counter:
+            agent_type = "academic_advisor" if i % 2 == 0 else "student_services"
+            start = time.perf_counter()
+            await serve(agent_type, QUERIES[agent_type], {"user_id": f"user{i}"})
+            timings.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+    timings.sort()
+    return timings, elapsed
+
+
+def percentile(timings, fraction: float) -> float:
+    return timings[min(len(timings) - 1, int(len(timings) * fraction))]
+
+
+async def run_benchmark(requests: int = 400, clients: int = 32, pool_size: int = 16, load_ms: int = 20):
+    logging.disable(logging.INFO)
+    simulate_load_time(load_ms)
+
+    print("🧪 Agent pool load test")
+    print("=" * 60)
+    print(f"Requests: {requests:,}  clients: {clients}  pool size per type: {pool_size}  "
+          f"reference table load: {load_ms} ms")
+    print()
+
+    context = UniversityContext(
+        institution_name="Benchmark University",
+        accreditations=[],
+        student_population=25000,
+        academic_programs=["Computer Science"],
+        current_semester="Fall 2025",
+        academic_year="2025-2026"
+    )
+    factories = default_agent_factories(context)
+
+    async def per_request(agent_type, message, query_context):
+        # The behaviour before pooling: every agent loads its own reference tables
+        agent_class = AcademicAdvisorAgent if agent_type == "academic_advisor" else StudentServicesAgent
+        agent_class._reference_tables = None
+        agent = factories[agent_type](agent_type)
+        return await agent.process_query(message, query_context)
+
+    async def pooled(agent_type, message, query_context):
+        async with pool.lease(agent_type) as agent:
+            return await agent.process_query(message, query_context)
+
+    print(f"{'mode':>12} {'req/s':>8} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9}")
+    timings, elapsed = await measure(per_request, requests, clients)
+    print(f"{'per-request':>12} {requests / elapsed:8.1f} {statistics.median(timings):9.1f} "
+          f"{percentile(timings, 0.95):9.1f} {percentile(timings, 0.99):9.1f}")
+
+    for agent_class in (AcademicAdvisorAgent, StudentServicesAgent):
+        agent_class._reference_tables = None
+    pool = AgentPool(factories, AgentPoolConfig(size_per_type=pool_size))
+    start = time.perf_counter()
+    await pool.start()
+    warmup = time.perf_counter() - start
+
+    timings, elapsed = await measure(pooled, requests, clients)
+    print(f"{'pooled':>12} {requests / elapsed:8.1f} {statistics.median(timings):9.1f} "
+          f"{percentile(timings, 0.95):9.1f} {percentile(timings, 0.99):9.1f}")
+
+    print()
+    status = pool.get_status()
+    print(f"Pool warm-up: {warmup * 1000:.1f} ms for {pool_size * len(factories)} agents")
+    print(f"Lease waits: {status['waited']} of {status['leases']} leases, "
+          f"p50 {status['p50_wait_time'] * 1000:.1f} ms, p99 {status['p99_wait_time'] * 1000:.1f} ms")
+    for agent_type, occupancy in status["agents"].items():
+        print(f"  {agent_type:>16}: peak in use {occupancy['peak_in_use']}/{occupancy['size']}, "
+              f"average utilization {occupancy['average_utilization']:.0%}")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:5]]
+    asyncio.run(run_benchmark(*args))
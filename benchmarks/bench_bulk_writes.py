@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+CollegiumAI Bulk Write Benchmark
+================================
+
+Inserts the same cognitive memories into PostgreSQL three ways and reports
+rows per second for each: one ``store_memory`` call per row (one pooled
+connection and round-trip per statement, ``concurrency`` at a time), the
+rows queued in a ``DatabaseService.pipeline()`` (executemany on one
+connection), and ``store_memories_bulk`` (one COPY). Needs the database
+named by ``DATABASE_URL``; the schema is created if missing and the
+benchmark's rows are deleted afterwards.
+
+Run with: python benchmarks/bench_bulk_writes.py [memories] [concurrency]
+"""
+
+import asyncio
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Add framework to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from framework.database.service import DatabaseService
+from framework.database.init import DatabaseInitializer
+
+PERSONA_PREFIX = "bench_bulk_"
+
+
+def make_memories(count: int, mode: str):
+    return [
+        {
+            "persona_id": f"{PERSONA_PREFIX}{mode}_{i % 100}",
+            "memory_type": "episodic",
+            "content": {"event": f"Advising session {i}", "course": f"CS{100 + i % 400}", "outcome": "enrolled"},
+            "importance_score": (i % 10) / 10,
+            "confidence": 0.9,
+            "context_tags": ["advising", "enrollment"]
+        }
+        for i in range(count)
+    ]
+
+
+async def single_row(db: DatabaseService, memories, concurrency: int):
+    pending = iter(memories)
+
+    async def worker():
+        for memory in pending:
+            await db.store_memory(**memory)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+async def pipelined(db: DatabaseService, memories, concurrency: int):
+    query = """
+        INSERT INTO cognitive_memories (
+            persona_id, memory_type, content, importance_score, confidence, context_tags
+        ) VALUES ($1, $2, $3, $4, $5, $6)
+    """
+    async with db.pipeline() as statements:
+        for memory in memories:
+            statements.execute(
+                query, memory["persona_id"], memory["memory_type"], json.dumps(memory["content"]),
+                memory["importance_score"], memory["confidence"], memory["context_tags"]
+            )
+
+
+async def bulk(db: DatabaseService, memories, concurrency: int):
+    await db.store_memories_bulk(memories)
+
+
+async def run_benchmark(count: int = 100_000, concurrency: int = 16):
+    logging.disable(logging.INFO)
+
+    print("🧪 Cognitive memory bulk write benchmark")
+    print("=" * 60)
+
+    db = DatabaseService()
+    if not await db.initialize():
+        print(f"PostgreSQL is not reachable at {db.config.host}:{db.config.port}; set DATABASE_URL")
+        return
+    await DatabaseInitializer(db).initialize_database()
+
+    print(f"Memories: {count:,}  single-row concurrency: {concurrency}  "
+          f"pool size: {db.config.min_pool_size}-{db.config.max_pool_size}")
+    print()
+    print(f"{'mode':>12} {'seconds':>9} {'rows/s':>10} {'speed-up':>9}")
+
+    baseline = None
+    try:
+        for mode, insert in (("single-row", single_row), ("pipeline", pipelined), ("bulk", bulk)):
+            memories = make_memories(count, mode)
+            start = time.perf_counter()
+            await insert(db, memories, concurrency)
+            elapsed = time.perf_counter() - start
+
+            stored = await db.fetchval(
+                "SELECT count(*) FROM cognitive_memories WHERE persona_id LIKE $1", f"{PERSONA_PREFIX}{mode}_%"
+            )
+            assert stored == count, f"{mode} stored {stored} of {count} memories"
+            baseline = baseline or elapsed
+            print(f"{mode:>12} {elapsed:9.2f} {count / elapsed:10,.0f} {baseline / elapsed:8.1f}x")
+    finally:
+        await db.execute("DELETE FROM cognitive_memories WHERE persona_id LIKE $1", f"{PERSONA_PREFIX}%")
+        await db.close()
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    asyncio.run(run_benchmark(*args))
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+CollegiumAI Cognitive Cycle Latency Benchmark
+============================================
+
+Runs ``CognitiveEngine.process_cognitive_cycle`` against cognitive modules
+that simulate I/O-bound work (model or database calls) with jittered
+``asyncio.sleep`` latencies. Compares end-to-end cycle latency with the
+phases run strictly in order against the phase DAG executor, which gathers
+independent retrieval and reasoning steps and defers learning and
+metacognition until after the result is returned.
+
+Run with: python benchmarks/bench_cognitive_cycle.py [cycles]
+"""
+
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add framework to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from framework.cognitive.cognitive_core import CognitiveEngine
+
+# Simulated per-call latency in milliseconds
+LATENCIES = {
+    "attention": 1, "perception": 2,
+    "episodic": 8, "semantic": 8, "working_memory": 1, "consolidation": 2,
+    "causal": 10, "analogical": 10, "abstract": 6,
+    "decision": 4, "adaptive_learning": 12, "meta_learning": 5, "metacognition": 3
+}
+
+
+def simulated(name: str, rng: random.Random, result=None):
+    """Async callable that sleeps for a jittered latency and returns result"""
+    async def call(*args, **kwargs):
+        await asyncio.sleep(LATENCIES[name] * rng.lognormvariate(0, 0.25) / 1000)
+        return {} if result is None else result
+    return call
+
+
+def build_engine(rng: random.Random) -> CognitiveEngine:
+    engine = CognitiveEngine("student")
+    engine.attention_mechanism = SimpleNamespace(focus_attention=simulated("attention", rng))
+    engine.perception_module = SimpleNamespace(process_multimodal_input=simulated("perception", rng))
+    engine.memory_system = SimpleNamespace(
+        episodic_memory=SimpleNamespace(retrieve_similar_episodes=simulated("episodic", rng, [])),
+        long_term_memory=SimpleNamespace(retrieve_relevant_knowledge=simulated("semantic", rng, [])),
+        working_memory=SimpleNamespace(update=simulated("working_memory", rng), get_state=lambda: {}),
+        schedule_consolidation=simulated("consolidation", rng)
+    )
+    engine.reasoning_engine = SimpleNamespace(
+        causal_reasoning=SimpleNamespace(analyze_causality=simulated("causal", rng)),
+        analogical_reasoning=SimpleNamespace(find_analogies=simulated("analogical", rng)),
+        identify_abstract_patterns=simulated("abstract", rng),
+        get_confidence=lambda: 0.7
+    )
+    engine.decision_engine = SimpleNamespace(
+        utility_based_decision=SimpleNamespace(evaluate_options=simulated("decision", rng)),
+        get_confidence=lambda: 0.7
+    )
+    engine.learning_system = SimpleNamespace(
+        adaptive_learning=SimpleNamespace(update_from_episode=simulated("adaptive_learning", rng)),
+        meta_learning=SimpleNamespace(update_learning_strategies=simulated("meta_learning", rng))
+    )
+    engine.metacognitive_controller = SimpleNamespace(
+        monitor_performance=simulated("metacognition", rng),
+        adjust_processing_strategy=simulated("metacognition", rng)
+    )
+    return engine
+
+
+async def measure(cycles: int, pipelined: bool):
+    engine = build_engine(random.Random(11))
+    engine.concurrent_phases = pipelined
+    engine.defer_post_response_phases = pipelined
+    input_data = {"text": "I need help planning my thesis timeline", "context": {"domain": "academic"}}
+
+    latencies = []
+    for _ in range(cycles):
+        start = time.perf_counter()
+        result = await engine.process_cognitive_cycle(input_data)
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert "error" not in result, result
+    await engine.drain_deferred_phases()
+
+    latencies.sort()
+    return latencies, (await engine.get_cognitive_status())["phase_statistics"]
+
+
+async def run_benchmark(cycles: int = 200):
+    print("🧪 Cognitive cycle latency benchmark")
+    print("=" * 60)
+    print(f"Cycles per mode: {cycles}")
+    print()
+    print(f"{'mode':>12} {'mean (ms)':>10} {'p50 (ms)':>10} {'p99 (ms)':>10}")
+
+    phase_statistics = None
+    for label, pipelined in (("sequential", False), ("phase DAG", True)):
+        latencies, stats = await measure(cycles, pipelined)
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        print(f"{label:>12} {statistics.mean(latencies):10.1f} {statistics.median(latencies):10.1f} {p99:10.1f}")
+        phase_statistics = stats
+
+    print()
+    print("Per-phase average time with the phase DAG (ms):")
+    for name, stats in phase_statistics.items():
+        print(f"  {name:<22} {stats['average_time'] * 1000:7.2f}")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:2]]
+    asyncio.run(run_benchmark(*args))
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+CollegiumAI Episodic Memory Capacity Benchmark
+=============================================
+
+Stores 100k+ episodes into an ``EpisodicMemory`` held at a fixed capacity,
+so every store past the limit triggers ``_manage_capacity`` eviction. Then
+measures timeframe range queries and a decay sweep that prunes a large
+share of the episodes.
+
+Run with: python benchmarks/bench_episodic_capacity.py [episodes] [capacity]
+"""
+
+import asyncio
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add framework to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from framework.cognitive.memory import EpisodicMemory, Episode
+
+
+async def run_benchmark(total_episodes: int = 120000, capacity: int = 50000):
+    rng = random.Random(3)
+    memory = EpisodicMemory("student")
+    memory.max_episodes = capacity
+    base_time = datetime(2026, 1, 1)
+    
+    print("🧪 Episodic memory capacity-pressure benchmark")
+    print("=" * 60)
+    print(f"Episodes stored: {total_episodes:,}  capacity: {capacity:,}")
+    
+    start = time.perf_counter()
+    for i in range(total_episodes):
+        # Mostly chronological with some late arrivals
+        offset = i if rng.random() > 0.05 else max(0, i - rng.randint(1, 5000))
+        episode = Episode(
+            timestamp=base_time + timedelta(seconds=offset),
+            context={"type": rng.choice(["academic", "social", "administrative"])},
+            importance=rng.random(),
+            tags=[f"tag{rng.randint(0, 200)}"]
+        )
+        await memory.store_episode(episode)
+    store_seconds = time.perf_counter() - start
+    print(f"Store under pressure: {store_seconds:8.2f} s "
+          f"({store_seconds / total_episodes * 1e6:.1f} µs/episode)")
+    
+    queries = 1000
+    start = time.perf_counter()
+    returned = 0
+    for _ in range(queries):
+        window_start = base_time + timedelta(seconds=rng.randint(0, total_episodes))
+        for _ in memory.iter_by_timeframe(window_start, window_start + timedelta(seconds=600)):
+            returned += 1
+    range_ms = (time.perf_counter() - start) * 1000 / queries
+    print(f"10-minute range query: {range_ms:8.3f} ms/query ({returned / queries:.0f} episodes avg)")
+    
+    memory.importance_threshold = 0.75
+    remaining = len(memory.episodes)
+    start = time.perf_counter()
+    await memory.apply_decay(24)
+    decay_seconds = time.perf_counter() - start
+    print(f"Decay sweep pruning {remaining - len(memory.episodes):,} of {remaining:,}: "
+          f"{decay_seconds:8.2f} s")
+    print(f"Temporal index compactions: {memory.temporal_index.compactions}")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    asyncio.run(run_benchmark(*args))
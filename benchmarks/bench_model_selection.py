@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+CollegiumAI Model Selection Overhead Benchmark
+=============================================
+
+Measures the per-request cost of ``LLMManager._select_provider_and_model``
+with simulated providers whose ``get_available_models`` takes a small,
+configurable latency (an Ollama ``/api/tags`` round trip, for example).
+Compares a full provider scan per request (the catalog invalidated before
+every selection) against the memoized model catalog.
+
+Run with: python benchmarks/bench_model_selection.py [requests] [models_per_provider] [list_latency_us]
+"""
+
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add framework to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from framework.llm import (
+    LLMManager, LLMRequest, LLMMessage, LLMProvider, ModelCapability,
+    ModelInfo, ModelSelection, ProviderConfig, BaseLLMProvider
+)
+
+PROVIDERS = (LLMProvider.OPENAI, LLMProvider.ANTHROPIC, LLMProvider.OLLAMA)
+
+
+class CatalogProvider(BaseLLMProvider):
+    """Provider that only lists models, after a simulated round trip"""
+
+    def __init__(self, provider_type: LLMProvider, models, list_latency: float):
+        super().__init__({})
+        self.provider_type = provider_type
+        self.available_models = models
+        self.list_latency = list_latency
+
+    async def initialize(self):
+        pass
+
+    async def generate_completion(self, request):
+        raise NotImplementedError
+
+    async def generate_streaming_completion(self, request):
+        raise NotImplementedError
+
+    async def get_available_models(self):
+        if self.list_latency:
+            await asyncio.sleep(self.list_latency)
+        return self.available_models
+
+    async def validate_model(self, model_name):
+        return True
+
+
+def build_manager(models_per_provider: int, list_latency: float) -> LLMManager:
+    rng = random.Random(21)
+    capabilities = list(ModelCapability)
+    manager = LLMManager()
+    manager.providers = {}
+    for priority, provider_type in enumerate(PROVIDERS, 1):
+        models = [ModelInfo(
+            name=f"{provider_type.value}-{i}",
+            provider=provider_type,
+            model_id=f"{provider_type.value}-{i}",
+            capabilities=[ModelCapability.CHAT_COMPLETION] + rng.sample(capabilities, 3),
+            context_length=rng.choice([4096, 8192, 32768, 128000]),
+            max_output_tokens=4096,
+            cost_per_1k_tokens={"input": rng.choice([0.0, 0.0005, 0.003, 0.01])},
+            description="Benchmark model",
+            is_local=provider_type == LLMProvider.OLLAMA
+        ) for i in range(models_per_provider)]
+        manager.providers[provider_type] = CatalogProvider(provider_type, models, list_latency)
+        manager.provider_configs[provider_type] = ProviderConfig(provider_type, {}, priority=priority)
+    manager._initialized = True
+    return manager
+
+
+def make_selections():
+    """A handful of distinct selection profiles, as issued by different agents"""
+    return [
+        ModelSelection(required_capabilities=[ModelCapability.CHAT_COMPLETION]),
+        ModelSelection(required_capabilities=[ModelCapability.CHAT_COMPLETION], max_cost_per_1k_tokens=0.01,
+                       min_context_length=4096),
+        ModelSelection(required_capabilities=[ModelCapability.CODE_GENERATION], prefer_local=True),
+        ModelSelection(preferred_providers=[LLMProvider.ANTHROPIC], require_streaming=True),
+        ModelSelection(required_capabilities=[ModelCapability.VISION], min_context_length=32768)
+    ]
+
+
+async def measure(manager: LLMManager, requests: int, full_scan: bool):
+    selections = make_selections()
+    request = LLMRequest(messages=[LLMMessage(role="user", content="Plan my semester")], model="")
+    timings = []
+    for i in range(requests):
+        if full_scan:
+            manager.model_catalog.invalidate()
+        start = time.perf_counter()
+        await manager._select_provider_and_model(request, selections[i % len(selections)])
+        timings.append((time.perf_counter() - start) * 1e6)
+    timings.sort()
+    return timings
+
+
+async def run_benchmark(requests: int = 5000, models_per_provider: int = 40, list_latency_us: int = 200):
+    print("🧪 Model selection overhead benchmark")
+    print("=" * 60)
+    print(f"Selections: {requests:,}  models: {models_per_provider * len(PROVIDERS)}  "
+          f"model listing latency: {list_latency_us} µs")
+    print()
+    print(f"{'mode':>14} {'mean (µs)':>10} {'p50 (µs)':>10} {'p99 (µs)':>10}")
+
+    for label, full_scan in (("full scan", True), ("catalog", False)):
+        manager = build_manager(models_per_provider, list_latency_us / 1e6)
+        timings = await measure(manager, requests, full_scan)
+        p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+        print(f"{label:>14} {statistics.mean(timings):10.1f} {statistics.median(timings):10.1f} {p99:10.1f}")
+
+    print()
+    print(f"Catalog metrics: {manager.model_catalog.get_metrics()}")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:4]]
+    asyncio.run(run_benchmark(*args))
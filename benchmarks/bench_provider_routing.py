@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+CollegiumAI Provider Routing Benchmark
+======================================
+
+Drives ``LLMManager.generate_completion`` from many concurrent clients
+against three simulated providers with skewed, long-tailed latencies and a
+per-provider in-flight limit. Compares priority routing (every request to
+the highest-priority provider) with adaptive routing (power of two choices
+on latency moving average times in-flight requests), reporting throughput,
+tail latency and how requests were spread across providers.
+
+Run with: python benchmarks/bench_provider_routing.py [requests] [clients] [max_in_flight]
+"""
+
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add framework to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from framework.llm import (
+    LLMManager, LLMRequest, LLMResponse, LLMMessage, LLMProvider, ModelCapability,
+    ModelInfo, ProviderConfig, BaseLLMProvider
+)
+
+# (provider, priority, median latency in seconds); the preferred provider is the slowest
+PROVIDERS = (
+    (LLMProvider.OPENAI, 3, 0.080),
+    (LLMProvider.ANTHROPIC, 2, 0.030),
+    (LLMProvider.OLLAMA, 1, 0.010)
+)
+
+
+class SkewedLatencyProvider(BaseLLMProvider):
+    """Provider answering after a log-normally distributed delay"""
+
+    def __init__(self, provider_type: LLMProvider, median_latency: float, seed: int):
+        super().__init__({})
+        self.provider_type = provider_type
+        self.median_latency = median_latency
+        self.rng = random.Random(seed)
+        self.calls = 0
+        self.available_models = [ModelInfo(
+            name=f"{provider_type.value}-chat",
+            provider=provider_type,
+            model_id=f"{provider_type.value}-chat",
+            capabilities=[ModelCapability.CHAT_COMPLETION, ModelCapability.STREAMING],
+            context_length=8192,
+            max_output_tokens=1024,
+            cost_per_1k_tokens={"input": 0.0, "output": 0.0},
+            description="Benchmark model",
+            is_local=provider_type == LLMProvider.OLLAMA
+        )]
+
+    async def initialize(self):
+        pass
+
+    async def generate_completion(self, request):
+        self.calls += 1
+        await asyncio.sleep(self.median_latency * self.rng.lognormvariate(0, 0.5))
+        return LLMResponse(
+            content="ok",
+            model=request.model,
+            provider=self.provider_type,
+            usage={"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+            finish_reason="stop"
+        )
+
+    async def generate_streaming_completion(self, request):
+        raise NotImplementedError
+
+    async def get_available_models(self):
+        return self.available_models
+
+    async def validate_model(self, model_name):
+        return True
+
+
+def build_manager(strategy: str, max_in_flight: int) -> LLMManager:
+    manager = LLMManager()
+    manager.providers = {}
+    manager.provider_configs = {}
+    for seed, (provider_type, priority, latency) in enumerate(PROVIDERS):
+        manager.providers[provider_type] = SkewedLatencyProvider(provider_type, latency, seed)
+        manager.provider_configs[provider_type] = ProviderConfig(
+            provider_type, {}, priority=priority, max_concurrent_requests=max_in_flight
+        )
+    manager.load_balancer.strategy = strategy
+    manager.load_balancer.rng.seed(42)
+    manager._initialized = True
+    return manager
+
+
+async def measure(manager: LLMManager, requests: int, clients: int):
+    """Closed loop: each client sends its next request as soon as the previous one returns"""
+    timings = []
+    counter = iter(range(requests))
+
+    async def client():
+        for i in counter:
+            request = LLMRequest(messages=[LLMMessage(role="user", content=f"question {i}")], model="")
+            start = time.perf_counter()
+            await manager.generate_completion(request)
+            timings.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+    timings.sort()
+    return timings, elapsed
+
+
+def percentile(timings, fraction: float) -> float:
+    return timings[min(len(timings) - 1, int(len(timings) * fraction))]
+
+
+async def run_benchmark(requests: int = 600, clients: int = 48, max_in_flight: int = 8):
+    print("🧪 Provider routing benchmark")
+    print("=" * 60)
+    print(f"Requests: {requests:,}  clients: {clients}  max in flight per provider: {max_in_flight}")
+    print("Median latencies: " + ", ".join(
+        f"{provider_type.value} {latency * 1000:.0f} ms (priority {priority})"
+        for provider_type, priority, latency in PROVIDERS
+    ))
+    print()
+    print(f"{'strategy':>10} {'req/s':>8} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9}  share")
+
+    for strategy in ("priority", "adaptive"):
+        manager = build_manager(strategy, max_in_flight)
+        timings, elapsed = await measure(manager, requests, clients)
+        share = " ".join(
+            f"{provider_type.value}={manager.providers[provider_type].calls / requests:.0%}"
+            for provider_type, _, _ in PROVIDERS
+        )
+        print(f"{strategy:>10} {requests / elapsed:8.1f} {statistics.median(timings):9.1f} "
+              f"{percentile(timings, 0.95):9.1f} {percentile(timings, 0.99):9.1f}  {share}")
+
+    print()
+    stats = manager.get_load_balancing_statistics()
+    print(f"Adaptive routing: {stats['routed']} routed, {stats['rerouted']} away from the top-ranked provider")
+    for provider, load in stats["providers"].items():
+        print(f"  {provider:>10}: ewma {load['ewma_latency'] * 1000:.1f} ms, peak in flight {load['peak_in_flight']}, "
+              f"avg queue {load['average_queue_time'] * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:4]]
+    asyncio.run(run_benchmark(*args))
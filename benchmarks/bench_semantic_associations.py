@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+CollegiumAI Semantic Association Benchmark
+=========================================
+
+Measures per-store cost of ``LongTermMemory.store_semantic`` as the semantic
+network grows, and compares the prefix-filtered candidate generator with
+the previous all-pairs keyword comparison at the same network sizes.
+
+Run with: python benchmarks/bench_semantic_associations.py [max_concepts]
+"""
+
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add framework to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from framework.cognitive.memory import LongTermMemory
+
+# Concepts draw most keywords from one topic plus a few common general terms
+TOPICS = [[f"topic{t}_term{i}" for i in range(40)] for t in range(5000)]
+GENERAL_TERMS = [f"general{i}" for i in range(200)]
+SAMPLES = 200
+
+
+def random_content(rng: random.Random) -> str:
+    words = rng.sample(rng.choice(TOPICS), rng.randint(6, 16))
+    words += rng.sample(GENERAL_TERMS, rng.randint(0, 3))
+    return " ".join(words)
+
+
+def all_pairs_associations(memory: LongTermMemory, keywords: frozenset) -> int:
+    """Reference implementation: compare against every existing concept"""
+    associations = 0
+    for existing_keywords in memory.concept_keywords.values():
+        overlap = len(keywords & existing_keywords)
+        if overlap > 0 and overlap / len(keywords | existing_keywords) > memory.association_threshold:
+            associations += 1
+    return associations
+
+
+async def run_benchmark(max_concepts: int = 100000):
+    rng = random.Random(17)
+    memory = LongTermMemory("faculty")
+    checkpoints = [n for n in (1000, 10000, 100000, 1000000) if n <= max_concepts]
+    
+    print("🧪 Semantic association benchmark")
+    print("=" * 60)
+    print(f"{'concepts':>10} {'indexed (µs)':>13} {'all-pairs (µs)':>16} {'candidates':>12} {'matches':>9}")
+    
+    for checkpoint in checkpoints:
+        while len(memory.semantic_network) < checkpoint:
+            await memory.store_semantic(random_content(rng))
+        
+        samples = [random_content(rng) for _ in range(SAMPLES)]
+        
+        # Candidate generation plus verification, as done by store_semantic
+        start = time.perf_counter()
+        candidate_total = 0
+        for content in samples:
+            keywords = frozenset(memory._extract_keywords(content))
+            candidates = memory._association_candidates(None, keywords)
+            candidate_total += len(candidates)
+            for candidate_id in candidates:
+                existing_keywords = memory.concept_keywords[candidate_id]
+                overlap = len(keywords & existing_keywords)
+                overlap / (len(keywords) + len(existing_keywords) - overlap)
+        indexed_us = (time.perf_counter() - start) * 1e6 / SAMPLES
+        
+        start = time.perf_counter()
+        match_total = 0
+        for content in samples:
+            match_total += all_pairs_associations(memory, frozenset(memory._extract_keywords(content)))
+        all_pairs_us = (time.perf_counter() - start) * 1e6 / SAMPLES
+        
+        print(f"{checkpoint:>10,} {indexed_us:>13.1f} {all_pairs_us:>16.1f} "
+              f"{candidate_total / SAMPLES:>12.1f} {match_total / SAMPLES:>9.1f}")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:2]]
+    asyncio.run(run_benchmark(*args))
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+CollegiumAI Token Accounting Benchmark
+======================================
+
+Simulates a chat session that grows to 1,000 messages and, after every new
+turn, estimates the request size and truncates the history to a context
+budget. Compares the original approach (encoder looked up and every message
+re-tokenized on each call, result built with ``insert(0, ...)``) against
+the cached encoder, per-message token memo and prefix-sum truncation.
+
+Uses tiktoken encodings when they can be loaded, otherwise the
+character-based fallback; the memo helps most with real tokenization.
+
+Run with: python benchmarks/bench_token_accounting.py [messages] [budget]
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+import tiktoken
+
+# Add framework to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from framework.llm import LLMMessage, LLMRequest
+from framework.llm.utils import estimate_request_tokens, truncate_conversation, token_counts, get_encoder
+
+VOCABULARY = [f"word{i}" for i in range(2000)]
+
+
+def original_estimate_tokens(text: str, model: str) -> int:
+    """Reference implementation: encoding looked up on every call"""
+    try:
+        encoding_map = {"gpt-4": "cl100k_base", "gpt-3.5-turbo": "cl100k_base"}
+        encoding = tiktoken.get_encoding(encoding_map.get(model, "cl100k_base"))
+        return len(encoding.encode(text))
+    except Exception:
+        return len(text) // 4
+
+
+def original_request_tokens(messages, model: str) -> int:
+    return sum(4 + original_estimate_tokens(m.content, model) for m in messages) + 2
+
+
+def original_truncate(messages, max_tokens: int, model: str):
+    """Reference implementation: every message re-estimated, result built front to back"""
+    system_messages = [m for m in messages if m.role == "system"]
+    conversation = [m for m in messages if m.role != "system"]
+    system_tokens = sum(original_estimate_tokens(m.content, model) + 4 for m in system_messages)
+    available = max_tokens - system_tokens
+    truncated, used = [], 0
+    for m in reversed(conversation):
+        cost = original_estimate_tokens(m.content, model) + 4
+        if used + cost > available:
+            break
+        truncated.insert(0, m)
+        used += cost
+    return system_messages + truncated
+
+
+def make_history(length: int, rng: random.Random):
+    history = [LLMMessage(role="system", content="You are an academic advisor for university students.")]
+    for i in range(length - 1):
+        role = "user" if i % 2 == 0 else "assistant"
+        history.append(LLMMessage(role=role, content=" ".join(rng.choices(VOCABULARY, k=rng.randint(10, 80)))))
+    return history
+
+
+def session(history, budget: int, model: str, estimate, truncate) -> float:
+    """Grow the conversation one message at a time, accounting and truncating after each turn"""
+    start = time.perf_counter()
+    for turn in range(1, len(history) + 1):
+        conversation = history[:turn]
+        estimate(conversation, model)
+        truncate(conversation, budget, model)
+    return time.perf_counter() - start
+
+
+def run_benchmark(messages: int = 1000, budget: int = 100000):
+    rng = random.Random(17)
+    history = make_history(messages, rng)
+    model = "gpt-4"
+    tokenizer = "tiktoken" if get_encoder("cl100k_base") is not None else "character fallback"
+
+    print("🧪 Token accounting benchmark")
+    print("=" * 60)
+    print(f"Messages: {messages:,}  budget: {budget:,} tokens  tokenizer: {tokenizer}")
+    print()
+
+    original = session(history, budget, model, original_request_tokens, original_truncate)
+
+    token_counts.clear()
+    memoized = session(
+        history, budget, model,
+        lambda conversation, m: estimate_request_tokens(LLMRequest(messages=conversation, model=m)),
+        lambda conversation, b, m: truncate_conversation(conversation, b, model=m)
+    )
+
+    assert original_truncate(history, budget, model) == truncate_conversation(history, budget, model=model)
+
+    print(f"{'mode':>10} {'total (ms)':>12} {'per turn (µs)':>14}")
+    print(f"{'original':>10} {original * 1000:12.1f} {original / messages * 1e6:14.1f}")
+    print(f"{'memoized':>10} {memoized * 1000:12.1f} {memoized / messages * 1e6:14.1f}")
+    print(f"Speedup: {original / memoized:.1f}x")
+    print()
+    print(f"Token memo: {token_counts.get_metrics()}")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    run_benchmark(*args)
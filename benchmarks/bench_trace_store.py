@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+CollegiumAI Columnar Trace Store Benchmark
+=========================================
+
+Compares per-trace memory of ``MemoryTrace`` views backed by a
+``ColumnarTraceStore`` against the previous dataclass representation, and
+times vectorized decay sweeps over up to 1M traces.
+
+Run with: python benchmarks/bench_trace_store.py
+"""
+
+import sys
+import time
+import tracemalloc
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+# Add framework to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from framework.cognitive.memory import MemoryTrace, MemoryType, ColumnarTraceStore
+
+TRACES = 100000
+
+
+@dataclass
+class LegacyMemoryTrace:
+    """The dataclass MemoryTrace layout before the columnar store"""
+    trace_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    content: Any = None
+    memory_type: MemoryType = MemoryType.WORKING
+    strength: float = 0.5
+    created_at: datetime = field(default_factory=datetime.now)
+    last_accessed: datetime = field(default_factory=datetime.now)
+    access_count: int = 0
+    tags: List[str] = field(default_factory=list)
+    associations: List[str] = field(default_factory=list)
+    context: Dict[str, Any] = field(default_factory=dict)
+    decay_rate: float = 0.1
+    
+    def decay(self, time_passed: float):
+        self.strength *= np.exp(-self.decay_rate * time_passed)
+        self.strength = max(0.01, self.strength)
+
+
+def measure_bytes(factory) -> float:
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    keep = factory()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del keep
+    return (current - baseline) / TRACES
+
+
+def legacy_traces():
+    return [LegacyMemoryTrace(content=i, strength=0.8, decay_rate=0.3) for i in range(TRACES)]
+
+
+def columnar_traces():
+    store = ColumnarTraceStore(TRACES)
+    traces = [MemoryTrace(content=i, strength=0.8, decay_rate=0.3) for i in range(TRACES)]
+    for trace in traces:
+        store.attach(trace)
+    return store, traces
+
+
+def run_benchmark():
+    print("🧪 Columnar trace store benchmark")
+    print("=" * 60)
+    
+    legacy_bytes = measure_bytes(legacy_traces)
+    columnar_bytes = measure_bytes(columnar_traces)
+    print(f"Memory per trace: legacy {legacy_bytes:.0f} B, columnar {columnar_bytes:.0f} B "
+          f"({legacy_bytes / columnar_bytes:.1f}x smaller)")
+    
+    # Scalar fields only: datetimes, floats and ints vs one row of the columns
+    legacy_scalars = 2 * sys.getsizeof(datetime.now()) + 2 * sys.getsizeof(0.5) + sys.getsizeof(1000)
+    columnar_scalars = ColumnarTraceStore(1).nbytes
+    print(f"Scalar fields per trace: legacy {legacy_scalars} B, columnar {columnar_scalars} B "
+          f"({legacy_scalars / columnar_scalars:.1f}x smaller)")
+    
+    traces = legacy_traces()
+    start = time.perf_counter()
+    for trace in traces:
+        trace.decay(1.0)
+    print(f"Legacy per-object decay, {TRACES:,} traces: {(time.perf_counter() - start) * 1000:.1f} ms")
+    
+    for size in (100000, 1000000):
+        store = ColumnarTraceStore(size)
+        store.alive[:] = True
+        store.size = size
+        store.strength[:] = np.random.default_rng(0).uniform(0.05, 1.0, size)
+        store.decay_rate[:] = 0.3
+        
+        start = time.perf_counter()
+        store.apply_decay(1.0)
+        weak = np.flatnonzero(store.alive & (store.strength < 0.1))
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"Vectorized decay + weak scan, {size:,} traces: {elapsed_ms:.1f} ms ({len(weak):,} weak)")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+CollegiumAI Working Memory Retrieval Benchmark
+=============================================
+
+Compares indexed ``WorkingMemory.retrieve`` against the original linear
+scan that scores every trace with ``_calculate_similarity``.
+
+Run with: python benchmarks/bench_working_memory_retrieval.py
+"""
+
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add framework to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from framework.cognitive.memory import WorkingMemory
+
+VOCABULARY = [f"term{i}" for i in range(5000)]
+CAPACITIES = [100, 1000, 10000]
+QUERIES = 200
+
+
+def linear_scan(memory: WorkingMemory, query, threshold: float):
+    """Reference implementation: score every trace one at a time"""
+    matches = []
+    for trace_id, trace in memory.memories.items():
+        if memory._calculate_similarity(query, trace) >= threshold:
+            trace.access()
+            memory.active_chunk_ids.move_to_end(trace_id)
+            matches.append(trace)
+    matches.sort(key=lambda t: (t.strength, t.access_count), reverse=True)
+    return matches
+
+
+async def populate(capacity: int, rng: random.Random) -> WorkingMemory:
+    memory = WorkingMemory("student")
+    memory.capacity = capacity
+    
+    for _ in range(capacity):
+        content = " ".join(rng.sample(VOCABULARY, 8))
+        await memory.store(content, {"type": "perception"}, rng.sample(VOCABULARY, 2))
+    
+    return memory
+
+
+async def run_benchmark():
+    rng = random.Random(42)
+    print("🧪 Working memory retrieval benchmark")
+    print("=" * 60)
+    print(f"{'traces':>8} {'linear (ms)':>14} {'indexed (ms)':>14} {'speedup':>10}")
+    
+    for capacity in CAPACITIES:
+        memory = await populate(capacity, rng)
+        queries = [" ".join(rng.sample(VOCABULARY, 6)) for _ in range(QUERIES)]
+        threshold = 0.1
+        
+        start = time.perf_counter()
+        for query in queries:
+            linear_scan(memory, query, threshold)
+        linear_ms = (time.perf_counter() - start) * 1000 / QUERIES
+        
+        start = time.perf_counter()
+        for query in queries:
+            await memory.retrieve(query, threshold)
+        indexed_ms = (time.perf_counter() - start) * 1000 / QUERIES
+        
+        speedup = linear_ms / indexed_ms if indexed_ms > 0 else float("inf")
+        print(f"{capacity:>8} {linear_ms:>14.3f} {indexed_ms:>14.3f} {speedup:>9.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_benchmark())
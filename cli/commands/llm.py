@@ -14,7 +14,7 @@ import click
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
 from rich import print as rprint
 
 from framework.llm import LLMManager, LLMRequest, LLMMessage, ModelSelection, ModelCapability, LLMProvider
@@ -338,6 +338,105 @@ def chat(prompt: str, config_path: Optional[str], model: Optional[str], provider
     
     return asyncio.run(_chat())
 
+def _batch_request(record: dict, index: int, model: Optional[str], temperature: float, max_tokens: Optional[int]) -> LLMRequest:
+    """Build a request from one JSONL record: {"id", "prompt" or "messages", optional "system", "model", ...}"""
+    if "messages" in record:
+        messages = [LLMMessage(role=m["role"], content=m["content"], name=m.get("name")) for m in record["messages"]]
+    elif "prompt" in record:
+        messages = [LLMMessage(role="user", content=record["prompt"])]
+    else:
+        raise click.ClickException(f"Line {index + 1}: expected a 'prompt' or 'messages' field")
+    if record.get("system"):
+        messages.insert(0, LLMMessage(role="system", content=record["system"]))
+    
+    return LLMRequest(
+        messages=messages,
+        model=record.get("model", model or ""),
+        temperature=record.get("temperature", temperature),
+        max_tokens=record.get("max_tokens", max_tokens),
+        metadata={"batch_id": str(record.get("id", index))}
+    )
+
+@llm.command()
+@click.argument('input_file', type=click.Path(exists=True, dir_okay=False))
+@click.option('--output', '-o', type=click.Path(dir_okay=False), help='JSONL file for results (default: <input>.results.jsonl)')
+@click.option('--config-path', '-c', type=click.Path(exists=True), help='Path to LLM configuration file')
+@click.option('--concurrency', '-j', type=int, default=8, help='Requests in flight at once')
+@click.option('--max-retries', type=int, default=2, help='Retries per item before it is reported as failed')
+@click.option('--checkpoint', type=click.Path(dir_okay=False), help='Record completed items here and skip them when rerun')
+@click.option('--resume', is_flag=True, help='Checkpoint to <output>.checkpoint (shorthand for --checkpoint)')
+@click.option('--model', '-m', help='Model for items that do not name one')
+@click.option('--temperature', '-t', type=float, default=0.7, help='Temperature for items that do not set one')
+@click.option('--max-tokens', type=int, help='Maximum tokens for items that do not set one')
+@click.option('--prefer-local', is_flag=True, help='Prefer local models')
+def batch(input_file: str, output: Optional[str], config_path: Optional[str], concurrency: int, max_retries: int,
+          checkpoint: Optional[str], resume: bool, model: Optional[str], temperature: float,
+          max_tokens: Optional[int], prefer_local: bool):
+    """Run every prompt in a JSONL file, writing results as they complete"""
+    
+    input_path = Path(input_file)
+    output_path = Path(output) if output else input_path.with_suffix(".results.jsonl")
+    if resume and not checkpoint:
+        checkpoint = str(output_path) + ".checkpoint"
+    
+    with open(input_path, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    requests = [_batch_request(record, i, model, temperature, max_tokens) for i, record in enumerate(records)]
+    
+    async def _batch():
+        config_file = Path(config_path) if config_path else None
+        llm_manager = LLMManager(config_file)
+        failed = 0
+        
+        try:
+            await llm_manager.initialize()
+            
+            with open(output_path, "w", encoding="utf-8") as out, Progress(
+                SpinnerColumn(),
+                TextColumn("[progress.description]{task.description}"),
+                BarColumn(),
+                TextColumn("{task.completed}/{task.total}"),
+                console=console
+            ) as progress:
+                task = progress.add_task("Generating completions...", total=len(requests))
+                
+                async for result in llm_manager.generate_batch(
+                    requests,
+                    max_concurrency=concurrency,
+                    selection_criteria=ModelSelection(prefer_local=prefer_local),
+                    max_retries=max_retries,
+                    checkpoint_path=checkpoint
+                ):
+                    record = {"id": result.item_id, "attempts": result.attempts, "resumed": result.resumed}
+                    if result.ok:
+                        record.update(
+                            content=result.response.content,
+                            model=result.response.model,
+                            provider=result.response.provider.value,
+                            usage=result.response.usage
+                        )
+                    else:
+                        failed += 1
+                        record["error"] = result.error
+                    out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    out.flush()
+                    progress.advance(task)
+            
+            metrics = llm_manager.batch_metrics
+            console.print(f"[green]Completed {len(requests) - failed}/{len(requests)} items[/green] "
+                          f"[dim](resumed {metrics.get('resumed', 0)}, retried {metrics.get('retried', 0)})[/dim]")
+            console.print(f"[dim]Results: {output_path}[/dim]")
+            if failed:
+                hint = "; rerun with the same checkpoint to retry only those" if checkpoint else ""
+                console.print(f"[yellow]{failed} item(s) failed{hint}[/yellow]")
+                return 1
+            
+        except Exception as e:
+            console.print(f"[red]Error: {e}[/red]")
+            return 1
+    
+    return asyncio.run(_batch())
+
 @llm.command()
 @click.option('--config-path', '-c', type=click.Path(exists=True), help='Path to LLM configuration file')
 @click.option('--format', '-f', type=click.Choice(['table', 'json', 'yaml']), default='table', help='Output format')
@@ -367,6 +466,8 @@ def usage(config_path: Optional[str], format: str):
                         'total_cost': stat.total_cost,
                         'avg_latency': stat.avg_latency,
                         'error_count': stat.error_count,
+                        'cache_hits': stat.cache_hits,
+                        'cache_misses': stat.cache_misses,
                         'last_used': stat.last_used.isoformat() if stat.last_used else None
                     }
                 rprint(json.dumps(stats_data, indent=2))
@@ -382,6 +483,8 @@ def usage(config_path: Optional[str], format: str):
                         'total_cost': stat.total_cost,
                         'avg_latency': stat.avg_latency,
                         'error_count': stat.error_count,
+                        'cache_hits': stat.cache_hits,
+                        'cache_misses': stat.cache_misses,
                         'last_used': stat.last_used.isoformat() if stat.last_used else None
                     }
                 rprint(yaml.dump(stats_data, default_flow_style=False))
@@ -395,6 +498,7 @@ def usage(config_path: Optional[str], format: str):
                 table.add_column("Total Cost", style="red")
                 table.add_column("Avg Latency", style="blue")
                 table.add_column("Errors", style="magenta")
+                table.add_column("Cache Hits", style="green")
                 table.add_column("Last Used", style="white")
                 
                 for key, stat in stats.items():
@@ -407,6 +511,7 @@ def usage(config_path: Optional[str], format: str):
                         f"${stat.total_cost:.4f}" if stat.total_cost > 0 else "$0.00",
                         f"{stat.avg_latency:.2f}s",
                         str(stat.error_count),
+                        str(stat.cache_hits),
                         last_used
                     )
                 
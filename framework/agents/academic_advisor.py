@@ -42,14 +42,8 @@ class AcademicAdvisorAgent(BaseAgent):
             university_context=university_context
         )
         
-        # Initialize academic advisor specific knowledge
-        self.knowledge_base.update({
-            "degree_requirements": self._load_degree_requirements(),
-            "course_catalog": self._load_course_catalog(),
-            "prerequisite_chains": self._load_prerequisite_chains(),
-            "career_pathways": self._load_career_pathways(),
-            "academic_policies": self._load_academic_policies()
-        })
+        # Initialize academic advisor specific knowledge; the tables are shared by all instances
+        self.knowledge_base.update(self._shared_reference_tables())
     
     async def think(self, query: str, context: Dict[str, Any]) -> List[AgentThought]:
         """
@@ -443,6 +437,16 @@ class AcademicAdvisorAgent(BaseAgent):
         return compliance_action
     
     # Mock data loading methods (would integrate with real systems)
+    def _load_reference_tables(self) -> Dict[str, Any]:
+        """Load the academic advisor reference tables"""
+        return {
+            "degree_requirements": self._load_degree_requirements(),
+            "course_catalog": self._load_course_catalog(),
+            "prerequisite_chains": self._load_prerequisite_chains(),
+            "career_pathways": self._load_career_pathways(),
+            "academic_policies": self._load_academic_policies()
+        }
+    
     def _load_degree_requirements(self) -> Dict[str, Any]:
         """Load degree requirements from university systems"""
         return {
@@ -0,0 +1,205 @@
+"""
+Agent Pool
+==========
+
+Keeps a fixed number of pre-built agents per agent type, so request handlers
+lease a warm agent instead of constructing one per request. Agents are built
+once at startup; their static reference tables (course catalog, support
+services, ...) are loaded once per agent class and shared by every instance.
+What an agent accumulates while serving a request (its interaction memory and
+any knowledge base additions) is cleared when the lease ends, so nothing from
+one user's request is visible to the next lease of the same agent.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Optional
+
+from ..core import BaseAgent, PersonaType, ProcessType, UniversityContext
+
+logger = logging.getLogger(__name__)
+
+AgentFactory = Callable[[str], BaseAgent]  # Builds an agent from its agent_id
+
+@dataclass
+class AgentPoolConfig:
+    """Agent pool configuration"""
+    size_per_type: int = 4
+    acquire_timeout: Optional[float] = 30.0  # Seconds a request waits for a free agent; None waits forever
+    wait_samples: int = 1024  # Recent lease wait times kept for percentiles
+
+class AgentPoolExhausted(Exception):
+    """No agent of the requested type became free within the acquire timeout"""
+
+class AgentPool:
+    """Fixed-size pools of warm agents leased with async checkout and return"""
+
+    def __init__(self, factories: Dict[str, AgentFactory], config: Optional[AgentPoolConfig] = None):
+        self.factories = factories
+        self.config = config or AgentPoolConfig()
+        self.started_at: Optional[float] = None
+
+        self._idle: Dict[str, Deque[BaseAgent]] = {}
+        self._waiters: Dict[str, Deque[asyncio.Future]] = {}  # Pending leases, served first come first served
+        self._baselines: Dict[str, Dict[str, Any]] = {}  # agent_id -> knowledge base as built
+        self._in_use: Dict[str, int] = {}
+        self._peak_in_use: Dict[str, int] = {}
+        self._busy_time: Dict[str, float] = {}  # Agent-seconds spent leased, per type
+        self._wait_times: Deque[float] = deque(maxlen=self.config.wait_samples)
+
+        self.metrics = {
+            "leases": 0,
+            "waited": 0,  # Leases that found no idle agent and had to wait
+            "timeouts": 0,
+            "total_wait_time": 0.0,
+            "max_wait_time": 0.0
+        }
+
+    @property
+    def agent_types(self) -> List[str]:
+        return list(self.factories)
+
+    async def start(self) -> None:
+        """Build size_per_type agents of every registered type"""
+        for agent_type, factory in self.factories.items():
+            idle = deque()
+            for i in range(self.config.size_per_type):
+                agent = factory(f"{agent_type}_{i + 1}")
+                self._baselines[agent.agent_id] = dict(agent.knowledge_base)
+                idle.append(agent)
+            self._idle[agent_type] = idle
+            self._waiters[agent_type] = deque()
+            self._in_use[agent_type] = 0
+            self._peak_in_use[agent_type] = 0
+            self._busy_time[agent_type] = 0.0
+
+        self.started_at = time.monotonic()
+        logger.info(f"Agent pool started with {self.config.size_per_type} agents for each of {self.agent_types}")
+
+    @asynccontextmanager
+    async def lease(self, agent_type: str) -> AsyncIterator[BaseAgent]:
+        """Check out an idle agent for the duration of the block"""
+        idle = self._idle.get(agent_type)
+        if idle is None:
+            raise ValueError(f"Unknown agent type: {agent_type}")
+
+        requested = time.monotonic()
+        agent = await self._checkout(agent_type)
+        leased = time.monotonic()
+        self._record_wait(leased - requested)
+        self._in_use[agent_type] += 1
+        self._peak_in_use[agent_type] = max(self._peak_in_use[agent_type], self._in_use[agent_type])
+        try:
+            yield agent
+        finally:
+            self._in_use[agent_type] -= 1
+            self._busy_time[agent_type] += time.monotonic() - leased
+            self._reset(agent)
+            self._checkin(agent_type, agent)
+
+    async def _checkout(self, agent_type: str) -> BaseAgent:
+        """Take an idle agent, or queue behind earlier requests until one is handed over"""
+        idle, waiters = self._idle[agent_type], self._waiters[agent_type]
+        if idle and not waiters:
+            return idle.popleft()
+
+        self.metrics["waited"] += 1
+        waiter = asyncio.get_running_loop().create_future()
+        waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.config.acquire_timeout)
+        except BaseException as e:
+            if waiter.done():
+                # Handed an agent just as this request gave up; pass it on
+                self._checkin(agent_type, waiter.result())
+            else:
+                waiter.cancel()
+                waiters.remove(waiter)
+            if isinstance(e, asyncio.TimeoutError):
+                self.metrics["timeouts"] += 1
+                raise AgentPoolExhausted(
+                    f"No {agent_type} agent became free within {self.config.acquire_timeout}s"
+                ) from None
+            raise
+        return waiter.result()
+
+    def _checkin(self, agent_type: str, agent: BaseAgent) -> None:
+        """Hand a returned agent straight to the longest waiting request, if any"""
+        waiters = self._waiters[agent_type]
+        while waiters:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(agent)
+                return
+        self._idle[agent_type].append(agent)
+
+    def _reset(self, agent: BaseAgent) -> None:
+        """Drop the per-request state an agent accumulated during its lease"""
+        agent.memory = []
+        agent.knowledge_base = dict(self._baselines[agent.agent_id])
+
+    def _record_wait(self, waited: float) -> None:
+        self.metrics["leases"] += 1
+        self.metrics["total_wait_time"] += waited
+        self.metrics["max_wait_time"] = max(self.metrics["max_wait_time"], waited)
+        self._wait_times.append(waited)
+
+    def _wait_percentile(self, fraction: float) -> float:
+        if not self._wait_times:
+            return 0.0
+        ordered = sorted(self._wait_times)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+    def get_metrics(self) -> Dict[str, Any]:
+        leases = self.metrics["leases"]
+        return {
+            **self.metrics,
+            "average_wait_time": self.metrics["total_wait_time"] / leases if leases else 0.0,
+            "p50_wait_time": self._wait_percentile(0.5),
+            "p99_wait_time": self._wait_percentile(0.99)
+        }
+
+    def get_status(self) -> Dict[str, Any]:
+        """Per-type occupancy plus lease wait metrics"""
+        elapsed = time.monotonic() - self.started_at if self.started_at is not None else 0.0
+        size = self.config.size_per_type
+        agents = {}
+        for agent_type in self._idle:
+            in_use = self._in_use[agent_type]
+            agents[agent_type] = {
+                "size": size,
+                "in_use": in_use,
+                "idle": len(self._idle[agent_type]),
+                "waiting": len(self._waiters[agent_type]),
+                "utilization": in_use / size if size else 0.0,
+                "peak_in_use": self._peak_in_use[agent_type],
+                # Share of the pool's agent-seconds spent leased since start
+                "average_utilization": self._busy_time[agent_type] / (size * elapsed) if size and elapsed else 0.0
+            }
+        return {"agents": agents, **self.get_metrics()}
+
+def default_agent_factories(university_context: UniversityContext) -> Dict[str, AgentFactory]:
+    """Factories for the agent types served by the API"""
+    from .academic_advisor import AcademicAdvisorAgent
+    from .student_services import StudentServicesAgent
+
+    return {
+        "academic_advisor": lambda agent_id: AcademicAdvisorAgent(
+            agent_id=agent_id,
+            persona_type=PersonaType.ACADEMIC_ADVISOR,
+            supported_processes=[ProcessType.TEACHING_AND_LEARNING, ProcessType.STUDENT_LIFECYCLE_MANAGEMENT],
+            governance_frameworks=list(university_context.accreditations),
+            university_context=university_context
+        ),
+        "student_services": lambda agent_id: StudentServicesAgent(
+            agent_id=agent_id,
+            persona_type=PersonaType.STUDENT_SERVICES_COORDINATOR,
+            supported_processes=[ProcessType.STUDENT_ENGAGEMENT_AND_EXPERIENCE, ProcessType.STUDENT_LIFECYCLE_MANAGEMENT],
+            governance_frameworks=list(university_context.accreditations),
+            university_context=university_context
+        )
+    }
@@ -0,0 +1,152 @@
+"""
+Agent Response Streaming
+========================
+
+Delivery of agent events to clients while a query is still being processed.
+AgentEventStream runs one query in its own task and relays its events to a
+single client through a bounded buffer. When the client reads slower than
+the agent produces, final response tokens are merged into larger chunks
+instead of queueing one event per word, and every other event waits for
+buffer space; a client that accepts nothing for send_timeout seconds ends
+the stream, which also stops the query. InteractionBroadcaster fans
+completed interactions out to live subscribers, dropping a subscriber's
+oldest undelivered updates rather than slowing down the publisher.
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field, replace
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+
+from ..core import AgentEvent, AgentResponse
+
+logger = logging.getLogger(__name__)
+
+_END = object()  # Marks the end of a relayed stream
+
+@dataclass
+class AgentInteraction:
+    """A completed agent query, as published to interaction subscribers"""
+    agent_type: str
+    response: AgentResponse
+    collaborating_agents: List[str] = field(default_factory=list)
+
+class AgentStreamTimeout(Exception):
+    """The client did not accept an event within the send timeout"""
+
+class AgentEventStream:
+    """Bounded relay of one agent query's events to one client"""
+
+    def __init__(self, events: AsyncIterator[AgentEvent], max_buffered: int = 32,
+                 send_timeout: Optional[float] = 30.0):
+        self.events = events
+        self.send_timeout = send_timeout
+        self.error: Optional[Exception] = None
+        self._buffer: asyncio.Queue = asyncio.Queue(maxsize=max(1, max_buffered))
+
+        self.metrics = {
+            "events": 0,  # Events delivered to the client
+            "coalesced_tokens": 0,  # Token events merged into an earlier chunk
+            "blocked_sends": 0  # Times the agent waited for the client to free buffer space
+        }
+
+    async def __aiter__(self) -> AsyncIterator[AgentEvent]:
+        producer = asyncio.ensure_future(self._produce())
+        try:
+            while True:
+                event = await self._buffer.get()
+                if event is _END:
+                    break
+                self.metrics["events"] += 1
+                yield event
+            if self.error is not None:
+                raise self.error
+        finally:
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+
+    async def _produce(self) -> None:
+        pending_tokens: Optional[AgentEvent] = None
+        try:
+            async for event in self.events:
+                if event.event_type == "token":
+                    if pending_tokens is None:
+                        pending_tokens = event
+                    else:
+                        pending_tokens = replace(pending_tokens, data=pending_tokens.data + event.data)
+                        self.metrics["coalesced_tokens"] += 1
+                    if not self._buffer.full():
+                        self._buffer.put_nowait(pending_tokens)
+                        pending_tokens = None
+                    continue
+
+                if pending_tokens is not None:
+                    await self._send(pending_tokens)
+                    pending_tokens = None
+                await self._send(event)
+
+            if pending_tokens is not None:
+                await self._send(pending_tokens)
+        except Exception as e:
+            self.error = e
+        finally:
+            aclose = getattr(self.events, "aclose", None)
+            if aclose is not None:
+                await aclose()
+        await self._buffer.put(_END)
+
+    async def _send(self, event: AgentEvent) -> None:
+        if self._buffer.full():
+            self.metrics["blocked_sends"] += 1
+        try:
+            await asyncio.wait_for(self._buffer.put(event), self.send_timeout)
+        except asyncio.TimeoutError:
+            raise AgentStreamTimeout(f"Client accepted no events for {self.send_timeout}s") from None
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return dict(self.metrics)
+
+class InteractionBroadcaster:
+    """In-process publish/subscribe for completed agent interactions"""
+
+    def __init__(self, max_buffered: int = 100):
+        self.max_buffered = max_buffered
+        self._subscribers: Set[asyncio.Queue] = set()
+
+        self.metrics = {
+            "published": 0,
+            "delivered": 0,
+            "dropped": 0  # Updates discarded because a subscriber fell behind
+        }
+
+    def publish(self, update: AgentInteraction) -> None:
+        """Queue an update for every subscriber without waiting on any of them"""
+        self.metrics["published"] += 1
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()
+                self.metrics["dropped"] += 1
+            queue.put_nowait(update)
+
+    @asynccontextmanager
+    async def subscribe(self) -> AsyncIterator[AsyncIterator[AgentInteraction]]:
+        """Updates published while the block is open, in publication order"""
+        queue = asyncio.Queue(maxsize=self.max_buffered)
+        self._subscribers.add(queue)
+        try:
+            yield self._updates(queue)
+        finally:
+            self._subscribers.discard(queue)
+
+    async def _updates(self, queue: asyncio.Queue) -> AsyncIterator[AgentInteraction]:
+        while True:
+            update = await queue.get()
+            self.metrics["delivered"] += 1
+            yield update
+
+    def get_status(self) -> Dict[str, Any]:
+        return {**self.metrics, "subscribers": len(self._subscribers)}
+
+# Shared by the REST and GraphQL endpoints of the process
+interaction_updates = InteractionBroadcaster()
@@ -42,15 +42,8 @@ class StudentServicesAgent(BaseAgent):
             university_context=university_context
         )
         
-        # Initialize student services specific knowledge
-        self.knowledge_base.update({
-            "support_services": self._load_support_services(),
-            "wellness_resources": self._load_wellness_resources(),
-            "career_services": self._load_career_services(),
-            "campus_resources": self._load_campus_resources(),
-            "emergency_protocols": self._load_emergency_protocols(),
-            "accessibility_services": self._load_accessibility_services()
-        })
+        # Initialize student services specific knowledge; the tables are shared by all instances
+        self.knowledge_base.update(self._shared_reference_tables())
     
     async def think(self, query: str, context: Dict[str, Any]) -> List[AgentThought]:
         """
@@ -546,6 +539,17 @@ class StudentServicesAgent(BaseAgent):
         return followup_action
     
     # Knowledge base loading methods
+    def _load_reference_tables(self) -> Dict[str, Any]:
+        """Load the student services reference tables"""
+        return {
+            "support_services": self._load_support_services(),
+            "wellness_resources": self._load_wellness_resources(),
+            "career_services": self._load_career_services(),
+            "campus_resources": self._load_campus_resources(),
+            "emergency_protocols": self._load_emergency_protocols(),
+            "accessibility_services": self._load_accessibility_services()
+        }
+    
     def _load_support_services(self) -> Dict[str, Any]:
         """Load available support services"""
         return {
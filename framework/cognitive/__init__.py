@@ -7,6 +7,7 @@ from .cognitive_core import CognitiveEngine, CognitiveState
 from .perception import PerceptionModule, PerceptualFeature, MultiModalPerception
 from .reasoning import ReasoningEngine, CausalReasoning, AnalogicalReasoning, ReasoningChain
 from .memory import CognitiveMemory, WorkingMemory, EpisodicMemory, LongTermMemory
+from .memory_snapshot import MemorySnapshot, SnapshotError
 from .learning import AdaptiveLearning, MetaLearning, TransferLearning, LearningType, LearningEpisode
 from .decision_making import DecisionEngine, DecisionType, DecisionCriteria, DecisionAlternative, DecisionContext
 from .attention import AttentionMechanism, AttentionType, FocusState, AttentionTarget, AttentionalResource
@@ -60,6 +61,8 @@ __all__ = [
     'WorkingMemory',
     'EpisodicMemory',
     'LongTermMemory',
+    'MemorySnapshot',
+    'SnapshotError',
     
     # Learning system
     'AdaptiveLearning',
@@ -5,10 +5,13 @@ Advanced cognitive processing inspired by cognitive science and neuroscience
 
 import asyncio
 import numpy as np
-from typing import Dict, List, Any, Optional, Tuple, Union
+from typing import Dict, List, Any, Optional, Tuple, Union, Callable, Awaitable
 from dataclasses import dataclass, field
 from enum import Enum
+from collections import defaultdict
+from functools import partial
 import logging
+import time
 from datetime import datetime
 import uuid
 
@@ -55,6 +58,116 @@ class CognitiveState:
         """Calculate available cognitive capacity"""
         return max(0.0, self.working_memory_capacity - self.cognitive_load)
 
+@dataclass
+class CognitivePhase:
+    """A step of the cognitive cycle and the results it depends on"""
+    name: str
+    handler: Callable[..., Awaitable[Any]]  # called with the dependency results in order
+    depends_on: Tuple[str, ...] = ()
+    deferred: bool = False  # runs after the cycle result has been returned
+    batch_handler: Optional[Callable[..., Awaitable[List[Any]]]] = None  # called with one list per dependency
+
+class PhaseGraph:
+    """
+    Dependency-declared executor for cognitive phases
+    Phases are grouped into waves; phases within a wave are independent and run with asyncio.gather
+    """
+    
+    def __init__(self, phases: List[CognitivePhase], inputs: Tuple[str, ...] = ()):
+        self.phases = {phase.name: phase for phase in phases}
+        self.inputs = set(inputs)
+        self.waves = self._build_waves()
+    
+    def _build_waves(self) -> List[List[CognitivePhase]]:
+        """Topologically order phases into waves of mutually independent phases"""
+        for phase in self.phases.values():
+            for dependency in phase.depends_on:
+                if dependency not in self.phases and dependency not in self.inputs:
+                    raise ValueError(f"Phase '{phase.name}' depends on unknown phase '{dependency}'")
+                if dependency in self.phases and self.phases[dependency].deferred and not phase.deferred:
+                    raise ValueError(f"Phase '{phase.name}' cannot depend on deferred phase '{dependency}'")
+        
+        completed = set(self.inputs)
+        remaining = list(self.phases.values())
+        waves = []
+        while remaining:
+            wave = [phase for phase in remaining if all(d in completed for d in phase.depends_on)]
+            if not wave:
+                raise ValueError(f"Cyclic phase dependencies: {[phase.name for phase in remaining]}")
+            waves.append(wave)
+            completed.update(phase.name for phase in wave)
+            remaining = [phase for phase in remaining if phase.name not in completed]
+        
+        return waves
+    
+    async def run(self, results: Dict[str, Any], timings: Dict[str, float],
+                  deferred: bool = False, concurrent: bool = True) -> Dict[str, Any]:
+        """
+        Run the immediate (or deferred) phases, storing each output in results under the phase name
+        Phases already in results are skipped, so a cycle interrupted by an error resumes where it stopped
+        """
+        for wave in self.waves:
+            phases = [phase for phase in wave if phase.deferred == deferred and phase.name not in results]
+            await self._run_wave([partial(self._run_phase, phase, results, timings) for phase in phases], concurrent)
+        
+        return results
+    
+    async def run_batch(self, batch_results: List[Dict[str, Any]], timings: Dict[str, float],
+                        deferred: bool = False, concurrent: bool = True) -> List[Dict[str, Any]]:
+        """
+        Run phases for a batch of cycles; phases with a batch handler run once for the whole batch
+        On an error every cycle keeps the outputs of the phases it completed and can be resumed with run
+        """
+        for wave in self.waves:
+            phases = [phase for phase in wave if phase.deferred == deferred]
+            await self._run_wave([partial(self._run_phase_batch, phase, batch_results, timings, concurrent)
+                                  for phase in phases], concurrent)
+        
+        return batch_results
+    
+    @staticmethod
+    async def _run_wave(calls: List[Callable[[], Awaitable[None]]], concurrent: bool):
+        """Run independent calls; all of them finish before the first error is raised"""
+        if concurrent and len(calls) > 1:
+            outcomes = await asyncio.gather(*(call() for call in calls), return_exceptions=True)
+            for outcome in outcomes:
+                if isinstance(outcome, BaseException):
+                    raise outcome
+        else:
+            for call in calls:
+                await call()
+    
+    async def _run_phase_batch(self, phase: CognitivePhase, batch_results: List[Dict[str, Any]],
+                               timings: Dict[str, float], concurrent: bool):
+        """Run one phase across the cycles of a batch that lack its output and record its wall-clock time"""
+        pending = [results for results in batch_results if phase.name not in results]
+        if not pending:
+            return
+        
+        start = time.perf_counter()
+        try:
+            if phase.batch_handler:
+                outputs = await phase.batch_handler(*([results[dependency] for results in pending]
+                                                      for dependency in phase.depends_on))
+                for results, output in zip(pending, outputs):
+                    results[phase.name] = output
+                return
+            
+            async def run_one(results):
+                results[phase.name] = await phase.handler(*(results[dependency] for dependency in phase.depends_on))
+            
+            await self._run_wave([partial(run_one, results) for results in pending], concurrent)
+        finally:
+            timings[phase.name] = time.perf_counter() - start
+    
+    async def _run_phase(self, phase: CognitivePhase, results: Dict[str, Any], timings: Dict[str, float]):
+        """Run a single phase, store its output and record its wall-clock time"""
+        start = time.perf_counter()
+        try:
+            results[phase.name] = await phase.handler(*(results[dependency] for dependency in phase.depends_on))
+        finally:
+            timings[phase.name] = time.perf_counter() - start
+
 class CognitiveEngine:
     """
     Core cognitive processing engine that orchestrates all cognitive capabilities
@@ -81,6 +194,13 @@ class CognitiveEngine:
         self.active_goals = []
         self.cognitive_history = []
         
+        # Phase execution
+        self.concurrent_phases = True  # gather independent phases
+        self.defer_post_response_phases = True  # learning and metacognition run after the result is returned
+        self.phase_graph = self._build_phase_graph()
+        self.deferred_phase_tasks = set()
+        self.phase_statistics = defaultdict(lambda: {"count": 0, "total_time": 0.0, "max_time": 0.0})
+        
         # Persona-specific cognitive parameters
         self.cognitive_profile = self._initialize_cognitive_profile()
         
@@ -128,6 +248,27 @@ class CognitiveEngine:
         
         return base_profile
     
+    def _build_phase_graph(self) -> PhaseGraph:
+        """Declare the cognitive cycle: Perceive -> Retrieve -> Reason -> Decide -> Act -> Learn"""
+        return PhaseGraph([
+            CognitivePhase("perception", self._perception_phase, ("input",)),
+            CognitivePhase("episodic_retrieval", self._episodic_retrieval_phase, ("perception",)),
+            CognitivePhase("semantic_retrieval", self._semantic_retrieval_phase, ("perception",),
+                           batch_handler=self._semantic_retrieval_batch),
+            CognitivePhase("memory_integration", self._memory_integration_phase,
+                           ("perception", "episodic_retrieval", "semantic_retrieval"),
+                           batch_handler=self._memory_integration_batch),
+            CognitivePhase("causal_reasoning", self._causal_reasoning_phase, ("memory_integration",)),
+            CognitivePhase("analogical_reasoning", self._analogical_reasoning_phase, ("memory_integration",)),
+            CognitivePhase("abstract_reasoning", self._abstract_reasoning_phase, ("memory_integration",)),
+            CognitivePhase("reasoning", self._reasoning_phase,
+                           ("memory_integration", "causal_reasoning", "analogical_reasoning", "abstract_reasoning")),
+            CognitivePhase("decision", self._decision_phase, ("reasoning",)),
+            CognitivePhase("action_planning", self._action_planning_phase, ("decision",)),
+            CognitivePhase("learning", self._learning_phase, ("input", "action_planning", "cycle_id"), deferred=True),
+            CognitivePhase("metacognition", self._metacognitive_phase, ("cycle_id", "cycle_start"), deferred=True)
+        ], inputs=("input", "cycle_id", "cycle_start"))
+    
     async def initialize_cognitive_modules(self, modules: Dict[str, Any]):
         """Initialize and connect cognitive modules"""
         self.perception_module = modules.get('perception')
@@ -169,46 +310,122 @@ class CognitiveEngine:
         Execute one complete cognitive cycle
         Based on the cognitive cycle: Perceive -> Reason -> Decide -> Act -> Learn
         """
-        cycle_start = datetime.now()
-        cycle_id = str(uuid.uuid4())
+        results = {"input": input_data, "cycle_id": str(uuid.uuid4()), "cycle_start": datetime.now()}
+        return await self._complete_cognitive_cycle(results)
+    
+    async def _complete_cognitive_cycle(self, results: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the phases of a cycle that have not run yet and build its result"""
+        phase_timings = {}
         
         try:
-            # Phase 1: Perception and Attention
-            perceived_data = await self._perception_phase(input_data)
+            # Phases 1-5: Perception, memory retrieval, reasoning, decision and action planning
+            await self.phase_graph.run(results, phase_timings, concurrent=self.concurrent_phases)
+            action_plan = results["action_planning"]
             
-            # Phase 2: Memory Retrieval and Context Integration
-            contextual_data = await self._memory_retrieval_phase(perceived_data)
+            # Phases 6-7: Learning and metacognitive monitoring
+            if self.defer_post_response_phases:
+                self._schedule_deferred_phases(results)
+            else:
+                await self.phase_graph.run(results, phase_timings, deferred=True, concurrent=self.concurrent_phases)
             
-            # Phase 3: Reasoning and Problem Solving
-            reasoning_output = await self._reasoning_phase(contextual_data)
-            
-            # Phase 4: Decision Making
-            decision = await self._decision_phase(reasoning_output)
-            
-            # Phase 5: Action Planning and Execution
-            action_plan = await self._action_planning_phase(decision)
-            
-            # Phase 6: Learning and Memory Consolidation
-            await self._learning_phase(input_data, action_plan, cycle_id)
-            
-            # Phase 7: Metacognitive Monitoring and Control
-            await self._metacognitive_phase(cycle_id, cycle_start)
+            self._record_phase_timings(phase_timings)
             
             # Update cognitive state
             self._update_cognitive_state(action_plan)
             
             return {
-                "cycle_id": cycle_id,
+                "cycle_id": results["cycle_id"],
                 "cognitive_state": self.cognitive_state,
                 "action_plan": action_plan,
-                "reasoning_output": reasoning_output,
+                "reasoning_output": results["reasoning"],
                 "confidence": self.cognitive_state.confidence_level,
-                "processing_time": (datetime.now() - cycle_start).total_seconds()
+                "processing_time": (datetime.now() - results["cycle_start"]).total_seconds(),
+                "phase_timings": phase_timings
             }
             
         except Exception as e:
             self.logger.error(f"Cognitive cycle error: {e}")
-            return {"error": str(e), "cycle_id": cycle_id}
+            return {"error": str(e), "cycle_id": results["cycle_id"]}
+    
+    async def process_cognitive_batch(self, inputs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Execute cognitive cycles for a batch of inputs
+        Phases with a batch handler (semantic retrieval) run once for the whole batch;
+        if the batch fails each input finishes as its own cycle, without repeating the phases it completed
+        """
+        if not inputs:
+            return []
+        
+        cycle_start = datetime.now()
+        phase_timings = {}
+        batch_results = [
+            {"input": input_data, "cycle_id": str(uuid.uuid4()), "cycle_start": cycle_start}
+            for input_data in inputs
+        ]
+        
+        try:
+            await self.phase_graph.run_batch(batch_results, phase_timings, concurrent=self.concurrent_phases)
+            
+            if self.defer_post_response_phases:
+                self._schedule_deferred_phases(batch_results)
+            else:
+                await self.phase_graph.run_batch(batch_results, phase_timings, deferred=True,
+                                                 concurrent=self.concurrent_phases)
+            
+        except Exception as e:
+            self.logger.error(f"Cognitive batch error, finishing the cycles individually: {e}")
+            self._record_phase_timings(phase_timings)
+            return [await self._complete_cognitive_cycle(results) for results in batch_results]
+        
+        self._record_phase_timings(phase_timings)
+        
+        responses = []
+        for results in batch_results:
+            self._update_cognitive_state(results["action_planning"])
+            responses.append({
+                "cycle_id": results["cycle_id"],
+                "cognitive_state": self.cognitive_state,
+                "action_plan": results["action_planning"],
+                "reasoning_output": results["reasoning"],
+                "confidence": self.cognitive_state.confidence_level,
+                "processing_time": (datetime.now() - cycle_start).total_seconds(),
+                "phase_timings": phase_timings,
+                "batch_size": len(inputs)
+            })
+        
+        return responses
+    
+    def _schedule_deferred_phases(self, results: Union[Dict[str, Any], List[Dict[str, Any]]]):
+        """Run post-response phases in the background"""
+        task = asyncio.create_task(self._run_deferred_phases(results))
+        self.deferred_phase_tasks.add(task)
+        task.add_done_callback(self.deferred_phase_tasks.discard)
+    
+    async def _run_deferred_phases(self, results: Union[Dict[str, Any], List[Dict[str, Any]]]):
+        """Run deferred phases for a completed cycle or batch of cycles"""
+        phase_timings = {}
+        try:
+            if isinstance(results, list):
+                await self.phase_graph.run_batch(results, phase_timings, deferred=True,
+                                                 concurrent=self.concurrent_phases)
+            else:
+                await self.phase_graph.run(results, phase_timings, deferred=True, concurrent=self.concurrent_phases)
+        except Exception as e:
+            self.logger.error(f"Deferred cognitive phase error: {e}")
+        self._record_phase_timings(phase_timings)
+    
+    async def drain_deferred_phases(self):
+        """Wait for post-response phases of earlier cycles to finish"""
+        while self.deferred_phase_tasks:
+            await asyncio.gather(*list(self.deferred_phase_tasks))
+    
+    def _record_phase_timings(self, phase_timings: Dict[str, float]):
+        """Accumulate per-phase timing statistics"""
+        for phase_name, elapsed in phase_timings.items():
+            stats = self.phase_statistics[phase_name]
+            stats["count"] += 1
+            stats["total_time"] += elapsed
+            stats["max_time"] = max(stats["max_time"], elapsed)
     
     async def _perception_phase(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Process perception and attention"""
@@ -230,20 +447,38 @@ class CognitiveEngine:
         
         return perceived
     
-    async def _memory_retrieval_phase(self, perceived_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Retrieve relevant memories and context"""
+    async def _episodic_retrieval_phase(self, perceived_data: Dict[str, Any]) -> List[Any]:
+        """Retrieve similar episodes"""
         if not self.memory_system:
-            return perceived_data
+            return []
         
-        # Retrieve episodic memories
-        episodic_context = await self.memory_system.episodic_memory.retrieve_similar_episodes(
+        return await self.memory_system.episodic_memory.retrieve_similar_episodes(
             perceived_data, similarity_threshold=0.7
         )
+    
+    async def _semantic_retrieval_phase(self, perceived_data: Dict[str, Any]) -> List[Any]:
+        """Retrieve relevant semantic knowledge"""
+        if not self.memory_system:
+            return []
         
-        # Retrieve semantic knowledge
-        semantic_context = await self.memory_system.long_term_memory.retrieve_relevant_knowledge(
+        return await self.memory_system.long_term_memory.retrieve_relevant_knowledge(
             perceived_data, activation_threshold=0.5
         )
+    
+    async def _semantic_retrieval_batch(self, perceived_batch: List[Dict[str, Any]]) -> List[List[Any]]:
+        """Retrieve semantic knowledge for a batch with a single batched activation spread"""
+        if not self.memory_system:
+            return [[] for _ in perceived_batch]
+        
+        return await self.memory_system.long_term_memory.retrieve_relevant_knowledge_batch(
+            perceived_batch, activation_threshold=0.5
+        )
+    
+    async def _memory_integration_phase(self, perceived_data: Dict[str, Any], episodic_context: List[Any],
+                                        semantic_context: List[Any]) -> Dict[str, Any]:
+        """Integrate retrieved memories into working memory"""
+        if not self.memory_system:
+            return perceived_data
         
         # Update working memory
         await self.memory_system.working_memory.update(
@@ -257,25 +492,58 @@ class CognitiveEngine:
             "working_memory_state": self.memory_system.working_memory.get_state()
         }
     
-    async def _reasoning_phase(self, contextual_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Apply reasoning and problem-solving"""
+    async def _memory_integration_batch(self, perceived_batch: List[Dict[str, Any]], episodic_batch: List[List[Any]],
+                                        semantic_batch: List[List[Any]]) -> List[Dict[str, Any]]:
+        """Integrate retrieved memories for a batch with a single working memory update"""
+        if not self.memory_system:
+            return list(perceived_batch)
+        
+        working_memory = self.memory_system.working_memory
+        await working_memory.update_batch(list(zip(perceived_batch, episodic_batch, semantic_batch)))
+        working_memory_state = working_memory.get_state()
+        
+        return [
+            {
+                "perceived": perceived_data,
+                "episodic_context": episodic_context,
+                "semantic_context": semantic_context,
+                "working_memory_state": working_memory_state
+            }
+            for perceived_data, episodic_context, semantic_context in zip(perceived_batch, episodic_batch, semantic_batch)
+        ]
+    
+    async def _causal_reasoning_phase(self, contextual_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Causal reasoning"""
         if not self.reasoning_engine:
-            return contextual_data
+            return None
         
-        # Causal reasoning
-        causal_analysis = await self.reasoning_engine.causal_reasoning.analyze_causality(
+        return await self.reasoning_engine.causal_reasoning.analyze_causality(
             contextual_data, self.cognitive_profile["analytical_reasoning"]
         )
+    
+    async def _analogical_reasoning_phase(self, contextual_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Analogical reasoning"""
+        if not self.reasoning_engine:
+            return None
         
-        # Analogical reasoning
-        analogical_insights = await self.reasoning_engine.analogical_reasoning.find_analogies(
+        return await self.reasoning_engine.analogical_reasoning.find_analogies(
             contextual_data, self.memory_system.long_term_memory
         )
+    
+    async def _abstract_reasoning_phase(self, contextual_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Abstract reasoning"""
+        if not self.reasoning_engine:
+            return None
         
-        # Abstract reasoning
-        abstract_patterns = await self.reasoning_engine.identify_abstract_patterns(
+        return await self.reasoning_engine.identify_abstract_patterns(
             contextual_data, self.cognitive_profile["creative_thinking"]
         )
+    
+    async def _reasoning_phase(self, contextual_data: Dict[str, Any], causal_analysis: Any,
+                               analogical_insights: Any, abstract_patterns: Any) -> Dict[str, Any]:
+        """Combine reasoning results"""
+        if not self.reasoning_engine:
+            return contextual_data
         
         return {
             "contextual_data": contextual_data,
@@ -386,8 +654,8 @@ class CognitiveEngine:
                 episode, self.cognitive_profile
             )
         
-        # Memory consolidation
-        await self.memory_system.consolidate_episode(episode)
+        # Memory consolidation (queued for the background scheduler when it is running)
+        await self.memory_system.schedule_consolidation(episode)
     
     async def _metacognitive_phase(self, cycle_id: str, cycle_start: datetime):
         """Metacognitive monitoring and control"""
@@ -448,6 +716,10 @@ class CognitiveEngine:
             "cognitive_state": self.cognitive_state,
             "cognitive_profile": self.cognitive_profile,
             "active_goals": self.active_goals,
+            "phase_statistics": {
+                name: {**stats, "average_time": stats["total_time"] / stats["count"]}
+                for name, stats in self.phase_statistics.items() if stats["count"]
+            },
             "module_status": {
                 "perception": self.perception_module is not None,
                 "reasoning": self.reasoning_engine is not None,
@@ -0,0 +1,204 @@
+"""
+CollegiumAI Cognitive Architecture - Background Consolidation
+Asynchronous scheduler that moves episode consolidation and memory decay off the cognitive hot path
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Dict, Any, Optional
+
+
+class ConsolidationScheduler:
+    """
+    Background consolidation worker for a CognitiveMemory instance
+    Episodes are queued by the hot path and consolidated one at a time by a single task,
+    which takes up to max_per_wakeup queued episodes each time it wakes; a bounded queue
+    applies backpressure to producers when consolidation falls behind
+    """
+
+    def __init__(self, memory, max_queue_size: int = 1024, max_per_wakeup: int = 32,
+                 decay_interval: Optional[float] = None, enqueue_timeout: Optional[float] = None):
+        self.memory = memory
+        self.logger = logging.getLogger(f"ConsolidationScheduler-{memory.persona_type}")
+
+        # Scheduling parameters
+        self.max_queue_size = max_queue_size
+        self.max_per_wakeup = max_per_wakeup
+        self.decay_interval = decay_interval if decay_interval is not None else memory.decay_update_interval
+        self.enqueue_timeout = enqueue_timeout  # None blocks producers until there is room
+
+        self.queue = asyncio.Queue(maxsize=max_queue_size)
+        self.pending_since = deque()  # enqueue times of queued episodes, oldest first
+        self.worker_task = None
+        self.decay_task = None
+
+        # Metrics
+        self.metrics = {
+            "enqueued": 0,
+            "consolidated": 0,
+            "failed": 0,
+            "discarded": 0,
+            "wakeups": 0,
+            "decay_runs": 0,
+            "backpressure_waits": 0,
+            "backpressure_wait_time": 0.0,
+            "inline_fallbacks": 0,
+            "last_lag": 0.0,
+            "max_lag": 0.0,
+            "average_lag": 0.0
+        }
+
+    @property
+    def running(self) -> bool:
+        return self.worker_task is not None and not self.worker_task.done()
+
+    async def start(self):
+        """Start the background consolidation task"""
+        if self.running:
+            return
+        await self.stop(drain=False)  # Reap a decay task left behind by a dead worker
+        self.worker_task = asyncio.create_task(self._run())
+        self.decay_task = asyncio.create_task(self._decay_loop())
+        self.logger.debug("Consolidation scheduler started")
+
+    async def stop(self, drain: bool = True):
+        """
+        Stop the background task, consolidating queued episodes first; when drain is
+        False queued episodes are discarded so they are not reported as pending
+        or consolidated after a restart
+        """
+        if self.worker_task is None and self.decay_task is None:
+            return
+        if drain and self.running:
+            await self.queue.join()
+        for task in (self.worker_task, self.decay_task):
+            if task is None:
+                continue
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self.worker_task = None
+        self.decay_task = None
+        if not drain:
+            self._discard_pending()
+        self.logger.debug("Consolidation scheduler stopped")
+
+    async def flush(self):
+        """Wait until every queued episode has been consolidated"""
+        if self.running:
+            await self.queue.join()
+
+    async def submit(self, episode_data: Dict[str, Any]) -> bool:
+        """
+        Queue an episode for consolidation
+        Returns True when queued; when the queue stays full past enqueue_timeout the
+        episode is consolidated inline so the producer pays for the backlog
+        """
+        item = (time.monotonic(), episode_data)
+        self.pending_since.append(item[0])
+
+        if self.queue.full():
+            self.metrics["backpressure_waits"] += 1
+            try:
+                if self.enqueue_timeout is None:
+                    await self.queue.put(item)
+                else:
+                    await asyncio.wait_for(self.queue.put(item), self.enqueue_timeout)
+            except asyncio.TimeoutError:
+                self.pending_since.remove(item[0])
+                self.metrics["inline_fallbacks"] += 1
+                await self.memory.consolidate_episode(episode_data)
+                return False
+            finally:
+                self.metrics["backpressure_wait_time"] += time.monotonic() - item[0]
+        else:
+            self.queue.put_nowait(item)
+
+        self.metrics["enqueued"] += 1
+        return True
+
+    async def _run(self):
+        """Consolidate queued episodes, taking up to max_per_wakeup at a time"""
+        while True:
+            episodes = [await self.queue.get()]
+            while len(episodes) < self.max_per_wakeup and not self.queue.empty():
+                episodes.append(self.queue.get_nowait())
+            await self._consolidate_episodes(episodes)
+
+    async def _decay_loop(self):
+        """Apply memory decay on a timer"""
+        while True:
+            await asyncio.sleep(self.decay_interval)
+            await self._apply_decay()
+
+    async def _consolidate_episodes(self, episodes):
+        """Consolidate episodes taken off the queue, one at a time"""
+        started = finished = 0
+        try:
+            for enqueued_at, episode_data in episodes:
+                self.pending_since.popleft()
+                started += 1
+                try:
+                    await self.memory.consolidate_episode(episode_data)
+                    self.metrics["consolidated"] += 1
+                except Exception as e:
+                    self.metrics["failed"] += 1
+                    self.logger.error(f"Episode consolidation failed: {e}")
+                finished += 1
+                self.queue.task_done()
+
+                self._record_lag(time.monotonic() - enqueued_at)
+
+                # Yield between episodes so queued cognitive cycles are not starved
+                await asyncio.sleep(0)
+        finally:
+            # Episodes interrupted or not reached when the worker is cancelled
+            for _ in range(len(episodes) - started):
+                self.pending_since.popleft()
+            for _ in range(len(episodes) - finished):
+                self.queue.task_done()
+            self.metrics["discarded"] += len(episodes) - finished
+
+        self.metrics["wakeups"] += 1
+
+    def _discard_pending(self):
+        """Drop queued episodes together with their enqueue times"""
+        while not self.queue.empty():
+            self.queue.get_nowait()
+            self.queue.task_done()
+            self.pending_since.popleft()
+            self.metrics["discarded"] += 1
+
+    async def _apply_decay(self):
+        """Run the memory decay pass"""
+        try:
+            await self.memory.update_memory_strengths()
+            self.metrics["decay_runs"] += 1
+        except Exception as e:
+            self.logger.error(f"Memory decay update failed: {e}")
+
+    def _record_lag(self, lag: float):
+        """Track enqueue-to-consolidation lag"""
+        processed = self.metrics["consolidated"] + self.metrics["failed"]
+        self.metrics["last_lag"] = lag
+        self.metrics["max_lag"] = max(self.metrics["max_lag"], lag)
+        self.metrics["average_lag"] += (lag - self.metrics["average_lag"]) / max(1, processed)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get queue depth, lag and throughput metrics"""
+        oldest_pending = time.monotonic() - self.pending_since[0] if self.pending_since else 0.0
+        wakeups = self.metrics["wakeups"]
+        return {
+            **self.metrics,
+            "running": self.running,
+            "queue_depth": self.queue.qsize(),
+            "max_queue_size": self.max_queue_size,
+            "oldest_pending_age": oldest_pending,
+            "average_per_wakeup": (
+                (self.metrics["consolidated"] + self.metrics["failed"]) / wakeups if wakeups else 0.0
+            )
+        }
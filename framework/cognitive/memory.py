@@ -12,8 +12,11 @@ import logging
 from datetime import datetime, timedelta
 import uuid
 import json
-from collections import defaultdict, deque
+from collections import defaultdict, deque, OrderedDict
 import heapq
+import bisect
+
+from .consolidation import ConsolidationScheduler
 
 class MemoryType(Enum):
     """Types of memory systems"""
@@ -30,20 +33,122 @@ class MemoryStrength(Enum):
     STRONG = 0.8
     PERMANENT = 1.0
 
-@dataclass
 class MemoryTrace:
-    """Individual memory trace"""
-    trace_id: str = field(default_factory=lambda: str(uuid.uuid4()))
-    content: Any = None
-    memory_type: MemoryType = MemoryType.WORKING
-    strength: float = 0.5
-    created_at: datetime = field(default_factory=datetime.now)
-    last_accessed: datetime = field(default_factory=datetime.now)
-    access_count: int = 0
-    tags: List[str] = field(default_factory=list)
-    associations: List[str] = field(default_factory=list)  # IDs of related memories
-    context: Dict[str, Any] = field(default_factory=dict)
-    decay_rate: float = 0.1  # How fast this memory decays
+    """
+    Individual memory trace
+    Scalar fields live in a ColumnarTraceStore once the trace is attached to
+    one; detached traces keep them in their own slots.
+    """
+    
+    __slots__ = ("trace_id", "content", "memory_type", "_tags", "_context", "_associations",
+                 "_store", "_slot", "_strength", "_decay_rate", "_created_at",
+                 "_last_accessed", "_access_count")
+    
+    def __init__(self, trace_id: Optional[str] = None, content: Any = None,
+                 memory_type: MemoryType = MemoryType.WORKING, strength: float = 0.5,
+                 created_at: Optional[datetime] = None, last_accessed: Optional[datetime] = None,
+                 access_count: int = 0, tags: Optional[List[str]] = None,
+                 associations: Optional[List[str]] = None, context: Optional[Dict[str, Any]] = None,
+                 decay_rate: float = 0.1):  # How fast this memory decays
+        now = datetime.now()
+        self.trace_id = trace_id or str(uuid.uuid4())
+        self.content = content
+        self.memory_type = memory_type
+        self._tags = tags  # Containers are created on first use
+        self._context = context
+        self._associations = associations  # IDs of related memories
+        self._store = None
+        self._slot = -1
+        self._strength = strength
+        self._decay_rate = decay_rate
+        self._created_at = (created_at or now).timestamp()
+        self._last_accessed = (last_accessed or now).timestamp()
+        self._access_count = access_count
+    
+    def __repr__(self) -> str:
+        return (f"MemoryTrace(trace_id={self.trace_id!r}, memory_type={self.memory_type}, "
+                f"strength={self.strength:.3f}, access_count={self.access_count})")
+    
+    def _get(self, column: str):
+        if self._store is None:
+            return getattr(self, "_" + column)
+        return getattr(self._store, column)[self._slot]
+    
+    def _set(self, column: str, value):
+        if self._store is None:
+            setattr(self, "_" + column, value)
+        else:
+            getattr(self._store, column)[self._slot] = value
+    
+    @property
+    def strength(self) -> float:
+        return float(self._get("strength"))
+    
+    @strength.setter
+    def strength(self, value: float):
+        self._set("strength", value)
+    
+    @property
+    def decay_rate(self) -> float:
+        return float(self._get("decay_rate"))
+    
+    @decay_rate.setter
+    def decay_rate(self, value: float):
+        self._set("decay_rate", value)
+    
+    @property
+    def access_count(self) -> int:
+        return int(self._get("access_count"))
+    
+    @access_count.setter
+    def access_count(self, value: int):
+        self._set("access_count", value)
+    
+    @property
+    def created_at(self) -> datetime:
+        return datetime.fromtimestamp(float(self._get("created_at")))
+    
+    @created_at.setter
+    def created_at(self, value: datetime):
+        self._set("created_at", value.timestamp())
+    
+    @property
+    def last_accessed(self) -> datetime:
+        return datetime.fromtimestamp(float(self._get("last_accessed")))
+    
+    @last_accessed.setter
+    def last_accessed(self, value: datetime):
+        self._set("last_accessed", value.timestamp())
+    
+    @property
+    def tags(self) -> List[str]:
+        if self._tags is None:
+            self._tags = []
+        return self._tags
+    
+    @tags.setter
+    def tags(self, value: List[str]):
+        self._tags = value
+    
+    @property
+    def context(self) -> Dict[str, Any]:
+        if self._context is None:
+            self._context = {}
+        return self._context
+    
+    @context.setter
+    def context(self, value: Dict[str, Any]):
+        self._context = value
+    
+    @property
+    def associations(self) -> List[str]:
+        if self._associations is None:
+            self._associations = []
+        return self._associations
+    
+    @associations.setter
+    def associations(self, value: List[str]):
+        self._associations = value
     
     def access(self):
         """Record memory access"""
@@ -58,6 +163,115 @@ class MemoryTrace:
         self.strength *= decay_factor
         self.strength = max(0.01, self.strength)  # Minimum strength
 
+class ColumnarTraceStore:
+    """
+    Columnar storage for memory trace scalars, keyed by integer slot ids
+    Strength, decay rate, timestamps (epoch seconds) and access counts are
+    NumPy arrays, so decay, eviction and strength ordering are array operations.
+    """
+    
+    COLUMNS = {
+        "strength": np.float32,
+        "decay_rate": np.float32,
+        "created_at": np.float64,
+        "last_accessed": np.float64,
+        "access_count": np.int32,
+    }
+    
+    def __init__(self, initial_capacity: int = 64):
+        self.capacity = max(1, initial_capacity)
+        for column, dtype in self.COLUMNS.items():
+            setattr(self, column, np.zeros(self.capacity, dtype=dtype))
+        self.alive = np.zeros(self.capacity, dtype=bool)
+        self.traces = [None] * self.capacity  # slot -> MemoryTrace view
+        self.free_slots = list(range(self.capacity - 1, -1, -1))
+        self.size = 0
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the column arrays"""
+        return sum(getattr(self, column).nbytes for column in self.COLUMNS) + self.alive.nbytes
+    
+    def _grow(self):
+        """Double the column arrays"""
+        new_capacity = self.capacity * 2
+        for column, dtype in self.COLUMNS.items():
+            grown = np.zeros(new_capacity, dtype=dtype)
+            grown[:self.capacity] = getattr(self, column)
+            setattr(self, column, grown)
+        alive = np.zeros(new_capacity, dtype=bool)
+        alive[:self.capacity] = self.alive
+        self.alive = alive
+        self.traces.extend([None] * (new_capacity - self.capacity))
+        self.free_slots.extend(range(new_capacity - 1, self.capacity - 1, -1))
+        self.capacity = new_capacity
+    
+    def attach(self, trace: MemoryTrace) -> int:
+        """Move a detached trace's scalars into a free slot"""
+        if trace._store is self:
+            return trace._slot
+        if trace._store is not None:
+            trace._store.release(trace)
+        if not self.free_slots:
+            self._grow()
+        
+        slot = self.free_slots.pop()
+        for column in self.COLUMNS:
+            getattr(self, column)[slot] = getattr(trace, "_" + column)
+            setattr(trace, "_" + column, None)  # The store now owns the value
+        self.alive[slot] = True
+        self.traces[slot] = trace
+        self.size += 1
+        
+        trace._store, trace._slot = self, slot
+        return slot
+    
+    def release(self, trace: MemoryTrace):
+        """Copy a trace's scalars back onto it and free its slot"""
+        if trace._store is not self:
+            return
+        
+        slot = trace._slot
+        for column in self.COLUMNS:
+            setattr(trace, "_" + column, getattr(self, column)[slot].item())
+        trace._store, trace._slot = None, -1
+        
+        self.alive[slot] = False
+        self.traces[slot] = None
+        self.free_slots.append(slot)
+        self.size -= 1
+    
+    def live_slots(self) -> np.ndarray:
+        return np.flatnonzero(self.alive)
+    
+    def apply_decay(self, time_passed: float, min_strength: float = 0.01):
+        """Exponentially decay every live trace in one vectorized pass"""
+        alive = self.alive
+        decayed = self.strength[alive] * np.exp(-self.decay_rate[alive] * time_passed)
+        self.strength[alive] = np.maximum(min_strength, decayed)
+    
+    def weak_traces(self, threshold: float) -> List[MemoryTrace]:
+        """Traces whose strength has fallen below the threshold"""
+        slots = np.flatnonzero(self.alive & (self.strength < threshold))
+        return [self.traces[slot] for slot in slots]
+    
+    def order_by_strength(self, traces: List[MemoryTrace]) -> List[MemoryTrace]:
+        """Sort traces by (strength, access_count) descending, ties kept in input order"""
+        if len(traces) < 2:
+            return list(traces)
+        slots = np.fromiter((t._slot for t in traces), dtype=np.int64, count=len(traces))
+        order = np.lexsort((-self.access_count[slots], -self.strength[slots]))
+        return [traces[i] for i in order]
+    
+    def mean_strength(self) -> float:
+        return float(self.strength[self.alive].mean()) if self.size else 0.0
+    
+    def oldest_created_at(self) -> Optional[float]:
+        return float(self.created_at[self.alive].min()) if self.size else None
+
 @dataclass
 class Episode:
     """Episodic memory episode"""
@@ -73,6 +287,264 @@ class Episode:
     location: Optional[str] = None
     success_indicator: Optional[bool] = None
 
+@dataclass
+class EpisodeFeatures:
+    """Precomputed matching features for an episode (or a query)"""
+    context_pairs: frozenset = frozenset()  # hashable (key, value) pairs
+    context_size: int = 0
+    tag_set: frozenset = frozenset()
+    content_tokens: frozenset = frozenset()
+
+def _freeze_value(value: Any) -> Any:
+    """Convert a context value into a hashable form that preserves equality"""
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        pass
+    
+    if isinstance(value, dict):
+        return (dict, frozenset((k, _freeze_value(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return (list, tuple(_freeze_value(v) for v in value))
+    if isinstance(value, set):
+        return frozenset(_freeze_value(v) for v in value)
+    return (type(value).__name__, repr(value))
+
+class SortedTemporalIndex:
+    """
+    Time-ordered episode index backed by bisect over parallel sorted lists
+    Removals are O(1) tombstones, compacted once they outnumber live entries
+    """
+    
+    def __init__(self, compaction_ratio: float = 0.5, min_compaction: int = 1024):
+        self._timestamps = []  # sorted datetimes
+        self._episode_ids = []  # episode ids aligned with _timestamps
+        self._tombstones = set()  # removed episode ids still present in the lists
+        self.compaction_ratio = compaction_ratio
+        self.min_compaction = min_compaction
+        self.compactions = 0
+    
+    def __len__(self) -> int:
+        return len(self._episode_ids) - len(self._tombstones)
+    
+    def __iter__(self):
+        return self.irange()
+    
+    def add(self, timestamp: datetime, episode_id: str):
+        """Insert an episode, keeping the lists sorted by timestamp"""
+        if episode_id in self._tombstones:
+            # Re-inserting a removed id: purge the stale entry first
+            self.compact()
+        
+        if not self._timestamps or timestamp >= self._timestamps[-1]:
+            self._timestamps.append(timestamp)
+            self._episode_ids.append(episode_id)
+        else:
+            position = bisect.bisect_right(self._timestamps, timestamp)
+            self._timestamps.insert(position, timestamp)
+            self._episode_ids.insert(position, episode_id)
+    
+    def discard(self, episode_id: str):
+        """Mark an episode as removed; storage is reclaimed on compaction"""
+        self._tombstones.add(episode_id)
+        
+        dead = len(self._tombstones)
+        if dead >= self.min_compaction and dead > len(self._episode_ids) * self.compaction_ratio:
+            self.compact()
+    
+    def compact(self):
+        """Drop tombstoned entries from the sorted lists"""
+        if not self._tombstones:
+            return
+        
+        live = [(t, eid) for t, eid in zip(self._timestamps, self._episode_ids)
+                if eid not in self._tombstones]
+        # Fresh lists so iterators over the old ones stay consistent
+        self._timestamps = [t for t, _ in live]
+        self._episode_ids = [eid for _, eid in live]
+        self._tombstones = set()
+        self.compactions += 1
+    
+    def irange(self, start_time: Optional[datetime] = None, end_time: Optional[datetime] = None):
+        """Lazily yield (timestamp, episode_id) pairs with start_time <= t <= end_time"""
+        timestamps, episode_ids = self._timestamps, self._episode_ids
+        lo = 0 if start_time is None else bisect.bisect_left(timestamps, start_time)
+        hi = len(timestamps) if end_time is None else bisect.bisect_right(timestamps, end_time)
+        
+        for position in range(lo, hi):
+            episode_id = episode_ids[position]
+            if episode_id not in self._tombstones:
+                yield timestamps[position], episode_id
+
+class SemanticActivationGraph:
+    """
+    Compiled sparse adjacency (CSR) of the semantic network for spreading activation
+    New edges collect in a small pending buffer that is merged into the CSR
+    arrays lazily; removed concepts are masked until the next compaction.
+    """
+    
+    def __init__(self, merge_ratio: float = 0.25, min_merge: int = 4096):
+        self.node_index = {}  # concept_id -> row
+        self.node_ids = []  # row -> concept_id
+        self.alive = np.zeros(0, dtype=bool)
+        
+        # Compiled CSR arrays over source rows [0, compiled_nodes)
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.indices = np.zeros(0, dtype=np.int64)
+        self.weights = np.zeros(0, dtype=np.float64)
+        self.compiled_nodes = 0
+        
+        # Edges added since the last compile
+        self.pending_sources = []
+        self.pending_targets = []
+        self.pending_weights = []
+        
+        self.merge_ratio = merge_ratio
+        self.min_merge = min_merge
+        self.dead_nodes = 0
+        self.compilations = 0
+    
+    def __len__(self) -> int:
+        return len(self.node_ids) - self.dead_nodes
+    
+    def add_node(self, concept_id: str) -> int:
+        """Register a concept and return its row"""
+        if concept_id in self.node_index:
+            return self.node_index[concept_id]
+        
+        row = len(self.node_ids)
+        self.node_index[concept_id] = row
+        self.node_ids.append(concept_id)
+        if row >= len(self.alive):
+            grown = np.zeros(max(16, 2 * len(self.alive)), dtype=bool)
+            grown[:len(self.alive)] = self.alive
+            self.alive = grown
+        self.alive[row] = True
+        return row
+    
+    def add_edge(self, source_id: str, target_id: str, strength: float):
+        """Add a directed weighted edge between two registered concepts"""
+        self.pending_sources.append(self.node_index[source_id])
+        self.pending_targets.append(self.node_index[target_id])
+        self.pending_weights.append(strength)
+        
+        if len(self.pending_sources) >= max(self.min_merge, self.merge_ratio * len(self.indices)):
+            self.compile()
+    
+    def remove_node(self, concept_id: str):
+        """Mask a concept out of the graph; its edges are dropped on compaction"""
+        row = self.node_index.pop(concept_id, None)
+        if row is None:
+            return
+        
+        self.alive[row] = False
+        self.dead_nodes += 1
+        if self.dead_nodes >= self.min_merge and self.dead_nodes > len(self.node_ids) * self.merge_ratio:
+            self.compile(compact=True)
+    
+    def compile(self, compact: bool = False):
+        """Merge pending edges into the CSR arrays, optionally renumbering out dead rows"""
+        sources = np.concatenate([
+            np.repeat(np.arange(self.compiled_nodes, dtype=np.int64), np.diff(self.indptr)),
+            np.asarray(self.pending_sources, dtype=np.int64)
+        ])
+        targets = np.concatenate([self.indices, np.asarray(self.pending_targets, dtype=np.int64)])
+        weights = np.concatenate([self.weights, np.asarray(self.pending_weights, dtype=np.float64)])
+        self.pending_sources, self.pending_targets, self.pending_weights = [], [], []
+        
+        node_count = len(self.node_ids)
+        alive = self.alive[:node_count]
+        keep = alive[sources] & alive[targets]
+        sources, targets, weights = sources[keep], targets[keep], weights[keep]
+        
+        if compact and self.dead_nodes:
+            remap = np.cumsum(alive) - 1
+            sources, targets = remap[sources], remap[targets]
+            self.node_ids = [cid for cid, is_alive in zip(self.node_ids, alive) if is_alive]
+            self.node_index = {cid: row for row, cid in enumerate(self.node_ids)}
+            node_count = len(self.node_ids)
+            self.alive = np.ones(max(16, node_count), dtype=bool)
+            self.alive[node_count:] = False
+            self.dead_nodes = 0
+        
+        order = np.argsort(sources, kind="stable")
+        self.indices = targets[order]
+        self.weights = weights[order]
+        self.indptr = np.zeros(node_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=node_count), out=self.indptr[1:])
+        self.compiled_nodes = node_count
+        self.compilations += 1
+    
+    def spread(self, initial: Dict[str, float], levels: int = 3,
+               spread_factor: float = 0.5, min_activation: float = 0.1) -> np.ndarray:
+        """Run spreading activation as sparse matrix-vector products
+        
+        Each level adds spread_factor * W^T (a * [a > min_activation]) to a,
+        gathering only the CSR rows of sufficiently activated concepts.
+        """
+        return self.spread_batch([initial], levels, spread_factor, min_activation)[0]
+    
+    def spread_batch(self, initials: List[Dict[str, float]], levels: int = 3,
+                     spread_factor: float = 0.5, min_activation: float = 0.1) -> np.ndarray:
+        """Spread activation for several queries at once
+        
+        Activations are held as a (queries x concepts) matrix and every level
+        gathers the CSR rows of all active (query, concept) pairs together;
+        row b of the result equals spread(initials[b]).
+        """
+        node_count = len(self.node_ids)
+        if self.compiled_nodes < node_count:
+            # Rows registered since the last compile have no compiled edges yet
+            padding = np.full(node_count - self.compiled_nodes, self.indptr[-1], dtype=np.int64)
+            self.indptr = np.concatenate([self.indptr, padding])
+            self.compiled_nodes = node_count
+        
+        alive = self.alive[:node_count]
+        pending_sources = np.asarray(self.pending_sources, dtype=np.int64)
+        pending_targets = np.asarray(self.pending_targets, dtype=np.int64)
+        pending_weights = np.asarray(self.pending_weights, dtype=np.float64)
+        
+        activation = np.zeros((len(initials), node_count), dtype=np.float64)
+        for query_row, initial in enumerate(initials):
+            for concept_id, value in initial.items():
+                row = self.node_index.get(concept_id)
+                if row is not None:
+                    activation[query_row, row] += value
+        
+        for _ in range(levels):
+            query_rows, sources = np.nonzero(activation > min_activation)
+            if not len(sources):
+                break
+            
+            starts = self.indptr[sources]
+            lengths = self.indptr[sources + 1] - starts
+            total = int(lengths.sum())
+            
+            # Concatenated edge positions of all active rows, scattered into flat (query, concept) cells
+            row_offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+            positions = row_offsets + np.arange(total)
+            contributions = (self.weights[positions] * np.repeat(activation[query_rows, sources], lengths)
+                             * spread_factor)
+            cells = np.repeat(query_rows * node_count, lengths) + self.indices[positions]
+            # bincount returns an integer array when no edges are gathered
+            spread = np.bincount(cells, weights=contributions, minlength=activation.size).astype(np.float64, copy=False)
+            
+            # Edges not yet merged into the CSR arrays
+            if len(pending_sources):
+                pending_activation = activation[:, pending_sources]
+                pending_rows, edges = np.nonzero(pending_activation > min_activation)
+                pending_contributions = (pending_weights[edges] * pending_activation[pending_rows, edges]
+                                         * spread_factor)
+                spread += np.bincount(pending_rows * node_count + pending_targets[edges],
+                                      weights=pending_contributions, minlength=activation.size)
+            
+            activation += spread.reshape(activation.shape)
+            activation[:, ~alive] = 0.0  # Removed concepts neither receive nor pass on activation
+        
+        activation[:, ~alive] = 0.0
+        return activation
+
 class CognitiveMemory:
     """
     Unified cognitive memory system managing all memory types
@@ -96,6 +568,9 @@ class CognitiveMemory:
         # Cross-memory associations
         self.memory_associations = defaultdict(list)  # trace_id -> [associated_trace_ids]
         
+        # Background consolidation (started explicitly; None means consolidate inline)
+        self.consolidation_scheduler = None
+        
     async def store_memory(self, content: Any, memory_type: MemoryType, 
                          context: Dict[str, Any] = None, tags: List[str] = None) -> str:
         """Store memory in appropriate subsystem"""
@@ -162,6 +637,25 @@ class CognitiveMemory:
         
         return episode_id
     
+    async def start_consolidation_scheduler(self, **options) -> ConsolidationScheduler:
+        """Start background consolidation; options are passed to ConsolidationScheduler"""
+        if self.consolidation_scheduler is None or not self.consolidation_scheduler.running:
+            self.consolidation_scheduler = ConsolidationScheduler(self, **options)
+            await self.consolidation_scheduler.start()
+        return self.consolidation_scheduler
+    
+    async def stop_consolidation_scheduler(self, drain: bool = True):
+        """Stop background consolidation, by default consolidating queued episodes first"""
+        if self.consolidation_scheduler:
+            await self.consolidation_scheduler.stop(drain=drain)
+    
+    async def schedule_consolidation(self, episode_data: Dict[str, Any]) -> Optional[str]:
+        """Queue an episode for background consolidation, or consolidate inline when no scheduler runs"""
+        if self.consolidation_scheduler and self.consolidation_scheduler.running:
+            await self.consolidation_scheduler.submit(episode_data)
+            return None
+        return await self.consolidate_episode(episode_data)
+    
     async def _extract_semantic_knowledge(self, episode: Episode) -> Optional[Dict[str, Any]]:
         """Extract generalizable knowledge from specific episodes"""
         
@@ -220,6 +714,21 @@ class CognitiveMemory:
             "created_at": datetime.now()
         })
     
+    async def save_snapshot(self, path: str) -> Dict[str, Any]:
+        """Write all memory stores, indexes and the semantic network to a snapshot file"""
+        from .memory_snapshot import write_memory_snapshot
+        return write_memory_snapshot(self, path)
+    
+    async def checkpoint(self, path: str) -> Dict[str, Any]:
+        """Append an incremental segment to this memory's snapshot (full write if none exists)"""
+        from .memory_snapshot import write_memory_snapshot
+        return write_memory_snapshot(self, path, append=True)
+    
+    async def load_snapshot(self, path: str) -> Dict[str, Any]:
+        """Replace memory contents with the latest state stored in a snapshot file"""
+        from .memory_snapshot import restore_memory_snapshot
+        return restore_memory_snapshot(self, path)
+    
     async def get_memory_status(self) -> Dict[str, Any]:
         """Get overall memory system status"""
         return {
@@ -227,7 +736,10 @@ class CognitiveMemory:
             "episodic_memory": await self.episodic_memory.get_status(),
             "long_term_memory": await self.long_term_memory.get_status(),
             "total_associations": len(self.memory_associations),
-            "last_consolidation": self.last_decay_update.isoformat()
+            "last_consolidation": self.last_decay_update.isoformat(),
+            "consolidation_scheduler": (
+                self.consolidation_scheduler.get_metrics() if self.consolidation_scheduler else None
+            )
         }
 
 
@@ -241,7 +753,14 @@ class WorkingMemory:
         self.persona_type = persona_type
         self.capacity = self._initialize_capacity()
         self.memories = {}  # trace_id -> MemoryTrace
-        self.active_chunk_ids = deque(maxlen=self.capacity)  # Most recently used
+        self.trace_store = ColumnarTraceStore()  # columnar strength/decay/access data
+        self.active_chunk_ids = OrderedDict()  # trace_id -> None, least recently used first
+        
+        # Inverted keyword index used to narrow retrieval to candidate traces
+        self.token_index = defaultdict(set)  # token -> {trace_ids}
+        self.trace_tokens = {}  # trace_id -> frozenset of tokens
+        self.trace_sequence = {}  # trace_id -> insertion order (stable tie-breaking)
+        self._next_sequence = 0
         
         # Working memory components
         self.central_executive = []  # Control and coordination
@@ -270,8 +789,8 @@ class WorkingMemory:
             content=content,
             memory_type=MemoryType.WORKING,
             strength=0.8,  # Working memory starts strong
-            tags=tags or [],
-            context=context or {},
+            tags=tags,
+            context=context,
             decay_rate=0.3  # Working memory decays faster
         )
         
@@ -291,11 +810,57 @@ class WorkingMemory:
             self.central_executive.append(trace.trace_id)
         
         # Store memory and update active chunks
+        self.trace_store.attach(trace)
         self.memories[trace.trace_id] = trace
-        self.active_chunk_ids.append(trace.trace_id)
+        self.active_chunk_ids[trace.trace_id] = None
+        self._index_trace(trace)
         
         return trace.trace_id
     
+    def _trace_token_set(self, trace: MemoryTrace) -> frozenset:
+        """Tokenize trace content, context and tags for keyword matching"""
+        content_words = str(trace.content).lower().split()
+        context_words = str(trace.context).lower().split()
+        tag_words = " ".join(trace.tags).lower().split()
+        return frozenset(content_words).union(context_words, tag_words)
+    
+    def _index_trace(self, trace: MemoryTrace):
+        """Add a trace to the inverted keyword index"""
+        tokens = self._trace_token_set(trace)
+        self.trace_tokens[trace.trace_id] = tokens
+        self.trace_sequence[trace.trace_id] = self._next_sequence
+        self._next_sequence += 1
+        
+        for token in tokens:
+            self.token_index[token].add(trace.trace_id)
+    
+    def _unindex_trace(self, trace_id: str):
+        """Remove a trace from the inverted keyword index"""
+        tokens = self.trace_tokens.pop(trace_id, frozenset())
+        self.trace_sequence.pop(trace_id, None)
+        
+        for token in tokens:
+            posting = self.token_index.get(token)
+            if posting is None:
+                continue
+            posting.discard(trace_id)
+            if not posting:
+                del self.token_index[token]
+    
+    def _remove_trace(self, trace_id: str):
+        """Remove a trace from storage, LRU tracking, components and indices"""
+        trace = self.memories.pop(trace_id, None)
+        if trace is not None:
+            self.trace_store.release(trace)
+        self.active_chunk_ids.pop(trace_id, None)
+        
+        for component in [self.central_executive, self.phonological_loop, 
+                        self.visuospatial_sketchpad, self.episodic_buffer]:
+            if trace_id in component:
+                component.remove(trace_id)
+        
+        self._unindex_trace(trace_id)
+    
     def _classify_content_type(self, content: Any) -> str:
         """Classify content for appropriate working memory component"""
         content_str = str(content).lower()
@@ -312,41 +877,64 @@ class WorkingMemory:
     async def retrieve(self, query: Dict[str, Any], similarity_threshold: float = 0.6) -> List[MemoryTrace]:
         """Retrieve items from working memory"""
         
-        matching_traces = []
-        query_str = str(query).lower()
+        query_words = frozenset(str(query).lower().split())
         
-        for trace_id, trace in self.memories.items():
-            # Calculate similarity
-            similarity = self._calculate_similarity(query, trace)
+        if similarity_threshold > 0:
+            # Only traces sharing at least one keyword can score above zero
+            candidate_ids, similarities = self._score_candidates(query_words)
+        else:
+            candidate_ids = list(self.memories.keys())
+            similarities = np.array([self._calculate_similarity(query, self.memories[tid]) 
+                                     for tid in candidate_ids])
+        
+        if not candidate_ids:
+            return []
+        
+        matched_ids = [candidate_ids[i] for i in np.flatnonzero(similarities >= similarity_threshold)]
+        matched_ids.sort(key=lambda tid: self.trace_sequence.get(tid, 0))
+        
+        matching_traces = []
+        for trace_id in matched_ids:
+            trace = self.memories[trace_id]
+            trace.access()  # Record access
+            matching_traces.append(trace)
             
-            if similarity >= similarity_threshold:
-                trace.access()  # Record access
-                matching_traces.append(trace)
-                
-                # Move to front of active chunks (LRU)
-                if trace_id in self.active_chunk_ids:
-                    self.active_chunk_ids.remove(trace_id)
-                    self.active_chunk_ids.append(trace_id)
+            # Move to front of active chunks (LRU)
+            if trace_id in self.active_chunk_ids:
+                self.active_chunk_ids.move_to_end(trace_id)
         
         # Sort by strength and recency
-        matching_traces.sort(key=lambda t: (t.strength, t.access_count), reverse=True)
-        
-        return matching_traces
+        return self.trace_store.order_by_strength(matching_traces)
+    
+    def _score_candidates(self, query_words: frozenset) -> Tuple[List[str], np.ndarray]:
+        """Score all traces sharing a keyword with the query in one vectorized pass"""
+        if not query_words:
+            return [], np.zeros(0)
+        
+        overlap_counts = defaultdict(int)
+        for word in query_words:
+            for trace_id in self.token_index.get(word, ()):
+                overlap_counts[trace_id] += 1
+        
+        if not overlap_counts:
+            return [], np.zeros(0)
+        
+        candidate_ids = list(overlap_counts.keys())
+        intersections = np.fromiter(overlap_counts.values(), dtype=np.float64, count=len(candidate_ids))
+        trace_sizes = np.fromiter((len(self.trace_tokens[tid]) for tid in candidate_ids),
+                                  dtype=np.float64, count=len(candidate_ids))
+        
+        # Jaccard similarity: |Q & T| / |Q | T|
+        unions = len(query_words) + trace_sizes - intersections
+        return candidate_ids, intersections / unions
     
     def _calculate_similarity(self, query: Dict[str, Any], trace: MemoryTrace) -> float:
         """Calculate similarity between query and memory trace"""
         query_str = str(query).lower()
-        content_str = str(trace.content).lower()
-        context_str = str(trace.context).lower()
-        tags_str = " ".join(trace.tags).lower()
         
         # Simple keyword-based similarity
         query_words = set(query_str.split())
-        content_words = set(content_str.split())
-        context_words = set(context_str.split())
-        tag_words = set(tags_str.split())
-        
-        all_trace_words = content_words.union(context_words).union(tag_words)
+        all_trace_words = self.trace_tokens.get(trace.trace_id) or self._trace_token_set(trace)
         
         if not query_words or not all_trace_words:
             return 0.0
@@ -358,48 +946,49 @@ class WorkingMemory:
     
     async def update(self, perceived_data: Dict[str, Any], episodic_context: List[Any], semantic_context: List[Any]):
         """Update working memory with new information"""
+        for content, context, tags in self._update_items(perceived_data, episodic_context, semantic_context):
+            await self.store(content, context, tags)
+    
+    async def update_batch(self, updates: List[Tuple[Dict[str, Any], List[Any], List[Any]]]):
+        """Apply several update() calls in order
+        
+        Later stores in the batch evict earlier ones once capacity is reached, so only
+        the last `capacity` items are stored; the resulting contents match sequential updates.
+        """
+        items = [item for update in updates for item in self._update_items(*update)]
+        for content, context, tags in items[max(0, len(items) - self.capacity):]:
+            await self.store(content, context, tags)
+    
+    def _update_items(self, perceived_data: Dict[str, Any], episodic_context: List[Any],
+                      semantic_context: List[Any]) -> List[Tuple[Any, Dict[str, Any], List[str]]]:
+        """Items stored by an update, in order"""
         
         # Store new perceived data
-        await self.store(perceived_data, {"type": "perception"}, ["current", "perception"])
+        items = [(perceived_data, {"type": "perception"}, ["current", "perception"])]
         
         # Store episodic context if relevant
         if episodic_context:
-            await self.store(episodic_context, {"type": "episodic_context"}, ["context", "episodic"])
+            items.append((episodic_context, {"type": "episodic_context"}, ["context", "episodic"]))
         
         # Store semantic context if relevant  
         if semantic_context:
-            await self.store(semantic_context, {"type": "semantic_context"}, ["context", "semantic"])
+            items.append((semantic_context, {"type": "semantic_context"}, ["context", "semantic"]))
+        
+        return items
     
     async def _evict_oldest(self):
         """Evict oldest item from working memory"""
         if self.active_chunk_ids:
-            oldest_id = self.active_chunk_ids.popleft()
-            if oldest_id in self.memories:
-                del self.memories[oldest_id]
-                
-                # Remove from components
-                for component in [self.central_executive, self.phonological_loop, 
-                                self.visuospatial_sketchpad, self.episodic_buffer]:
-                    if oldest_id in component:
-                        component.remove(oldest_id)
+            oldest_id, _ = self.active_chunk_ids.popitem(last=False)
+            self._remove_trace(oldest_id)
     
     async def apply_decay(self, time_hours: float):
         """Apply memory decay to working memory contents"""
-        to_remove = []
+        self.trace_store.apply_decay(time_hours)
         
-        for trace_id, trace in self.memories.items():
-            trace.decay(time_hours)
-            
-            # Remove very weak memories
-            if trace.strength < 0.1:
-                to_remove.append(trace_id)
-        
-        # Remove weak memories
-        for trace_id in to_remove:
-            if trace_id in self.memories:
-                del self.memories[trace_id]
-            if trace_id in self.active_chunk_ids:
-                self.active_chunk_ids.remove(trace_id)
+        # Remove very weak memories
+        for trace in self.trace_store.weak_traces(0.1):
+            self._remove_trace(trace.trace_id)
     
     async def clear_related_items(self, tags: List[str]):
         """Clear items with specific tags (for consolidation)"""
@@ -410,10 +999,7 @@ class WorkingMemory:
                 to_remove.append(trace_id)
         
         for trace_id in to_remove:
-            if trace_id in self.memories:
-                del self.memories[trace_id]
-            if trace_id in self.active_chunk_ids:
-                self.active_chunk_ids.remove(trace_id)
+            self._remove_trace(trace_id)
     
     def get_state(self) -> Dict[str, Any]:
         """Get current working memory state"""
@@ -427,7 +1013,7 @@ class WorkingMemory:
                 "visuospatial_sketchpad": len(self.visuospatial_sketchpad),
                 "episodic_buffer": len(self.episodic_buffer)
             },
-            "average_strength": np.mean([t.strength for t in self.memories.values()]) if self.memories else 0.0
+            "average_strength": self.trace_store.mean_strength()
         }
     
     async def get_status(self) -> Dict[str, Any]:
@@ -435,8 +1021,8 @@ class WorkingMemory:
         return {
             "total_items": len(self.memories),
             "capacity_utilization": len(self.memories) / self.capacity,
-            "average_strength": np.mean([t.strength for t in self.memories.values()]) if self.memories else 0.0,
-            "oldest_item_age": (datetime.now() - min(t.created_at for t in self.memories.values())).total_seconds() / 3600 if self.memories else 0
+            "average_strength": self.trace_store.mean_strength(),
+            "oldest_item_age": (datetime.now().timestamp() - self.trace_store.oldest_created_at()) / 3600 if self.memories else 0
         }
 
 
@@ -449,9 +1035,11 @@ class EpisodicMemory:
     def __init__(self, persona_type: str):
         self.persona_type = persona_type
         self.episodes = {}  # episode_id -> Episode
-        self.temporal_index = []  # [(timestamp, episode_id), ...] sorted by time
-        self.context_index = defaultdict(list)  # context_type -> [episode_ids]
-        self.tag_index = defaultdict(list)  # tag -> [episode_ids]
+        self.temporal_index = SortedTemporalIndex()  # (timestamp, episode_id) sorted by time
+        self.context_index = defaultdict(dict)  # context_type -> {episode_id: None}, insertion ordered
+        self.tag_index = defaultdict(dict)  # tag -> {episode_id: None}, insertion ordered
+        self.eviction_heap = []  # [(importance, timestamp, episode_id), ...] min-heap, lazily validated
+        self.episode_features = {}  # episode_id -> EpisodeFeatures
         
         # Episodic memory parameters
         self.max_episodes = 10000  # Maximum episodes to store
@@ -474,15 +1062,17 @@ class EpisodicMemory:
         
         # Store episode
         self.episodes[episode.episode_id] = episode
+        self.episode_features[episode.episode_id] = self._build_episode_features(episode)
         
         # Update indices
-        heapq.heappush(self.temporal_index, (episode.timestamp, episode.episode_id))
+        self.temporal_index.add(episode.timestamp, episode.episode_id)
+        heapq.heappush(self.eviction_heap, (episode.importance, episode.timestamp, episode.episode_id))
         
         context_type = episode.context.get("type", "general")
-        self.context_index[context_type].append(episode.episode_id)
+        self.context_index[context_type][episode.episode_id] = None
         
         for tag in episode.tags:
-            self.tag_index[tag].append(episode.episode_id)
+            self.tag_index[tag][episode.episode_id] = None
         
         # Manage memory capacity
         await self._manage_capacity()
@@ -490,111 +1080,163 @@ class EpisodicMemory:
         return episode.episode_id
     
     async def retrieve_similar_episodes(self, query: Dict[str, Any], 
-                                      similarity_threshold: float = 0.7) -> List[Episode]:
-        """Retrieve episodes similar to the query"""
-        
-        matching_episodes = []
+                                      similarity_threshold: float = 0.7,
+                                      max_results: Optional[int] = None) -> List[Episode]:
+        """Retrieve episodes similar to the query, best matches first"""
         
-        # Extract query features
-        query_context = query.get("context", {})
-        query_tags = query.get("tags", [])
-        query_content = str(query).lower()
+        query_features = self._build_query_features(query)
         
-        for episode in self.episodes.values():
-            similarity = await self._calculate_episode_similarity(query, episode)
+        scored = []
+        for episode_id in self._candidate_episode_ids(query, query_features, similarity_threshold):
+            episode = self.episodes.get(episode_id)
+            if episode is None:
+                continue
             
+            similarity = self._score_episode(query_features, self.episode_features[episode_id])
             if similarity >= similarity_threshold:
-                matching_episodes.append(episode)
+                scored.append((similarity, episode.timestamp, episode))
         
-        # Sort by similarity and recency
-        matching_episodes.sort(key=lambda e: (
-            self._calculate_episode_similarity_sync(query, e), 
-            e.timestamp
-        ), reverse=True)
+        # Rank by similarity and recency in a single pass
+        rank_key = lambda item: (item[0], item[1])
+        if max_results is not None:
+            ranked = heapq.nlargest(max_results, scored, key=rank_key)
+        else:
+            ranked = sorted(scored, key=rank_key, reverse=True)
         
-        return matching_episodes
+        return [episode for _, _, episode in ranked]
     
-    async def _calculate_episode_similarity(self, query: Dict[str, Any], episode: Episode) -> float:
-        """Calculate similarity between query and episode"""
-        return self._calculate_episode_similarity_sync(query, episode)
+    def _build_episode_features(self, episode: Episode) -> EpisodeFeatures:
+        """Precompute the features used for similarity matching"""
+        return EpisodeFeatures(
+            context_pairs=frozenset((k, _freeze_value(v)) for k, v in episode.context.items()),
+            context_size=len(episode.context),
+            tag_set=frozenset(episode.tags),
+            content_tokens=frozenset(str(episode.events).lower().split())
+        )
     
-    def _calculate_episode_similarity_sync(self, query: Dict[str, Any], episode: Episode) -> float:
-        """Synchronous version of episode similarity calculation"""
+    def _build_query_features(self, query: Dict[str, Any]) -> EpisodeFeatures:
+        """Extract the same features from a retrieval query"""
+        query_context = query.get("context", {}) or {}
+        return EpisodeFeatures(
+            context_pairs=frozenset((k, _freeze_value(v)) for k, v in query_context.items()),
+            context_size=len(query_context),
+            tag_set=frozenset(query.get("tags", [])),
+            content_tokens=frozenset(str(query).lower().split())
+        )
+    
+    def _candidate_episode_ids(self, query: Dict[str, Any], query_features: EpisodeFeatures,
+                               similarity_threshold: float):
+        """Select episodes that could reach the similarity threshold
+        
+        Candidates share a tag or the context type with the query. Any other
+        episode scores zero on tags and at most 0.3 on content, so the index
+        lookup is only exact while the threshold is above that bound; below
+        it, every episode is a candidate.
+        """
+        query_context = query.get("context", {}) or {}
+        
+        # Upper bound on the score of an episode outside the candidate set
+        context_bound = 0.0
+        if query_context:
+            if "type" in query_context:
+                context_bound = 0.4 * (len(query_context) - 1) / len(query_context)
+            else:
+                context_bound = 0.4
+        outside_bound = context_bound + 0.3
+        
+        if similarity_threshold <= outside_bound:
+            return list(self.episodes.keys())
+        
+        candidate_ids = {}
+        if "type" in query_context:
+            try:
+                candidate_ids.update(self.context_index.get(query_context["type"], {}))
+            except TypeError:
+                pass  # Unhashable context types are never indexed, so nothing can match
+        for tag in query_features.tag_set:
+            candidate_ids.update(self.tag_index.get(tag, {}))
+        
+        return list(candidate_ids)
+    
+    def _score_episode(self, query_features: EpisodeFeatures, features: EpisodeFeatures) -> float:
+        """Score an episode against a query from precomputed features"""
         similarity_score = 0.0
         
         # Context similarity
-        query_context = query.get("context", {})
-        if query_context and episode.context:
-            context_match = sum(1 for k, v in query_context.items() 
-                              if k in episode.context and episode.context[k] == v)
-            context_total = max(len(query_context), len(episode.context))
-            if context_total > 0:
-                similarity_score += (context_match / context_total) * 0.4
+        if query_features.context_size and features.context_size:
+            context_match = len(query_features.context_pairs & features.context_pairs)
+            context_total = max(query_features.context_size, features.context_size)
+            similarity_score += (context_match / context_total) * 0.4
         
         # Tag similarity
-        query_tags = set(query.get("tags", []))
-        episode_tags = set(episode.tags)
-        if query_tags or episode_tags:
-            tag_intersection = len(query_tags.intersection(episode_tags))
-            tag_union = len(query_tags.union(episode_tags))
+        if query_features.tag_set or features.tag_set:
+            tag_intersection = len(query_features.tag_set & features.tag_set)
+            tag_union = len(query_features.tag_set) + len(features.tag_set) - tag_intersection
             if tag_union > 0:
                 similarity_score += (tag_intersection / tag_union) * 0.3
         
         # Content similarity
-        query_str = str(query).lower()
-        episode_str = str(episode.events).lower()
-        query_words = set(query_str.split())
-        episode_words = set(episode_str.split())
-        
-        if query_words or episode_words:
-            word_intersection = len(query_words.intersection(episode_words))
-            word_union = len(query_words.union(episode_words))
+        if query_features.content_tokens or features.content_tokens:
+            word_intersection = len(query_features.content_tokens & features.content_tokens)
+            word_union = len(query_features.content_tokens) + len(features.content_tokens) - word_intersection
             if word_union > 0:
                 similarity_score += (word_intersection / word_union) * 0.3
         
         return similarity_score
     
+    async def _calculate_episode_similarity(self, query: Dict[str, Any], episode: Episode) -> float:
+        """Calculate similarity between query and episode"""
+        return self._calculate_episode_similarity_sync(query, episode)
+    
+    def _calculate_episode_similarity_sync(self, query: Dict[str, Any], episode: Episode) -> float:
+        """Synchronous version of episode similarity calculation"""
+        features = self.episode_features.get(episode.episode_id) or self._build_episode_features(episode)
+        return self._score_episode(self._build_query_features(query), features)
+    
     async def retrieve_by_timeframe(self, start_time: datetime, end_time: datetime) -> List[Episode]:
         """Retrieve episodes within a specific timeframe"""
-        matching_episodes = []
-        
-        for timestamp, episode_id in self.temporal_index:
-            if start_time <= timestamp <= end_time:
-                if episode_id in self.episodes:
-                    matching_episodes.append(self.episodes[episode_id])
-        
-        return matching_episodes
+        return list(self.iter_by_timeframe(start_time, end_time))
+    
+    def iter_by_timeframe(self, start_time: datetime, end_time: datetime):
+        """Lazily iterate episodes within a timeframe in chronological order"""
+        for _, episode_id in self.temporal_index.irange(start_time, end_time):
+            episode = self.episodes.get(episode_id)
+            if episode is not None:
+                yield episode
     
     async def retrieve_by_context(self, context_type: str) -> List[Episode]:
         """Retrieve episodes by context type"""
-        episode_ids = self.context_index.get(context_type, [])
+        episode_ids = self.context_index.get(context_type, {})
         return [self.episodes[eid] for eid in episode_ids if eid in self.episodes]
     
     async def retrieve_by_tags(self, tags: List[str]) -> List[Episode]:
         """Retrieve episodes that have any of the specified tags"""
         episode_ids = set()
         for tag in tags:
-            episode_ids.update(self.tag_index.get(tag, []))
+            episode_ids.update(self.tag_index.get(tag, {}))
         
         return [self.episodes[eid] for eid in episode_ids if eid in self.episodes]
     
     async def _manage_capacity(self):
         """Manage episodic memory capacity by removing less important episodes"""
-        if len(self.episodes) > self.max_episodes:
-            # Sort episodes by importance and recency
-            episodes_by_importance = sorted(
-                self.episodes.values(),
-                key=lambda e: (e.importance, e.timestamp),
-                reverse=True
-            )
+        # Evict the least important (then oldest) episodes until back under capacity
+        while len(self.episodes) > self.max_episodes and self.eviction_heap:
+            importance, timestamp, episode_id = heapq.heappop(self.eviction_heap)
+            episode = self.episodes.get(episode_id)
             
-            # Keep the most important and recent episodes
-            episodes_to_keep = episodes_by_importance[:self.max_episodes]
-            episodes_to_remove = set(self.episodes.keys()) - {e.episode_id for e in episodes_to_keep}
+            if episode is None:
+                continue  # Stale entry for an already removed episode
+            if episode.importance != importance:
+                # Importance changed since the entry was pushed; requeue with the current value
+                heapq.heappush(self.eviction_heap, (episode.importance, episode.timestamp, episode_id))
+                continue
             
-            # Remove less important episodes
-            for episode_id in episodes_to_remove:
-                await self._remove_episode(episode_id)
+            await self._remove_episode(episode_id)
+        
+        # Keep stale entries from accumulating
+        if len(self.eviction_heap) > 2 * len(self.episodes) + 1024:
+            self.eviction_heap = [(e.importance, e.timestamp, e.episode_id) for e in self.episodes.values()]
+            heapq.heapify(self.eviction_heap)
     
     async def _remove_episode(self, episode_id: str):
         """Remove an episode and update all indices"""
@@ -605,20 +1247,18 @@ class EpisodicMemory:
         
         # Remove from main storage
         del self.episodes[episode_id]
+        self.episode_features.pop(episode_id, None)
         
         # Remove from temporal index
-        self.temporal_index = [(t, eid) for t, eid in self.temporal_index if eid != episode_id]
-        heapq.heapify(self.temporal_index)
+        self.temporal_index.discard(episode_id)
         
         # Remove from context index
         context_type = episode.context.get("type", "general")
-        if episode_id in self.context_index[context_type]:
-            self.context_index[context_type].remove(episode_id)
+        self.context_index[context_type].pop(episode_id, None)
         
         # Remove from tag index
         for tag in episode.tags:
-            if episode_id in self.tag_index[tag]:
-                self.tag_index[tag].remove(episode_id)
+            self.tag_index[tag].pop(episode_id, None)
     
     async def apply_decay(self, time_hours: float):
         """Apply decay to episodic memories based on time and access patterns"""
@@ -637,6 +1277,10 @@ class EpisodicMemory:
         # Remove decayed episodes
         for episode_id in episodes_to_remove:
             await self._remove_episode(episode_id)
+        
+        # Every importance changed, so rebuild the eviction heap in one pass
+        self.eviction_heap = [(e.importance, e.timestamp, e.episode_id) for e in self.episodes.values()]
+        heapq.heapify(self.eviction_heap)
     
     async def get_status(self) -> Dict[str, Any]:
         """Get episodic memory status"""
@@ -665,8 +1309,13 @@ class LongTermMemory:
     def __init__(self, persona_type: str):
         self.persona_type = persona_type
         self.semantic_network = {}  # concept_id -> {content, associations, strength}
-        self.concept_index = defaultdict(list)  # keyword -> [concept_ids]
-        self.category_index = defaultdict(list)  # category -> [concept_ids]
+        self.concept_index = defaultdict(dict)  # keyword -> {concept_id: None}, insertion ordered
+        self.category_index = defaultdict(dict)  # category -> {concept_id: None}, insertion ordered
+        self.concept_keywords = {}  # concept_id -> frozenset of keywords
+        self.activation_graph = SemanticActivationGraph()  # compiled association graph
+        
+        # Association parameters
+        self.association_threshold = 0.2  # Minimum keyword Jaccard to associate concepts
         
         # Initialize with domain-specific knowledge
         self.domain_knowledge = self._initialize_domain_knowledge()
@@ -729,9 +1378,11 @@ class LongTermMemory:
         
         # Update indices
         for keyword in keywords:
-            self.concept_index[keyword].append(concept_id)
+            self.concept_index[keyword][concept_id] = None
         
-        self.category_index[category].append(concept_id)
+        self.category_index[category][concept_id] = None
+        self.concept_keywords[concept_id] = frozenset(keywords)
+        self.activation_graph.add_node(concept_id)
         
         # Create associations with existing concepts
         await self._create_semantic_associations(concept_id)
@@ -755,21 +1406,19 @@ class LongTermMemory:
     async def _create_semantic_associations(self, concept_id: str):
         """Create associations between the new concept and existing ones"""
         new_concept = self.semantic_network[concept_id]
-        new_keywords = set(new_concept["keywords"])
+        new_keywords = self.concept_keywords[concept_id]
         
-        # Find concepts with overlapping keywords
-        for existing_id, existing_concept in self.semantic_network.items():
-            if existing_id == concept_id:
-                continue
-            
-            existing_keywords = set(existing_concept["keywords"])
-            overlap = len(new_keywords.intersection(existing_keywords))
+        # Only concepts surviving the prefix filter can clear the threshold
+        for existing_id in self._association_candidates(concept_id, new_keywords):
+            existing_concept = self.semantic_network[existing_id]
+            existing_keywords = self.concept_keywords[existing_id]
+            overlap = len(new_keywords & existing_keywords)
             
             if overlap > 0:
                 # Calculate association strength
-                association_strength = overlap / len(new_keywords.union(existing_keywords))
+                association_strength = overlap / (len(new_keywords) + len(existing_keywords) - overlap)
                 
-                if association_strength > 0.2:  # Minimum threshold for association
+                if association_strength > self.association_threshold:  # Minimum threshold for association
                     # Create bidirectional association
                     new_concept["associations"].append({
                         "target_id": existing_id,
@@ -781,64 +1430,116 @@ class LongTermMemory:
                         "strength": association_strength,
                         "type": "semantic_similarity"
                     })
+                    self.activation_graph.add_edge(concept_id, existing_id, association_strength)
+                    self.activation_graph.add_edge(existing_id, concept_id, association_strength)
+    
+    def _association_candidates(self, concept_id: str, keywords: frozenset) -> List[str]:
+        """Find concepts that could share enough keywords to be associated
+        
+        Strength is the keyword Jaccard, so clearing the threshold t needs an
+        overlap above t * |A|. Any such concept must therefore contain one of
+        the |A| - floor(t * |A|) rarest keywords of A (prefix filtering), and
+        the most common keywords never need their posting lists scanned.
+        """
+        if not keywords:
+            return []
+        
+        threshold = self.association_threshold
+        required_overlap = int(threshold * len(keywords)) + 1
+        prefix_length = max(1, len(keywords) - required_overlap + 1)
+        rarest_first = sorted(keywords, key=lambda k: len(self.concept_index.get(k, ())))
+        max_size = len(keywords) / threshold if threshold > 0 else float("inf")
+        
+        candidates = {}
+        for keyword in rarest_first[:prefix_length]:
+            for candidate_id in self.concept_index.get(keyword, ()):
+                if candidate_id == concept_id or candidate_id in candidates:
+                    continue
+                # Size filter: a much larger concept cannot reach the threshold
+                if len(self.concept_keywords[candidate_id]) < max_size:
+                    candidates[candidate_id] = None
+        
+        return list(candidates)
     
     async def retrieve_relevant_knowledge(self, query: Dict[str, Any], 
-                                        activation_threshold: float = 0.5) -> List[Dict[str, Any]]:
+                                        activation_threshold: float = 0.5,
+                                        max_results: Optional[int] = None) -> List[Dict[str, Any]]:
         """Retrieve relevant knowledge based on spreading activation"""
         
-        # Extract query keywords
-        query_keywords = self._extract_keywords(str(query))
-        
         # Initial activation based on keyword matches
-        activated_concepts = {}
-        
-        for keyword in query_keywords:
-            concept_ids = self.concept_index.get(keyword, [])
-            for concept_id in concept_ids:
-                if concept_id not in activated_concepts:
-                    activated_concepts[concept_id] = 0.0
-                activated_concepts[concept_id] += 0.3  # Base activation per keyword match
-        
-        # Spreading activation through associations
-        for _ in range(3):  # 3 levels of spreading
-            new_activations = activated_concepts.copy()
-            
-            for concept_id, activation in activated_concepts.items():
-                if activation > 0.1:  # Only spread from sufficiently activated concepts
-                    concept = self.semantic_network.get(concept_id, {})
-                    
-                    for association in concept.get("associations", []):
-                        target_id = association["target_id"]
-                        spread_amount = activation * association["strength"] * 0.5
-                        
-                        if target_id not in new_activations:
-                            new_activations[target_id] = 0.0
-                        new_activations[target_id] += spread_amount
-            
-            activated_concepts = new_activations
+        initial_activation = self._initial_activation(query)
         
-        # Filter by activation threshold and create result list
-        relevant_knowledge = []
+        if not initial_activation:
+            return []
         
-        for concept_id, activation in activated_concepts.items():
-            if activation >= activation_threshold:
-                concept = self.semantic_network.get(concept_id, {})
-                concept["activation"] = activation
-                concept["concept_id"] = concept_id
-                
-                # Record access
-                concept["access_count"] = concept.get("access_count", 0) + 1
-                
-                relevant_knowledge.append(concept)
+        # Spreading activation through associations (3 levels)
+        activation = self.activation_graph.spread(initial_activation, levels=3)
+        
+        return self._select_activated(activation, activation_threshold, max_results)
+    
+    async def retrieve_relevant_knowledge_batch(self, queries: List[Dict[str, Any]],
+                                              activation_threshold: float = 0.5,
+                                              max_results: Optional[int] = None,
+                                              max_batch_cells: int = 1 << 22) -> List[List[Dict[str, Any]]]:
+        """Retrieve relevant knowledge for several queries with one batched activation spread per chunk"""
+        initial_activations = [self._initial_activation(query) for query in queries]
+        results = [[] for _ in queries]
+        
+        # Queries without keyword matches activate nothing
+        seeded = [i for i, initial in enumerate(initial_activations) if initial]
+        
+        # Bound the (queries x concepts) activation matrix
+        chunk_size = max(1, max_batch_cells // max(1, len(self.activation_graph.node_ids)))
+        for chunk_start in range(0, len(seeded), chunk_size):
+            chunk = seeded[chunk_start:chunk_start + chunk_size]
+            activations = self.activation_graph.spread_batch(
+                [initial_activations[i] for i in chunk], levels=3
+            )
+            for i, activation in zip(chunk, activations):
+                results[i] = self._select_activated(activation, activation_threshold, max_results)
+        
+        return results
+    
+    def _initial_activation(self, query: Any) -> Dict[str, float]:
+        """Seed activation from concepts sharing keywords with the query"""
+        initial_activation = defaultdict(float)
+        
+        for keyword in self._extract_keywords(str(query)):
+            for concept_id in self.concept_index.get(keyword, {}):
+                initial_activation[concept_id] += 0.3  # Base activation per keyword match
+        
+        return initial_activation
+    
+    def _select_activated(self, activation: np.ndarray, activation_threshold: float,
+                          max_results: Optional[int]) -> List[Dict[str, Any]]:
+        """Concepts at or above the activation threshold, most activated first"""
+        
+        # Filter by activation threshold, keeping only the top results if requested
+        rows = np.flatnonzero(activation >= activation_threshold)
+        if max_results is not None and len(rows) > max_results:
+            rows = rows[np.argpartition(-activation[rows], max_results - 1)[:max_results]]
+        rows = rows[np.argsort(-activation[rows], kind="stable")]
         
-        # Sort by activation level
-        relevant_knowledge.sort(key=lambda c: c["activation"], reverse=True)
+        relevant_knowledge = []
+        
+        for row in rows:
+            concept_id = self.activation_graph.node_ids[row]
+            concept = self.semantic_network.get(concept_id)
+            if concept is None:
+                continue
+            concept["activation"] = float(activation[row])
+            concept["concept_id"] = concept_id
+            
+            # Record access
+            concept["access_count"] = concept.get("access_count", 0) + 1
+            
+            relevant_knowledge.append(concept)
         
         return relevant_knowledge
     
     async def retrieve_by_category(self, category: str) -> List[Dict[str, Any]]:
         """Retrieve all knowledge in a specific category"""
-        concept_ids = self.category_index.get(category, [])
+        concept_ids = self.category_index.get(category, {})
         return [self.semantic_network[cid] for cid in concept_ids if cid in self.semantic_network]
     
     async def strengthen_concept(self, concept_id: str, strength_increase: float = 0.1):
@@ -878,16 +1579,20 @@ class LongTermMemory:
         
         # Remove from main storage
         del self.semantic_network[concept_id]
+        self.concept_keywords.pop(concept_id, None)
+        self.activation_graph.remove_node(concept_id)
         
         # Remove from keyword index
         for keyword in concept.get("keywords", []):
-            if concept_id in self.concept_index[keyword]:
-                self.concept_index[keyword].remove(concept_id)
+            posting = self.concept_index.get(keyword)
+            if posting is not None:
+                posting.pop(concept_id, None)
+                if not posting:
+                    del self.concept_index[keyword]
         
         # Remove from category index
         category = concept.get("category", "general")
-        if concept_id in self.category_index[category]:
-            self.category_index[category].remove(concept_id)
+        self.category_index[category].pop(concept_id, None)
         
         # Remove associations
         for association in concept.get("associations", []):
@@ -0,0 +1,530 @@
+"""
+CollegiumAI Cognitive Architecture - Memory Snapshots
+Versioned, memory-mappable persistence for the cognitive memory systems
+
+File layout::
+
+    [file header: magic, version]
+    [segment 0: aligned arrays ... | offsets table (JSON) | footer]
+    [segment 1: aligned arrays ... | offsets table (JSON) | footer]
+    ...
+
+Each segment ends with a fixed-size footer pointing at its offsets table,
+and each table points at the previous segment's table. The footer of the
+last segment is always the last 32 bytes of the file. Appending a segment
+never rewrites earlier bytes, so readers that already mapped the file keep
+a consistent view.
+
+Numeric columns (strengths, timestamps, access counts, the semantic CSR
+graph) are stored raw and exposed as zero-copy read-only views over an
+mmap. Python payloads (trace content, episodes, concept bodies) are stored
+as pickled records behind an offsets array and decoded on demand. Every
+item gets a stable ordinal the first time it is written. Later segments
+only add records for new items, plus the full (small) numeric columns and
+live ordinal lists, so a checkpoint costs O(new items + live scalars).
+"""
+
+import heapq
+import json
+import mmap
+import os
+import pickle
+import struct
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+
+from .memory import CognitiveMemory, WorkingMemory, EpisodicMemory, LongTermMemory, MemoryTrace
+
+SNAPSHOT_MAGIC = b"CGMSNAP\x00"
+SNAPSHOT_VERSION = 1
+
+_FILE_HEADER = struct.Struct("<8sII")  # magic, version, reserved
+_FOOTER = struct.Struct("<8sIIQQ")  # magic, version, segment index, table offset, table length
+_ALIGNMENT = 64
+
+WORKING_COMPONENTS = ["central_executive", "phonological_loop", "visuospatial_sketchpad", "episodic_buffer"]
+SNAPSHOT_KINDS = ["working", "episodic", "semantic"]
+
+class SnapshotError(Exception):
+    """Raised for missing, corrupt or incompatible snapshot files"""
+    pass
+
+class SnapshotRecords:
+    """Lazily decoded sequence of pickled records inside a mapped snapshot"""
+
+    def __init__(self, offsets: np.ndarray, data: np.ndarray):
+        self.offsets = offsets
+        self.data = data
+
+    def __len__(self) -> int:
+        return max(0, len(self.offsets) - 1)
+
+    def __getitem__(self, index: int) -> Any:
+        start, end = int(self.offsets[index]), int(self.offsets[index + 1])
+        return pickle.loads(self.data[start:end])
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+class SegmentWriter:
+    """Collects the arrays of one snapshot segment and appends them to a file"""
+
+    def __init__(self):
+        self.arrays = {}  # name -> ndarray
+
+    def add_array(self, name: str, array: np.ndarray):
+        self.arrays[name] = np.ascontiguousarray(array)
+
+    def add_records(self, name: str, records: List[Any]):
+        """Store Python objects as a pickle blob plus an offsets array"""
+        payloads = [pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL) for record in records]
+        offsets = np.zeros(len(payloads) + 1, dtype=np.int64)
+        if payloads:
+            np.cumsum([len(payload) for payload in payloads], out=offsets[1:])
+        self.add_array(f"{name}.offsets", offsets)
+        self.add_array(f"{name}.data", np.frombuffer(b"".join(payloads), dtype=np.uint8))
+
+    def write(self, handle, segment_index: int, previous_table: Optional[List[int]],
+              metadata: Dict[str, Any]) -> List[int]:
+        """Append arrays, offsets table and footer; return [table_offset, table_length]"""
+        handle.seek(0, os.SEEK_END)
+        table = {
+            "segment": segment_index,
+            "previous": previous_table,
+            "metadata": metadata,
+            "arrays": {}
+        }
+
+        for name, array in self.arrays.items():
+            position = handle.tell()
+            padding = (-position) % _ALIGNMENT
+            if padding:
+                handle.write(b"\0" * padding)
+                position += padding
+            handle.write(array.tobytes())
+            table["arrays"][name] = {
+                "offset": position,
+                "dtype": array.dtype.str,
+                "shape": list(array.shape)
+            }
+
+        table_bytes = json.dumps(table, default=str).encode("utf-8")
+        table_offset = handle.tell()
+        handle.write(table_bytes)
+        handle.write(_FOOTER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, segment_index,
+                                  table_offset, len(table_bytes)))
+        return [table_offset, len(table_bytes)]
+
+class MemorySnapshot:
+    """
+    Read-only, memory-mapped view of a snapshot file
+    Opening only reads the offsets tables; arrays are zero-copy views into
+    the shared mapping, so many processes can map the same file cheaply.
+    """
+
+    def __init__(self, path: str):
+        self.path = os.path.abspath(path)
+        try:
+            self._file = open(self.path, "rb")
+        except OSError as e:
+            raise SnapshotError(f"Cannot open snapshot {path}: {e}")
+
+        size = os.fstat(self._file.fileno()).st_size
+        if size < _FILE_HEADER.size + _FOOTER.size:
+            self._file.close()
+            raise SnapshotError(f"Snapshot {path} is truncated")
+
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.size = size
+        try:
+            self.segments = self._read_tables()
+        except (SnapshotError, ValueError, struct.error) as e:
+            self.close()
+            raise e if isinstance(e, SnapshotError) else SnapshotError(f"Corrupt snapshot {path}: {e}")
+
+    def _read_tables(self) -> List[Dict[str, Any]]:
+        """Walk the offsets-table chain back from the last footer"""
+        magic, version, _ = _FILE_HEADER.unpack_from(self._mmap, 0)
+        self._check_version(magic, version)
+        magic, version, _, table_offset, table_length = _FOOTER.unpack_from(self._mmap, self.size - _FOOTER.size)
+        self._check_version(magic, version)
+
+        segments = []
+        location = [table_offset, table_length]
+        while location is not None:
+            offset, length = location
+            table = json.loads(bytes(self._mmap[offset:offset + length]).decode("utf-8"))
+            segments.append(table)
+            location = table.get("previous")
+        segments.reverse()
+        self.table_location = [table_offset, table_length]
+        return segments
+
+    def _check_version(self, magic: bytes, version: int):
+        if magic != SNAPSHOT_MAGIC:
+            raise SnapshotError(f"{self.path} is not a cognitive memory snapshot")
+        if version > SNAPSHOT_VERSION:
+            raise SnapshotError(f"Snapshot version {version} is newer than supported version {SNAPSHOT_VERSION}")
+
+    @property
+    def latest(self) -> Dict[str, Any]:
+        return self.segments[-1]
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        return self.latest["metadata"]
+
+    def has_array(self, name: str, segment: int = -1) -> bool:
+        return name in self.segments[segment]["arrays"]
+
+    def array(self, name: str, segment: int = -1) -> np.ndarray:
+        """Zero-copy read-only view of an array in the given segment"""
+        spec = self.segments[segment]["arrays"].get(name)
+        if spec is None:
+            raise SnapshotError(f"Array {name} missing from segment {segment}")
+        dtype = np.dtype(spec["dtype"])
+        count = int(np.prod(spec["shape"])) if spec["shape"] else 1
+        view = np.frombuffer(self._mmap, dtype=dtype, count=count, offset=spec["offset"])
+        return view.reshape(spec["shape"])
+
+    def records(self, name: str, segment: int = -1) -> SnapshotRecords:
+        return SnapshotRecords(self.array(f"{name}.offsets", segment), self.array(f"{name}.data", segment))
+
+    def record_locator(self, kind: str):
+        """Return a function mapping an item ordinal to its pickled record"""
+        first_ordinals = np.array([s["metadata"][kind]["first_ordinal"] for s in self.segments], dtype=np.int64)
+        record_sets = [self.records(f"{kind}.records", index) for index in range(len(self.segments))]
+
+        def locate(ordinal: int) -> Any:
+            segment = int(np.searchsorted(first_ordinals, ordinal, side="right")) - 1
+            return record_sets[segment][int(ordinal - first_ordinals[segment])]
+
+        return locate
+
+    def close(self):
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass  # Views are still exported; the mapping is released with them
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+def _assign_ordinals(live_ids: List[str], ordinals: Dict[str, int], next_ordinal: int):
+    """Give unseen ids fresh ordinals; return (live ordinals, new ids, next ordinal, live map)"""
+    live_ordinals = np.empty(len(live_ids), dtype=np.int64)
+    live_map = {}
+    new_ids = []
+
+    for position, item_id in enumerate(live_ids):
+        ordinal = ordinals.get(item_id)
+        if ordinal is None:
+            ordinal = next_ordinal
+            next_ordinal += 1
+            new_ids.append(item_id)
+        live_ordinals[position] = ordinal
+        live_map[item_id] = ordinal
+
+    return live_ordinals, new_ids, next_ordinal, live_map
+
+def _write_working(memory: WorkingMemory, segment: SegmentWriter, state: Dict[str, Any]) -> Dict[str, Any]:
+    store = memory.trace_store
+    live_ids = [tid for tid in memory.active_chunk_ids if tid in memory.memories]
+    live_ids += [tid for tid in memory.memories if tid not in memory.active_chunk_ids]
+
+    first_ordinal = state["next_ordinal"]["working"]
+    live_ordinals, new_ids, next_ordinal, live_map = _assign_ordinals(
+        live_ids, state["ordinals"]["working"], first_ordinal
+    )
+
+    slots = np.fromiter((memory.memories[tid]._slot for tid in live_ids), dtype=np.int64, count=len(live_ids))
+    segment.add_array("working.ordinals", live_ordinals)
+    for column in store.COLUMNS:
+        segment.add_array(f"working.{column}", getattr(store, column)[slots])
+
+    component_of = {}
+    for code, component in enumerate(WORKING_COMPONENTS):
+        for tid in getattr(memory, component):
+            component_of[tid] = code
+    segment.add_array("working.component", np.array([component_of.get(tid, -1) for tid in live_ids], dtype=np.int8))
+
+    segment.add_records("working.records", [
+        {
+            "trace_id": tid,
+            "content": memory.memories[tid].content,
+            "memory_type": memory.memories[tid].memory_type,
+            "tags": memory.memories[tid]._tags,
+            "context": memory.memories[tid]._context,
+            "associations": memory.memories[tid]._associations
+        }
+        for tid in new_ids
+    ])
+
+    state["ordinals"]["working"] = live_map
+    state["next_ordinal"]["working"] = next_ordinal
+    return {"first_ordinal": first_ordinal, "new_records": len(new_ids),
+            "live": len(live_ids), "capacity": memory.capacity}
+
+def _write_episodic(memory: EpisodicMemory, segment: SegmentWriter, state: Dict[str, Any]) -> Dict[str, Any]:
+    timeline = [(timestamp, eid) for timestamp, eid in memory.temporal_index.irange() if eid in memory.episodes]
+    live_ids = [eid for _, eid in timeline]
+
+    first_ordinal = state["next_ordinal"]["episodic"]
+    live_ordinals, new_ids, next_ordinal, live_map = _assign_ordinals(
+        live_ids, state["ordinals"]["episodic"], first_ordinal
+    )
+
+    # Chronological order, so the temporal index is restored without sorting
+    segment.add_array("episodic.ordinals", live_ordinals)
+    segment.add_array("episodic.timestamp", np.array([t.timestamp() for t, _ in timeline], dtype=np.float64))
+    segment.add_array("episodic.importance", np.array([memory.episodes[eid].importance for eid in live_ids],
+                                                      dtype=np.float64))
+    segment.add_records("episodic.records", [memory.episodes[eid] for eid in new_ids])
+
+    state["ordinals"]["episodic"] = live_map
+    state["next_ordinal"]["episodic"] = next_ordinal
+    return {"first_ordinal": first_ordinal, "new_records": len(new_ids), "live": len(live_ids),
+            "max_episodes": memory.max_episodes, "importance_threshold": memory.importance_threshold}
+
+def _write_semantic(memory: LongTermMemory, segment: SegmentWriter, state: Dict[str, Any]) -> Dict[str, Any]:
+    graph = memory.activation_graph
+    graph.compile(compact=True)  # Rows now match live concepts in insertion order
+    live_ids = list(graph.node_ids)
+
+    first_ordinal = state["next_ordinal"]["semantic"]
+    live_ordinals, new_ids, next_ordinal, live_map = _assign_ordinals(
+        live_ids, state["ordinals"]["semantic"], first_ordinal
+    )
+
+    segment.add_array("semantic.ordinals", live_ordinals)
+    segment.add_array("semantic.strength", np.array([memory.semantic_network[cid]["strength"] for cid in live_ids],
+                                                    dtype=np.float64))
+    segment.add_array("semantic.access_count", np.array(
+        [memory.semantic_network[cid].get("access_count", 0) for cid in live_ids], dtype=np.int64
+    ))
+    segment.add_array("semantic.graph.indptr", graph.indptr)
+    segment.add_array("semantic.graph.indices", graph.indices)
+    segment.add_array("semantic.graph.weights", graph.weights)
+
+    excluded = {"associations", "activation", "concept_id", "strength", "access_count"}
+    segment.add_records("semantic.records", [
+        (cid, {k: v for k, v in memory.semantic_network[cid].items() if k not in excluded})
+        for cid in new_ids
+    ])
+
+    state["ordinals"]["semantic"] = live_map
+    state["next_ordinal"]["semantic"] = next_ordinal
+    return {"first_ordinal": first_ordinal, "new_records": len(new_ids), "live": len(live_ids),
+            "association_threshold": memory.association_threshold}
+
+def write_memory_snapshot(memory: CognitiveMemory, path: str, append: bool = False) -> Dict[str, Any]:
+    """Write a full snapshot, or append an incremental segment to this memory's snapshot file"""
+    path = os.path.abspath(path)
+    previous = getattr(memory, "_snapshot_state", None)
+
+    append = (append and previous is not None and previous["path"] == path
+              and os.path.exists(path) and os.path.getsize(path) == previous["file_size"])
+    if append:
+        state = {
+            "path": path,
+            "segments": previous["segments"],
+            "table": previous["table"],
+            "ordinals": {kind: dict(previous["ordinals"][kind]) for kind in SNAPSHOT_KINDS},
+            "next_ordinal": dict(previous["next_ordinal"])
+        }
+    else:
+        state = {
+            "path": path,
+            "segments": 0,
+            "table": None,
+            "ordinals": {kind: {} for kind in SNAPSHOT_KINDS},
+            "next_ordinal": {kind: 0 for kind in SNAPSHOT_KINDS}
+        }
+
+    segment = SegmentWriter()
+    metadata = {
+        "persona_type": memory.persona_type,
+        "kind": "delta" if append else "base",
+        "written_at": datetime.now().isoformat(),
+        "last_decay_update": memory.last_decay_update.timestamp(),
+        "working": _write_working(memory.working_memory, segment, state),
+        "episodic": _write_episodic(memory.episodic_memory, segment, state),
+        "semantic": _write_semantic(memory.long_term_memory, segment, state)
+    }
+    segment.add_records("memory.associations", [dict(memory.memory_associations)])
+
+    if append:
+        handle = open(path, "r+b")
+    else:
+        # Write a fresh file next to the target and swap it in atomically
+        handle = open(path + ".tmp", "wb")
+        handle.write(_FILE_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, 0))
+
+    with handle:
+        table = segment.write(handle, state["segments"], state["table"], metadata)
+        handle.flush()
+        os.fsync(handle.fileno())
+
+    if not append:
+        os.replace(path + ".tmp", path)
+
+    state["segments"] += 1
+    state["table"] = table
+    state["file_size"] = os.path.getsize(path)
+    memory._snapshot_state = state
+
+    return {
+        "path": path,
+        "segment": state["segments"] - 1,
+        "kind": metadata["kind"],
+        "bytes": state["file_size"],
+        "new_records": {kind: metadata[kind]["new_records"] for kind in SNAPSHOT_KINDS}
+    }
+
+def _restore_working(snapshot: MemorySnapshot, memory: WorkingMemory, meta: Dict[str, Any]):
+    locate = snapshot.record_locator("working")
+    ordinals = snapshot.array("working.ordinals")
+    columns = {column: snapshot.array(f"working.{column}") for column in memory.trace_store.COLUMNS}
+    components = snapshot.array("working.component")
+    memory.capacity = meta["capacity"]
+
+    for position, ordinal in enumerate(ordinals):
+        record = locate(ordinal)
+        trace = MemoryTrace(
+            trace_id=record["trace_id"],
+            content=record["content"],
+            memory_type=record["memory_type"],
+            tags=record["tags"],
+            context=record["context"],
+            associations=record["associations"]
+        )
+        for column, values in columns.items():
+            setattr(trace, "_" + column, values[position].item())
+
+        memory.trace_store.attach(trace)
+        memory.memories[trace.trace_id] = trace
+        memory.active_chunk_ids[trace.trace_id] = None
+        if components[position] >= 0:
+            getattr(memory, WORKING_COMPONENTS[components[position]]).append(trace.trace_id)
+        memory._index_trace(trace)
+
+def _restore_episodic(snapshot: MemorySnapshot, memory: EpisodicMemory, meta: Dict[str, Any]):
+    locate = snapshot.record_locator("episodic")
+    ordinals = snapshot.array("episodic.ordinals")
+    importance = snapshot.array("episodic.importance")
+    memory.max_episodes = meta["max_episodes"]
+    memory.importance_threshold = meta["importance_threshold"]
+
+    for position, ordinal in enumerate(ordinals):
+        episode = locate(ordinal)
+        episode.importance = float(importance[position])
+
+        memory.episodes[episode.episode_id] = episode
+        memory.episode_features[episode.episode_id] = memory._build_episode_features(episode)
+        memory.temporal_index.add(episode.timestamp, episode.episode_id)  # chronological appends
+        memory.eviction_heap.append((episode.importance, episode.timestamp, episode.episode_id))
+        memory.context_index[episode.context.get("type", "general")][episode.episode_id] = None
+        for tag in episode.tags:
+            memory.tag_index[tag][episode.episode_id] = None
+
+    heapq.heapify(memory.eviction_heap)
+
+def _restore_semantic(snapshot: MemorySnapshot, memory: LongTermMemory, meta: Dict[str, Any]):
+    locate = snapshot.record_locator("semantic")
+    ordinals = snapshot.array("semantic.ordinals")
+    strength = snapshot.array("semantic.strength")
+    access_count = snapshot.array("semantic.access_count")
+    memory.association_threshold = meta["association_threshold"]
+    graph = memory.activation_graph
+
+    for position, ordinal in enumerate(ordinals):
+        concept_id, fields = locate(ordinal)
+        concept = dict(fields)
+        concept["strength"] = float(strength[position])
+        concept["access_count"] = int(access_count[position])
+        concept["associations"] = []
+
+        memory.semantic_network[concept_id] = concept
+        memory.concept_keywords[concept_id] = frozenset(concept.get("keywords", []))
+        for keyword in concept.get("keywords", []):
+            memory.concept_index[keyword][concept_id] = None
+        memory.category_index[concept.get("category", "general")][concept_id] = None
+        graph.add_node(concept_id)
+
+    # Graph rows were written in live order, so the CSR arrays load as-is
+    graph.indptr = np.array(snapshot.array("semantic.graph.indptr"))
+    graph.indices = np.array(snapshot.array("semantic.graph.indices"))
+    graph.weights = np.array(snapshot.array("semantic.graph.weights"))
+    graph.compiled_nodes = len(graph.node_ids)
+
+    node_ids = graph.node_ids
+    for row, concept_id in enumerate(node_ids):
+        associations = memory.semantic_network[concept_id]["associations"]
+        for position in range(graph.indptr[row], graph.indptr[row + 1]):
+            associations.append({
+                "target_id": node_ids[graph.indices[position]],
+                "strength": float(graph.weights[position]),
+                "type": "semantic_similarity"
+            })
+
+def restore_memory_snapshot(memory: CognitiveMemory, path: str) -> Dict[str, Any]:
+    """Replace a CognitiveMemory's contents with the latest state in a snapshot file"""
+    with MemorySnapshot(path) as snapshot:
+        metadata = snapshot.metadata
+
+        working = WorkingMemory(memory.persona_type)
+        episodic = EpisodicMemory(memory.persona_type)
+        long_term = LongTermMemory(memory.persona_type)
+
+        _restore_working(snapshot, working, metadata["working"])
+        _restore_episodic(snapshot, episodic, metadata["episodic"])
+        _restore_semantic(snapshot, long_term, metadata["semantic"])
+        cross_associations = snapshot.records("memory.associations")[0]
+
+        state = {
+            "path": snapshot.path,
+            "segments": len(snapshot.segments),
+            "table": snapshot.table_location,
+            "ordinals": {
+                kind: dict(zip(_live_ids(working, episodic, long_term, kind),
+                               snapshot.array(f"{kind}.ordinals").tolist()))
+                for kind in SNAPSHOT_KINDS
+            },
+            "next_ordinal": {
+                kind: metadata[kind]["first_ordinal"] + metadata[kind]["new_records"]
+                for kind in SNAPSHOT_KINDS
+            },
+            "file_size": snapshot.size
+        }
+        segments = len(snapshot.segments)
+
+    memory.working_memory = working
+    memory.episodic_memory = episodic
+    memory.long_term_memory = long_term
+    memory.memory_associations.clear()
+    memory.memory_associations.update(cross_associations)
+    memory.last_decay_update = datetime.fromtimestamp(metadata["last_decay_update"])
+    memory._snapshot_state = state
+
+    return {
+        "path": state["path"],
+        "segments": segments,
+        "working_items": len(working.memories),
+        "episodes": len(episodic.episodes),
+        "concepts": len(long_term.semantic_network)
+    }
+
+def _live_ids(working: WorkingMemory, episodic: EpisodicMemory, long_term: LongTermMemory, kind: str) -> List[str]:
+    """Live ids in the same order the snapshot wrote their ordinals"""
+    if kind == "working":
+        return list(working.active_chunk_ids)
+    if kind == "episodic":
+        return [eid for _, eid in episodic.temporal_index.irange()]
+    return list(long_term.activation_graph.node_ids)
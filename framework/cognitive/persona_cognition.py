@@ -5,6 +5,7 @@ Intelligent agents with advanced cognitive capabilities tailored to university p
 
 import asyncio
 import logging
+import numpy as np
 from typing import Dict, List, Any, Optional, Tuple, Union
 from dataclasses import dataclass, field
 from enum import Enum
@@ -19,6 +20,7 @@ from .learning import AdaptiveLearning, MetaLearning, TransferLearning
 from .decision_making import DecisionEngine
 from .attention import AttentionMechanism
 from .metacognition import MetacognitiveController
+from .request_batching import RequestBatcher
 
 class PersonaType(Enum):
     """University persona types"""
@@ -54,6 +56,13 @@ class PersonaType(Enum):
     PROVOST = "provost"
     CHANCELLOR = "chancellor"
 
+# Request keywords suggesting support needs: (indicator type, weight, keywords)
+SUPPORT_INDICATOR_KEYWORDS = [
+    ("emotional_distress", 0.3, ["stressed", "overwhelmed", "anxious", "confused", "lost", "frustrated"]),
+    ("academic_struggle", 0.4, ["failing", "behind", "difficulty", "struggling", "can't understand"]),
+    ("urgency", 0.5, ["urgent", "asap", "deadline", "emergency", "crisis"])
+]
+
 @dataclass
 class PersonaCognitiveProfile:
     """Cognitive profile specific to persona type"""
@@ -103,6 +112,10 @@ class PersonaCognitiveAgent:
         self.session_history = []
         self.performance_metrics = {}
         
+        # Micro-batching front end (started explicitly) and cached batch scoring matrices
+        self.request_batcher = None
+        self._keyword_matrices = None
+        
     def _initialize_cognitive_profile(self) -> PersonaCognitiveProfile:
         """Initialize persona-specific cognitive profile"""
         profile = PersonaCognitiveProfile(persona_type=self.persona_type)
@@ -261,6 +274,9 @@ class PersonaCognitiveAgent:
             
             await self.cognitive_engine.initialize_cognitive_modules(cognitive_modules)
             
+            # Move episode consolidation and decay off the request path
+            await self.memory_system.start_consolidation_scheduler()
+            
             # Initialize persona-specific knowledge and goals
             await self._initialize_persona_knowledge()
             await self._set_persona_goals()
@@ -332,33 +348,8 @@ class PersonaCognitiveAgent:
             # Phase 5: Learning and Adaptation
             await self._learn_from_interaction(request, intelligent_response, session_id)
             
-            # Finalize session
-            processing_time = (datetime.now() - start_time).total_seconds()
-            
-            final_response = {
-                "session_id": session_id,
-                "persona_type": self.persona_type.value,
-                "intelligent_response": intelligent_response,
-                "proactive_support": proactive_support,
-                "cognitive_insights": {
-                    "confidence": cognitive_result.get("confidence", 0.5),
-                    "cognitive_state": cognitive_result.get("cognitive_state"),
-                    "reasoning_summary": enhanced_result.get("reasoning_summary"),
-                    "persona_adaptations": enhanced_result.get("persona_adaptations")
-                },
-                "performance_metrics": {
-                    "processing_time": processing_time,
-                    "accuracy_estimate": enhanced_result.get("accuracy_estimate", 0.8),
-                    "personalization_score": enhanced_result.get("personalization_score", 0.7)
-                },
-                "timestamp": datetime.now().isoformat()
-            }
-            
-            # Clean up session
-            del self.active_sessions[session_id]
-            self.session_history.append(final_response)
-            
-            return final_response
+            return self._finalize_session(session_id, start_time, cognitive_result, enhanced_result,
+                                          intelligent_response, proactive_support)
             
         except Exception as e:
             self.logger.error(f"Error processing intelligent request: {e}")
@@ -369,11 +360,117 @@ class PersonaCognitiveAgent:
                 "timestamp": datetime.now().isoformat()
             }
     
+    async def process_request_batch(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Process a batch of requests together
+        Cognitive cycles share batched memory retrieval, and persona scoring and support
+        assessment are evaluated as array operations over the whole batch
+        """
+        if not requests:
+            return []
+        
+        start_time = datetime.now()
+        session_ids = [str(uuid.uuid4()) for _ in requests]
+        
+        try:
+            for session_id, request in zip(session_ids, requests):
+                self.active_sessions[session_id] = {
+                    "start_time": start_time,
+                    "request": request,
+                    "cognitive_state": self.cognitive_engine.cognitive_state
+                }
+            
+            # Phase 1: Batched cognitive processing
+            cognitive_results = await self.cognitive_engine.process_cognitive_batch(requests)
+            
+            # Vectorized persona scoring and support indicators for the whole batch
+            batch_scores = self._score_request_batch(requests)
+        
+        except Exception as e:
+            self.logger.error(f"Error processing request batch, processing individually: {e}")
+            for session_id in session_ids:
+                self.active_sessions.pop(session_id, None)
+            return [await self.process_intelligent_request(request) for request in requests]
+        
+        responses = []
+        for session_id, request, cognitive_result, request_scores in zip(
+                session_ids, requests, cognitive_results, batch_scores):
+            try:
+                enhanced_result = await self._apply_persona_enhancements(cognitive_result, request, request_scores)
+                intelligent_response = await self._generate_intelligent_response(enhanced_result, request)
+                proactive_support = await self._assess_proactive_support_needs(
+                    request, intelligent_response, request_scores["support_indicators"]
+                )
+                await self._learn_from_interaction(request, intelligent_response, session_id)
+                
+                responses.append(self._finalize_session(session_id, start_time, cognitive_result, enhanced_result,
+                                                        intelligent_response, proactive_support))
+            
+            except Exception as e:
+                self.logger.error(f"Error processing intelligent request: {e}")
+                self.active_sessions.pop(session_id, None)
+                responses.append({
+                    "session_id": session_id,
+                    "error": str(e),
+                    "persona_type": self.persona_type.value,
+                    "timestamp": datetime.now().isoformat()
+                })
+        
+        return responses
+    
+    async def start_request_batching(self, max_batch_size: int = 32, batch_window: float = 0.005) -> RequestBatcher:
+        """Route submit_request calls through a micro-batching front end"""
+        if self.request_batcher is None:
+            self.request_batcher = RequestBatcher(
+                self.process_request_batch, max_batch_size=max_batch_size,
+                batch_window=batch_window, name=self.persona_type.value
+            )
+        return self.request_batcher
+    
+    async def submit_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Process a request, batched with concurrent requests when batching is enabled"""
+        if self.request_batcher:
+            return await self.request_batcher.submit(request)
+        return await self.process_intelligent_request(request)
+    
+    def _finalize_session(self, session_id: str, start_time: datetime, cognitive_result: Dict[str, Any],
+                          enhanced_result: Dict[str, Any], intelligent_response: Dict[str, Any],
+                          proactive_support: Dict[str, Any]) -> Dict[str, Any]:
+        """Assemble the final response and close the session"""
+        processing_time = (datetime.now() - start_time).total_seconds()
+        
+        final_response = {
+            "session_id": session_id,
+            "persona_type": self.persona_type.value,
+            "intelligent_response": intelligent_response,
+            "proactive_support": proactive_support,
+            "cognitive_insights": {
+                "confidence": cognitive_result.get("confidence", 0.5),
+                "cognitive_state": cognitive_result.get("cognitive_state"),
+                "reasoning_summary": enhanced_result.get("reasoning_summary"),
+                "persona_adaptations": enhanced_result.get("persona_adaptations")
+            },
+            "performance_metrics": {
+                "processing_time": processing_time,
+                "accuracy_estimate": enhanced_result.get("accuracy_estimate", 0.8),
+                "personalization_score": enhanced_result.get("personalization_score", 0.7)
+            },
+            "timestamp": datetime.now().isoformat()
+        }
+        
+        # Clean up session
+        del self.active_sessions[session_id]
+        self.session_history.append(final_response)
+        
+        return final_response
+    
     async def _apply_persona_enhancements(self, cognitive_result: Dict[str, Any], 
-                                        original_request: Dict[str, Any]) -> Dict[str, Any]:
+                                        original_request: Dict[str, Any],
+                                        request_scores: Dict[str, Any] = None) -> Dict[str, Any]:
         """Apply persona-specific enhancements to cognitive processing results"""
         
         enhanced_result = cognitive_result.copy()
+        scores = request_scores or self._score_request(original_request)
         
         # Enhance based on cognitive strengths
         strength_multipliers = {}
@@ -395,9 +492,9 @@ class PersonaCognitiveAgent:
         # Add persona-specific context
         enhanced_result["persona_adaptations"] = {
             "cognitive_strengths_applied": [k for k, v in self.cognitive_profile.cognitive_strengths.items() if v > 0.7],
-            "domain_expertise_relevant": self._identify_relevant_expertise(original_request),
-            "typical_goals_alignment": self._assess_goal_alignment(original_request),
-            "challenge_awareness": self._identify_relevant_challenges(original_request)
+            "domain_expertise_relevant": scores["domain_expertise_relevant"],
+            "typical_goals_alignment": scores["typical_goals_alignment"],
+            "challenge_awareness": scores["challenge_awareness"]
         }
         
         # Enhance accuracy estimate based on domain expertise
@@ -409,14 +506,107 @@ class PersonaCognitiveAgent:
         
         # Calculate personalization score
         personalization_factors = [
-            self._assess_individual_context_alignment(original_request),
-            self._assess_persona_preference_alignment(original_request),
+            scores["individual_context_alignment"],
+            scores["persona_preference_alignment"],
             len(relevant_expertise) * 0.1
         ]
         enhanced_result["personalization_score"] = min(1.0, np.mean(personalization_factors))
         
         return enhanced_result
     
+    def _score_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Score a single request against the persona profile"""
+        return {
+            "domain_expertise_relevant": self._identify_relevant_expertise(request),
+            "typical_goals_alignment": self._assess_goal_alignment(request),
+            "challenge_awareness": self._identify_relevant_challenges(request),
+            "individual_context_alignment": self._assess_individual_context_alignment(request),
+            "persona_preference_alignment": self._assess_persona_preference_alignment(request)
+        }
+    
+    def _build_keyword_matrices(self) -> Dict[str, Any]:
+        """Keyword vocabulary with keyword x item count matrices for the persona profile and support indicators"""
+        profile = self.cognitive_profile
+        groups = {
+            "expertise": [item.replace("_", " ").split() for item in profile.domain_expertise],
+            "goals": [item.replace("_", " ").split() for item in profile.typical_goals],
+            "challenges": [item.replace("_", " ").split() for item in profile.common_challenges],
+            "support": [[keyword] for _, _, keywords in SUPPORT_INDICATOR_KEYWORDS for keyword in keywords]
+        }
+        
+        vocabulary = {}
+        for items in groups.values():
+            for keywords in items:
+                for keyword in keywords:
+                    vocabulary.setdefault(keyword, len(vocabulary))
+        
+        matrices = {"vocabulary": list(vocabulary)}
+        for name, items in groups.items():
+            membership = np.zeros((len(vocabulary), len(items)), dtype=np.float64)
+            for column, keywords in enumerate(items):
+                for keyword in keywords:
+                    membership[vocabulary[keyword], column] += 1
+            matrices[name] = membership
+        
+        matrices["goal_lengths"] = np.array([len(keywords) for keywords in groups["goals"]], dtype=np.float64)
+        matrices["support_items"] = [
+            (indicator_type, keyword, weight)
+            for indicator_type, weight, keywords in SUPPORT_INDICATOR_KEYWORDS for keyword in keywords
+        ]
+        return matrices
+    
+    def _score_request_batch(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Score a batch of requests against the persona profile with array operations
+        
+        Keyword hits form a (requests x keywords) matrix; multiplying it by the keyword x item
+        membership matrices gives expertise, goal, challenge and support-indicator matches for
+        every request at once. Results match _score_request and _identify_support_indicators.
+        """
+        if self._keyword_matrices is None:
+            self._keyword_matrices = self._build_keyword_matrices()
+        matrices = self._keyword_matrices
+        profile = self.cognitive_profile
+        
+        request_texts = [str(request).lower() for request in requests]
+        hits = np.array([[keyword in text for keyword in matrices["vocabulary"]] for text in request_texts],
+                        dtype=np.float64).reshape(len(requests), len(matrices["vocabulary"]))
+        
+        expertise_matches = hits @ matrices["expertise"] > 0
+        challenge_matches = hits @ matrices["challenges"] > 0
+        support_matches = hits @ matrices["support"] > 0
+        
+        goal_count = len(profile.typical_goals)
+        if goal_count:
+            goal_alignment = np.minimum(1.0, (hits @ matrices["goals"] / matrices["goal_lengths"]).sum(axis=1)
+                                        / goal_count)
+        else:
+            goal_alignment = np.zeros(len(requests))
+        
+        # Longer requests are treated as complex and matched against the processing-depth preference
+        complex_request = np.array([len(text) for text in request_texts]) / 100 > 2.0
+        preference_alignment = np.where(
+            complex_request,
+            profile.cognitive_preferences.get("processing_depth", 0.5),
+            profile.cognitive_preferences.get("structured_approach", 0.5)
+        )
+        
+        batch_scores = []
+        for row, request in enumerate(requests):
+            batch_scores.append({
+                "domain_expertise_relevant": [profile.domain_expertise[i] for i in np.flatnonzero(expertise_matches[row])],
+                "typical_goals_alignment": float(goal_alignment[row]),
+                "challenge_awareness": [profile.common_challenges[i] for i in np.flatnonzero(challenge_matches[row])],
+                "individual_context_alignment": self._assess_individual_context_alignment(request),
+                "persona_preference_alignment": float(preference_alignment[row]),
+                "support_indicators": [
+                    {"type": indicator_type, "indicator": keyword, "weight": weight}
+                    for indicator_type, keyword, weight in
+                    (matrices["support_items"][i] for i in np.flatnonzero(support_matches[row]))
+                ]
+            })
+        
+        return batch_scores
+    
     def _identify_relevant_expertise(self, request: Dict[str, Any]) -> List[str]:
         """Identify which domain expertise is relevant to the request"""
         request_str = str(request).lower()
@@ -608,14 +798,16 @@ class PersonaCognitiveAgent:
         return next_steps
     
     async def _assess_proactive_support_needs(self, request: Dict[str, Any], 
-                                            response: Dict[str, Any]) -> Dict[str, Any]:
+                                            response: Dict[str, Any],
+                                            support_indicators: List[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Assess if proactive support is needed"""
         
         proactivity_threshold = self.optimization_parameters["proactivity_level"]
         intervention_threshold = self.optimization_parameters["support_intervention_threshold"]
         
-        # Analyze request for support indicators
-        support_indicators = await self._identify_support_indicators(request)
+        # Analyze request for support indicators (precomputed for batched requests)
+        if support_indicators is None:
+            support_indicators = await self._identify_support_indicators(request)
         
         # Calculate proactive support score
         support_score = sum(indicator.get("weight", 0.1) for indicator in support_indicators)
@@ -648,35 +840,14 @@ class PersonaCognitiveAgent:
         indicators = []
         request_str = str(request).lower()
         
-        # Emotional distress indicators
-        distress_keywords = ["stressed", "overwhelmed", "anxious", "confused", "lost", "frustrated"]
-        for keyword in distress_keywords:
-            if keyword in request_str:
-                indicators.append({
-                    "type": "emotional_distress",
-                    "indicator": keyword,
-                    "weight": 0.3
-                })
-        
-        # Academic struggle indicators
-        struggle_keywords = ["failing", "behind", "difficulty", "struggling", "can't understand"]
-        for keyword in struggle_keywords:
-            if keyword in request_str:
-                indicators.append({
-                    "type": "academic_struggle",
-                    "indicator": keyword,
-                    "weight": 0.4
-                })
-        
-        # Urgency indicators
-        urgency_keywords = ["urgent", "asap", "deadline", "emergency", "crisis"]
-        for keyword in urgency_keywords:
-            if keyword in request_str:
-                indicators.append({
-                    "type": "urgency",
-                    "indicator": keyword,
-                    "weight": 0.5
-                })
+        for indicator_type, weight, keywords in SUPPORT_INDICATOR_KEYWORDS:
+            for keyword in keywords:
+                if keyword in request_str:
+                    indicators.append({
+                        "type": indicator_type,
+                        "indicator": keyword,
+                        "weight": weight
+                    })
         
         return indicators
     
@@ -744,8 +915,8 @@ class PersonaCognitiveAgent:
             "outcome": "unknown"  # Would be updated based on feedback
         }
         
-        # Store in episodic memory for future reference
-        await self.memory_system.consolidate_episode(episode_data)
+        # Store in episodic memory for future reference (consolidated in the background)
+        await self.memory_system.schedule_consolidation(episode_data)
         
         # Update performance metrics
         self._update_performance_metrics(response)
@@ -774,6 +945,14 @@ class PersonaCognitiveAgent:
         metrics["average_personalization_score"] = ((n-1) * metrics["average_personalization_score"] + 
                                                    response_metrics.get("personalization_score", 0.7)) / n
     
+    async def shutdown(self):
+        """Stop background work, finishing batched requests and consolidating any queued episodes"""
+        if self.request_batcher:
+            await self.request_batcher.close()
+        # Learning and metacognition of answered requests may still be running and write to memory
+        await self.cognitive_engine.drain_deferred_phases()
+        await self.memory_system.stop_consolidation_scheduler()
+    
     async def get_agent_status(self) -> Dict[str, Any]:
         """Get comprehensive agent status"""
         cognitive_status = await self.cognitive_engine.get_cognitive_status()
@@ -792,6 +971,7 @@ class PersonaCognitiveAgent:
             "performance_metrics": self.performance_metrics,
             "active_sessions": len(self.active_sessions),
             "total_session_history": len(self.session_history),
+            "request_batching": self.request_batcher.get_metrics() if self.request_batcher else None,
             "optimization_parameters": self.optimization_parameters
         }
     
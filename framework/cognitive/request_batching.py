@@ -0,0 +1,110 @@
+"""
+CollegiumAI Cognitive Architecture - Request Micro-Batching
+Collects concurrent requests over a short window so they can be processed as one batch
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+
+class RequestBatcher:
+    """
+    Micro-batching front end for a batch processing coroutine
+    A batch is dispatched when max_batch_size requests are waiting or batch_window
+    seconds after its first request arrived, whichever comes first
+    """
+
+    def __init__(self, process_batch: Callable[[List[Any]], Awaitable[List[Any]]],
+                 max_batch_size: int = 32, batch_window: float = 0.005, name: str = "requests"):
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window
+        self.logger = logging.getLogger(f"RequestBatcher-{name}")
+
+        self.pending = []  # [(request, future)]
+        self.window_timer = None
+        self.inflight = set()
+
+        # Metrics
+        self.metrics = {
+            "requests": 0,
+            "batched_requests": 0,
+            "batches": 0,
+            "size_triggered": 0,
+            "window_triggered": 0,
+            "failed_batches": 0,
+            "largest_batch": 0,
+            "total_batch_time": 0.0
+        }
+
+    async def submit(self, request: Any) -> Any:
+        """Queue a request and wait for its result from the batch it lands in"""
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((request, future))
+        self.metrics["requests"] += 1
+
+        if len(self.pending) >= self.max_batch_size:
+            self.metrics["size_triggered"] += 1
+            self._dispatch()
+        elif self.window_timer is None:
+            self.window_timer = asyncio.get_running_loop().call_later(self.batch_window, self._window_expired)
+
+        return await future
+
+    def _window_expired(self):
+        """Dispatch whatever arrived during the batching window"""
+        self.window_timer = None
+        if self.pending:
+            self.metrics["window_triggered"] += 1
+            self._dispatch()
+
+    def _dispatch(self):
+        """Hand the pending requests to a batch processing task"""
+        if self.window_timer is not None:
+            self.window_timer.cancel()
+            self.window_timer = None
+
+        batch, self.pending = self.pending, []
+        task = asyncio.create_task(self._process(batch))
+        self.inflight.add(task)
+        task.add_done_callback(self.inflight.discard)
+
+    async def _process(self, batch):
+        """Process one batch and fan results back out to the waiting callers"""
+        start = time.perf_counter()
+        try:
+            results = await self.process_batch([request for request, _ in batch])
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        except Exception as e:
+            self.metrics["failed_batches"] += 1
+            self.logger.error(f"Batch of {len(batch)} requests failed: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            self.metrics["batches"] += 1
+            self.metrics["batched_requests"] += len(batch)
+            self.metrics["largest_batch"] = max(self.metrics["largest_batch"], len(batch))
+            self.metrics["total_batch_time"] += time.perf_counter() - start
+
+    async def close(self):
+        """Dispatch any waiting requests and wait for in-flight batches"""
+        if self.pending:
+            self._dispatch()
+        while self.inflight:
+            await asyncio.gather(*list(self.inflight), return_exceptions=True)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get batching metrics"""
+        batches = self.metrics["batches"]
+        return {
+            **self.metrics,
+            "pending": len(self.pending),
+            "inflight_batches": len(self.inflight),
+            "average_batch_size": self.metrics["batched_requests"] / batches if batches else 0.0,
+            "average_batch_time": self.metrics["total_batch_time"] / batches if batches else 0.0
+        }
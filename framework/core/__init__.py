@@ -3,13 +3,14 @@ CollegiumAI Framework Core
 AI Multi-Agent Collaborative Framework for Digital Universities
 """
 
-from typing import Dict, List, Any, Optional, Type, Union
+from typing import Dict, List, Any, AsyncIterator, Optional, Type, Union
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from enum import Enum
 import asyncio
 import logging
 import json
+import re
 from datetime import datetime
 import uuid
 
@@ -130,6 +131,33 @@ class AgentResponse:
     metadata: Dict[str, Any] = field(default_factory=dict)
     timestamp: datetime = field(default_factory=datetime.now)
 
+@dataclass
+class AgentEvent:
+    """
+    One step of an agent's response, emitted as soon as it is produced:
+    thought, action, compliance, token (a chunk of the final response),
+    error, and finally final, which carries the complete AgentResponse
+    """
+    event_type: str
+    data: Any = None
+    timestamp: datetime = field(default_factory=datetime.now)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form for streaming to clients"""
+        if self.event_type in ("thought", "action"):
+            data = asdict(self.data)
+        elif self.event_type == "final":
+            data = {
+                "response_id": self.data.response_id,
+                "agent_id": self.data.agent_id,
+                "final_response": self.data.final_response,
+                "confidence": self.data.confidence,
+                "compliance_check": self.data.compliance_check
+            }
+        else:
+            data = self.data
+        return {"type": self.event_type, "data": data, "timestamp": self.timestamp.isoformat()}
+
 @dataclass
 class BolognaProcessData:
     """Bologna Process specific data structures for European Higher Education Area"""
@@ -159,6 +187,10 @@ class UniversityContext:
     systems: Dict[str, Any] = field(default_factory=dict)
     bologna_data: Optional[BolognaProcessData] = None
 
+def _response_chunks(text: str) -> List[str]:
+    """Split a response into word chunks that concatenate back to the text"""
+    return [chunk for chunk in re.findall(r"\S*\s*", text) if chunk]
+
 class BaseAgent(ABC):
     """
     Base class for all university agents implementing ReACT framework
@@ -211,29 +243,54 @@ class BaseAgent(ABC):
         """
         Main processing method implementing the ReACT loop
         """
+        response = None
+        async for event in self.process_query_stream(query, context, collaborative):
+            if event.event_type == "final":
+                response = event.data
+        return response
+    
+    async def process_query_stream(
+        self, 
+        query: str, 
+        context: Dict[str, Any],
+        collaborative: bool = True
+    ) -> AsyncIterator[AgentEvent]:
+        """
+        ReACT loop that yields thoughts, actions and final response tokens as
+        each step completes; the last event is always final
+        """
         response = AgentResponse(agent_id=self.agent_id)
         
         try:
             # Step 1: Reasoning (Think)
             thoughts = await self.think(query, context)
             response.thoughts = thoughts
+            for thought in thoughts:
+                yield AgentEvent("thought", thought)
             
             # Step 2: Acting (Act)
             actions = await self.act(thoughts, context)
             response.actions = actions
+            for action in actions:
+                yield AgentEvent("action", action)
             
             # Step 3: Collaboration (if enabled)
             if collaborative and self.collaborators:
                 collaborative_thoughts = await self._collaborate(query, context, thoughts)
                 response.thoughts.extend(collaborative_thoughts)
+                for thought in collaborative_thoughts:
+                    yield AgentEvent("thought", thought)
             
             # Step 4: Governance Compliance Check
             compliance_check = await self._check_compliance(response)
             response.compliance_check = compliance_check
+            yield AgentEvent("compliance", compliance_check)
             
             # Step 5: Generate final response
             response.final_response = await self._generate_final_response(response)
             response.confidence = self._calculate_confidence(response)
+            for chunk in _response_chunks(response.final_response):
+                yield AgentEvent("token", chunk)
             
             # Step 6: Update memory
             await self._update_memory(query, context, response)
@@ -242,8 +299,9 @@ class BaseAgent(ABC):
             logger.error(f"Error processing query: {str(e)}")
             response.final_response = f"I encountered an error while processing your request: {str(e)}"
             response.confidence = 0.0
+            yield AgentEvent("error", str(e))
         
-        return response
+        yield AgentEvent("final", response)
     
     async def _collaborate(
         self, 
@@ -415,6 +473,26 @@ class BaseAgent(ABC):
         """Update agent's knowledge base"""
         self.knowledge_base.update(knowledge)
         logger.info(f"Updated knowledge base for {self.agent_id}")
+    
+    def _load_reference_tables(self) -> Dict[str, Any]:
+        """
+        Load the agent type's static reference data (catalogs, policies, ...)
+        Subclasses override this; the result is cached per class
+        """
+        return {}
+    
+    def _shared_reference_tables(self) -> Dict[str, Any]:
+        """
+        Reference tables shared by every instance of this agent class. They are
+        loaded once and must be treated as read-only; per-agent additions go
+        through update_knowledge_base, which only touches this instance's dict
+        """
+        cls = type(self)
+        tables = cls.__dict__.get("_reference_tables")
+        if tables is None:
+            tables = self._load_reference_tables()
+            cls._reference_tables = tables
+        return tables
 
 class AgentOrchestrator:
     """
@@ -616,5 +694,6 @@ __all__ = [
     'UniversityContext',
     'AgentResponse',
     'AgentAction',
-    'AgentThought'
+    'AgentThought',
+    'AgentEvent'
 ]
\ No newline at end of file
@@ -28,7 +28,7 @@ import uuid
 
 # Import advanced database components
 try:
-    from .service import DatabaseService, DatabaseConfig, get_database_service, close_database_service
+    from .service import DatabaseService, DatabaseConfig, StatementPipeline, get_database_service, close_database_service
     from .init import DatabaseInitializer, initialize_database
     POSTGRES_AVAILABLE = True
 except ImportError:
@@ -266,7 +266,7 @@ async def close_database_service():
 if POSTGRES_AVAILABLE:
     # Export PostgreSQL components
     __all__ = [
-        'DatabaseService', 'DatabaseConfig', 'get_database_service', 'close_database_service',
+        'DatabaseService', 'DatabaseConfig', 'StatementPipeline', 'get_database_service', 'close_database_service',
         'DatabaseInitializer', 'initialize_database', 'InMemoryDatabaseService'
     ]
 else:
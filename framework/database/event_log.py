@@ -0,0 +1,483 @@
+"""
+Event Log Pipeline
+==================
+
+Write-behind logging of agent interactions, system metrics and audit events.
+Request handlers hand an event to the pipeline without waiting on the
+database: events go into a bounded in-process queue, and a single flusher
+task writes them in batches, one COPY per table, once batch_size events are
+waiting or flush_interval seconds after the first event of a batch arrived.
+
+When PostgreSQL cannot be reached (or the queue is full) events are appended
+to a local JSON-lines spool file, if one is configured, and the spool is
+replayed into the database once it is reachable again. Spool writes are
+batched onto a worker thread so request handlers never wait on the disk, and
+the spool stops growing at max_spool_bytes. Events that cannot be spooled are
+dropped and counted. Rows the database refuses (a constraint or type error)
+are logged and counted as rejected without holding back the rest of their
+batch.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Columns written per table; the last column of every table is its timestamp,
+# taken when the event is logged rather than when it reaches the database
+EVENT_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "agent_interactions": (
+        "agent_id", "user_id", "session_id", "interaction_type", "query", "response",
+        "thoughts", "actions", "confidence", "processing_time", "context_data", "created_at"
+    ),
+    "system_metrics": (
+        "metric_name", "metric_value", "metric_category", "component", "metadata", "tags", "recorded_at"
+    ),
+    "audit_logs": (
+        "user_id", "action", "resource_type", "resource_id", "success", "old_values",
+        "new_values", "ip_address", "user_agent", "metadata", "created_at"
+    )
+}
+
+Event = Tuple[str, tuple]  # (table, record in EVENT_COLUMNS order)
+
+_STOP = object()  # Queued by close() behind the last event to flush
+
+def _connection_errors() -> Tuple[type, ...]:
+    """Errors meaning the database is unreachable, as opposed to refusing a row"""
+    errors = [OSError, asyncio.TimeoutError]
+    try:
+        import asyncpg
+        for name in ("PostgresConnectionError", "InterfaceError", "OperatorInterventionError"):
+            error = getattr(asyncpg, name, None) or getattr(asyncpg.exceptions, name, None)
+            if error is not None:
+                errors.append(error)
+    except ImportError:
+        pass
+    return tuple(errors)
+
+CONNECTION_ERRORS = _connection_errors()
+
+@dataclass
+class EventLogConfig:
+    """Event log pipeline configuration"""
+    max_queue_size: int = 10000  # Events held in memory; beyond this they go to the spool
+    batch_size: int = 500
+    flush_interval: float = 0.5  # Seconds the first event of a batch waits for more
+    spool_path: Optional[str] = None  # Spool for events the database cannot take; None drops them
+    max_spool_bytes: int = 64 * 1024 * 1024  # Events beyond this are dropped rather than spooled
+    replay_interval: float = 30.0  # Seconds between attempts to replay the spool
+
+class EventLogPipeline:
+    """Bounded write-behind queue of log events with batched database writes"""
+
+    def __init__(self, database: Any = None, config: Optional[EventLogConfig] = None):
+        # database needs copy_records(table, columns, records) and get_agent_uuids(agent_ids),
+        # as provided by DatabaseService; without one events are dropped, since a spool
+        # could never be replayed
+        self.database = database
+        self.config = config or EventLogConfig()
+        self.spool_path = os.path.expanduser(self.config.spool_path) if self.config.spool_path else None
+        self.last_error: Optional[str] = None
+
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, self.config.max_queue_size))
+        self._agent_uuids: Dict[str, Any] = {}
+        self._flusher: Optional[asyncio.Task] = None
+        self._replayer: Optional[asyncio.Task] = None
+        self._closed = False
+        self._spool_pending: List[Event] = []  # Waiting for the spool writer
+        self._spool_writer: Optional[asyncio.Future] = None
+        self._flush_times: Deque[float] = deque(maxlen=1024)
+
+        self.metrics = {
+            "enqueued": 0,
+            "written": 0,  # Rows stored in the database, including replayed ones
+            "batches": 0,
+            "spooled": 0,  # Events written to the spool file
+            "replayed": 0,  # Spooled events later stored in the database
+            "rejected": 0,  # Rows the database refused
+            "overflowed": 0,  # Events that found the queue full
+            "dropped": 0,  # Events neither stored nor spooled
+            "max_flush_time": 0.0
+        }
+
+    # Logging API (never waits; safe to call from request handlers)
+    def log_agent_interaction(
+        self,
+        agent_id: str,
+        user_id: Optional[str],
+        query: str,
+        response: str,
+        thoughts: List[Dict[str, Any]] = None,
+        actions: List[Dict[str, Any]] = None,
+        confidence: float = None,
+        processing_time: float = None,
+        context_data: Dict[str, Any] = None,
+        session_id: str = None
+    ) -> None:
+        """Queue an agent-user interaction"""
+        self._enqueue("agent_interactions", (
+            agent_id, user_id, session_id, "chat", query, response,
+            json.dumps(thoughts or [], default=str), json.dumps(actions or [], default=str),
+            confidence, processing_time, json.dumps(context_data or {}, default=str),
+            datetime.now(timezone.utc)
+        ))
+
+    def log_system_metric(
+        self,
+        metric_name: str,
+        metric_value: float,
+        metric_category: str = 'general',
+        component: str = None,
+        metadata: Dict[str, Any] = None,
+        tags: List[str] = None
+    ) -> None:
+        """Queue a system metric"""
+        self._enqueue("system_metrics", (
+            metric_name, metric_value, metric_category, component,
+            json.dumps(metadata or {}, default=str), tags or [], datetime.now(timezone.utc)
+        ))
+
+    def log_audit_event(
+        self,
+        user_id: str,
+        action: str,
+        resource_type: str,
+        resource_id: str = None,
+        success: bool = True,
+        old_values: Dict[str, Any] = None,
+        new_values: Dict[str, Any] = None,
+        ip_address: str = None,
+        user_agent: str = None,
+        metadata: Dict[str, Any] = None
+    ) -> None:
+        """Queue an audit event"""
+        self._enqueue("audit_logs", (
+            user_id, action, resource_type, resource_id, success,
+            json.dumps(old_values, default=str) if old_values else None,
+            json.dumps(new_values, default=str) if new_values else None,
+            ip_address, user_agent, json.dumps(metadata or {}, default=str), datetime.now(timezone.utc)
+        ))
+
+    def _enqueue(self, table: str, record: tuple) -> None:
+        self.metrics["enqueued"] += 1
+        if self.database is None:
+            self.metrics["dropped"] += 1
+            return
+        if self._closed:
+            self._spool([(table, record)])
+            return
+        try:
+            self._queue.put_nowait((table, record))
+        except asyncio.QueueFull:
+            self.metrics["overflowed"] += 1
+            self._spool([(table, record)])
+
+    # Lifecycle
+    async def start(self) -> None:
+        """Start the flusher, and replay anything spooled by an earlier run"""
+        if self._flusher is None:
+            self._flusher = asyncio.ensure_future(self._run())
+            self._replayer = asyncio.ensure_future(self._replay_periodically())
+            logger.info(f"Event log pipeline started (batch size {self.config.batch_size}, "
+                        f"flush interval {self.config.flush_interval}s)")
+
+    async def close(self) -> None:
+        """Flush every queued event; events logged afterwards go to the spool"""
+        if self._closed:
+            return
+        self._closed = True
+        if self._replayer is not None:
+            self._replayer.cancel()
+            await asyncio.gather(self._replayer, return_exceptions=True)
+        if self._flusher is not None:
+            await self._queue.put(_STOP)
+            await self._flusher
+        else:
+            batch = []
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            await self.flush(batch)
+        await self._drain_spool()
+        logger.info("Event log pipeline closed")
+
+    async def _run(self) -> None:
+        """Collect events into batches and write each batch when full or due"""
+        loop = asyncio.get_running_loop()
+        getter: Optional[asyncio.Future] = None
+        stopping = False
+        while not stopping:
+            batch: List[Event] = []
+            deadline = None
+            while len(batch) < self.config.batch_size:
+                if getter is None:
+                    if self._queue.empty():
+                        getter = asyncio.ensure_future(self._queue.get())
+                        continue
+                    event = self._queue.get_nowait()
+                else:
+                    timeout = None if deadline is None else max(0.0, deadline - loop.time())
+                    done, _ = await asyncio.wait({getter}, timeout=timeout)
+                    if not done:
+                        break
+                    event, getter = getter.result(), None
+                if event is _STOP:
+                    stopping = True
+                    break
+                batch.append(event)
+                if deadline is None:
+                    deadline = loop.time() + self.config.flush_interval
+            if batch:
+                await self.flush(batch)
+
+    # Writing
+    async def flush(self, events: List[Event]) -> None:
+        """Write events to the database, one COPY per table, spooling them if it is unreachable"""
+        if not events:
+            return
+        started = time.perf_counter()
+        try:
+            unwritten = await self._write(events)
+        except Exception as e:
+            # Keep the flusher alive; the events are handled as if the database were unreachable
+            self.last_error = f"{type(e).__name__}: {e}"
+            logger.error(f"Event log write of {len(events)} events failed: {e}")
+            unwritten = events
+        if unwritten:
+            self._spool(unwritten)
+        elapsed = time.perf_counter() - started
+        self.metrics["batches"] += 1
+        self.metrics["max_flush_time"] = max(self.metrics["max_flush_time"], elapsed)
+        self._flush_times.append(elapsed)
+
+    async def _write(self, events: List[Event]) -> List[Event]:
+        """Store events; returns those left unwritten because the database became unreachable"""
+        by_table: Dict[str, List[tuple]] = {}
+        for table, record in events:
+            by_table.setdefault(table, []).append(record)
+
+        pending = list(by_table.items())
+        try:
+            while pending:
+                table, records = pending[0]
+                if table == "agent_interactions":
+                    records = await self._resolve_agents(records)
+                await self._copy(table, records)
+                pending.pop(0)
+        except CONNECTION_ERRORS as e:
+            self.last_error = f"{type(e).__name__}: {e}"
+            logger.warning(f"Database unavailable, {sum(len(r) for _, r in pending)} events not written: {e}")
+            return [(table, record) for table, records in pending for record in records]
+        return []
+
+    async def _copy(self, table: str, records: List[tuple]) -> None:
+        if not records:
+            return
+        columns = list(EVENT_COLUMNS[table])
+        try:
+            self.metrics["written"] += await self.database.copy_records(table, columns, records)
+        except CONNECTION_ERRORS:
+            raise
+        except Exception as e:
+            if len(records) == 1:
+                self.metrics["rejected"] += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+                logger.error(f"Rejected {table} row: {e}")
+                return
+            # Find the offending rows without losing the rest of the batch
+            for record in records:
+                await self._copy(table, [record])
+
+    async def _resolve_agents(self, records: List[tuple]) -> List[tuple]:
+        """Replace agent identifiers with agent row ids, looking up unknown ones in one query"""
+        missing = {record[0] for record in records if record[0] not in self._agent_uuids}
+        if missing:
+            self._agent_uuids.update(await self.database.get_agent_uuids(sorted(missing)))
+
+        resolved = []
+        for record in records:
+            agent_uuid = self._agent_uuids.get(record[0])
+            if agent_uuid is None:
+                self.metrics["rejected"] += 1
+                logger.error(f"Rejected agent_interactions row: agent {record[0]} not found")
+                continue
+            resolved.append((agent_uuid,) + record[1:])
+        return resolved
+
+    # Spool
+    def _spool(self, events: List[Event]) -> None:
+        """Hand events to the spool writer without waiting for the disk"""
+        if self.spool_path is None:
+            self.metrics["dropped"] += len(events)
+            return
+        self._spool_pending.extend(events)
+        if self._spool_writer is None or self._spool_writer.done():
+            self._spool_writer = asyncio.ensure_future(self._write_spool_pending())
+
+    async def _write_spool_pending(self) -> None:
+        # Everything queued while the previous batch was being written goes out as the next one
+        while self._spool_pending:
+            events, self._spool_pending = self._spool_pending, []
+            await self._append_spool(events)
+
+    async def _drain_spool(self) -> None:
+        """Wait until every event handed to the spool writer is on disk"""
+        while self._spool_writer is not None and not self._spool_writer.done():
+            await self._spool_writer
+
+    async def _append_spool(self, events: List[Event], respool: bool = False) -> None:
+        try:
+            written = await asyncio.to_thread(self._write_spool, events)
+        except OSError as e:
+            written = 0
+            self.last_error = f"{type(e).__name__}: {e}"
+            logger.error(f"Could not write the event spool: {e}")
+        if not respool:
+            self.metrics["spooled"] += written
+        self.metrics["dropped"] += len(events) - written
+
+    def _write_spool(self, events: List[Event]) -> int:
+        """Append events to the spool file, one JSON object per line, up to max_spool_bytes; runs off the event loop"""
+        directory = os.path.dirname(self.spool_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        size = os.path.getsize(self.spool_path) if os.path.exists(self.spool_path) else 0
+        written = 0
+        with open(self.spool_path, "a+b") as spool:
+            # Start on a fresh line if a crash left the last append torn
+            if size:
+                spool.seek(size - 1)
+                if spool.read(1) != b"\n":
+                    spool.write(b"\n")
+                    size += 1
+            for table, record in events:
+                line = (json.dumps({"table": table, "record": record}, default=_encode) + "\n").encode("utf-8")
+                size += len(line)
+                if size > self.config.max_spool_bytes:
+                    logger.warning(f"Event spool is full, dropping {len(events) - written} events")
+                    break
+                spool.write(line)
+                written += 1
+            # One sync per batch rather than per event
+            spool.flush()
+            os.fsync(spool.fileno())
+        return written
+
+    async def replay_spool(self) -> int:
+        """Move spooled events into the database; returns how many were stored"""
+        if self.database is None or self.spool_path is None:
+            return 0
+        # Events still on their way to the spool are replayed with the rest
+        await self._drain_spool()
+        # A replay file left by a run that stopped mid-replay is finished first
+        replay_path = self.spool_path + ".replay"
+        if not os.path.exists(replay_path):
+            if not os.path.exists(self.spool_path):
+                return 0
+            os.replace(self.spool_path, replay_path)
+
+        events, skipped = await asyncio.to_thread(_read_spool, replay_path)
+        self.metrics["dropped"] += skipped
+        replayed = 0
+        remaining: List[Event] = []
+        try:
+            for i in range(0, len(events), self.config.batch_size):
+                batch = events[i:i + self.config.batch_size]
+                unwritten = await self._write(batch)
+                if unwritten:
+                    # Unreachable again; keep what is left for the next attempt
+                    remaining = unwritten + events[i + len(batch):]
+                    break
+                replayed += len(batch)
+        except BaseException:
+            # Cancelled (or failed) mid-replay: put back what was not stored before giving up
+            self._write_spool(events[replayed:])
+            os.remove(replay_path)
+            raise
+        if remaining:
+            await self._append_spool(remaining, respool=True)
+        os.remove(replay_path)
+
+        self.metrics["replayed"] += replayed
+        if replayed:
+            logger.info(f"Replayed {replayed} spooled events")
+        return replayed
+
+    async def _replay_periodically(self) -> None:
+        while True:
+            try:
+                await self.replay_spool()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                logger.error(f"Spool replay failed: {e}")
+            await asyncio.sleep(self.config.replay_interval)
+
+    # Status
+    def _spool_bytes(self) -> int:
+        total = 0
+        if self.spool_path is None:
+            return total
+        for path in (self.spool_path, self.spool_path + ".replay"):
+            if os.path.exists(path):
+                total += os.path.getsize(path)
+        return total
+
+    def get_metrics(self) -> Dict[str, Any]:
+        flush_times = sorted(self._flush_times)
+        return {
+            **self.metrics,
+            "average_flush_time": sum(flush_times) / len(flush_times) if flush_times else 0.0,
+            "p99_flush_time": flush_times[min(len(flush_times) - 1, int(len(flush_times) * 0.99))] if flush_times else 0.0
+        }
+
+    def get_status(self) -> Dict[str, Any]:
+        """Queue depth, spool backlog and write metrics"""
+        spool_bytes = self._spool_bytes()
+        if self.database is None:
+            state = "disabled"
+        elif spool_bytes or self._spool_pending:
+            state = "spooling"
+        else:
+            state = "operational"
+        return {
+            "state": state,
+            "queue_depth": self._queue.qsize(),
+            "spool_bytes": spool_bytes,
+            "last_error": self.last_error,
+            **self.get_metrics()
+        }
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+def _read_spool(path: str) -> Tuple[List[Event], int]:
+    """Spooled events, and how many lines could not be read (a line torn by a crash mid-append)"""
+    events, skipped = [], 0
+    with open(path, encoding="utf-8", errors="replace") as spool:
+        for line in spool:
+            if not line.strip():
+                continue
+            try:
+                events.append(_decode(line))
+            except (ValueError, KeyError, TypeError, IndexError):
+                skipped += 1
+                logger.warning(f"Skipping unreadable event spool line in {path}")
+    return events, skipped
+
+def _decode(line: str) -> Event:
+    entry = json.loads(line)
+    record = entry["record"]
+    # Restore the timestamp column (always last)
+    record[-1] = datetime.fromisoformat(record[-1])
+    return entry["table"], tuple(record)
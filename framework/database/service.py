@@ -9,15 +9,102 @@ for the CollegiumAI platform with PostgreSQL backend.
 import os
 import asyncio
 import logging
-from typing import Dict, List, Any, Optional, Union, Tuple
+import time
+from collections import deque
+from typing import Dict, List, Any, Optional, Union, Tuple, Deque, Set
 from datetime import datetime, timezone, timedelta
 from contextlib import asynccontextmanager
 import asyncpg
 import json
 from urllib.parse import urlparse
+from uuid import uuid4
 
 logger = logging.getLogger(__name__)
 
+# Named statements, prepared once per pooled connection on first use and
+# reused for every later call on that connection
+STATEMENTS: Dict[str, str] = {
+    'user_by_email': """
+        SELECT u.*, i.name as institution_name, d.name as department_name
+        FROM users u
+        LEFT JOIN institutions i ON u.institution_id = i.id
+        LEFT JOIN departments d ON u.department_id = d.id
+        WHERE u.email = $1 AND u.is_active = true
+    """,
+    'user_by_id': """
+        SELECT u.*, i.name as institution_name, d.name as department_name
+        FROM users u
+        LEFT JOIN institutions i ON u.institution_id = i.id
+        LEFT JOIN departments d ON u.department_id = d.id
+        WHERE u.id = $1 AND u.is_active = true
+    """,
+    'user_permissions': """
+        SELECT DISTINCT p.name
+        FROM permissions p
+        WHERE p.id IN (
+            -- Direct permissions
+            SELECT permission_id FROM user_permissions WHERE user_id = $1
+            UNION
+            -- Role-based permissions
+            SELECT rp.permission_id 
+            FROM role_permissions rp
+            JOIN user_roles ur ON rp.role_id = ur.role_id
+            WHERE ur.user_id = $1
+        )
+    """,
+    'active_session': """
+        SELECT s.*, u.username, u.email, u.persona_type
+        FROM user_sessions s
+        JOIN users u ON s.user_id = u.id
+        WHERE s.session_id = $1 AND s.is_active = true AND s.expires_at > $2
+    """,
+    'agent_uuid': "SELECT id FROM agents WHERE agent_id = $1",
+    # One statement per combination of optional filters, so each gets a plan
+    # specific to the columns it filters on
+    'cognitive_memories': """
+        SELECT * FROM cognitive_memories
+        WHERE persona_id = $1 AND importance_score >= $2
+            AND (retention_until IS NULL OR retention_until > NOW())
+        ORDER BY importance_score DESC, created_at DESC
+        LIMIT $3
+    """,
+    'cognitive_memories_by_type': """
+        SELECT * FROM cognitive_memories
+        WHERE persona_id = $1 AND importance_score >= $2 AND memory_type = $3
+            AND (retention_until IS NULL OR retention_until > NOW())
+        ORDER BY importance_score DESC, created_at DESC
+        LIMIT $4
+    """,
+    'system_metrics': """
+        SELECT * FROM system_metrics
+        WHERE recorded_at >= $1
+        ORDER BY recorded_at DESC
+    """,
+    'system_metrics_by_name': """
+        SELECT * FROM system_metrics
+        WHERE recorded_at >= $1 AND metric_name = $2
+        ORDER BY recorded_at DESC
+    """,
+    'system_metrics_by_category': """
+        SELECT * FROM system_metrics
+        WHERE recorded_at >= $1 AND metric_category = $2
+        ORDER BY recorded_at DESC
+    """,
+    'system_metrics_by_name_and_category': """
+        SELECT * FROM system_metrics
+        WHERE recorded_at >= $1 AND metric_name = $2 AND metric_category = $3
+        ORDER BY recorded_at DESC
+    """
+}
+
+# Raised when a prepared statement no longer matches the schema or session
+_STALE_STATEMENT_ERRORS = (
+    asyncpg.exceptions.InvalidCachedStatementError,
+    asyncpg.exceptions.InvalidSQLStatementNameError
+)
+
+_EXPLAINABLE = ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE')
+
 class DatabaseConfig:
     """Database configuration settings"""
     
@@ -31,6 +118,7 @@ class DatabaseConfig:
         self.max_pool_size = int(os.getenv('DB_MAX_POOL_SIZE', '20'))
         self.command_timeout = int(os.getenv('DB_COMMAND_TIMEOUT', '60'))
         self.pool_recycle = int(os.getenv('DB_POOL_RECYCLE', '3600'))  # 1 hour
+        self.slow_query_ms = float(os.getenv('DB_SLOW_QUERY_MS', '500'))  # Queries this slow are EXPLAINed
         
         # Parse database URL for components
         parsed = urlparse(self.database_url)
@@ -53,6 +141,98 @@ class DatabaseConfig:
             'max_size': self.max_pool_size,
         }
 
+class StatementConnection(asyncpg.Connection):
+    """Pooled connection that keeps the named statements prepared on it"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.named_statements: Dict[str, Any] = {}
+
+class QueryStats:
+    """Per-query call counts, latency and rows, plus a log of slow queries"""
+    
+    def __init__(self, slow_query_ms: float, samples: int = 1024, slow_log_size: int = 50,
+                 explain_interval: float = 300.0):
+        self.slow_query_seconds = slow_query_ms / 1000
+        self.samples = samples
+        self.explain_interval = explain_interval  # Seconds before the same query is EXPLAINed again
+        self.queries: Dict[str, Dict[str, Any]] = {}
+        self.slow_queries: Deque[Dict[str, Any]] = deque(maxlen=slow_log_size)
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._explained_at: Dict[str, float] = {}
+    
+    def record(self, query: str, elapsed: float, rows: int) -> bool:
+        """Record one execution; returns True if it was slow"""
+        stats = self.queries.get(query)
+        if stats is None:
+            stats = self.queries[query] = {'count': 0, 'total_time': 0.0, 'max_time': 0.0, 'rows': 0, 'slow': 0}
+            self._latencies[query] = deque(maxlen=self.samples)
+        stats['count'] += 1
+        stats['total_time'] += elapsed
+        stats['max_time'] = max(stats['max_time'], elapsed)
+        stats['rows'] += rows
+        self._latencies[query].append(elapsed)
+        
+        slow = elapsed >= self.slow_query_seconds
+        if slow:
+            stats['slow'] += 1
+        return slow
+    
+    def should_explain(self, query: str, sql: str) -> bool:
+        """Whether a slow query is worth an EXPLAIN now"""
+        if not sql.lstrip().upper().startswith(_EXPLAINABLE):
+            return False
+        now = time.monotonic()
+        last = self._explained_at.get(query)
+        if last is not None and now - last < self.explain_interval:
+            return False
+        self._explained_at[query] = now
+        return True
+    
+    def summary(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """The queries with the most total time, slowest first"""
+        ranked = sorted(self.queries.items(), key=lambda item: item[1]['total_time'], reverse=True)
+        summary = []
+        for query, stats in ranked[:limit]:
+            latencies = sorted(self._latencies[query])
+            summary.append({
+                'query': query,
+                'count': stats['count'],
+                'rows': stats['rows'],
+                'slow': stats['slow'],
+                'total_time_ms': stats['total_time'] * 1000,
+                'average_time_ms': stats['total_time'] / stats['count'] * 1000,
+                'p95_time_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000,
+                'max_time_ms': stats['max_time'] * 1000
+            })
+        return summary
+
+def _status_rows(status: str) -> int:
+    """Rows affected according to a command status such as 'INSERT 0 5'"""
+    count = status.rsplit(' ', 1)[-1] if status else ''
+    return int(count) if count.isdigit() else 0
+
+class StatementPipeline:
+    """
+    Statements queued by DatabaseService.pipeline() and sent together on one
+    connection when the block exits. Consecutive runs of the same statement
+    are sent with executemany, which streams every argument set to the server
+    without waiting for each result.
+    """
+    
+    def __init__(self):
+        self.statements: List[Tuple[str, List[tuple]]] = []
+    
+    def execute(self, query: str, *args):
+        """Queue a statement; results are not returned"""
+        if self.statements and self.statements[-1][0] == query:
+            self.statements[-1][1].append(args)
+        else:
+            self.statements.append((query, [args]))
+    
+    def __len__(self) -> int:
+        return sum(len(arg_sets) for _, arg_sets in self.statements)
+
 class DatabaseService:
     """
     Advanced database service providing high-level operations
@@ -63,12 +243,18 @@ class DatabaseService:
         self.config = config or DatabaseConfig()
         self.pool: Optional[asyncpg.Pool] = None
         self._initialized = False
+        self._init_lock = asyncio.Lock()
+        self.query_stats = QueryStats(self.config.slow_query_ms)
+        self._explain_tasks: Set[asyncio.Task] = set()
         
     async def initialize(self) -> bool:
         """Initialize database connection pool"""
         try:
             logger.info("Initializing database connection pool...")
-            self.pool = await asyncpg.create_pool(**self.config.get_connection_params())
+            self.pool = await asyncpg.create_pool(
+                **self.config.get_connection_params(),
+                connection_class=StatementConnection
+            )
             
             # Test connection
             async with self.pool.acquire() as conn:
@@ -80,8 +266,20 @@ class DatabaseService:
             
         except Exception as e:
             logger.error(f"Failed to initialize database pool: {e}")
+            if self.pool is not None:
+                # Do not leak a pool whose test connection failed; the next call retries
+                self.pool.terminate()
+                self.pool = None
             return False
     
+    async def _ensure_initialized(self):
+        """Create the pool on first use; raises ConnectionError while the database is unreachable"""
+        if self._initialized:
+            return
+        async with self._init_lock:
+            if not self._initialized and not await self.initialize():
+                raise ConnectionError("Database service not available")
+    
     async def close(self):
         """Close database connection pool"""
         if self.pool:
@@ -92,34 +290,171 @@ class DatabaseService:
     @asynccontextmanager
     async def transaction(self):
         """Database transaction context manager"""
-        if not self._initialized:
-            raise RuntimeError("Database service not initialized")
-            
+        await self._ensure_initialized()
+        
         async with self.pool.acquire() as conn:
             async with conn.transaction():
                 yield conn
     
     async def execute(self, query: str, *args) -> str:
         """Execute a query and return status"""
-        async with self.pool.acquire() as conn:
-            return await conn.execute(query, *args)
+        return await self._run(" ".join(query.split()), query, args, lambda conn: conn.execute(query, *args))
     
     async def fetch(self, query: str, *args) -> List[Dict[str, Any]]:
         """Fetch multiple rows as dictionaries"""
-        async with self.pool.acquire() as conn:
-            rows = await conn.fetch(query, *args)
-            return [dict(row) for row in rows]
+        rows = await self._run(" ".join(query.split()), query, args, lambda conn: conn.fetch(query, *args))
+        return [dict(row) for row in rows]
     
     async def fetchrow(self, query: str, *args) -> Optional[Dict[str, Any]]:
         """Fetch single row as dictionary"""
-        async with self.pool.acquire() as conn:
-            row = await conn.fetchrow(query, *args)
-            return dict(row) if row else None
+        row = await self._run(" ".join(query.split()), query, args, lambda conn: conn.fetchrow(query, *args))
+        return dict(row) if row else None
     
     async def fetchval(self, query: str, *args) -> Any:
         """Fetch single value"""
+        return await self._run(" ".join(query.split()), query, args, lambda conn: conn.fetchval(query, *args))
+    
+    # Named statements
+    @staticmethod
+    def register_statement(name: str, query: str):
+        """Add a named statement for fetch_named and the other *_named methods"""
+        if STATEMENTS.get(name, query) != query:
+            raise ValueError(f"Statement {name} is already registered with different SQL")
+        STATEMENTS[name] = query
+    
+    async def execute_named(self, name: str, *args) -> str:
+        """Execute a registered statement and return status"""
+        return await self._run_named(name, args, 'execute')
+    
+    async def fetch_named(self, name: str, *args) -> List[Dict[str, Any]]:
+        """Fetch multiple rows with a registered statement"""
+        rows = await self._run_named(name, args, 'fetch')
+        return [dict(row) for row in rows]
+    
+    async def fetchrow_named(self, name: str, *args) -> Optional[Dict[str, Any]]:
+        """Fetch single row with a registered statement"""
+        row = await self._run_named(name, args, 'fetchrow')
+        return dict(row) if row else None
+    
+    async def fetchval_named(self, name: str, *args) -> Any:
+        """Fetch single value with a registered statement"""
+        return await self._run_named(name, args, 'fetchval')
+    
+    async def _run_named(self, name: str, args: tuple, method: str) -> Any:
+        if name not in STATEMENTS:
+            raise KeyError(f"Unknown statement: {name}")
+        
+        async def run(conn):
+            try:
+                return await self._call_prepared(conn, name, args, method)
+            except _STALE_STATEMENT_ERRORS:
+                # The schema changed under the statement; prepare it again
+                conn.named_statements.pop(name, None)
+                return await self._call_prepared(conn, name, args, method)
+        
+        return await self._run(name, STATEMENTS[name], args, run)
+    
+    async def _call_prepared(self, conn, name: str, args: tuple, method: str) -> Any:
+        statement = conn.named_statements.get(name)
+        if statement is None:
+            statement = conn.named_statements[name] = await conn.prepare(STATEMENTS[name])
+        if method == 'execute':
+            await statement.fetch(*args)
+            return statement.get_statusmsg()
+        return await getattr(statement, method)(*args)
+    
+    # Instrumentation
+    async def _run(self, key: str, query: str, args: tuple, run) -> Any:
+        """Run a statement on a pooled connection, recording its latency and rows under key"""
+        await self._ensure_initialized()
+        start = time.perf_counter()
         async with self.pool.acquire() as conn:
-            return await conn.fetchval(query, *args)
+            result = await run(conn)
+        elapsed = time.perf_counter() - start
+        
+        if isinstance(result, str):
+            rows = _status_rows(result)
+        elif isinstance(result, list):
+            rows = len(result)
+        else:
+            rows = 0 if result is None else 1
+        if self.query_stats.record(key, elapsed, rows):
+            self._log_slow_query(key, query, args, elapsed)
+        return result
+    
+    def _log_slow_query(self, key: str, query: str, args: tuple, elapsed: float):
+        logger.warning(f"Slow query ({elapsed * 1000:.0f} ms): {key}")
+        entry = {
+            'query': key,
+            'duration_ms': elapsed * 1000,
+            'timestamp': datetime.utcnow().isoformat(),
+            'plan': None
+        }
+        self.query_stats.slow_queries.append(entry)
+        
+        if self.query_stats.should_explain(key, query):
+            # EXPLAIN on another connection so the caller is not held up
+            task = asyncio.ensure_future(self._explain(entry, query, args))
+            self._explain_tasks.add(task)
+            task.add_done_callback(self._explain_tasks.discard)
+    
+    async def _explain(self, entry: Dict[str, Any], query: str, args: tuple):
+        try:
+            async with self.pool.acquire() as conn:
+                rows = await conn.fetch(f"EXPLAIN {query}", *args)
+            entry['plan'] = "\n".join(row[0] for row in rows)
+            logger.warning(f"Plan for slow query {entry['query']}:\n{entry['plan']}")
+        except Exception as e:
+            entry['plan_error'] = str(e)
+            logger.error(f"Could not EXPLAIN slow query {entry['query']}: {e}")
+    
+    def get_query_stats(self, limit: int = 20) -> Dict[str, Any]:
+        """Per-query statistics and the most recent slow queries"""
+        return {
+            'slow_query_ms': self.config.slow_query_ms,
+            'queries': self.query_stats.summary(limit),
+            'slow_queries': list(self.query_stats.slow_queries)
+        }
+
+    @asynccontextmanager
+    async def pipeline(self, transactional: bool = True):
+        """
+        Queue statements and run them all on one pooled connection, inside one
+        transaction unless transactional is False. Nothing is sent if the
+        block raises.
+        """
+        await self._ensure_initialized()
+        
+        statements = StatementPipeline()
+        yield statements
+        
+        async with self.pool.acquire() as conn:
+            if transactional:
+                async with conn.transaction():
+                    await self._run_pipeline(conn, statements)
+            else:
+                await self._run_pipeline(conn, statements)
+    
+    async def _run_pipeline(self, conn, statements: StatementPipeline):
+        for query, arg_sets in statements.statements:
+            start = time.perf_counter()
+            if len(arg_sets) == 1:
+                await conn.execute(query, *arg_sets[0])
+            else:
+                await conn.executemany(query, arg_sets)
+            self.query_stats.record(" ".join(query.split()), time.perf_counter() - start, len(arg_sets))
+
+    async def copy_records(self, table: str, columns: List[str], records: List[Tuple]) -> int:
+        """Write rows with one COPY inside a transaction and return the row count"""
+        if not records:
+            return 0
+        await self._ensure_initialized()
+        
+        start = time.perf_counter()
+        async with self.transaction() as conn:
+            await conn.copy_records_to_table(table, records=records, columns=columns)
+        self.query_stats.record(f"COPY {table}", time.perf_counter() - start, len(records))
+        return len(records)
 
     # User Management Methods
     async def create_user(
@@ -153,25 +488,11 @@ class DatabaseService:
     
     async def get_user_by_email(self, email: str) -> Optional[Dict[str, Any]]:
         """Get user by email address"""
-        query = """
-            SELECT u.*, i.name as institution_name, d.name as department_name
-            FROM users u
-            LEFT JOIN institutions i ON u.institution_id = i.id
-            LEFT JOIN departments d ON u.department_id = d.id
-            WHERE u.email = $1 AND u.is_active = true
-        """
-        return await self.fetchrow(query, email)
+        return await self.fetchrow_named('user_by_email', email)
     
     async def get_user_by_id(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Get user by ID"""
-        query = """
-            SELECT u.*, i.name as institution_name, d.name as department_name
-            FROM users u
-            LEFT JOIN institutions i ON u.institution_id = i.id
-            LEFT JOIN departments d ON u.department_id = d.id
-            WHERE u.id = $1 AND u.is_active = true
-        """
-        return await self.fetchrow(query, user_id)
+        return await self.fetchrow_named('user_by_id', user_id)
     
     async def update_user_login(self, user_id: str, ip_address: str = None):
         """Update user's last login timestamp"""
@@ -180,21 +501,7 @@ class DatabaseService:
     
     async def get_user_permissions(self, user_id: str) -> List[str]:
         """Get user's permissions (both direct and via roles)"""
-        query = """
-            SELECT DISTINCT p.name
-            FROM permissions p
-            WHERE p.id IN (
-                -- Direct permissions
-                SELECT permission_id FROM user_permissions WHERE user_id = $1
-                UNION
-                -- Role-based permissions
-                SELECT rp.permission_id 
-                FROM role_permissions rp
-                JOIN user_roles ur ON rp.role_id = ur.role_id
-                WHERE ur.user_id = $1
-            )
-        """
-        rows = await self.fetch(query, user_id)
+        rows = await self.fetch_named('user_permissions', user_id)
         return [row['name'] for row in rows]
 
     # Session Management
@@ -225,13 +532,7 @@ class DatabaseService:
     
     async def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
         """Get session by session ID"""
-        query = """
-            SELECT s.*, u.username, u.email, u.persona_type
-            FROM user_sessions s
-            JOIN users u ON s.user_id = u.id
-            WHERE s.session_id = $1 AND s.is_active = true AND s.expires_at > $2
-        """
-        return await self.fetchrow(query, session_id, datetime.utcnow())
+        return await self.fetchrow_named('active_session', session_id, datetime.utcnow())
     
     async def update_session(self, session_id: str, session_data: Dict[str, Any]):
         """Update session data"""
@@ -283,6 +584,40 @@ class DatabaseService:
         )
         return str(cred_uuid)
     
+    async def store_credentials_bulk(self, credentials: List[Dict[str, Any]]) -> List[str]:
+        """
+        Store many blockchain credentials with one COPY in one transaction.
+        Each item holds the arguments of store_credential; ids are returned
+        in input order.
+        """
+        columns = [
+            'id', 'credential_id', 'transaction_hash', 'student_id', 'institution_id',
+            'title', 'program', 'degree_level', 'grade', 'issuer_address',
+            'issue_date', 'completion_date', 'credits', 'ipfs_hash',
+            'document_urls', 'bologna_data', 'metadata'
+        ]
+        ids = [uuid4() for _ in credentials]
+        records = []
+        for cred_uuid, credential in zip(ids, credentials):
+            credential_data = credential['credential_data']
+            records.append((
+                cred_uuid, credential['credential_id'], credential['transaction_hash'],
+                credential['student_id'], credential['institution_id'],
+                credential_data['title'], credential_data['program'],
+                credential_data['degree_level'], credential_data.get('grade'),
+                credential_data['issuer_address'],
+                credential_data.get('issue_date', datetime.now(timezone.utc)),
+                credential_data.get('completion_date'),
+                credential_data.get('credits'),
+                credential_data.get('ipfs_hash'),
+                json.dumps(credential_data.get('document_urls', [])),
+                json.dumps(credential_data.get('bologna_data', {})),
+                json.dumps(credential_data.get('metadata', {}))
+            ))
+        
+        await self.copy_records('blockchain_credentials', columns, records)
+        return [str(cred_uuid) for cred_uuid in ids]
+    
     async def get_user_credentials(self, user_id: str) -> List[Dict[str, Any]]:
         """Get all credentials for a user"""
         query = """
@@ -365,9 +700,7 @@ class DatabaseService:
     ) -> str:
         """Log a new agent task"""
         # Get agent UUID
-        agent_uuid = await self.fetchval(
-            "SELECT id FROM agents WHERE agent_id = $1", agent_id
-        )
+        agent_uuid = await self.fetchval_named('agent_uuid', agent_id)
         
         if not agent_uuid:
             raise ValueError(f"Agent {agent_id} not found")
@@ -407,6 +740,13 @@ class DatabaseService:
             processing_time, confidence_score, error_message, task_id
         )
     
+    async def get_agent_uuids(self, agent_ids: List[str]) -> Dict[str, Any]:
+        """Map agent identifiers to their row ids with one query"""
+        rows = await self.fetch(
+            "SELECT agent_id, id FROM agents WHERE agent_id = ANY($1::text[])", list(agent_ids)
+        )
+        return {row['agent_id']: row['id'] for row in rows}
+    
     async def log_agent_interaction(
         self,
         agent_id: str,
@@ -422,9 +762,7 @@ class DatabaseService:
     ) -> str:
         """Log agent-user interaction"""
         # Get agent UUID
-        agent_uuid = await self.fetchval(
-            "SELECT id FROM agents WHERE agent_id = $1", agent_id
-        )
+        agent_uuid = await self.fetchval_named('agent_uuid', agent_id)
         
         if not agent_uuid:
             raise ValueError(f"Agent {agent_id} not found")
@@ -474,6 +812,31 @@ class DatabaseService:
         )
         return str(memory_id)
     
+    async def store_memories_bulk(self, memories: List[Dict[str, Any]]) -> List[str]:
+        """
+        Store many cognitive memories with one COPY in one transaction. Each
+        item holds the arguments of store_memory; ids are returned in input
+        order.
+        """
+        columns = [
+            'id', 'persona_id', 'memory_type', 'content', 'importance_score',
+            'confidence', 'context_tags', 'retention_until'
+        ]
+        now = datetime.now(timezone.utc)
+        ids = [uuid4() for _ in memories]
+        records = []
+        for memory_id, memory in zip(ids, memories):
+            retention_hours = memory.get('retention_hours')
+            records.append((
+                memory_id, memory['persona_id'], memory['memory_type'],
+                json.dumps(memory['content']), memory.get('importance_score', 0.0),
+                memory.get('confidence', 1.0), memory.get('context_tags') or [],
+                now + timedelta(hours=retention_hours) if retention_hours else None
+            ))
+        
+        await self.copy_records('cognitive_memories', columns, records)
+        return [str(memory_id) for memory_id in ids]
+    
     async def retrieve_memories(
         self,
         persona_id: str,
@@ -482,23 +845,11 @@ class DatabaseService:
         min_importance: float = 0.0
     ) -> List[Dict[str, Any]]:
         """Retrieve cognitive memories"""
-        conditions = ["persona_id = $1", "importance_score >= $2"]
-        params = [persona_id, min_importance]
-        
         if memory_type:
-            conditions.append("memory_type = $3")
-            params.append(memory_type)
-        
-        query = f"""
-            SELECT * FROM cognitive_memories
-            WHERE {' AND '.join(conditions)}
-                AND (retention_until IS NULL OR retention_until > NOW())
-            ORDER BY importance_score DESC, created_at DESC
-            LIMIT ${len(params) + 1}
-        """
-        params.append(limit)
-        
-        return await self.fetch(query, *params)
+            return await self.fetch_named(
+                'cognitive_memories_by_type', persona_id, min_importance, memory_type, limit
+            )
+        return await self.fetch_named('cognitive_memories', persona_id, min_importance, limit)
     
     async def log_learning_event(
         self,
@@ -522,6 +873,26 @@ class DatabaseService:
         )
         return str(learning_id)
 
+    async def log_learning_events_bulk(self, events: List[Dict[str, Any]]) -> List[str]:
+        """
+        Log many cognitive learning events with one COPY in one transaction.
+        Each item holds the arguments of log_learning_event; ids are returned
+        in input order.
+        """
+        columns = ['id', 'persona_id', 'learning_type', 'input_data', 'output_data', 'improvement_score']
+        ids = [uuid4() for _ in events]
+        records = [
+            (
+                learning_id, event['persona_id'], event['learning_type'],
+                json.dumps(event['input_data']), json.dumps(event['output_data']),
+                event.get('improvement_score')
+            )
+            for learning_id, event in zip(ids, events)
+        ]
+        
+        await self.copy_records('cognitive_learning', columns, records)
+        return [str(learning_id) for learning_id in ids]
+
     # Bologna Process Support
     async def store_bologna_compliance(
         self,
@@ -581,24 +952,15 @@ class DatabaseService:
         hours_back: int = 24
     ) -> List[Dict[str, Any]]:
         """Get system metrics"""
-        conditions = ["recorded_at >= $1"]
-        params = [datetime.utcnow() - timedelta(hours=hours_back)]
-        
+        name = 'system_metrics'
+        args = [datetime.utcnow() - timedelta(hours=hours_back)]
         if metric_name:
-            conditions.append("metric_name = $2")
-            params.append(metric_name)
-        
+            name += '_by_name'
+            args.append(metric_name)
         if category:
-            conditions.append("metric_category = $" + str(len(params) + 1))
-            params.append(category)
-        
-        query = f"""
-            SELECT * FROM system_metrics
-            WHERE {' AND '.join(conditions)}
-            ORDER BY recorded_at DESC
-        """
-        
-        return await self.fetch(query, *params)
+            name += '_and_category' if metric_name else '_by_category'
+            args.append(category)
+        return await self.fetch_named(name, *args)
     
     async def log_audit_event(
         self,
@@ -655,6 +1017,7 @@ class DatabaseService:
                 'response_time_ms': response_time * 1000,
                 'pool_stats': pool_stats,
                 'recent_errors': recent_errors,
+                'query_stats': self.get_query_stats(),
                 'timestamp': datetime.utcnow().isoformat()
             }
             
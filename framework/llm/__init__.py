@@ -9,9 +9,14 @@ routing, load balancing, and cost optimization.
 Key Features:
 - Multiple LLM provider support (OpenAI, Anthropic, Ollama, etc.)
 - Intelligent model selection and routing
-- Load balancing and fallback mechanisms
+- Latency-aware load balancing with per-provider concurrency limits
+- Fallback mechanisms, circuit breakers and hedged requests
 - Cost optimization and usage tracking
 - Rate limiting and quota management
+- Exact and near-duplicate response caching
+- Pooled keep-alive HTTP transport for local model servers
+- Coalescing of identical in-flight requests
+- Resumable batch completions with bounded parallelism
 - Local model support via Ollama
 - Streaming completions
 - Function calling capabilities
@@ -74,35 +79,79 @@ Provider Configuration:
     ```
 """
 
-from .providers import (
-    BaseLLMProvider,
-    OpenAIProvider,
-    AnthropicProvider,
-    OllamaProvider,
-    LLMProvider,
-    ModelCapability,
-    ModelInfo,
-    LLMMessage,
-    LLMRequest,
-    LLMResponse
-)
+import importlib
 
-from .manager import (
-    LLMManager,
-    ProviderConfig,
-    ModelSelection,
-    UsageStats
-)
+# Public names and the submodule defining each. Submodules are imported on first
+# access, so importing a light module such as framework.llm.transport does not
+# load every provider SDK imported by framework.llm.providers
+_EXPORTS = {
+    # Providers and request/response types
+    "BaseLLMProvider": "providers",
+    "OpenAIProvider": "providers",
+    "AnthropicProvider": "providers",
+    "OllamaProvider": "providers",
+    "LLMProvider": "providers",
+    "ModelCapability": "providers",
+    "ModelInfo": "providers",
+    "LLMMessage": "providers",
+    "LLMRequest": "providers",
+    "LLMResponse": "providers",
+    
+    "LLMManager": "manager",
+    "ProviderConfig": "manager",
+    "ModelSelection": "manager",
+    "UsageStats": "manager",
+    
+    "ResponseCache": "cache",
+    "CacheConfig": "cache",
+    "CacheBackend": "cache",
+    "DiskCacheBackend": "cache",
+    
+    "SingleFlight": "coalescing",
+    "StreamCoalescer": "coalescing",
+    
+    "ModelCatalog": "catalog",
+    
+    "ProviderRateLimiter": "rate_limiting",
+    "TokenBucket": "rate_limiting",
+    "RateLimitExceeded": "rate_limiting",
+    
+    "LoadBalancer": "load_balancing",
+    "ProviderLoad": "load_balancing",
+    
+    "CircuitBreaker": "resilience",
+    "CircuitBreakerConfig": "resilience",
+    "CircuitOpenError": "resilience",
+    "HedgingConfig": "resilience",
+    
+    "BatchResult": "batching",
+    "BatchCheckpoint": "batching",
+    
+    "OllamaContextCache": "ollama_context",
+    
+    "HTTPTransport": "transport",
+    "HTTPTransportConfig": "transport",
+    "get_transport": "transport",
+    
+    # Convenience imports for common use cases
+    "create_chat_request": "utils",
+    "create_system_message": "utils",
+    "create_user_message": "utils",
+    "create_assistant_message": "utils",
+    "estimate_tokens": "utils",
+    "format_conversation": "utils"
+}
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
 
-# Convenience imports for common use cases
-from .utils import (
-    create_chat_request,
-    create_system_message,
-    create_user_message,
-    create_assistant_message,
-    estimate_tokens,
-    format_conversation
-)
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
 
 __all__ = [
     # Core classes
@@ -123,6 +172,44 @@ __all__ = [
     "ModelSelection",
     "UsageStats",
     
+    # Response caching
+    "ResponseCache",
+    "CacheConfig",
+    "CacheBackend",
+    "DiskCacheBackend",
+    
+    # Request coalescing
+    "SingleFlight",
+    "StreamCoalescer",
+    
+    # Model selection and rate limiting
+    "ModelCatalog",
+    "ProviderRateLimiter",
+    "TokenBucket",
+    "RateLimitExceeded",
+    
+    # Load balancing
+    "LoadBalancer",
+    "ProviderLoad",
+    
+    # Circuit breakers and hedged requests
+    "CircuitBreaker",
+    "CircuitBreakerConfig",
+    "CircuitOpenError",
+    "HedgingConfig",
+    
+    # Batch completions
+    "BatchResult",
+    "BatchCheckpoint",
+    
+    # Ollama session context reuse
+    "OllamaContextCache",
+    
+    # Shared HTTP transport
+    "HTTPTransport",
+    "HTTPTransportConfig",
+    "get_transport",
+    
     # Enums
     "LLMProvider",
     "ModelCapability",
@@ -0,0 +1,205 @@
+"""
+LLM Batch Completions
+=====================
+
+Runs many completion requests with a bounded number in flight and yields
+results as they finish. Items are tagged as batch traffic, so they draw on
+the providers' rate limit buckets without starving interactive requests,
+and each item is retried with exponential backoff before it is reported as
+failed. With a checkpoint file, every completed item is appended to disk as
+one JSON line; a rerun with the same checkpoint replays those results
+instead of calling a provider again.
+"""
+
+import asyncio
+import json
+import logging
+import random
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Optional, Union
+
+from .providers import LLMProvider, LLMRequest, LLMResponse
+from .rate_limiting import BATCH
+
+logger = logging.getLogger(__name__)
+
+MAX_RETRY_DELAY = 30.0  # Seconds; cap on the backoff between attempts
+
+@dataclass
+class BatchResult:
+    """Outcome of one batch item"""
+    item_id: str
+    index: int  # Position of the request in the submitted batch
+    response: Optional[LLMResponse] = None
+    error: Optional[str] = None
+    attempts: int = 0
+    resumed: bool = False  # Replayed from the checkpoint rather than generated in this run
+
+    @property
+    def ok(self) -> bool:
+        return self.response is not None
+
+class BatchCheckpoint:
+    """Append-only JSONL record of completed batch items"""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = None
+
+    def load(self) -> Dict[str, BatchResult]:
+        """Completed items by id; a truncated last line from a crash is ignored"""
+        completed = {}
+        if not self.path.exists():
+            return completed
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    response = record["response"]
+                    completed[record["id"]] = BatchResult(
+                        item_id=record["id"],
+                        index=record["index"],
+                        response=LLMResponse(
+                            content=response["content"],
+                            model=response["model"],
+                            provider=LLMProvider(response["provider"]),
+                            usage=response.get("usage", {}),
+                            finish_reason=response.get("finish_reason", "stop"),
+                            metadata=response.get("metadata", {})
+                        ),
+                        attempts=record.get("attempts", 1),
+                        resumed=True
+                    )
+                except (ValueError, KeyError, TypeError):
+                    logger.warning(f"Skipping unreadable batch checkpoint line in {self.path}")
+        return completed
+
+    def record(self, result: BatchResult) -> None:
+        """Append a completed item and flush it, so it survives a crash of the process"""
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        response = result.response
+        provider = response.provider.value if isinstance(response.provider, LLMProvider) else response.provider
+        self._file.write(json.dumps({
+            "id": result.item_id,
+            "index": result.index,
+            "attempts": result.attempts,
+            "response": {
+                "content": response.content,
+                "model": response.model,
+                "provider": provider,
+                "usage": response.usage,
+                "finish_reason": response.finish_reason,
+                "metadata": response.metadata
+            }
+        }, default=str, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+class BatchRunner:
+    """Bounded-parallelism driver for a completion coroutine"""
+
+    def __init__(self,
+                 complete: Callable[..., Awaitable[LLMResponse]],
+                 max_concurrency: int = 8,
+                 max_retries: int = 2,
+                 retry_backoff: float = 1.0,
+                 checkpoint: Optional[BatchCheckpoint] = None):
+        self.complete = complete
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max(0, max_retries)
+        self.retry_backoff = retry_backoff
+        self.checkpoint = checkpoint
+
+        self.metrics = {
+            "submitted": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "retried": 0,
+            "resumed": 0
+        }
+
+    async def run(self, requests: Iterable[LLMRequest], selection_criteria: Any = None) -> AsyncIterator[BatchResult]:
+        """
+        Yield one BatchResult per request in completion order. Requests are read
+        lazily, so at most a couple of queued items per worker are held at a time
+        """
+        completed = self.checkpoint.load() if self.checkpoint else {}
+        pending: asyncio.Queue = asyncio.Queue(maxsize=self.max_concurrency * 2)
+        results: asyncio.Queue = asyncio.Queue()
+
+        async def feed():
+            try:
+                for index, request in enumerate(requests):
+                    self.metrics["submitted"] += 1
+                    item_id = str((request.metadata or {}).get("batch_id", index))
+                    resumed = completed.get(item_id)
+                    if resumed is not None:
+                        self.metrics["resumed"] += 1
+                        await results.put(replace(resumed, index=index))
+                    else:
+                        await pending.put((index, item_id, request))
+            finally:
+                for _ in range(self.max_concurrency):
+                    await pending.put(None)
+
+        async def work():
+            try:
+                while True:
+                    item = await pending.get()
+                    if item is None:
+                        break
+                    result = await self._run_item(*item, selection_criteria)
+                    if result.ok and self.checkpoint is not None:
+                        self.checkpoint.record(result)
+                    await results.put(result)
+            finally:
+                await results.put(None)  # This worker is done
+
+        feeder = asyncio.ensure_future(feed())
+        workers = [asyncio.ensure_future(work()) for _ in range(self.max_concurrency)]
+        try:
+            finished = 0
+            while finished < len(workers):
+                result = await results.get()
+                if result is None:
+                    finished += 1
+                    continue
+                yield result
+            await feeder  # Surface errors from reading the requests
+        finally:
+            for task in [feeder, *workers]:
+                task.cancel()
+            await asyncio.gather(feeder, *workers, return_exceptions=True)
+            if self.checkpoint is not None:
+                self.checkpoint.close()
+
+    async def _run_item(self, index: int, item_id: str, request: LLMRequest, selection_criteria: Any) -> BatchResult:
+        """Complete one item, retrying with jittered exponential backoff"""
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self.metrics["retried"] += 1
+                delay = min(MAX_RETRY_DELAY, self.retry_backoff * 2 ** (attempt - 1))
+                await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+            # Dispatch rewrites request.model, so every attempt starts from the submitted request
+            attempt_request = replace(request, metadata={"priority": BATCH, **(request.metadata or {})})
+            try:
+                response = await self.complete(attempt_request, selection_criteria)
+                self.metrics["succeeded"] += 1
+                return BatchResult(item_id, index, response=response, attempts=attempt + 1)
+            except Exception as e:
+                last_error = e
+                logger.warning(f"Batch item {item_id} failed (attempt {attempt + 1}): {e}")
+
+        self.metrics["failed"] += 1
+        return BatchResult(item_id, index, error=f"{type(last_error).__name__}: {last_error}", attempts=self.max_retries + 1)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return dict(self.metrics)
@@ -0,0 +1,593 @@
+"""
+LLM Response Cache
+==================
+
+Response cache placed in front of provider dispatch. The exact tier keys on a
+canonical hash of messages, model and sampling parameters; the optional
+near-duplicate tier matches recent prompts by shingle similarity. Entries
+expire after a TTL, are evicted least-recently-used past a size bound, are
+namespaced per persona and can be persisted to disk to survive restarts.
+Backend reads from async callers and all backend writes run in a worker
+thread, so a disk tier never blocks the event loop.
+"""
+
+import asyncio
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import Counter, OrderedDict, deque
+from dataclasses import dataclass, replace
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+from .providers import LLMProvider, LLMRequest, LLMResponse
+from .utils import canonical_request, fingerprint
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class CacheConfig:
+    """Response cache configuration"""
+    enabled: bool = True
+    ttl_seconds: float = 3600.0
+    max_entries: int = 10000
+    max_temperature: Optional[float] = None  # Requests sampled hotter than this bypass the cache
+    namespace_key: str = "persona"  # request.metadata key used as the cache namespace
+    near_duplicate: bool = False
+    similarity_threshold: float = 0.75  # Jaccard similarity of character shingles
+    word_similarity: float = 0.75  # Every differing word needs a counterpart spelled at least this similarly
+    shingle_size: int = 4
+    near_duplicate_window: int = 512  # Recent prompts per namespace compared for near duplicates
+    disk_path: Optional[str] = None
+    disk_max_entries: int = 100000
+
+@dataclass
+class CacheEntry:
+    """Cached response with its expiry and the prompt it answered"""
+    namespace: str
+    key: str
+    response: LLMResponse
+    created_at: float
+    expires_at: float
+    group: Optional[str] = None  # Near-duplicate group (request minus the final user message)
+    prompt: Optional[str] = None  # Normalized final user message
+    source: Optional[str] = None  # "provider:model" that produced the response
+    hits: int = 0
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        return (now if now is not None else time.time()) >= self.expires_at
+
+def response_to_dict(response: LLMResponse) -> Dict[str, Any]:
+    """Serialize a response for a persistent backend"""
+    return {
+        "content": response.content,
+        "model": response.model,
+        "provider": response.provider.value if isinstance(response.provider, LLMProvider) else response.provider,
+        "usage": response.usage,
+        "finish_reason": response.finish_reason,
+        "function_call": response.function_call,
+        "metadata": response.metadata
+    }
+
+def response_from_dict(data: Dict[str, Any]) -> LLMResponse:
+    """Rebuild a response serialized with response_to_dict"""
+    try:
+        provider = LLMProvider(data["provider"])
+    except ValueError:
+        provider = data["provider"]
+    return LLMResponse(
+        content=data["content"],
+        model=data["model"],
+        provider=provider,
+        usage=data.get("usage", {}),
+        finish_reason=data.get("finish_reason", "stop"),
+        function_call=data.get("function_call"),
+        metadata=data.get("metadata", {})
+    )
+
+class CacheBackend(ABC):
+    """Persistent storage behind the in-memory LRU tier"""
+
+    @abstractmethod
+    def load(self, namespace: str, key: str) -> Optional[CacheEntry]:
+        """Load an entry, or None if it is not stored"""
+        pass
+
+    @abstractmethod
+    def store(self, entry: CacheEntry) -> None:
+        """Store or replace an entry"""
+        pass
+
+    @abstractmethod
+    def delete(self, namespace: str, key: str) -> None:
+        """Delete an entry"""
+        pass
+
+    @abstractmethod
+    def clear(self, namespace: Optional[str] = None) -> None:
+        """Delete every entry, or every entry in one namespace"""
+        pass
+
+    @abstractmethod
+    def recent(self, limit: int) -> List[CacheEntry]:
+        """Most recently stored unexpired entries, newest first"""
+        pass
+
+    def close(self) -> None:
+        """Release backend resources"""
+        pass
+
+class DiskCacheBackend(CacheBackend):
+    """SQLite-backed local disk store so cache contents survive restarts"""
+
+    def __init__(self, path: str, max_entries: int = 100000):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._writes_since_prune = 0
+
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " namespace TEXT NOT NULL, key TEXT NOT NULL, response TEXT NOT NULL,"
+            " created_at REAL NOT NULL, expires_at REAL NOT NULL,"
+            " cache_group TEXT, prompt TEXT, source TEXT,"
+            " PRIMARY KEY (namespace, key))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_created ON responses (created_at)")
+        self._conn.commit()
+
+    def load(self, namespace: str, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT namespace, key, response, created_at, expires_at, cache_group, prompt, source"
+                " FROM responses WHERE namespace = ? AND key = ?",
+                (namespace, key)
+            ).fetchone()
+        return self._row_to_entry(row) if row else None
+
+    def store(self, entry: CacheEntry) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (entry.namespace, entry.key, json.dumps(response_to_dict(entry.response), default=str),
+                 entry.created_at, entry.expires_at, entry.group, entry.prompt, entry.source)
+            )
+            self._conn.commit()
+
+            # Prune expired and oldest rows periodically rather than on every write
+            self._writes_since_prune += 1
+            if self._writes_since_prune >= max(1, self.max_entries // 100):
+                self._writes_since_prune = 0
+                self._prune()
+
+    def delete(self, namespace: str, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses WHERE namespace = ? AND key = ?", (namespace, key))
+            self._conn.commit()
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        with self._lock:
+            if namespace is None:
+                self._conn.execute("DELETE FROM responses")
+            else:
+                self._conn.execute("DELETE FROM responses WHERE namespace = ?", (namespace,))
+            self._conn.commit()
+
+    def recent(self, limit: int) -> List[CacheEntry]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT namespace, key, response, created_at, expires_at, cache_group, prompt, source"
+                " FROM responses WHERE expires_at > ? ORDER BY created_at DESC LIMIT ?",
+                (time.time(), limit)
+            ).fetchall()
+        return [self._row_to_entry(row) for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def _prune(self) -> None:
+        """Drop expired rows and the oldest rows beyond max_entries (caller holds the lock)"""
+        self._conn.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+        self._conn.execute(
+            "DELETE FROM responses WHERE rowid IN ("
+            " SELECT rowid FROM responses ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _row_to_entry(row) -> CacheEntry:
+        namespace, key, response, created_at, expires_at, group, prompt, source = row
+        return CacheEntry(
+            namespace=namespace,
+            key=key,
+            response=response_from_dict(json.loads(response)),
+            created_at=created_at,
+            expires_at=expires_at,
+            group=group,
+            prompt=prompt,
+            source=source
+        )
+
+class ShingleIndex:
+    """
+    Inverted index from character shingles to recent prompts in one group
+    Candidates are scored by exact Jaccard similarity of their shingle sets
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self.order = deque()  # keys, oldest first
+        self.sizes: Dict[str, int] = {}
+        self.prompts: Dict[str, str] = {}
+        self.shingles: Dict[str, frozenset] = {}
+        self.postings: Dict[int, set] = {}
+
+    def add(self, key: str, prompt: str, shingles: frozenset) -> None:
+        if key in self.sizes:
+            return
+        while len(self.order) >= self.window:
+            self.remove(self.order[0])
+
+        self.order.append(key)
+        self.sizes[key] = len(shingles)
+        self.prompts[key] = prompt
+        self.shingles[key] = shingles
+        for shingle in shingles:
+            self.postings.setdefault(shingle, set()).add(key)
+
+    def remove(self, key: str) -> None:
+        if key not in self.sizes:
+            return
+        self.order.remove(key)
+        del self.sizes[key]
+        del self.prompts[key]
+        for shingle in self.shingles.pop(key):
+            keys = self.postings.get(shingle)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.postings[shingle]
+
+    def similar(self, shingles: frozenset, threshold: float) -> List[Tuple[str, float]]:
+        """Keys with Jaccard similarity of at least threshold, most similar first"""
+        overlaps = Counter()
+        for shingle in shingles:
+            keys = self.postings.get(shingle)
+            if keys:
+                overlaps.update(keys)
+
+        matches = []
+        for key, overlap in overlaps.items():
+            score = overlap / (len(shingles) + self.sizes[key] - overlap)
+            if score >= threshold:
+                matches.append((key, score))
+        matches.sort(key=lambda match: -match[1])
+        return matches
+
+class ResponseCache:
+    """
+    Two-tier response cache: exact canonical-request matches and, optionally,
+    near-duplicate prompts within the same conversation context.
+    Hot entries live in an in-memory LRU; a backend persists them across restarts.
+    """
+
+    def __init__(self, config: Optional[CacheConfig] = None, backend: Optional[CacheBackend] = None):
+        self.config = config or CacheConfig()
+        self.backend = backend
+        if self.backend is None and self.config.disk_path:
+            self.backend = DiskCacheBackend(self.config.disk_path, self.config.disk_max_entries)
+
+        self.entries: "OrderedDict[Tuple[str, str], CacheEntry]" = OrderedDict()
+        self.indexes: Dict[Tuple[str, str], ShingleIndex] = {}  # (namespace, group) -> index
+
+        # Write-behind queue of backend operations, applied in order by one worker thread
+        self._writes = deque()
+        self._write_lock = threading.Lock()
+        self._writing = False  # A worker thread is draining the queue
+        self._writer = None  # Future of the latest worker
+
+        self.metrics = {
+            "hits": 0,
+            "near_duplicate_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "bypassed": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "disk_hits": 0,
+            "disk_write_errors": 0
+        }
+
+        if self.backend is not None and self.config.near_duplicate:
+            self._warm_indexes()
+
+    def is_cacheable(self, request: LLMRequest) -> bool:
+        """Whether a request may be served from or stored in the cache"""
+        if not self.config.enabled or request.stream:
+            return False
+        if self.config.max_temperature is not None and request.temperature > self.config.max_temperature:
+            return False
+        return True
+
+    def namespace_for(self, request: LLMRequest) -> str:
+        """Cache namespace of a request (its persona, when tagged with one)"""
+        namespace = request.metadata.get(self.config.namespace_key) if request.metadata else None
+        return str(namespace) if namespace is not None else "default"
+
+    def make_key(self, request: LLMRequest, context: Any = None) -> str:
+        """Exact-tier key: hash of the canonical request and selection context"""
+        return fingerprint(canonical_request(request, context))
+
+    def get(self, request: LLMRequest, key: str, context: Any = None,
+            read_backend: bool = True) -> Optional[LLMResponse]:
+        """Look up a cached response for a request whose exact key is key"""
+        if not self.is_cacheable(request):
+            self.metrics["bypassed"] += 1
+            return None
+
+        namespace = self.namespace_for(request)
+        entry = self._load(namespace, key, read_backend)
+        if entry is not None:
+            self.metrics["hits"] += 1
+            return self._serve(entry, "exact")
+
+        if self.config.near_duplicate:
+            group, prompt = self._near_duplicate_group(request, context)
+            index = self.indexes.get((namespace, group)) if prompt else None
+            if index is not None:
+                for match, score in index.similar(self._shingles(prompt), self.config.similarity_threshold):
+                    if not self._words_align(prompt, index.prompts[match]):
+                        continue
+                    entry = self._load(namespace, match, read_backend)
+                    if entry is not None:
+                        self.metrics["near_duplicate_hits"] += 1
+                        return self._serve(entry, "near_duplicate", similarity=score)
+                    index.remove(match)
+                    break
+
+        self.metrics["misses"] += 1
+        return None
+
+    async def aget(self, request: LLMRequest, key: str, context: Any = None) -> Optional[LLMResponse]:
+        """get() for async callers: a backend read on a memory miss runs in a worker thread"""
+        if self.backend is not None and self.is_cacheable(request):
+            namespace = self.namespace_for(request)
+            if (namespace, key) not in self.entries:
+                try:
+                    entry = await asyncio.to_thread(self.backend.load, namespace, key)
+                except Exception as e:
+                    logger.warning(f"Failed to read cached response: {e}")
+                    entry = None
+                if entry is not None and (namespace, key) not in self.entries:
+                    self._admit(entry)
+        # Near-duplicate candidates are indexed only while their entries are in memory
+        return self.get(request, key, context, read_backend=False)
+
+    def put(self, request: LLMRequest, key: str, response: LLMResponse,
+            context: Any = None, source: Optional[str] = None) -> None:
+        """Cache a provider response for a request whose exact key is key"""
+        if not self.is_cacheable(request):
+            return
+
+        now = time.time()
+        namespace = self.namespace_for(request)
+        group, prompt = self._near_duplicate_group(request, context) if self.config.near_duplicate else (None, None)
+        entry = CacheEntry(
+            namespace=namespace,
+            key=key,
+            response=response,
+            created_at=now,
+            expires_at=now + self.config.ttl_seconds,
+            group=group,
+            prompt=prompt,
+            source=source
+        )
+
+        self._insert(entry)
+        self.metrics["stores"] += 1
+        if self.backend is not None:
+            self._write(self.backend.store, entry)
+
+    def invalidate(self, namespace: Optional[str] = None) -> None:
+        """Drop all cached responses, or those of one namespace"""
+        for entry_key in [k for k in self.entries if namespace is None or k[0] == namespace]:
+            del self.entries[entry_key]
+        for index_key in [k for k in self.indexes if namespace is None or k[0] == namespace]:
+            del self.indexes[index_key]
+        if self.backend is not None:
+            self._write(self.backend.clear, namespace)
+
+    async def flush(self) -> None:
+        """Wait until queued backend writes have been applied"""
+        while self._writer is not None and not self._writer.done():
+            await self._writer
+
+    def close(self) -> None:
+        """Apply queued backend writes and close the persistent backend"""
+        if self.backend is not None:
+            self._apply_writes()
+            self.backend.close()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get hit/miss and eviction metrics"""
+        served = self.metrics["hits"] + self.metrics["near_duplicate_hits"]
+        lookups = served + self.metrics["misses"]
+        namespaces = Counter(namespace for namespace, _ in self.entries)
+        return {
+            **self.metrics,
+            "hit_rate": served / lookups if lookups else 0.0,
+            "entries": len(self.entries),
+            "max_entries": self.config.max_entries,
+            "namespaces": dict(namespaces),
+            "persistent": self.backend is not None,
+            "pending_disk_writes": len(self._writes)
+        }
+
+    def _load(self, namespace: str, key: str, read_backend: bool = True) -> Optional[CacheEntry]:
+        """Fetch an unexpired entry from memory, falling back to the backend when read_backend is set"""
+        now = time.time()
+        entry = self.entries.get((namespace, key))
+        if entry is not None:
+            if entry.is_expired(now):
+                self._remove(entry)
+                self.metrics["expirations"] += 1
+                return None
+            self.entries.move_to_end((namespace, key))
+            return entry
+
+        if self.backend is None or not read_backend:
+            return None
+        try:
+            entry = self.backend.load(namespace, key)
+        except Exception as e:
+            logger.warning(f"Failed to read cached response: {e}")
+            return None
+        return self._admit(entry) if entry is not None else None
+
+    def _admit(self, entry: CacheEntry) -> Optional[CacheEntry]:
+        """Move an entry read from the backend into the memory tier unless it has expired"""
+        if entry.is_expired():
+            self._write(self.backend.delete, entry.namespace, entry.key)
+            self.metrics["expirations"] += 1
+            return None
+
+        self.metrics["disk_hits"] += 1
+        self._insert(entry)
+        return entry
+
+    def _write(self, operation, *args) -> None:
+        """Queue a backend write; inside an event loop a single worker thread applies queued writes"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        with self._write_lock:
+            self._writes.append((operation, args))
+            if self._writing or loop is None:
+                start_worker = False
+            else:
+                start_worker = self._writing = True
+        if start_worker:
+            self._writer = loop.run_in_executor(None, self._apply_writes, True)
+        elif loop is None:
+            self._apply_writes()  # No event loop to block: write inline
+
+    def _apply_writes(self, worker: bool = False) -> None:
+        """Apply queued backend writes in order until the queue is empty"""
+        while True:
+            with self._write_lock:
+                if not self._writes:
+                    if worker:
+                        self._writing = False
+                    return
+                operation, args = self._writes.popleft()
+            try:
+                operation(*args)
+            except Exception as e:
+                self.metrics["disk_write_errors"] += 1
+                logger.warning(f"Failed to persist cached response: {e}")
+
+    def _insert(self, entry: CacheEntry) -> None:
+        """Add an entry to the memory tier, evicting least-recently-used entries"""
+        entry_key = (entry.namespace, entry.key)
+        self.entries[entry_key] = entry
+        self.entries.move_to_end(entry_key)
+        if entry.prompt:
+            index = self.indexes.get((entry.namespace, entry.group))
+            if index is None:
+                index = self.indexes[(entry.namespace, entry.group)] = ShingleIndex(self.config.near_duplicate_window)
+            index.add(entry.key, entry.prompt, self._shingles(entry.prompt))
+
+        while len(self.entries) > self.config.max_entries:
+            _, evicted = self.entries.popitem(last=False)
+            self._unindex(evicted)
+            self.metrics["evictions"] += 1
+
+    def _remove(self, entry: CacheEntry) -> None:
+        self.entries.pop((entry.namespace, entry.key), None)
+        self._unindex(entry)
+        if self.backend is not None:
+            self._write(self.backend.delete, entry.namespace, entry.key)
+
+    def _unindex(self, entry: CacheEntry) -> None:
+        index = self.indexes.get((entry.namespace, entry.group)) if entry.prompt else None
+        if index is not None:
+            index.remove(entry.key)
+            if not index.sizes:
+                del self.indexes[(entry.namespace, entry.group)]
+
+    def _serve(self, entry: CacheEntry, tier: str, **details) -> LLMResponse:
+        """Copy of a cached response tagged with how it was served"""
+        entry.hits += 1
+        metadata = dict(entry.response.metadata or {})
+        metadata["cache"] = {
+            "tier": tier,
+            "key": entry.key,
+            "source": entry.source,
+            "age": time.time() - entry.created_at,
+            **details
+        }
+        return replace(entry.response, usage=dict(entry.response.usage), metadata=metadata)
+
+    def _near_duplicate_group(self, request: LLMRequest, context: Any = None) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Split a request into its near-duplicate group and normalized final user prompt
+        Only requests identical apart from the final user message are compared
+        """
+        canonical = canonical_request(request, context)
+        for message in reversed(canonical["messages"]):
+            if message[0] == "user":
+                prompt = self._normalize(message[1])
+                message[1] = None
+                return fingerprint(canonical), prompt or None
+        return None, None
+
+    def _shingles(self, text: str) -> frozenset:
+        size = self.config.shingle_size
+        if len(text) <= size:
+            return frozenset([hash(text)])
+        return frozenset(hash(text[i:i + size]) for i in range(len(text) - size + 1))
+
+    def _words_align(self, prompt: str, candidate: str) -> bool:
+        """
+        Whether two prompts differ only by misspellings: shingle overlap alone
+        rates "career in ai" and "career in law" as near-identical
+        """
+        words, candidate_words = set(prompt.split()), set(candidate.split())
+        for missing, pool in ((words - candidate_words, candidate_words - words),
+                              (candidate_words - words, words - candidate_words)):
+            for word in missing:
+                if not any(SequenceMatcher(None, word, other).ratio() >= self.config.word_similarity
+                           for other in pool):
+                    return False
+        return True
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return re.sub(r"\s+", " ", re.sub(r"[^\w\s]", " ", (text or "").lower())).strip()
+
+    def _warm_indexes(self) -> None:
+        """Rebuild near-duplicate indexes from persisted entries after a restart"""
+        try:
+            recent = self.backend.recent(min(self.config.max_entries, self.config.near_duplicate_window * 8))
+        except Exception as e:
+            logger.warning(f"Failed to warm response cache from disk: {e}")
+            return
+        for entry in reversed(recent):
+            self._insert(entry)
@@ -0,0 +1,241 @@
+"""
+LLM Model Catalog
+=================
+
+Precomputed index of the models offered by every initialized provider.
+Models are grouped by capability bitmask and sorted by context length, so
+candidate filtering touches only compatible groups, and the ranked candidate
+list for each distinct ``ModelSelection`` is memoized until the catalog is
+rebuilt (on provider changes or when the refresh interval elapses). A provider
+whose model listing failed is retried after the shorter retry interval rather
+than staying unroutable until the next scheduled refresh.
+"""
+
+import asyncio
+import bisect
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+from .providers import BaseLLMProvider, LLMProvider, ModelInfo, ModelCapability
+
+logger = logging.getLogger(__name__)
+
+CAPABILITY_BITS = {capability: 1 << i for i, capability in enumerate(ModelCapability)}
+
+def capability_mask(capabilities) -> int:
+    """Bitmask of a collection of ModelCapability values"""
+    mask = 0
+    for capability in capabilities:
+        mask |= CAPABILITY_BITS.get(capability, 0)
+    return mask
+
+@dataclass
+class CatalogEntry:
+    """A model together with its provider and precomputed selection keys"""
+    provider_type: LLMProvider
+    provider: BaseLLMProvider
+    model: ModelInfo
+    mask: int
+    context_length: int
+    input_cost: float
+    position: int  # Provider enumeration order, used to keep rankings stable
+
+@dataclass
+class RankedCandidates:
+    """Memoized ranking for one selection signature"""
+    entries: List[Tuple[int, CatalogEntry]]  # (priority, entry), best first
+    by_model_id: Dict[str, int]  # model_id -> position of its best-ranked entry
+    per_provider: List[int]  # Position of each provider's best-ranked entry, best first
+
+class ModelCatalog:
+    """
+    Model index built once from all providers and refreshed on provider
+    changes or a timer, making per-request model selection a dict lookup
+    """
+
+    def __init__(self, refresh_interval: float = 300.0, retry_interval: float = 10.0):
+        self.refresh_interval = refresh_interval
+        self.retry_interval = retry_interval
+        self.entries: List[CatalogEntry] = []
+        self.groups: Dict[int, List[CatalogEntry]] = {}  # capability mask -> entries by context length
+        self.group_contexts: Dict[int, List[int]] = {}
+        self.by_provider: Dict[LLMProvider, List[CatalogEntry]] = {}
+        self.priorities: Dict[LLMProvider, int] = {}
+        self.rankings: Dict[Tuple, RankedCandidates] = {}
+        self.built_at: Optional[float] = None
+        self.provider_ids: Optional[Tuple] = None
+        self.failed_providers: Set[LLMProvider] = set()  # Providers missing from the last build
+        self._lock = asyncio.Lock()
+
+        self.metrics = {
+            "builds": 0,
+            "ranking_hits": 0,
+            "ranking_misses": 0,
+            "provider_errors": 0
+        }
+
+    def invalidate(self) -> None:
+        """Force a rebuild before the next lookup"""
+        self.built_at = None
+
+    def is_stale(self, providers: Dict[LLMProvider, BaseLLMProvider]) -> bool:
+        if self.built_at is None:
+            return True
+        if self.provider_ids != self._provider_ids(providers):
+            return True
+        age = time.monotonic() - self.built_at
+        if self.failed_providers and self.retry_interval is not None and age > self.retry_interval:
+            return True
+        return self.refresh_interval is not None and age > self.refresh_interval
+
+    async def ensure_fresh(self, providers: Dict[LLMProvider, BaseLLMProvider],
+                           priorities: Dict[LLMProvider, int]) -> None:
+        """Rebuild the catalog if providers changed or the refresh interval elapsed"""
+        if not self.is_stale(providers):
+            return
+        async with self._lock:
+            if self.is_stale(providers):
+                await self.rebuild(providers, priorities)
+
+    async def rebuild(self, providers: Dict[LLMProvider, BaseLLMProvider],
+                      priorities: Dict[LLMProvider, int]) -> None:
+        """
+        Fetch every provider's models concurrently and rebuild the indexes
+        priorities are the configured provider priorities used for ranking
+        """
+        provider_items = list(providers.items())
+        results = await asyncio.gather(
+            *(provider.get_available_models() for _, provider in provider_items),
+            return_exceptions=True
+        )
+
+        entries = []
+        failed_providers = set()
+        for (provider_type, provider), models in zip(provider_items, results):
+            if isinstance(models, Exception):
+                failed_providers.add(provider_type)
+                self.metrics["provider_errors"] += 1
+                logger.warning(f"Failed to get models from {provider_type.value}: {models}")
+                continue
+            for model in models:
+                entries.append(CatalogEntry(
+                    provider_type=provider_type,
+                    provider=provider,
+                    model=model,
+                    mask=capability_mask(model.capabilities),
+                    context_length=model.context_length,
+                    input_cost=model.cost_per_1k_tokens.get("input", 0),
+                    position=len(entries)
+                ))
+
+        groups: Dict[int, List[CatalogEntry]] = {}
+        by_provider: Dict[LLMProvider, List[CatalogEntry]] = {}
+        for entry in entries:
+            groups.setdefault(entry.mask, []).append(entry)
+            by_provider.setdefault(entry.provider_type, []).append(entry)
+        for group in groups.values():
+            group.sort(key=lambda entry: entry.context_length)
+
+        self.entries = entries
+        self.groups = groups
+        self.group_contexts = {mask: [entry.context_length for entry in group] for mask, group in groups.items()}
+        self.by_provider = by_provider
+        self.priorities = dict(priorities)
+        self.rankings = {}
+        self.provider_ids = self._provider_ids(providers)
+        self.failed_providers = failed_providers
+        self.built_at = time.monotonic()
+        self.metrics["builds"] += 1
+
+    def rank(self, criteria) -> RankedCandidates:
+        """
+        Candidates meeting criteria (a ModelSelection) ranked by provider priority
+        (highest first), then input cost (lowest first)
+        """
+        signature = self.selection_signature(criteria)
+        ranked = self.rankings.get(signature)
+        if ranked is not None:
+            self.metrics["ranking_hits"] += 1
+            return ranked
+
+        self.metrics["ranking_misses"] += 1
+        priorities = self.priorities
+        preferred = set(criteria.preferred_providers)
+        excluded = set(criteria.exclude_providers)
+
+        candidates = []
+        for entry in self.filter(criteria):
+            if entry.provider_type in excluded or entry.provider_type not in priorities:
+                continue
+            priority = priorities[entry.provider_type]
+            # Boost priority for preferred providers and, if preferred, local models
+            if entry.provider_type in preferred:
+                priority += 2
+            if criteria.prefer_local and entry.model.is_local:
+                priority += 1
+            candidates.append((priority, entry))
+
+        candidates.sort(key=lambda candidate: (-candidate[0], candidate[1].input_cost))
+
+        by_model_id = {}
+        per_provider = {}
+        for position, (_, entry) in enumerate(candidates):
+            by_model_id.setdefault(entry.model.model_id, position)
+            per_provider.setdefault(entry.provider_type, position)
+
+        ranked = self.rankings[signature] = RankedCandidates(candidates, by_model_id, list(per_provider.values()))
+        return ranked
+
+    def filter(self, criteria) -> List[CatalogEntry]:
+        """Entries meeting the capability, context length and cost constraints of criteria"""
+        required = capability_mask(criteria.required_capabilities)
+        if criteria.require_streaming:
+            required |= CAPABILITY_BITS[ModelCapability.STREAMING]
+
+        matches = []
+        for mask, group in self.groups.items():
+            if mask & required != required:
+                continue
+            start = 0
+            if criteria.min_context_length is not None:
+                start = bisect.bisect_left(self.group_contexts[mask], criteria.min_context_length)
+            for entry in group[start:]:
+                if criteria.max_cost_per_1k_tokens is None or entry.input_cost <= criteria.max_cost_per_1k_tokens:
+                    matches.append(entry)
+
+        # Keep provider enumeration order stable within equal rank keys
+        matches.sort(key=lambda entry: entry.position)
+        return matches
+
+    def provider_models(self, provider_type: LLMProvider) -> List[ModelInfo]:
+        """Catalogued models of one provider"""
+        return [entry.model for entry in self.by_provider.get(provider_type, [])]
+
+    @staticmethod
+    def selection_signature(criteria) -> Tuple:
+        """Hashable identity of a ModelSelection for memoization"""
+        return (
+            capability_mask(criteria.required_capabilities),
+            criteria.max_cost_per_1k_tokens,
+            criteria.min_context_length,
+            frozenset(criteria.preferred_providers),
+            frozenset(criteria.exclude_providers),
+            criteria.prefer_local,
+            criteria.require_streaming
+        )
+
+    @staticmethod
+    def _provider_ids(providers: Dict[LLMProvider, BaseLLMProvider]) -> Tuple:
+        return tuple(sorted((provider_type.value, id(provider)) for provider_type, provider in providers.items()))
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            **self.metrics,
+            "models": len(self.entries),
+            "capability_groups": len(self.groups),
+            "memoized_rankings": len(self.rankings),
+            "failed_providers": [provider_type.value for provider_type in self.failed_providers],
+            "age": time.monotonic() - self.built_at if self.built_at is not None else None
+        }
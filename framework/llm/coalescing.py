@@ -0,0 +1,141 @@
+"""
+LLM Request Coalescing
+======================
+
+Single-flight helpers that collapse concurrent identical requests into one
+upstream call. Completions share one future; streams share one upstream
+generator whose chunks are fanned out to every subscriber through a replay
+buffer, so late joiners still receive the full response.
+"""
+
+import asyncio
+import logging
+from functools import partial
+from typing import Any, AsyncGenerator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class SingleFlight:
+    """Shares one in-flight call among concurrent callers with the same key"""
+
+    def __init__(self):
+        self.inflight: Dict[str, asyncio.Future] = {}
+        self.metrics = {
+            "leaders": 0,
+            "coalesced": 0
+        }
+
+    async def run(self, key: str, call: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Await call() once per key; returns (result, leader) where leader is True
+        for the caller whose request actually went upstream.
+        The upstream call runs as its own task, so a cancelled caller does not
+        cancel it for the others.
+        """
+        task = self.inflight.get(key)
+        leader = task is None
+        if leader:
+            task = asyncio.ensure_future(call())
+            self.inflight[key] = task
+            task.add_done_callback(partial(self._finished, key))
+            self.metrics["leaders"] += 1
+        else:
+            self.metrics["coalesced"] += 1
+
+        return await asyncio.shield(task), leader
+
+    def _finished(self, key: str, task: asyncio.Future) -> None:
+        if self.inflight.get(key) is task:
+            del self.inflight[key]
+        if not task.cancelled():
+            task.exception()  # Mark retrieved when every caller has gone away
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {**self.metrics, "inflight": len(self.inflight)}
+
+class StreamBroadcast:
+    """One upstream chunk stream replayed to any number of subscribers"""
+
+    def __init__(self, source: AsyncGenerator[str, None]):
+        self.source = source
+        self.buffer: List[str] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.subscribers = 0
+        self._signal = asyncio.Event()
+        self.task = asyncio.ensure_future(self._pump())
+
+    async def _pump(self) -> None:
+        """Read the upstream stream into the replay buffer"""
+        try:
+            async for chunk in self.source:
+                self.buffer.append(chunk)
+                self._notify()
+        except asyncio.CancelledError:
+            self.error = asyncio.CancelledError()
+            raise
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done = True
+            self._notify()
+
+    def _notify(self) -> None:
+        signal, self._signal = self._signal, asyncio.Event()
+        signal.set()
+
+    async def subscribe(self) -> AsyncGenerator[str, None]:
+        """Yield every chunk from the start of the stream, then follow it live"""
+        index = 0
+        while True:
+            if index < len(self.buffer):
+                index += 1
+                yield self.buffer[index - 1]
+                continue
+            if self.done:
+                if self.error is not None:
+                    raise self.error
+                return
+            await self._signal.wait()
+
+class StreamCoalescer:
+    """Fans identical concurrent streaming requests out from one upstream stream"""
+
+    def __init__(self):
+        self.inflight: Dict[str, StreamBroadcast] = {}
+        self.metrics = {
+            "leaders": 0,
+            "coalesced": 0,
+            "replayed_chunks": 0
+        }
+
+    async def stream(self, key: str,
+                     open_stream: Callable[[], AsyncGenerator[str, None]]) -> AsyncGenerator[str, None]:
+        """Subscribe to the in-flight stream for key, opening it upstream if there is none"""
+        broadcast = self.inflight.get(key)
+        if broadcast is None or broadcast.done:
+            broadcast = StreamBroadcast(open_stream())
+            self.inflight[key] = broadcast
+            broadcast.task.add_done_callback(partial(self._finished, key, broadcast))
+            self.metrics["leaders"] += 1
+        else:
+            self.metrics["coalesced"] += 1
+            self.metrics["replayed_chunks"] += len(broadcast.buffer)
+
+        broadcast.subscribers += 1
+        try:
+            async for chunk in broadcast.subscribe():
+                yield chunk
+        finally:
+            broadcast.subscribers -= 1
+            if broadcast.subscribers == 0 and not broadcast.done:
+                # Nobody is listening any more; stop the upstream request
+                self._finished(key, broadcast)
+                broadcast.task.cancel()
+
+    def _finished(self, key: str, broadcast: StreamBroadcast, task: Optional[asyncio.Future] = None) -> None:
+        if self.inflight.get(key) is broadcast:
+            del self.inflight[key]
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {**self.metrics, "inflight": len(self.inflight)}
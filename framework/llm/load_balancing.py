@@ -0,0 +1,181 @@
+"""
+LLM Load Balancing
+==================
+
+Per-provider concurrency limits and latency-aware routing. Every provider
+has a semaphore capping its in-flight requests and an exponentially
+weighted moving average of its latency; routing samples two candidate
+providers and sends the request to the one with the lower expected wait
+(power of two choices), so load spreads away from slow or saturated
+providers without herding onto a single "best" one. Only providers of the
+best rank are balanced between; lower ranks take traffic once every
+better-ranked provider is at its in-flight limit.
+"""
+
+import asyncio
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional, Sequence, Tuple
+
+from .providers import LLMProvider
+
+PRIORITY = "priority"
+ADAPTIVE = "adaptive"
+MIN_LATENCY = 0.001  # Seconds; floor for latency estimates
+
+class ProviderLoad:
+    """Concurrency slots and latency estimate for one provider"""
+
+    def __init__(self, max_in_flight: int = 16, alpha: float = 0.3, initial_latency: Optional[float] = None):
+        self.max_in_flight = max_in_flight
+        self.alpha = alpha
+        self.semaphore = asyncio.Semaphore(max_in_flight)
+        self.ewma_latency = initial_latency
+        self.in_flight = 0
+        self.queued = 0
+
+        self.metrics = {
+            "completed": 0,
+            "failed": 0,
+            "peak_in_flight": 0,
+            "total_queue_time": 0.0
+        }
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one of the provider's in-flight slots, recording latency on success"""
+        self.queued += 1
+        queued_at = time.perf_counter()
+        try:
+            await self.semaphore.acquire()
+        finally:
+            self.queued -= 1
+        self.metrics["total_queue_time"] += time.perf_counter() - queued_at
+
+        self.in_flight += 1
+        self.metrics["peak_in_flight"] = max(self.metrics["peak_in_flight"], self.in_flight)
+        started_at = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.metrics["failed"] += 1
+            raise
+        else:
+            self.metrics["completed"] += 1
+            self.observe(time.perf_counter() - started_at)
+        finally:
+            self.in_flight -= 1
+            self.semaphore.release()
+
+    def observe(self, latency: float) -> None:
+        """Fold a latency sample into the moving average"""
+        if self.ewma_latency is None:
+            self.ewma_latency = latency
+        else:
+            self.ewma_latency += self.alpha * (latency - self.ewma_latency)
+
+    def saturated(self) -> bool:
+        """Whether every in-flight slot is taken"""
+        return self.in_flight >= self.max_in_flight
+
+    def expected_wait(self) -> float:
+        """Latency estimate scaled by the requests already ahead of a new one"""
+        # Unmeasured providers count as fast so they get tried, but their load still counts
+        latency = max(self.ewma_latency or 0.0, MIN_LATENCY)
+        return latency * (1 + self.in_flight + self.queued)
+
+    def get_status(self) -> Dict[str, Any]:
+        completed = self.metrics["completed"] + self.metrics["failed"]
+        return {
+            **self.metrics,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "max_in_flight": self.max_in_flight,
+            "ewma_latency": self.ewma_latency,
+            "average_queue_time": self.metrics["total_queue_time"] / completed if completed else 0.0
+        }
+
+class LoadBalancer:
+    """Routes requests across candidate providers and bounds their concurrency"""
+
+    def __init__(self, strategy: str = PRIORITY, alpha: float = 0.3, seed: Optional[int] = None):
+        self.strategy = strategy
+        self.alpha = alpha
+        self.loads: Dict[LLMProvider, ProviderLoad] = {}
+        self.rng = random.Random(seed)
+        self.metrics = {
+            "routed": 0,
+            "rerouted": 0,  # Requests sent somewhere other than the top-ranked provider
+            "spilled": 0  # Requests balanced beyond the best rank because it was saturated
+        }
+
+    def configure(self, provider_type: LLMProvider, max_in_flight: int,
+                  initial_latency: Optional[float] = None) -> ProviderLoad:
+        """Create (or resize) the load tracker for a provider"""
+        load = self.loads.get(provider_type)
+        if load is None or load.max_in_flight != max_in_flight:
+            load = ProviderLoad(max_in_flight, self.alpha, initial_latency if load is None else load.ewma_latency)
+            self.loads[provider_type] = load
+        return load
+
+    def remove(self, provider_type: LLMProvider) -> None:
+        self.loads.pop(provider_type, None)
+
+    def load_for(self, provider_type: LLMProvider) -> Optional[ProviderLoad]:
+        return self.loads.get(provider_type)
+
+    def choose(self, candidates: Sequence[Tuple[LLMProvider, Any]],
+               ranks: Optional[Sequence[float]] = None) -> int:
+        """
+        Index of the candidate to route to; candidates are (provider_type, item)
+        pairs in rank order, at most one per provider. With ranks (higher is better)
+        adaptive routing balances only between candidates of the best rank, widening
+        to the next rank while every candidate considered is saturated
+        """
+        self.metrics["routed"] += 1
+        if self.strategy != ADAPTIVE or len(candidates) < 2:
+            return 0
+
+        count = self._tier_size(candidates, ranks) if ranks is not None else len(candidates)
+        if count < 2:
+            return 0
+
+        first, second = self.rng.sample(range(count), 2)
+        if first > second:
+            first, second = second, first
+
+        # Ties go to the better-ranked candidate
+        choice = first
+        if self._expected_wait(candidates[second][0]) < self._expected_wait(candidates[first][0]):
+            choice = second
+        if choice != 0:
+            self.metrics["rerouted"] += 1
+        return choice
+
+    def _tier_size(self, candidates: Sequence[Tuple[LLMProvider, Any]], ranks: Sequence[float]) -> int:
+        """Number of leading candidates eligible for routing"""
+        count = 1
+        while count < len(candidates):
+            if ranks[count] != ranks[count - 1]:
+                if not all(self._saturated(provider_type) for provider_type, _ in candidates[:count]):
+                    break
+                if ranks[count - 1] == ranks[0]:
+                    self.metrics["spilled"] += 1
+            count += 1
+        return count
+
+    def _saturated(self, provider_type: LLMProvider) -> bool:
+        load = self.loads.get(provider_type)
+        return load is not None and load.saturated()
+
+    def _expected_wait(self, provider_type: LLMProvider) -> float:
+        load = self.loads.get(provider_type)
+        return load.expected_wait() if load is not None else 0.0
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "strategy": self.strategy,
+            **self.metrics,
+            "providers": {provider_type.value: load.get_status() for provider_type, load in self.loads.items()}
+        }
@@ -10,8 +10,9 @@ import asyncio
 import json
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Union, AsyncGenerator
-from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional, Union, AsyncGenerator, Iterable
+from dataclasses import dataclass, field, replace
+from contextlib import asynccontextmanager
 from pathlib import Path
 import yaml
 
@@ -19,6 +20,15 @@ from .providers import (
     BaseLLMProvider, OpenAIProvider, AnthropicProvider, OllamaProvider,
     LLMProvider, LLMRequest, LLMResponse, ModelInfo, ModelCapability
 )
+from .cache import ResponseCache, CacheConfig, CacheBackend
+from .coalescing import SingleFlight, StreamCoalescer
+from .catalog import ModelCatalog
+from .rate_limiting import ProviderRateLimiter, RateLimitReservation, RateLimitExceeded, INTERACTIVE
+from .load_balancing import LoadBalancer, ProviderLoad, PRIORITY
+from .resilience import CircuitBreaker, CircuitBreakerConfig, CircuitOpenError, HedgingConfig
+from .transport import HTTPTransportConfig, configure_transport, get_transport
+from .batching import BatchRunner, BatchCheckpoint, BatchResult
+from .utils import request_fingerprint, estimate_request_tokens, estimate_tokens
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +41,8 @@ class ProviderConfig:
     enabled: bool = True
     max_requests_per_minute: int = 60
     max_tokens_per_minute: int = 40000
+    rate_limit_max_wait: float = 2.0  # Seconds to wait for rate limit capacity before falling back
+    max_concurrent_requests: int = 16  # In-flight requests before new ones queue
     fallback_providers: List[LLMProvider] = field(default_factory=list)
 
 @dataclass
@@ -54,8 +66,16 @@ class UsageStats:
     total_cost: float = 0.0
     avg_latency: float = 0.0
     error_count: int = 0
+    cache_hits: int = 0  # Requests answered from the response cache
+    cache_misses: int = 0  # Cacheable requests that went to the provider
     last_used: Optional[datetime] = None
 
+@dataclass
+class ProviderAttempt:
+    """One admitted call to a provider; the caller fills in the tokens it used"""
+    total_tokens: Optional[int] = None
+    latency: Optional[float] = None  # Seconds the call took, unless the caller measures it differently
+
 class LLMManager:
     """
     Central manager for multiple LLM providers with intelligent routing,
@@ -67,7 +87,19 @@ class LLMManager:
         self.providers: Dict[LLMProvider, BaseLLMProvider] = {}
         self.provider_configs: Dict[LLMProvider, ProviderConfig] = {}
         self.usage_stats: Dict[str, UsageStats] = {}  # key: f"{provider}:{model}"
-        self.rate_limits: Dict[LLMProvider, Dict[str, Any]] = {}
+        self.rate_limiters: Dict[LLMProvider, ProviderRateLimiter] = {}
+        self.batch_reserve = 0.2  # Share of each rate limit kept free for interactive traffic
+        self.response_cache: Optional[ResponseCache] = None
+        self.coalesce_requests = True  # Identical concurrent requests share one provider call
+        self.completion_flights = SingleFlight()
+        self.stream_flights = StreamCoalescer()
+        self.model_catalog = ModelCatalog()
+        self.load_balancer = LoadBalancer()  # Per-provider in-flight limits and routing
+        self.circuit_breaker_config = CircuitBreakerConfig()
+        self.circuit_breakers: Dict[LLMProvider, CircuitBreaker] = {}
+        self.hedging = HedgingConfig()
+        self.hedge_stats: Dict[LLMProvider, Dict[str, int]] = {}  # Keyed by the primary provider
+        self.batch_metrics: Dict[str, int] = {}  # Counters of the most recent generate_batch run
         self._initialized = False
         
         # Load configuration
@@ -144,6 +176,8 @@ class LLMManager:
                     enabled=provider_data.get("enabled", True),
                     max_requests_per_minute=provider_data.get("max_requests_per_minute", 60),
                     max_tokens_per_minute=provider_data.get("max_tokens_per_minute", 40000),
+                    rate_limit_max_wait=provider_data.get("rate_limit_max_wait", 2.0),
+                    max_concurrent_requests=provider_data.get("max_concurrent_requests", 16),
                     fallback_providers=[
                         LLMProvider(fp) for fp in provider_data.get("fallback_providers", [])
                     ]
@@ -151,6 +185,51 @@ class LLMManager:
                 
             except ValueError as e:
                 logger.warning(f"Unknown provider {provider_name}: {e}")
+        
+        performance = config_data.get("performance") or {}
+        self.coalesce_requests = performance.get("coalesce_requests", True)
+        self.model_catalog.refresh_interval = performance.get("catalog_refresh_interval", 300)
+        self.model_catalog.retry_interval = performance.get("catalog_retry_interval", 10)
+        self.batch_reserve = performance.get("rate_limit_batch_reserve", 0.2)
+        self.load_balancer = LoadBalancer(
+            strategy=performance.get("routing_strategy", PRIORITY),
+            alpha=performance.get("latency_ewma_alpha", 0.3)
+        )
+        
+        try:
+            self.circuit_breaker_config = CircuitBreakerConfig(**(config_data.get("circuit_breaker") or {}))
+            self.hedging = HedgingConfig(**(config_data.get("hedging") or {}))
+        except TypeError as e:
+            logger.warning(f"Invalid circuit breaker or hedging configuration: {e}")
+        
+        transport_config = config_data.get("http_transport")
+        if transport_config:
+            try:
+                configure_transport(HTTPTransportConfig(**transport_config))
+            except TypeError as e:
+                logger.warning(f"Invalid HTTP transport configuration: {e}")
+        
+        cache_config = config_data.get("cache")
+        if cache_config and cache_config.get("enabled", True):
+            try:
+                self.enable_response_cache(CacheConfig(**cache_config))
+            except (TypeError, OSError) as e:
+                logger.warning(f"Invalid response cache configuration: {e}")
+    
+    def enable_response_cache(self, 
+                              config: Optional[CacheConfig] = None, 
+                              backend: Optional[CacheBackend] = None) -> ResponseCache:
+        """Put a response cache in front of provider dispatch"""
+        if self.response_cache is not None:
+            self.response_cache.close()
+        self.response_cache = ResponseCache(config, backend)
+        return self.response_cache
+    
+    def disable_response_cache(self) -> None:
+        """Send every request to a provider again"""
+        if self.response_cache is not None:
+            self.response_cache.close()
+        self.response_cache = None
     
     async def initialize(self) -> None:
         """Initialize all configured providers"""
@@ -165,11 +244,13 @@ class LLMManager:
                 provider = await self._create_provider(provider_type, config.config)
                 if provider:
                     self.providers[provider_type] = provider
-                    self.rate_limits[provider_type] = {
-                        "requests_count": 0,
-                        "tokens_count": 0,
-                        "window_start": datetime.now()
-                    }
+                    self.rate_limiters[provider_type] = ProviderRateLimiter(
+                        config.max_requests_per_minute,
+                        config.max_tokens_per_minute,
+                        max_wait=config.rate_limit_max_wait,
+                        batch_reserve=self.batch_reserve
+                    )
+                    self._provider_load(provider_type)
                     logger.info(f"Initialized {provider_type.value} provider")
                     
             except Exception as e:
@@ -178,6 +259,7 @@ class LLMManager:
         if not self.providers:
             raise RuntimeError("No LLM providers could be initialized")
         
+        self.model_catalog.invalidate()
         self._initialized = True
         logger.info(f"LLM Manager initialized with {len(self.providers)} providers")
     
@@ -206,80 +288,245 @@ class LLMManager:
                                 selection_criteria: Optional[ModelSelection] = None) -> LLMResponse:
         """
         Generate completion with intelligent provider and model selection
+        Identical (or near-duplicate) requests answered recently are served from the response cache,
+        and identical requests already in flight share one provider call
         """
         if not self._initialized:
             await self.initialize()
         
+        # Key on the request as submitted; dispatch rewrites request.model
+        request_key = request_fingerprint(request, selection_criteria)
+        
+        cache_request = None
+        if self.response_cache is not None and self.response_cache.is_cacheable(request):
+            cache_request = replace(request)
+            cached = await self.response_cache.aget(cache_request, request_key, selection_criteria)
+            if cached is not None:
+                self._record_cache_result(cached.metadata["cache"]["source"], cached, hit=True)
+                return cached
+        
+        if not self.coalesce_requests:
+            return await self._complete_and_cache(request, selection_criteria, request_key, cache_request)
+        
+        async def dispatch():
+            response = await self._complete_and_cache(request, selection_criteria, request_key, cache_request)
+            return response, request.model
+        
+        (response, model_id), leader = await self.completion_flights.run(request_key, dispatch)
+        if not leader:
+            request.model = model_id
+            response = replace(response, usage=dict(response.usage), 
+                               metadata={**response.metadata, "coalesced": True})
+        
+        return response
+    
+    async def _complete_and_cache(self, 
+                                  request: LLMRequest, 
+                                  selection_criteria: Optional[ModelSelection], 
+                                  request_key: str, 
+                                  cache_request: Optional[LLMRequest]) -> LLMResponse:
+        """Dispatch a completion and store the response when the request is cacheable"""
+        response = await self._dispatch_completion(request, selection_criteria)
+        
+        if cache_request is not None and self.response_cache is not None:
+            source = f"{self._provider_value(response.provider)}:{request.model}"
+            self.response_cache.put(cache_request, request_key, response, selection_criteria, source=source)
+            self._record_cache_result(source, response, hit=False)
+        
+        return response
+    
+    async def _dispatch_completion(self, 
+                                   request: LLMRequest, 
+                                   selection_criteria: Optional[ModelSelection] = None) -> LLMResponse:
+        """Select a provider and generate a completion, falling back on rate limits or errors"""
         # Select best provider and model
         provider, model_info = await self._select_provider_and_model(request, selection_criteria)
         
         if not provider:
             raise RuntimeError("No suitable provider available")
         
+        try:
+            if self.hedging.enabled:
+                return await self._hedged_call(provider, model_info, request, selection_criteria)
+            return await self._call_provider(provider, model_info, request)
+            
+        except Exception as e:
+            # Try fallback providers
+            fallback_provider = await self._get_fallback_provider(provider.provider_type, request, selection_criteria)
+            if not fallback_provider:
+                if isinstance(e, RateLimitExceeded):
+                    raise RateLimitExceeded(f"{e} and no fallback available") from e
+                raise e
+            
+            provider, model_info = fallback_provider
+            try:
+                return await self._call_provider(provider, model_info, request)
+                
+            except Exception as fallback_error:
+                logger.error(f"Fallback provider also failed: {fallback_error}")
+                raise e
+    
+    async def _call_provider(self, 
+                             provider: BaseLLMProvider, 
+                             model_info: ModelInfo, 
+                             request: LLMRequest) -> LLMResponse:
+        """Generate a completion on one provider within its rate limits and record usage"""
         # Update request with selected model
         request.model = model_info.model_id
         
-        try:
-            # Check rate limits
-            if not await self._check_rate_limits(provider.provider_type, request):
-                # Try fallback providers
-                fallback_provider = await self._get_fallback_provider(provider.provider_type, request, selection_criteria)
-                if fallback_provider:
-                    provider, model_info = fallback_provider
-                    request.model = model_info.model_id
-                else:
-                    raise RuntimeError("Rate limit exceeded and no fallback available")
-            
-            # Generate completion
-            start_time = datetime.now()
+        async with self._provider_attempt(provider, model_info, request) as attempt:
             response = await provider.generate_completion(request)
-            end_time = datetime.now()
+            attempt.total_tokens = response.usage.get("total_tokens")
+        
+        # Update usage statistics
+        await self._update_usage_stats(provider.provider_type, model_info.model_id, response, attempt.latency)
+        return response
+    
+    @asynccontextmanager
+    async def _provider_attempt(self, 
+                                provider: BaseLLMProvider, 
+                                model_info: ModelInfo, 
+                                request: LLMRequest):
+        """
+        Admit one call to a provider: its circuit breaker, then its rate limits, then a load slot.
+        The outcome is recorded with the breaker and the rate limit reservation is released on
+        failure or reconciled with attempt.total_tokens on success
+        """
+        # Consult the breaker first so a rejected call never waits for or spends rate limit capacity
+        breaker = self._circuit_breaker(provider.provider_type)
+        if not breaker.allow_request():
+            raise CircuitOpenError(f"Circuit breaker open for {provider.provider_type.value}")
+        
+        try:
+            reservation = await self._acquire_rate_limit(provider.provider_type, request)
+        except BaseException:
+            breaker.record_cancelled()  # Free a half-open probe; the provider was never called
+            raise
+        
+        attempt = ProviderAttempt()
+        try:
+            async with self._provider_load(provider.provider_type).slot():
+                start_time = datetime.now()
+                yield attempt
+                if attempt.latency is None:
+                    attempt.latency = (datetime.now() - start_time).total_seconds()
+        except Exception:
+            if reservation is not None:
+                reservation.release()
+            breaker.record_failure()
+            self._record_error(provider.provider_type, model_info.model_id)
+            raise
+        except BaseException:
+            # Abandoned, e.g. a hedged request that lost the race or a stream closed by its reader
+            if reservation is not None:
+                reservation.release()
+            breaker.record_cancelled()
+            raise
+        
+        breaker.record_success(attempt.latency)
+        # Replace the token estimate with reported usage
+        if reservation is not None:
+            reservation.reconcile(attempt.total_tokens)
+    
+    async def _hedged_call(self, 
+                           provider: BaseLLMProvider, 
+                           model_info: ModelInfo, 
+                           request: LLMRequest, 
+                           selection_criteria: Optional[ModelSelection]) -> LLMResponse:
+        """
+        Call the primary provider and, if it has not answered within its hedge delay,
+        race a copy of the request on the next-best provider; the first success wins
+        """
+        primary = asyncio.ensure_future(self._call_provider(provider, model_info, request))
+        hedge = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=self._hedge_delay(provider.provider_type))
+            if done:
+                return primary.result()
             
-            # Update usage statistics
-            await self._update_usage_stats(
-                provider.provider_type, 
-                model_info.model_id, 
-                response, 
-                (end_time - start_time).total_seconds()
-            )
+            target = self._select_hedge_target(provider.provider_type, selection_criteria)
+            if target is None:
+                return await primary
             
-            # Update rate limits
-            await self._update_rate_limits(provider.provider_type, response)
+            stats = self._hedge_stats(provider.provider_type)
+            stats["hedged"] += 1
+            hedge_request = replace(request)
+            hedge = asyncio.ensure_future(self._call_provider(*target, hedge_request))
             
-            return response
+            pending = {primary, hedge}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            stats["hedge_wins"] += 1
+                            request.model = hedge_request.model
+                        return task.result()
             
-        except Exception as e:
-            # Try fallback providers
-            fallback_provider = await self._get_fallback_provider(provider.provider_type, request, selection_criteria)
-            if fallback_provider:
-                provider, model_info = fallback_provider
-                request.model = model_info.model_id
-                
-                try:
-                    start_time = datetime.now()
-                    response = await provider.generate_completion(request)
-                    end_time = datetime.now()
-                    
-                    await self._update_usage_stats(
-                        provider.provider_type, 
-                        model_info.model_id, 
-                        response, 
-                        (end_time - start_time).total_seconds()
-                    )
-                    
-                    return response
-                    
-                except Exception as fallback_error:
-                    logger.error(f"Fallback provider also failed: {fallback_error}")
-                    raise e
-            else:
-                raise e
+            # Both failed; report the primary's error
+            raise primary.exception()
+        finally:
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+    
+    def _hedge_delay(self, provider_type: LLMProvider) -> float:
+        """Seconds to wait on a provider before hedging: its recent latency at the configured percentile"""
+        breaker = self._circuit_breaker(provider_type)
+        if len(breaker.latencies) < self.hedging.min_samples:
+            return self.hedging.initial_delay
+        return max(self.hedging.min_delay, breaker.latency_percentile(self.hedging.percentile))
+    
+    def _select_hedge_target(self, 
+                             primary_type: LLMProvider, 
+                             selection_criteria: Optional[ModelSelection]) -> Optional[tuple[BaseLLMProvider, ModelInfo]]:
+        """Best-ranked model on another available provider that meets the selection criteria"""
+        ranked = self.model_catalog.rank(selection_criteria or ModelSelection())
+        for position in ranked.per_provider:
+            entry = ranked.entries[position][1]
+            if entry.provider_type != primary_type and self._circuit_breaker(entry.provider_type).is_available():
+                return entry.provider, entry.model
+        return None
+    
+    def _hedge_stats(self, provider_type: LLMProvider) -> Dict[str, int]:
+        return self.hedge_stats.setdefault(provider_type, {"hedged": 0, "hedge_wins": 0})
+    
+    async def generate_batch(self, 
+                             requests: Iterable[LLMRequest], 
+                             max_concurrency: int = 8, 
+                             selection_criteria: Optional[ModelSelection] = None, 
+                             max_retries: int = 2, 
+                             retry_backoff: float = 1.0, 
+                             checkpoint_path: Optional[Union[str, Path]] = None) -> AsyncGenerator[BatchResult, None]:
+        """
+        Generate completions for many requests, at most max_concurrency at a time,
+        yielding a BatchResult per request in completion order. Items run as batch
+        priority traffic against the rate limits and are retried with backoff;
+        failures are reported in the result rather than raised.
+        With checkpoint_path, completed items are appended to that file and skipped
+        (replayed from it) when the batch is run again. Items are identified by
+        request.metadata["batch_id"], or by their position in the batch.
+        """
+        if not self._initialized:
+            await self.initialize()
+        
+        runner = BatchRunner(
+            self.generate_completion,
+            max_concurrency=max_concurrency,
+            max_retries=max_retries,
+            retry_backoff=retry_backoff,
+            checkpoint=BatchCheckpoint(checkpoint_path) if checkpoint_path else None
+        )
+        self.batch_metrics = runner.metrics
+        async for result in runner.run(requests, selection_criteria):
+            yield result
     
     async def generate_streaming_completion(self, 
                                           request: LLMRequest, 
                                           selection_criteria: Optional[ModelSelection] = None) -> AsyncGenerator[str, None]:
         """
         Generate streaming completion with intelligent provider selection
+        Identical concurrent streams are fanned out from one upstream stream
         """
         if not self._initialized:
             await self.initialize()
@@ -289,80 +536,108 @@ class LLMManager:
             selection_criteria = ModelSelection()
         selection_criteria.require_streaming = True
         
+        if self.coalesce_requests:
+            stream = self.stream_flights.stream(
+                request_fingerprint(request, selection_criteria), 
+                lambda: self._dispatch_streaming(request, selection_criteria)
+            )
+        else:
+            stream = self._dispatch_streaming(request, selection_criteria)
+        
+        async for chunk in stream:
+            yield chunk
+    
+    async def _dispatch_streaming(self, 
+                                  request: LLMRequest, 
+                                  selection_criteria: ModelSelection) -> AsyncGenerator[str, None]:
+        """Select a streaming provider and stream a completion, falling back on errors"""
         # Select best provider and model
         provider, model_info = await self._select_provider_and_model(request, selection_criteria)
         
         if not provider:
             raise RuntimeError("No suitable streaming provider available")
         
-        request.model = model_info.model_id
-        
+        streamed = False
         try:
-            async for chunk in provider.generate_streaming_completion(request):
+            async for chunk in self._stream_provider(provider, model_info, request):
+                streamed = True
                 yield chunk
-                
-        except Exception as e:
-            # Try fallback providers
+        except Exception:
+            # Once part of the answer has gone out, a fallback would start it again on the same stream
+            if streamed:
+                raise
             fallback_provider = await self._get_fallback_provider(provider.provider_type, request, selection_criteria)
-            if fallback_provider:
-                provider, model_info = fallback_provider
-                request.model = model_info.model_id
-                
-                async for chunk in provider.generate_streaming_completion(request):
-                    yield chunk
-            else:
-                raise e
+            if not fallback_provider:
+                raise
+            provider, model_info = fallback_provider
+            async for chunk in self._stream_provider(provider, model_info, request):
+                yield chunk
+    
+    async def _stream_provider(self, 
+                               provider: BaseLLMProvider, 
+                               model_info: ModelInfo, 
+                               request: LLMRequest) -> AsyncGenerator[str, None]:
+        """Stream a completion from one provider within its circuit breaker, rate limits and load slot"""
+        request.model = model_info.model_id
+        chunks = []
+        async with self._provider_attempt(provider, model_info, request) as attempt:
+            start_time = datetime.now()
+            async for chunk in provider.generate_streaming_completion(request):
+                if attempt.latency is None:
+                    # A long answer is not a slow provider; judge the stream by its first chunk
+                    attempt.latency = (datetime.now() - start_time).total_seconds()
+                chunks.append(chunk)
+                yield chunk
+            # Streams report no usage; count the prompt and the streamed text instead
+            attempt.total_tokens = estimate_request_tokens(request) + estimate_tokens("".join(chunks), request.model)
     
     async def _select_provider_and_model(self, 
                                        request: LLMRequest, 
                                        selection_criteria: Optional[ModelSelection]) -> tuple[Optional[BaseLLMProvider], Optional[ModelInfo]]:
         """
         Select the best provider and model based on request and criteria
+        Candidates come from the model catalog, ranked once per distinct selection criteria;
+        with adaptive routing the load balancer picks among the best-ranked providers' best
+        candidates. Providers with an open circuit breaker are skipped
         """
         if not selection_criteria:
             selection_criteria = ModelSelection()
         
-        # Get all available models from all providers
-        available_options = []
+        await self._ensure_model_catalog()
+        ranked = self.model_catalog.rank(selection_criteria)
         
-        for provider_type, provider in self.providers.items():
-            if provider_type in selection_criteria.exclude_providers:
-                continue
-            
-            try:
-                models = await provider.get_available_models()
-                for model in models:
-                    # Check if model meets criteria
-                    if self._model_meets_criteria(model, selection_criteria):
-                        priority = self.provider_configs[provider_type].priority
-                        
-                        # Boost priority for preferred providers
-                        if provider_type in selection_criteria.preferred_providers:
-                            priority += 2
-                        
-                        # Boost priority for local models if preferred
-                        if selection_criteria.prefer_local and model.is_local:
-                            priority += 1
-                        
-                        available_options.append((priority, provider, model))
-                        
-            except Exception as e:
-                logger.warning(f"Failed to get models from {provider_type.value}: {e}")
-        
-        if not available_options:
+        if not ranked.entries:
             return None, None
         
-        # Sort by priority (highest first), then by cost (lowest first)
-        available_options.sort(key=lambda x: (-x[0], x[2].cost_per_1k_tokens.get("input", 0)))
-        
         # If a specific model is requested, try to find it
         if request.model:
-            for priority, provider, model in available_options:
-                if model.model_id == request.model:
-                    return provider, model
-        
-        # Return the best option
-        return available_options[0][1], available_options[0][2]
+            position = ranked.by_model_id.get(request.model)
+            if position is not None:
+                entry = ranked.entries[position][1]
+                if self._circuit_breaker(entry.provider_type).is_available():
+                    return entry.provider, entry.model
+        
+        # Route between the providers' best options, skipping providers whose circuit is open
+        candidates = [
+            (ranked.entries[position][1].provider_type, position) for position in ranked.per_provider
+            if self._circuit_breaker(ranked.entries[position][1].provider_type).is_available()
+        ]
+        if not candidates:
+            raise CircuitOpenError("Every provider meeting the selection criteria has an open circuit breaker")
+        for provider_type, _ in candidates:
+            self._provider_load(provider_type)
+        ranks = [ranked.entries[position][0] for _, position in candidates]
+        best = ranked.entries[candidates[self.load_balancer.choose(candidates, ranks)][1]][1]
+        return best.provider, best.model
+    
+    async def _ensure_model_catalog(self) -> None:
+        """Rebuild the model catalog if providers changed or its refresh interval elapsed"""
+        if self.model_catalog.is_stale(self.providers):
+            priorities = {
+                provider_type: config.priority 
+                for provider_type, config in self.provider_configs.items()
+            }
+            await self.model_catalog.ensure_fresh(self.providers, priorities)
     
     def _model_meets_criteria(self, model: ModelInfo, criteria: ModelSelection) -> bool:
         """Check if a model meets the selection criteria"""
@@ -388,38 +663,51 @@ class LLMManager:
         
         return True
     
-    async def _check_rate_limits(self, provider_type: LLMProvider, request: LLMRequest) -> bool:
-        """Check if request is within rate limits"""
-        if provider_type not in self.rate_limits:
-            return True
-        
-        config = self.provider_configs[provider_type]
-        limits = self.rate_limits[provider_type]
-        
-        now = datetime.now()
-        window_duration = timedelta(minutes=1)
-        
-        # Reset window if needed
-        if now - limits["window_start"] > window_duration:
-            limits["requests_count"] = 0
-            limits["tokens_count"] = 0
-            limits["window_start"] = now
-        
-        # Check limits
-        if limits["requests_count"] >= config.max_requests_per_minute:
-            return False
+    def _circuit_breaker(self, provider_type: LLMProvider) -> CircuitBreaker:
+        breaker = self.circuit_breakers.get(provider_type)
+        if breaker is None:
+            breaker = self.circuit_breakers[provider_type] = CircuitBreaker(self.circuit_breaker_config)
+        return breaker
+    
+    def _provider_load(self, provider_type: LLMProvider) -> ProviderLoad:
+        """In-flight limit and latency tracker of a provider, seeded from its recorded average latency"""
+        load = self.load_balancer.load_for(provider_type)
+        if load is not None:
+            return load
+        
+        config = self.provider_configs.get(provider_type)
+        max_in_flight = config.max_concurrent_requests if config else ProviderConfig.max_concurrent_requests
+        measured = [
+            stats for stats in self.usage_stats.values() 
+            if stats.provider == provider_type and stats.request_count
+        ]
+        initial_latency = None
+        if measured:
+            initial_latency = (
+                sum(stats.avg_latency * stats.request_count for stats in measured) / 
+                sum(stats.request_count for stats in measured)
+            )
+        return self.load_balancer.configure(provider_type, max_in_flight, initial_latency)
+    
+    async def _acquire_rate_limit(self, 
+                                  provider_type: LLMProvider, 
+                                  request: LLMRequest) -> Optional[RateLimitReservation]:
+        """
+        Reserve rate limit capacity for a request, waiting briefly for the provider's buckets to refill
+        Requests tagged metadata["priority"] = "batch" yield to interactive traffic
+        """
+        limiter = self.rate_limiters.get(provider_type)
+        if limiter is None:
+            return None
         
-        estimated_tokens = len(str(request.messages)) // 4  # Rough estimation
-        if limits["tokens_count"] + estimated_tokens > config.max_tokens_per_minute:
-            return False
+        # Prompt tokens plus the completion budget; reconciled against reported usage afterwards
+        estimated_tokens = estimate_request_tokens(request) + (request.max_tokens or 0)
+        priority = request.metadata.get("priority", INTERACTIVE) if request.metadata else INTERACTIVE
         
-        return True
-    
-    async def _update_rate_limits(self, provider_type: LLMProvider, response: LLMResponse) -> None:
-        """Update rate limit counters"""
-        if provider_type in self.rate_limits:
-            self.rate_limits[provider_type]["requests_count"] += 1
-            self.rate_limits[provider_type]["tokens_count"] += response.usage.get("total_tokens", 0)
+        reservation = await limiter.acquire(estimated_tokens, priority)
+        if reservation is None:
+            raise RateLimitExceeded(f"Rate limit exceeded for {provider_type.value}")
+        return reservation
     
     async def _get_fallback_provider(self, 
                                    failed_provider: LLMProvider, 
@@ -430,12 +718,13 @@ class LLMManager:
         if not config or not config.fallback_providers:
             return None
         
+        await self._ensure_model_catalog()
+        
         for fallback_type in config.fallback_providers:
-            if fallback_type in self.providers:
+            if fallback_type in self.providers and self._circuit_breaker(fallback_type).is_available():
                 provider = self.providers[fallback_type]
-                models = await provider.get_available_models()
                 
-                for model in models:
+                for model in self.model_catalog.provider_models(fallback_type):
                     if not selection_criteria or self._model_meets_criteria(model, selection_criteria):
                         return provider, model
         
@@ -491,10 +780,67 @@ class LLMManager:
         
         return all_models
     
+    def _record_error(self, provider_type: LLMProvider, model: str) -> None:
+        """Count a failed provider call"""
+        key = f"{provider_type.value}:{model}"
+        
+        if key not in self.usage_stats:
+            self.usage_stats[key] = UsageStats(
+                provider=provider_type,
+                model=model
+            )
+        
+        self.usage_stats[key].error_count += 1
+    
+    def _record_cache_result(self, source: Optional[str], response: LLMResponse, hit: bool) -> None:
+        """Count a cache hit or miss against the provider and model that produced the response"""
+        key = source or f"{self._provider_value(response.provider)}:{response.model}"
+        
+        if key not in self.usage_stats:
+            provider_value, _, model = key.partition(":")
+            try:
+                provider_type = LLMProvider(provider_value)
+            except ValueError:
+                provider_type = response.provider
+            self.usage_stats[key] = UsageStats(provider=provider_type, model=model)
+        
+        stats = self.usage_stats[key]
+        if hit:
+            stats.cache_hits += 1
+            stats.last_used = datetime.now()
+        else:
+            stats.cache_misses += 1
+    
+    @staticmethod
+    def _provider_value(provider: Union[LLMProvider, str]) -> str:
+        return provider.value if isinstance(provider, LLMProvider) else str(provider)
+    
     async def get_usage_statistics(self) -> Dict[str, UsageStats]:
-        """Get usage statistics for all providers and models"""
+        """Get usage statistics for all providers and models, including response cache hits and misses"""
         return self.usage_stats.copy()
     
+    def get_coalescing_statistics(self) -> Dict[str, Any]:
+        """Get counters for requests that shared an in-flight provider call"""
+        return {
+            "enabled": self.coalesce_requests,
+            "completions": self.completion_flights.get_metrics(),
+            "streams": self.stream_flights.get_metrics()
+        }
+    
+    def get_load_balancing_statistics(self) -> Dict[str, Any]:
+        """Get routing counters and per-provider in-flight, queueing and latency figures"""
+        return self.load_balancer.get_status()
+    
+    def get_cache_statistics(self) -> Dict[str, Any]:
+        """Get response cache metrics (hit rate, evictions, entries per namespace)"""
+        if self.response_cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.response_cache.get_metrics()}
+    
+    def get_transport_statistics(self) -> Dict[str, Any]:
+        """Get shared HTTP connection pool metrics (connections opened and reused, connect time)"""
+        return get_transport().get_metrics()
+    
     async def get_provider_status(self) -> Dict[str, Dict[str, Any]]:
         """Get status of all providers"""
         status = {}
@@ -503,18 +849,32 @@ class LLMManager:
             try:
                 models = await provider.get_available_models()
                 config = self.provider_configs[provider_type]
-                limits = self.rate_limits.get(provider_type, {})
+                limiter = self.rate_limiters.get(provider_type)
+                limits = limiter.get_status() if limiter else {}
+                load = self.load_balancer.load_for(provider_type)
                 
                 status[provider_type.value] = {
                     "enabled": config.enabled,
                     "priority": config.priority,
                     "available_models": len(models),
-                    "requests_this_minute": limits.get("requests_count", 0),
-                    "tokens_this_minute": limits.get("tokens_count", 0),
+                    "requests_this_minute": round(limits.get("requests_capacity", 0) - limits.get("requests_available", 0)),
+                    "tokens_this_minute": round(limits.get("tokens_capacity", 0) - limits.get("tokens_available", 0)),
+                    "rate_limit": limits,
+                    "in_flight": load.in_flight if load else 0,
+                    "max_concurrent_requests": config.max_concurrent_requests,
+                    "load": load.get_status() if load else {},
+                    "circuit_breaker": self._circuit_breaker(provider_type).get_status(),
+                    "hedging": {
+                        "enabled": self.hedging.enabled,
+                        "delay": self._hedge_delay(provider_type),
+                        **self._hedge_stats(provider_type)
+                    },
                     "max_requests_per_minute": config.max_requests_per_minute,
                     "max_tokens_per_minute": config.max_tokens_per_minute,
                     "models": [model.name for model in models[:5]]  # First 5 models
                 }
+                if hasattr(provider, "get_context_cache_status"):
+                    status[provider_type.value]["context_cache"] = provider.get_context_cache_status()
                 
             except Exception as e:
                 status[provider_type.value] = {
@@ -527,6 +887,8 @@ class LLMManager:
     def add_provider(self, provider_type: LLMProvider, config: ProviderConfig) -> None:
         """Add a new provider configuration"""
         self.provider_configs[provider_type] = config
+        self.model_catalog.invalidate()
+        self.load_balancer.remove(provider_type)  # Recreated with the new in-flight limit
         self._initialized = False  # Force re-initialization
     
     def remove_provider(self, provider_type: LLMProvider) -> None:
@@ -535,8 +897,11 @@ class LLMManager:
             del self.providers[provider_type]
         if provider_type in self.provider_configs:
             del self.provider_configs[provider_type]
-        if provider_type in self.rate_limits:
-            del self.rate_limits[provider_type]
+        if provider_type in self.rate_limiters:
+            del self.rate_limiters[provider_type]
+        self.load_balancer.remove(provider_type)
+        self.circuit_breakers.pop(provider_type, None)
+        self.model_catalog.invalidate()
     
     async def health_check(self) -> Dict[str, Any]:
         """Perform health check on all providers"""
@@ -0,0 +1,117 @@
+"""
+Ollama Session Context Cache
+============================
+
+Ollama's /api/generate returns the evaluated conversation as `context`
+tokens. Passing them back with the next turn lets the server continue from
+that state, so the persona system prompt and earlier turns are not
+evaluated again; only the new messages are. This module keeps those
+tokens per agent session, together with fingerprints of the messages they
+cover, so a follow-up request is recognized as a continuation only when it
+extends exactly the same conversation with the same model. Sessions are
+evicted least-recently-used beyond a size bound and after an idle TTL.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+def message_key(role: str, content: str, name: Optional[str] = None) -> str:
+    """Fingerprint of one message; surrounding whitespace is ignored"""
+    return hashlib.sha1(f"{role}\x1f{name or ''}\x1f{(content or '').strip()}".encode("utf-8")).hexdigest()
+
+@dataclass
+class SessionContext:
+    """Context tokens of one session and the messages they cover"""
+    model: str
+    message_keys: List[str]
+    context: List[int]
+    last_used: float = field(default_factory=time.monotonic)
+    turns: int = 1
+    reused_tokens: int = 0
+    prompt_eval_tokens: int = 0
+
+class OllamaContextCache:
+    """Per-session Ollama context tokens with LRU and idle-time eviction"""
+
+    def __init__(self, max_sessions: int = 256, ttl_seconds: Optional[float] = 1800.0):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.sessions: "OrderedDict[str, SessionContext]" = OrderedDict()
+
+        self.metrics = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expired": 0,
+            "prompt_eval_tokens": 0,  # Tokens the server evaluated, as reported in prompt_eval_count
+            "reused_context_tokens": 0  # Tokens carried over in context instead of being re-evaluated
+        }
+
+    def continuation(self, session_id: str, model: str,
+                     messages: Sequence[Any]) -> Tuple[Optional[SessionContext], List[str]]:
+        """
+        Cached context when messages extend the session's conversation with new
+        messages, plus the keys of all messages; (None, keys) on a miss
+        """
+        keys = [message_key(m.role, m.content, m.name) for m in messages]
+        entry = self.sessions.get(session_id)
+        if entry is not None and self._expired(entry):
+            del self.sessions[session_id]
+            self.metrics["expired"] += 1
+            entry = None
+
+        covered = len(entry.message_keys) if entry is not None else 0
+        if entry is None or entry.model != model or len(keys) <= covered or keys[:covered] != entry.message_keys:
+            self.metrics["misses"] += 1
+            return None, keys
+
+        self.sessions.move_to_end(session_id)
+        self.metrics["hits"] += 1
+        return entry, keys
+
+    def store(self, session_id: str, model: str, message_keys: List[str], context: List[int],
+              prompt_eval_tokens: int, previous: Optional[SessionContext] = None) -> SessionContext:
+        """Record the context after a turn; message_keys must include the assistant reply"""
+        reused = len(previous.context) if previous is not None else 0
+        entry = SessionContext(
+            model=model,
+            message_keys=message_keys,
+            context=context,
+            turns=previous.turns + 1 if previous is not None else 1,
+            reused_tokens=(previous.reused_tokens if previous is not None else 0) + reused,
+            prompt_eval_tokens=(previous.prompt_eval_tokens if previous is not None else 0) + prompt_eval_tokens
+        )
+        self.metrics["prompt_eval_tokens"] += prompt_eval_tokens
+        self.metrics["reused_context_tokens"] += reused
+
+        self.sessions[session_id] = entry
+        self.sessions.move_to_end(session_id)
+        while len(self.sessions) > self.max_sessions:
+            self.sessions.popitem(last=False)
+            self.metrics["evictions"] += 1
+        return entry
+
+    def record_evaluation(self, prompt_eval_tokens: int) -> None:
+        """Count prompt tokens evaluated by a call made outside any session"""
+        self.metrics["prompt_eval_tokens"] += prompt_eval_tokens
+
+    def discard(self, session_id: str) -> None:
+        self.sessions.pop(session_id, None)
+
+    def _expired(self, entry: SessionContext) -> bool:
+        return self.ttl_seconds is not None and time.monotonic() - entry.last_used > self.ttl_seconds
+
+    def get_status(self) -> Dict[str, Any]:
+        evaluated = self.metrics["prompt_eval_tokens"]
+        reused = self.metrics["reused_context_tokens"]
+        lookups = self.metrics["hits"] + self.metrics["misses"]
+        return {
+            **self.metrics,
+            "sessions": len(self.sessions),
+            "hit_rate": self.metrics["hits"] / lookups if lookups else 0.0,
+            # Share of prompt tokens served from cached context rather than evaluated
+            "prompt_eval_savings": reused / (reused + evaluated) if reused + evaluated else 0.0
+        }
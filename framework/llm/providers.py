@@ -19,11 +19,13 @@ import openai
 from anthropic import AsyncAnthropic
 import google.generativeai as genai
 from transformers import pipeline
-import ollama
 import boto3
 from azure.identity import DefaultAzureCredential
 from azure.ai.ml import MLClient
 
+from .transport import get_transport
+from .ollama_context import OllamaContextCache, message_key
+
 logger = logging.getLogger(__name__)
 
 class LLMProvider(Enum):
@@ -442,25 +444,29 @@ class AnthropicProvider(BaseLLMProvider):
         return any(model.model_id == model_name for model in self.available_models)
 
 class OllamaProvider(BaseLLMProvider):
-    """Ollama local model provider implementation"""
+    """Ollama local model provider implementation, over the shared pooled HTTP transport"""
     
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self.provider_type = LLMProvider.OLLAMA
-        self.base_url = config.get("base_url", "http://localhost:11434")
-        self.client = None
+        self.base_url = config.get("base_url", "http://localhost:11434").rstrip("/")
+        self.timeout = config.get("timeout")  # Seconds per request; None uses the transport default
+        self.keep_alive = config.get("keep_alive", "30m")  # Keep the model, and its prompt cache, loaded
+        self.transport = get_transport()
+        
+        # Context tokens of multi-turn sessions (request.metadata["session_id"])
+        self.context_cache = OllamaContextCache(
+            max_sessions=config.get("session_cache_size", 256),
+            ttl_seconds=config.get("session_ttl", 1800)
+        )
     
     async def initialize(self) -> None:
         """Initialize Ollama client"""
         try:
             # Test connection to Ollama
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{self.base_url}/api/tags") as response:
-                    if response.status != 200:
-                        raise ConnectionError(f"Cannot connect to Ollama at {self.base_url}")
-            
-            # Initialize Ollama client
-            self.client = ollama.AsyncClient(host=self.base_url)
+            status, _ = await self.transport.request_json("GET", f"{self.base_url}/api/tags", timeout=self.timeout)
+            if status != 200:
+                raise ConnectionError(f"Cannot connect to Ollama at {self.base_url}")
             
             # Get available models from Ollama
             await self._load_available_models()
@@ -472,10 +478,16 @@ class OllamaProvider(BaseLLMProvider):
             logger.error(f"Failed to initialize Ollama provider: {e}")
             raise
     
+    async def _list_models(self) -> Dict[str, Any]:
+        status, data = await self.transport.request_json("GET", f"{self.base_url}/api/tags", timeout=self.timeout)
+        if status != 200:
+            raise ConnectionError(f"Ollama model listing failed: HTTP {status}")
+        return data or {}
+    
     async def _load_available_models(self) -> None:
         """Load available models from Ollama"""
         try:
-            models_response = await self.client.list()
+            models_response = await self._list_models()
             self.available_models = []
             
             for model in models_response.get('models', []):
@@ -534,68 +546,159 @@ class OllamaProvider(BaseLLMProvider):
             ]
     
     async def generate_completion(self, request: LLMRequest) -> LLMResponse:
-        """Generate completion using Ollama"""
+        """
+        Generate completion using Ollama
+        Requests with metadata["session_id"] continue the session's cached context,
+        so only messages added since the previous turn are evaluated; others use
+        the chat endpoint, where a stable leading system prompt is reused from the
+        server's prompt cache while the model stays loaded
+        """
         if not self._initialized:
             await self.initialize()
         
-        # Convert messages to a single prompt for Ollama
-        prompt = self._convert_messages_to_prompt(request.messages)
+        session_id = request.metadata.get("session_id") if request.metadata else None
         
         try:
-            response = await self.client.generate(
-                model=request.model,
-                prompt=prompt,
-                options={
-                    'temperature': request.temperature,
-                    'top_p': request.top_p,
-                    'num_predict': request.max_tokens or -1,
-                    'stop': request.stop or []
+            if session_id:
+                return await self._generate_in_session(str(session_id), request)
+            
+            status, response = await self.transport.request_json(
+                "POST",
+                f"{self.base_url}/api/chat",
+                timeout=self.timeout,
+                json={
+                    'model': request.model,
+                    'messages': self._convert_messages_to_chat(request.messages),
+                    'stream': False,
+                    'keep_alive': self.keep_alive,
+                    'options': self._options(request)
                 }
             )
+            if status != 200:
+                raise ConnectionError(f"Ollama completion failed: HTTP {status} {response}")
             
-            return LLMResponse(
-                content=response['response'],
-                model=request.model,
-                provider=LLMProvider.OLLAMA,
-                usage={
-                    "prompt_tokens": response.get('prompt_eval_count', 0),
-                    "completion_tokens": response.get('eval_count', 0),
-                    "total_tokens": response.get('prompt_eval_count', 0) + response.get('eval_count', 0)
-                },
-                finish_reason="stop"
-            )
+            self.context_cache.record_evaluation(response.get('prompt_eval_count', 0))
+            return self._to_response(request, response.get('message', {}).get('content', ''), response)
             
         except Exception as e:
             logger.error(f"Ollama completion error: {e}")
             raise
     
+    async def _generate_in_session(self, session_id: str, request: LLMRequest) -> LLMResponse:
+        """Generate with the session's context tokens, sending only the messages they do not cover"""
+        previous, keys = self.context_cache.continuation(session_id, request.model, request.messages)
+        if previous is not None:
+            new_messages = request.messages[len(previous.message_keys):]
+            prompt = self._convert_messages_to_prompt(new_messages)
+        else:
+            prompt = self._convert_messages_to_prompt(request.messages)
+        
+        payload = {
+            'model': request.model,
+            'prompt': prompt,
+            'stream': False,
+            'keep_alive': self.keep_alive,
+            'options': self._options(request)
+        }
+        if previous is not None:
+            payload['context'] = previous.context
+        
+        status, response = await self.transport.request_json(
+            "POST", f"{self.base_url}/api/generate", timeout=self.timeout, json=payload
+        )
+        if status != 200:
+            self.context_cache.discard(session_id)
+            raise ConnectionError(f"Ollama completion failed: HTTP {status} {response}")
+        
+        content = response.get('response', '')
+        prompt_eval_count = response.get('prompt_eval_count', 0)
+        if response.get('context'):
+            self.context_cache.store(
+                session_id, request.model, keys + [message_key("assistant", content)],
+                response['context'], prompt_eval_count, previous
+            )
+        else:
+            self.context_cache.discard(session_id)
+            self.context_cache.record_evaluation(prompt_eval_count)
+        
+        llm_response = self._to_response(request, content, response)
+        llm_response.metadata["reused_context_tokens"] = len(previous.context) if previous is not None else 0
+        return llm_response
+    
+    def _options(self, request: LLMRequest) -> Dict[str, Any]:
+        return {
+            'temperature': request.temperature,
+            'top_p': request.top_p,
+            'num_predict': request.max_tokens or -1,
+            'stop': request.stop or []
+        }
+    
+    def _to_response(self, request: LLMRequest, content: str, response: Dict[str, Any]) -> LLMResponse:
+        return LLMResponse(
+            content=content,
+            model=request.model,
+            provider=LLMProvider.OLLAMA,
+            usage={
+                "prompt_tokens": response.get('prompt_eval_count', 0),
+                "completion_tokens": response.get('eval_count', 0),
+                "total_tokens": response.get('prompt_eval_count', 0) + response.get('eval_count', 0)
+            },
+            finish_reason="stop",
+            metadata={"prompt_eval_count": response.get('prompt_eval_count', 0)}
+        )
+    
     async def generate_streaming_completion(self, request: LLMRequest) -> AsyncGenerator[str, None]:
         """Generate streaming completion using Ollama"""
         if not self._initialized:
             await self.initialize()
         
-        prompt = self._convert_messages_to_prompt(request.messages)
-        
         try:
-            stream = await self.client.generate(
-                model=request.model,
-                prompt=prompt,
-                stream=True,
-                options={
-                    'temperature': request.temperature,
-                    'top_p': request.top_p,
-                    'num_predict': request.max_tokens or -1
+            async with self.transport.request(
+                "POST",
+                f"{self.base_url}/api/chat",
+                timeout=self.timeout,
+                json={
+                    'model': request.model,
+                    'messages': self._convert_messages_to_chat(request.messages),
+                    'stream': True,
+                    'keep_alive': self.keep_alive,
+                    'options': {
+                        'temperature': request.temperature,
+                        'top_p': request.top_p,
+                        'num_predict': request.max_tokens or -1
+                    }
                 }
-            )
-            
-            async for chunk in stream:
-                if 'response' in chunk:
-                    yield chunk['response']
+            ) as response:
+                if response.status != 200:
+                    raise ConnectionError(f"Ollama streaming failed: HTTP {response.status}")
+                
+                # One JSON object per line
+                async for line in response.content:
+                    if not line.strip():
+                        continue
+                    chunk = json.loads(line)
+                    content = chunk.get('message', {}).get('content')
+                    if content:
+                        yield content
+                    if chunk.get('done'):
+                        self.context_cache.record_evaluation(chunk.get('prompt_eval_count', 0))
+                        break
                     
         except Exception as e:
             logger.error(f"Ollama streaming error: {e}")
             raise
     
+    def _convert_messages_to_chat(self, messages: List[LLMMessage]) -> List[Dict[str, str]]:
+        """Messages in Ollama chat format; function results are passed as tool messages"""
+        return [
+            {"role": "tool" if message.role == "function" else message.role, "content": message.content}
+            for message in messages
+        ]
+    
+    def get_context_cache_status(self) -> Dict[str, Any]:
+        """Session context reuse and prompt evaluation savings"""
+        return self.context_cache.get_status()
+    
     def _convert_messages_to_prompt(self, messages: List[LLMMessage]) -> str:
         """Convert messages to a single prompt for Ollama"""
         prompt_parts = []
@@ -621,7 +724,7 @@ class OllamaProvider(BaseLLMProvider):
         """Validate Ollama model availability"""
         try:
             # Try to check if model exists
-            models = await self.client.list()
+            models = await self._list_models()
             return any(model['name'] == model_name for model in models.get('models', []))
         except:
             return False
@@ -629,7 +732,16 @@ class OllamaProvider(BaseLLMProvider):
     async def pull_model(self, model_name: str) -> bool:
         """Pull a model to Ollama"""
         try:
-            await self.client.pull(model_name)
+            # Streamed progress keeps the connection within the read timeout during long downloads
+            async with self.transport.request(
+                "POST", f"{self.base_url}/api/pull", json={"name": model_name, "stream": True}
+            ) as response:
+                if response.status != 200:
+                    raise ConnectionError(f"HTTP {response.status}")
+                async for line in response.content:
+                    progress = json.loads(line) if line.strip() else {}
+                    if "error" in progress:
+                        raise RuntimeError(progress["error"])
             await self._load_available_models()  # Refresh available models
             return True
         except Exception as e:
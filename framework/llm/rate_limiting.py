@@ -0,0 +1,186 @@
+"""
+LLM Rate Limiting
+=================
+
+Per-provider dual token buckets (requests and tokens per minute). Callers
+reserve capacity with an async ``acquire`` that waits a bounded time for
+the buckets to refill, interactive traffic is served ahead of batch traffic,
+and token reservations are reconciled against the usage providers report.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Dict, Any, Optional
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+PRIORITIES = (INTERACTIVE, BATCH)
+
+class RateLimitExceeded(RuntimeError):
+    """Raised when a provider's rate limit cannot be met within the allowed wait"""
+    pass
+
+class TokenBucket:
+    """Continuously refilling bucket; the level may go negative after reconciliation"""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = float(capacity)
+        self.refill_per_second = float(refill_per_second)
+        self.level = float(capacity)
+        self.updated = time.monotonic()
+
+    def refill(self, now: Optional[float] = None) -> float:
+        now = time.monotonic() if now is None else now
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.refill_per_second)
+        self.updated = now
+        return self.level
+
+    def time_until(self, amount: float, now: Optional[float] = None) -> float:
+        """Seconds until the bucket holds amount"""
+        deficit = amount - self.refill(now)
+        if deficit <= 0:
+            return 0.0
+        return deficit / self.refill_per_second if self.refill_per_second > 0 else float("inf")
+
+    def consume(self, amount: float) -> None:
+        self.level -= amount
+
+    def credit(self, amount: float) -> None:
+        self.level = min(self.capacity, self.level + amount)
+
+@dataclass
+class RateLimitReservation:
+    """Capacity taken from a provider's buckets for one request"""
+    limiter: "ProviderRateLimiter"
+    tokens: int
+    priority: str
+    waited: float = 0.0
+    settled: bool = False
+
+    def reconcile(self, actual_tokens: Optional[int]) -> None:
+        """Replace the token estimate with the usage the provider reported"""
+        if not self.settled:
+            self.settled = True
+            self.limiter._reconcile(self, actual_tokens)
+
+    def release(self) -> None:
+        """Return the reserved tokens, e.g. when the request failed before using them"""
+        if not self.settled:
+            self.settled = True
+            self.limiter.tokens.credit(self.tokens)
+            self.limiter.metrics["released"] += 1
+
+class ProviderRateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute buckets for one provider
+    Batch traffic may not draw the buckets below batch_reserve of their
+    capacity and always yields to waiting interactive requests
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int,
+                 max_wait: float = 2.0, batch_reserve: float = 0.2, poll_interval: float = 0.05):
+        self.requests = TokenBucket(requests_per_minute, requests_per_minute / 60.0)
+        self.tokens = TokenBucket(tokens_per_minute, tokens_per_minute / 60.0)
+        self.max_wait = max_wait
+        self.batch_reserve = batch_reserve
+        self.poll_interval = poll_interval
+        self.waiting = {priority: 0 for priority in PRIORITIES}
+
+        self.metrics = {
+            "acquired": 0,
+            "acquired_after_wait": 0,
+            "rejected": 0,
+            "total_wait_time": 0.0,
+            "released": 0,
+            "reconciled": 0,
+            "estimated_tokens": 0,  # Estimates of reconciled reservations
+            "actual_tokens": 0
+        }
+
+    async def acquire(self, tokens: int, priority: str = INTERACTIVE,
+                      max_wait: Optional[float] = None) -> Optional[RateLimitReservation]:
+        """
+        Reserve one request and tokens, waiting up to max_wait seconds for capacity
+        Returns None without waiting when the buckets cannot refill in time
+        """
+        if priority not in self.waiting:
+            priority = INTERACTIVE
+        max_wait = self.max_wait if max_wait is None else max_wait
+        tokens = int(min(tokens, self.tokens.capacity))
+
+        start = time.monotonic()
+        deadline = start + max_wait
+        slept = False
+        self.waiting[priority] += 1
+        try:
+            while True:
+                now = time.monotonic()
+                delay = self._delay(tokens, priority, now)
+                if delay <= 0:
+                    self.requests.consume(1)
+                    self.tokens.consume(tokens)
+                    waited = now - start if slept else 0.0
+                    self.metrics["acquired"] += 1
+                    if slept:
+                        self.metrics["acquired_after_wait"] += 1
+                        self.metrics["total_wait_time"] += waited
+                    return RateLimitReservation(self, tokens, priority, waited)
+
+                if now + delay > deadline:
+                    self.metrics["rejected"] += 1
+                    return None
+
+                await asyncio.sleep(delay)
+                slept = True
+        finally:
+            self.waiting[priority] -= 1
+
+    def _delay(self, tokens: int, priority: str, now: float) -> float:
+        """Seconds until a request of this priority can be admitted"""
+        if priority == BATCH:
+            if self.waiting[INTERACTIVE]:
+                return self.poll_interval
+            needed_requests = min(self.requests.capacity, 1 + self.batch_reserve * self.requests.capacity)
+            needed_tokens = min(self.tokens.capacity, tokens + self.batch_reserve * self.tokens.capacity)
+        else:
+            needed_requests, needed_tokens = 1, tokens
+
+        return max(self.requests.time_until(needed_requests, now), self.tokens.time_until(needed_tokens, now))
+
+    def _reconcile(self, reservation: RateLimitReservation, actual_tokens: Optional[int]) -> None:
+        """Credit or debit the token bucket by the estimate error"""
+        if actual_tokens is None:
+            return
+        difference = reservation.tokens - actual_tokens
+        if difference > 0:
+            self.tokens.credit(difference)
+        else:
+            self.tokens.consume(-difference)
+        self.metrics["estimated_tokens"] += reservation.tokens
+        self.metrics["actual_tokens"] += actual_tokens
+        self.metrics["reconciled"] += 1
+
+    def get_status(self) -> Dict[str, Any]:
+        """Bucket fill levels, waiters and admission counters"""
+        now = time.monotonic()
+        requests_level = self.requests.refill(now)
+        tokens_level = self.tokens.refill(now)
+        return {
+            **self.metrics,
+            "requests_available": requests_level,
+            "requests_capacity": self.requests.capacity,
+            "requests_fill": requests_level / self.requests.capacity if self.requests.capacity else 0.0,
+            "tokens_available": tokens_level,
+            "tokens_capacity": self.tokens.capacity,
+            "tokens_fill": tokens_level / self.tokens.capacity if self.tokens.capacity else 0.0,
+            "waiting": dict(self.waiting),
+            "average_wait_time": (
+                self.metrics["total_wait_time"] / self.metrics["acquired_after_wait"]
+                if self.metrics["acquired_after_wait"] else 0.0
+            ),
+            "estimate_ratio": (
+                self.metrics["actual_tokens"] / self.metrics["estimated_tokens"]
+                if self.metrics["estimated_tokens"] else None
+            )
+        }
@@ -0,0 +1,162 @@
+"""
+LLM Provider Resilience
+=======================
+
+Per-provider circuit breakers and hedged-request settings. A breaker keeps
+a rolling window of call outcomes; when too many calls fail (or run slower
+than a threshold) it opens and the provider is skipped until a cool-down
+passes, after which a few probe calls decide whether it closes again.
+Recent successful latencies also supply the percentile used to time
+hedged requests.
+"""
+
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Any, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+LATENCY_SAMPLES = 200  # Successful call latencies kept for percentiles
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a provider's circuit breaker is rejecting calls"""
+    pass
+
+@dataclass
+class CircuitBreakerConfig:
+    """Circuit breaker thresholds, shared by every provider"""
+    enabled: bool = True
+    window_size: int = 20  # Most recent calls considered
+    min_requests: int = 5  # Calls in the window before the breaker may open
+    failure_rate_threshold: float = 0.5
+    slow_call_threshold: Optional[float] = None  # Seconds; None disables slow-call tracking
+    slow_call_rate_threshold: float = 0.8
+    open_duration: float = 30.0  # Seconds to reject calls before probing
+    half_open_max_calls: int = 1  # Concurrent probe calls while half-open
+
+@dataclass
+class HedgingConfig:
+    """When to send a second copy of a slow request to the next-best provider"""
+    enabled: bool = False
+    percentile: float = 0.95  # Hedge after the primary's latency at this percentile
+    min_samples: int = 20  # Latency samples needed before the percentile is trusted
+    initial_delay: float = 2.0  # Seconds; hedge delay until then
+    min_delay: float = 0.05
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker for one provider"""
+
+    def __init__(self, config: Optional[CircuitBreakerConfig] = None):
+        self.config = config or CircuitBreakerConfig()
+        self.state = CLOSED
+        self.outcomes = deque(maxlen=self.config.window_size)  # (failed, slow) per call
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+        self.opened_at: Optional[float] = None
+        self.probes = 0
+
+        self.metrics = {
+            "opened": 0,
+            "rejected": 0,
+            "successes": 0,
+            "failures": 0
+        }
+
+    def is_available(self) -> bool:
+        """Whether a call would be let through, without reserving a probe"""
+        if not self.config.enabled or self.state == CLOSED:
+            return True
+        if self.state == OPEN:
+            return time.monotonic() - self.opened_at >= self.config.open_duration
+        return self.probes < self.config.half_open_max_calls
+
+    def allow_request(self) -> bool:
+        """Admit a call, moving an expired open breaker to half-open"""
+        if not self.config.enabled or self.state == CLOSED:
+            return True
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.config.open_duration:
+            self.state = HALF_OPEN
+            self.probes = 0
+        if self.state == HALF_OPEN and self.probes < self.config.half_open_max_calls:
+            self.probes += 1
+            return True
+        self.metrics["rejected"] += 1
+        return False
+
+    def record_success(self, latency: Optional[float] = None) -> None:
+        self.metrics["successes"] += 1
+        if latency is not None:
+            self.latencies.append(latency)
+        slow = (
+            latency is not None and self.config.slow_call_threshold is not None
+            and latency > self.config.slow_call_threshold
+        )
+        if self.state == HALF_OPEN:
+            self.probes = max(0, self.probes - 1)
+            if slow:
+                self._open()
+            else:
+                self._close()
+            return
+        self._record(False, slow)
+
+    def record_failure(self) -> None:
+        self.metrics["failures"] += 1
+        if self.state == HALF_OPEN:
+            self.probes = max(0, self.probes - 1)
+            self._open()
+            return
+        self._record(True, False)
+
+    def record_cancelled(self) -> None:
+        """A call was abandoned (e.g. a losing hedge); free its probe without judging the provider"""
+        if self.state == HALF_OPEN:
+            self.probes = max(0, self.probes - 1)
+
+    def _record(self, failed: bool, slow: bool) -> None:
+        self.outcomes.append((failed, slow))
+        if self.state != CLOSED or len(self.outcomes) < self.config.min_requests:
+            return
+        failure_rate, slow_rate = self._rates()
+        if failure_rate >= self.config.failure_rate_threshold or slow_rate >= self.config.slow_call_rate_threshold:
+            self._open()
+
+    def _rates(self):
+        if not self.outcomes:
+            return 0.0, 0.0
+        failures = sum(1 for failed, _ in self.outcomes if failed)
+        slow = sum(1 for _, is_slow in self.outcomes if is_slow)
+        return failures / len(self.outcomes), slow / len(self.outcomes)
+
+    def _open(self) -> None:
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self.metrics["opened"] += 1
+
+    def _close(self) -> None:
+        self.state = CLOSED
+        self.opened_at = None
+        self.outcomes.clear()
+
+    def latency_percentile(self, percentile: float) -> Optional[float]:
+        """Latency of recent successful calls at percentile (0-1), or None without samples"""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * percentile))]
+
+    def get_status(self) -> Dict[str, Any]:
+        failure_rate, slow_rate = self._rates()
+        retry_in = None
+        if self.state == OPEN:
+            retry_in = max(0.0, self.config.open_duration - (time.monotonic() - self.opened_at))
+        return {
+            **self.metrics,
+            "state": self.state if self.config.enabled else "disabled",
+            "failure_rate": failure_rate,
+            "slow_call_rate": slow_rate,
+            "window": len(self.outcomes),
+            "retry_in": retry_in,
+            "p95_latency": self.latency_percentile(0.95)
+        }
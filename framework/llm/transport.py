@@ -0,0 +1,237 @@
+"""
+LLM HTTP Transport
+==================
+
+One process-wide, connection-pooled HTTP client for talking to model
+servers such as Ollama. Connections are kept alive and reused between
+requests instead of opening a session (and a TCP connection) per call,
+the pool is bounded overall and per host, and connect/read timeouts are
+applied uniformly. Connection-level metrics (new connections, reuses,
+time spent connecting) come from aiohttp request tracing.
+
+aiohttp sessions belong to the event loop that created them, so the
+transport keeps one session per running loop and closes it when that loop
+shuts down. Synchronous callers (the standalone CLI clients) go through a
+private event loop running on a background thread, so they share one pool
+as well.
+"""
+
+import asyncio
+import atexit
+import threading
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Tuple
+
+import aiohttp
+
+# Errors a transport call can raise for an unreachable or misbehaving server
+TRANSPORT_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError)
+
+@dataclass
+class HTTPTransportConfig:
+    """Connection pool limits and default timeouts"""
+    max_connections: int = 100  # Open connections across all hosts
+    max_connections_per_host: int = 32
+    keepalive_timeout: float = 60.0  # Seconds an idle connection stays in the pool
+    connect_timeout: float = 5.0
+    read_timeout: Optional[float] = 120.0  # Longest gap between received chunks; None disables
+    total_timeout: Optional[float] = None  # Whole request, unless a call passes its own
+    dns_cache_ttl: int = 300
+
+class HTTPTransport:
+    """Shared keep-alive HTTP client with a bounded connection pool"""
+
+    def __init__(self, config: Optional[HTTPTransportConfig] = None):
+        self.config = config or HTTPTransportConfig()
+        # A session holds its loop, so entries are dropped explicitly rather than by weak reference
+        self._sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+        self._closers: Dict[asyncio.AbstractEventLoop, asyncio.Task] = {}  # Close each session with its loop
+        self._background_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._background_lock = threading.Lock()
+
+        self.metrics = {
+            "requests": 0,
+            "errors": 0,
+            "connections_created": 0,
+            "connections_reused": 0,
+            "total_connect_time": 0.0
+        }
+
+    def session(self) -> aiohttp.ClientSession:
+        """Pooled session for the running event loop, created on first use"""
+        loop = asyncio.get_running_loop()
+        self._discard_finished_loops()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.config.max_connections,
+                limit_per_host=self.config.max_connections_per_host,
+                keepalive_timeout=self.config.keepalive_timeout,
+                ttl_dns_cache=self.config.dns_cache_ttl
+            )
+            session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self.timeout(),
+                trace_configs=[self._trace_config()]
+            )
+            self._sessions[loop] = session
+            previous = self._closers.get(loop)
+            if previous is not None:
+                previous.cancel()
+            self._closers[loop] = loop.create_task(self._close_with_loop(loop, session))
+        return session
+
+    async def _close_with_loop(self, loop: asyncio.AbstractEventLoop, session: aiohttp.ClientSession) -> None:
+        """Close a loop's session when the loop shuts down (asyncio.run cancels the tasks left running)"""
+        try:
+            await asyncio.Event().wait()
+        finally:
+            if self._sessions.get(loop) is session:
+                del self._sessions[loop]
+            if self._closers.get(loop) is asyncio.current_task():
+                del self._closers[loop]
+            await session.close()
+
+    def _discard_finished_loops(self) -> None:
+        """Drop sessions of loops that were closed without cancelling their tasks"""
+        for loop in [loop for loop in self._sessions if loop.is_closed()]:
+            # The loop cannot run session.close() any more; detach so the session counts as closed
+            self._sessions.pop(loop).detach()
+            self._closers.pop(loop, None)
+
+    def timeout(self, total: Optional[float] = None) -> aiohttp.ClientTimeout:
+        """Configured connect and read timeouts, with an optional whole-request limit"""
+        return aiohttp.ClientTimeout(
+            total=total if total is not None else self.config.total_timeout,
+            connect=self.config.connect_timeout,
+            sock_read=self.config.read_timeout
+        )
+
+    @asynccontextmanager
+    async def request(self, method: str, url: str, timeout: Optional[float] = None, **kwargs):
+        """Send a request on a pooled connection and yield the response for streaming reads"""
+        self.metrics["requests"] += 1
+        try:
+            async with self.session().request(method, url, timeout=self.timeout(timeout), **kwargs) as response:
+                yield response
+        except TRANSPORT_ERRORS:
+            self.metrics["errors"] += 1
+            raise
+
+    async def request_json(self, method: str, url: str, timeout: Optional[float] = None, **kwargs) -> Tuple[int, Any]:
+        """Send a request and return its status and decoded JSON body (None if the body is not JSON)"""
+        async with self.request(method, url, timeout=timeout, **kwargs) as response:
+            try:
+                data = await response.json(content_type=None)
+            except ValueError:
+                data = None
+            return response.status, data
+
+    def request_json_sync(self, method: str, url: str, timeout: Optional[float] = None, **kwargs) -> Tuple[int, Any]:
+        """Blocking request_json for synchronous callers"""
+        return self.run_sync(self.request_json(method, url, timeout=timeout, **kwargs))
+
+    def run_sync(self, coroutine):
+        """Run a coroutine on the transport's background loop and wait for its result"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._ensure_background_loop()).result()
+
+    def _ensure_background_loop(self) -> asyncio.AbstractEventLoop:
+        with self._background_lock:
+            if self._background_loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=_run_until_stopped, args=(loop,), name="llm-http-transport", daemon=True)
+                thread.start()
+                self._background_loop = loop
+            return self._background_loop
+
+    def _trace_config(self) -> aiohttp.TraceConfig:
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_start.append(self._on_connection_create_start)
+        trace_config.on_connection_create_end.append(self._on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reuseconn)
+        return trace_config
+
+    async def _on_connection_create_start(self, session, context, params) -> None:
+        context.connect_started = time.perf_counter()
+
+    async def _on_connection_create_end(self, session, context, params) -> None:
+        self.metrics["connections_created"] += 1
+        self.metrics["total_connect_time"] += time.perf_counter() - context.connect_started
+
+    async def _on_connection_reuseconn(self, session, context, params) -> None:
+        self.metrics["connections_reused"] += 1
+
+    async def aclose(self) -> None:
+        """Close the running loop's session"""
+        loop = asyncio.get_running_loop()
+        session = self._sessions.pop(loop, None)
+        if session is not None:
+            await self._close_session(session, self._closers.pop(loop, None))
+
+    @staticmethod
+    async def _close_session(session: aiohttp.ClientSession, closer: Optional[asyncio.Task]) -> None:
+        if closer is not None:
+            closer.cancel()
+            await asyncio.gather(closer, return_exceptions=True)
+        await session.close()
+
+    def close(self) -> None:
+        """Close every loop's session and stop the background loop"""
+        with self._background_lock:
+            background_loop, self._background_loop = self._background_loop, None
+        self._discard_finished_loops()
+        try:
+            current_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            current_loop = None
+
+        for loop, session in list(self._sessions.items()):
+            self._sessions.pop(loop, None)
+            closing = self._close_session(session, self._closers.pop(loop, None))
+            try:
+                if loop is current_loop:
+                    loop.create_task(closing)
+                elif loop.is_running():
+                    asyncio.run_coroutine_threadsafe(closing, loop).result(timeout=5)
+                else:
+                    loop.run_until_complete(closing)
+            except Exception:
+                session.detach()
+
+        if background_loop is not None:
+            background_loop.call_soon_threadsafe(background_loop.stop)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        created = self.metrics["connections_created"]
+        return {
+            **self.metrics,
+            "open_sessions": sum(1 for session in self._sessions.values() if not session.closed),
+            "avg_connect_time": self.metrics["total_connect_time"] / created if created else 0.0,
+            "reuse_rate": self.metrics["connections_reused"] / self.metrics["requests"] if self.metrics["requests"] else 0.0
+        }
+
+def _run_until_stopped(loop: asyncio.AbstractEventLoop) -> None:
+    try:
+        loop.run_forever()
+    finally:
+        loop.close()
+
+_shared_transport: Optional[HTTPTransport] = None
+_shared_lock = threading.Lock()
+
+def get_transport() -> HTTPTransport:
+    """The process-wide transport every Ollama client shares"""
+    global _shared_transport
+    with _shared_lock:
+        if _shared_transport is None:
+            _shared_transport = HTTPTransport()
+            atexit.register(_shared_transport.close)
+        return _shared_transport
+
+def configure_transport(config: HTTPTransportConfig) -> HTTPTransport:
+    """Apply pool and timeout settings to the shared transport; sessions opened afterwards use them"""
+    transport = get_transport()
+    transport.config = config
+    return transport
@@ -6,7 +6,15 @@ Utility functions for working with LLM requests, responses, and conversations.
 """
 
 import re
+import json
+import bisect
+import hashlib
+import threading
 import tiktoken
+from collections import OrderedDict
+from dataclasses import asdict, is_dataclass
+from functools import lru_cache
+from itertools import accumulate
 from typing import List, Dict, Any, Optional, Union
 from datetime import datetime
 
@@ -63,52 +71,145 @@ def create_chat_request(messages: List[LLMMessage],
         **kwargs
     )
 
-def estimate_tokens(text: str, model: str = "gpt-3.5-turbo") -> int:
+# Model names mapped to tiktoken encodings; anything else uses DEFAULT_ENCODING
+ENCODING_MAP = {
+    "gpt-4": "cl100k_base",
+    "gpt-4-turbo": "cl100k_base", 
+    "gpt-4-turbo-preview": "cl100k_base",
+    "gpt-3.5-turbo": "cl100k_base",
+    "text-davinci-003": "p50k_base",
+    "text-davinci-002": "p50k_base",
+    "code-davinci-002": "p50k_base"
+}
+DEFAULT_ENCODING = "cl100k_base"
+MESSAGE_OVERHEAD_TOKENS = 4  # Role, content wrapper, etc.
+
+@lru_cache(maxsize=None)
+def get_encoder(encoding_name: str):
     """
-    Estimate the number of tokens in a text string using tiktoken.
-    Falls back to a simple character-based estimation if tiktoken fails.
+    Process-wide tiktoken encoder for an encoding name, loaded once.
+    Returns None if the encoding cannot be loaded (e.g. offline), so the
+    failure is not retried on every call.
     """
     try:
-        # Map model names to tiktoken encodings
-        encoding_map = {
-            "gpt-4": "cl100k_base",
-            "gpt-4-turbo": "cl100k_base", 
-            "gpt-4-turbo-preview": "cl100k_base",
-            "gpt-3.5-turbo": "cl100k_base",
-            "text-davinci-003": "p50k_base",
-            "text-davinci-002": "p50k_base",
-            "code-davinci-002": "p50k_base"
-        }
+        return tiktoken.get_encoding(encoding_name)
+    except Exception:
+        return None
+
+class TokenCountMemo:
+    """
+    Bounded LRU of token counts keyed on (encoding, content), so text that has
+    been tokenized before, such as the earlier turns of a growing conversation,
+    is never tokenized again. Lookups hash the content string, whose hash
+    Python caches on the string object itself
+    """
+
+    def __init__(self, max_entries: int = 50000):
+        self.max_entries = max_entries
+        self.counts: "OrderedDict[tuple, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def count(self, text: str, encoding_name: str) -> int:
+        encoder = get_encoder(encoding_name)
+        if encoder is None:
+            # Fallback to character-based estimation (roughly 4 chars per token); cheaper than a lookup
+            return len(text) // 4
         
-        encoding_name = encoding_map.get(model, "cl100k_base")
-        encoding = tiktoken.get_encoding(encoding_name)
+        key = (encoding_name, text)
+        with self._lock:
+            tokens = self.counts.get(key)
+            if tokens is not None:
+                self.counts.move_to_end(key)
+                self.hits += 1
+                return tokens
         
-        return len(encoding.encode(text))
+        try:
+            tokens = len(encoder.encode(text))
+        except Exception:
+            tokens = len(text) // 4
         
-    except Exception:
-        # Fallback to character-based estimation (roughly 4 chars per token)
-        return len(text) // 4
+        with self._lock:
+            self.misses += 1
+            self.counts[key] = tokens
+            if len(self.counts) > self.max_entries:
+                self.counts.popitem(last=False)
+        return tokens
+
+    def clear(self) -> None:
+        with self._lock:
+            self.counts.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_metrics(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.counts),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+token_counts = TokenCountMemo()
+
+def estimate_tokens(text: str, model: str = "gpt-3.5-turbo") -> int:
+    """
+    Estimate the number of tokens in a text string using tiktoken.
+    Falls back to a simple character-based estimation if tiktoken fails.
+    """
+    if not text:
+        return 0
+    return token_counts.count(text, ENCODING_MAP.get(model, DEFAULT_ENCODING))
+
+def estimate_message_tokens(message: LLMMessage, model: str = "gpt-3.5-turbo") -> int:
+    """Estimate tokens for one message: content, name and structural overhead"""
+    tokens = MESSAGE_OVERHEAD_TOKENS + estimate_tokens(message.content, model)
+    if message.name:
+        tokens += estimate_tokens(message.name, model)
+    return tokens
 
 def estimate_request_tokens(request: LLMRequest) -> int:
     """Estimate total tokens for a request"""
-    total_tokens = 0
-    
-    for message in request.messages:
-        # Base tokens for message structure
-        total_tokens += 4  # Role, content wrapper, etc.
-        
-        # Content tokens
-        total_tokens += estimate_tokens(message.content, request.model)
-        
-        # Name tokens if present
-        if message.name:
-            total_tokens += estimate_tokens(message.name, request.model)
+    total_tokens = sum(estimate_message_tokens(message, request.model) for message in request.messages)
     
     # Additional tokens for request overhead
     total_tokens += 2
     
     return total_tokens
 
+def canonical_request(request: LLMRequest, context: Any = None) -> Dict[str, Any]:
+    """
+    Canonical form of a request covering everything that affects the completion:
+    messages, model and sampling parameters. Request metadata is excluded.
+    """
+    return {
+        "messages": [
+            [message.role, message.content, message.name, message.function_call]
+            for message in request.messages
+        ],
+        "model": request.model,
+        "temperature": request.temperature,
+        "max_tokens": request.max_tokens,
+        "top_p": request.top_p,
+        "frequency_penalty": request.frequency_penalty,
+        "presence_penalty": request.presence_penalty,
+        "stop": request.stop,
+        "functions": request.functions,
+        "function_call": request.function_call,
+        "context": asdict(context) if is_dataclass(context) else context
+    }
+
+def request_fingerprint(request: LLMRequest, context: Any = None) -> str:
+    """Stable SHA-256 key for a request, e.g. for response caching"""
+    return fingerprint(canonical_request(request, context))
+
+def fingerprint(data: Any) -> str:
+    """SHA-256 of a JSON-serializable structure with sorted keys"""
+    encoded = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
 def format_conversation(messages: List[LLMMessage], 
                        include_metadata: bool = False,
                        timestamp_format: str = "%Y-%m-%d %H:%M:%S") -> str:
@@ -164,7 +265,10 @@ def truncate_conversation(messages: List[LLMMessage],
                          model: str = "gpt-3.5-turbo",
                          keep_system: bool = True) -> List[LLMMessage]:
     """
-    Truncate conversation to fit within token limit while preserving important context
+    Truncate conversation to fit within token limit while preserving important context.
+    Each message is counted once (memoized across calls) and the cut points are
+    found by binary search over prefix sums, so truncation is linear in the
+    conversation length
     """
     if not messages:
         return messages
@@ -173,39 +277,25 @@ def truncate_conversation(messages: List[LLMMessage],
     system_messages = [msg for msg in messages if msg.role == "system"]
     conversation_messages = [msg for msg in messages if msg.role != "system"]
     
-    # Calculate tokens for system messages
-    system_tokens = sum(estimate_tokens(msg.content, model) + 4 for msg in system_messages)
+    # Running token totals for system messages in order
+    system_prefix = list(accumulate(
+        estimate_tokens(msg.content, model) + MESSAGE_OVERHEAD_TOKENS for msg in system_messages
+    ))
+    system_tokens = system_prefix[-1] if system_prefix else 0
     
     if keep_system and system_tokens >= max_tokens:
-        # If system messages alone exceed limit, truncate them
-        truncated_system = []
-        tokens_used = 0
-        
-        for msg in system_messages:
-            msg_tokens = estimate_tokens(msg.content, model) + 4
-            if tokens_used + msg_tokens <= max_tokens:
-                truncated_system.append(msg)
-                tokens_used += msg_tokens
-            else:
-                break
-        
-        return truncated_system
+        # If system messages alone exceed limit, keep the leading ones that fit
+        return system_messages[:bisect.bisect_right(system_prefix, max_tokens)]
     
     # Available tokens for conversation
     available_tokens = max_tokens - (system_tokens if keep_system else 0)
     
-    # Keep most recent messages that fit in available tokens
-    truncated_conversation = []
-    tokens_used = 0
-    
-    # Process messages in reverse order (most recent first)
-    for msg in reversed(conversation_messages):
-        msg_tokens = estimate_tokens(msg.content, model) + 4
-        if tokens_used + msg_tokens <= available_tokens:
-            truncated_conversation.insert(0, msg)
-            tokens_used += msg_tokens
-        else:
-            break
+    # Keep most recent messages that fit: running totals from the newest message backwards
+    recent_prefix = list(accumulate(
+        estimate_tokens(msg.content, model) + MESSAGE_OVERHEAD_TOKENS for msg in reversed(conversation_messages)
+    ))
+    kept = bisect.bisect_right(recent_prefix, available_tokens)
+    truncated_conversation = conversation_messages[len(conversation_messages) - kept:]
     
     # Combine system messages and truncated conversation
     if keep_system:
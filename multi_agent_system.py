@@ -7,7 +7,6 @@ True multi-agent system with autonomous collaboration and complex workflows.
 """
 
 import click
-import requests
 import json
 import time
 import uuid
@@ -16,8 +15,11 @@ from typing import Dict, List, Any, Optional
 from dataclasses import dataclass, asdict
 from pathlib import Path
 
+from framework.llm.transport import get_transport, TRANSPORT_ERRORS
+
 # Ollama API configuration
 OLLAMA_API_BASE = "http://localhost:11434"
+OLLAMA_KEEP_ALIVE = "30m"  # Keep the model and its prompt cache loaded between calls
 DEFAULT_MODEL = "deepseek-coder:latest"
 
 @dataclass
@@ -74,12 +76,13 @@ class OllamaClient:
     
     def __init__(self, base_url=OLLAMA_API_BASE):
         self.base_url = base_url
+        self.transport = get_transport()  # Shared keep-alive connection pool
     
     def is_available(self):
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
-            return response.status_code == 200
-        except requests.RequestException:
+            status, _ = self.transport.request_json_sync("GET", f"{self.base_url}/api/tags", timeout=5)
+            return status == 200
+        except TRANSPORT_ERRORS:
             return False
     
     def generate_with_context(self, model: str, prompt: str, system_prompt: str, 
@@ -96,24 +99,29 @@ class OllamaClient:
             
             full_prompt = context + prompt
             
+            # The agent's system prompt leads every call, so Ollama reuses its evaluated prefix
             payload = {
                 "model": model,
-                "prompt": full_prompt,
-                "system": system_prompt,
-                "stream": False
+                "messages": [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": full_prompt}
+                ],
+                "stream": False,
+                "keep_alive": OLLAMA_KEEP_ALIVE
             }
             
-            response = requests.post(
-                f"{self.base_url}/api/generate",
+            status, data = self.transport.request_json_sync(
+                "POST",
+                f"{self.base_url}/api/chat",
                 json=payload,
                 timeout=45
             )
             
-            if response.status_code == 200:
-                return response.json().get('response', 'No response')
+            if status == 200:
+                return (data or {}).get('message', {}).get('content', 'No response')
             else:
-                return f"Error: HTTP {response.status_code}"
-        except requests.RequestException as e:
+                return f"Error: HTTP {status}"
+        except TRANSPORT_ERRORS as e:
             return f"Connection error: {str(e)}"
 
 class AutonomousAgent:
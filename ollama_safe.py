@@ -7,12 +7,13 @@ Enhanced CLI with real Ollama LLM integration for Windows testing.
 """
 
 import click
-import requests
 import json
 import sys
 import os
 from pathlib import Path
 
+from framework.llm.transport import get_transport, TRANSPORT_ERRORS
+
 # Set UTF-8 encoding for Windows
 if os.name == 'nt':
     import locale
@@ -20,6 +21,7 @@ if os.name == 'nt':
 
 # Ollama API configuration
 OLLAMA_API_BASE = "http://localhost:11434"
+OLLAMA_KEEP_ALIVE = "30m"  # Keep the model and its prompt cache loaded between calls
 DEFAULT_MODEL = "deepseek-r1:1.5b"
 
 class OllamaClient:
@@ -27,48 +29,54 @@ class OllamaClient:
     
     def __init__(self, base_url=OLLAMA_API_BASE):
         self.base_url = base_url
+        self.transport = get_transport()  # Shared keep-alive connection pool
     
     def is_available(self):
         """Check if Ollama service is available"""
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
-            return response.status_code == 200
-        except requests.RequestException:
+            status, _ = self.transport.request_json_sync("GET", f"{self.base_url}/api/tags", timeout=5)
+            return status == 200
+        except TRANSPORT_ERRORS:
             return False
     
     def list_models(self):
         """List available models"""
         try:
-            response = requests.get(f"{self.base_url}/api/tags")
-            if response.status_code == 200:
-                return response.json().get('models', [])
-        except requests.RequestException:
+            status, data = self.transport.request_json_sync("GET", f"{self.base_url}/api/tags")
+            if status == 200:
+                return (data or {}).get('models', [])
+        except TRANSPORT_ERRORS:
             return []
     
     def generate(self, model, prompt, system_prompt=None):
         """Generate response using Ollama"""
         try:
+            # System prompt first, so Ollama reuses its evaluated prefix across calls
+            messages = []
+            if system_prompt:
+                messages.append({"role": "system", "content": system_prompt})
+            messages.append({"role": "user", "content": prompt})
+            
             payload = {
                 "model": model,
-                "prompt": prompt,
-                "stream": False
+                "messages": messages,
+                "stream": False,
+                "keep_alive": OLLAMA_KEEP_ALIVE
             }
             
-            if system_prompt:
-                payload["system"] = system_prompt
-            
-            response = requests.post(
-                f"{self.base_url}/api/generate",
+            status, data = self.transport.request_json_sync(
+                "POST",
+                f"{self.base_url}/api/chat",
                 json=payload,
                 timeout=60
             )
             
-            if response.status_code == 200:
-                return response.json().get('response', 'No response')
+            if status == 200:
+                return (data or {}).get('message', {}).get('content', 'No response')
             else:
-                return f"Error: HTTP {response.status_code}"
+                return f"Error: HTTP {status}"
                 
-        except requests.RequestException as e:
+        except TRANSPORT_ERRORS as e:
             return f"Connection error: {str(e)}"
 
 @click.group(invoke_without_command=True)
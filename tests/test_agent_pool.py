@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+CollegiumAI Agent Pool Test Suite
+=================================
+
+Validates leasing of pre-built agents (shared reference tables, isolation
+of per-request state, fair checkout order, pool metrics) and the streaming
+of agent responses to clients.
+
+Run with: python tests/test_agent_pool.py
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add framework to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+try:
+    from framework.core import UniversityContext, AgentEvent
+    from framework.agents.pool import AgentPool, AgentPoolConfig, AgentPoolExhausted, default_agent_factories
+    from framework.agents.streaming import AgentEventStream, AgentStreamTimeout, InteractionBroadcaster
+    FRAMEWORK_AVAILABLE = True
+except ImportError as e:
+    print(f"❌ Framework import failed: {e}")
+    FRAMEWORK_AVAILABLE = False
+
+def make_context():
+    return UniversityContext(
+        institution_name="Test University",
+        accreditations=[],
+        student_population=1000,
+        academic_programs=["Computer Science"],
+        current_semester="Fall 2025",
+        academic_year="2025-2026"
+    )
+
+class AgentPoolTester:
+    """Test suite for the agent pool"""
+
+    def __init__(self):
+        self.test_results = {}
+        self.passed_tests = 0
+        self.failed_tests = 0
+        self.total_tests = 0
+
+    def log_test(self, test_name: str, passed: bool, details: str = ""):
+        """Log test result"""
+        self.total_tests += 1
+        if passed:
+            self.passed_tests += 1
+            status = "✅ PASS"
+        else:
+            self.failed_tests += 1
+            status = "❌ FAIL"
+
+        print(f"{status} {test_name}")
+        if details:
+            print(f"    {details}")
+
+        self.test_results[test_name] = {
+            'passed': passed,
+            'details': details
+        }
+
+    async def test_shared_tables_and_isolation(self):
+        """Test agents share reference tables but not per-request state"""
+        test_name = "Shared Tables and Lease Isolation"
+
+        try:
+            pool = AgentPool(default_agent_factories(make_context()), AgentPoolConfig(size_per_type=2))
+            await pool.start()
+
+            async with pool.lease("academic_advisor") as first:
+                async with pool.lease("academic_advisor") as second:
+                    assert first is not second
+                    # Reference tables are loaded once and shared
+                    assert first.knowledge_base["course_catalog"] is second.knowledge_base["course_catalog"]
+
+                    await first.process_query("Which courses should I take?", {"user_id": "student1"})
+                    first.update_knowledge_base({"student1_plan": ["CS301"]})
+                    assert len(first.memory) == 1
+                    assert second.memory == [] and "student1_plan" not in second.knowledge_base
+
+            # The next leases see the agents as they were built
+            async with pool.lease("academic_advisor") as first:
+                async with pool.lease("academic_advisor") as second:
+                    for agent in (first, second):
+                        assert agent.memory == []
+                        assert "student1_plan" not in agent.knowledge_base
+                        assert "degree_requirements" in agent.knowledge_base
+
+            try:
+                async with pool.lease("registrar"):
+                    pass
+                assert False, "Unknown agent type was leased"
+            except ValueError:
+                pass
+
+            self.log_test(test_name, True, "Tables shared, memory and knowledge additions reset on return")
+            return True
+
+        except Exception as e:
+            self.log_test(test_name, False, f"Lease isolation error: {e!r}")
+            return False
+
+    async def test_fair_checkout_and_metrics(self):
+        """Test waiting leases are served in arrival order and timeouts are reported"""
+        test_name = "Fair Checkout and Pool Metrics"
+
+        try:
+            pool = AgentPool(
+                default_agent_factories(make_context()),
+                AgentPoolConfig(size_per_type=1, acquire_timeout=0.2)
+            )
+            await pool.start()
+            order = []
+
+            async def hold(name, seconds):
+                async with pool.lease("student_services"):
+                    order.append(name)
+                    await asyncio.sleep(seconds)
+
+            first = asyncio.ensure_future(hold("first", 0.05))
+            await asyncio.sleep(0)
+            waiting = [asyncio.ensure_future(hold(f"waiter{i}", 0.01)) for i in range(3)]
+            await asyncio.sleep(0)
+            status = pool.get_status()["agents"]["student_services"]
+            assert status["in_use"] == 1 and status["waiting"] == 3 and status["utilization"] == 1.0
+
+            await asyncio.gather(first, *waiting)
+            assert order == ["first", "waiter0", "waiter1", "waiter2"]
+
+            # A lease that cannot be served within the timeout fails without losing the agent
+            blocker = asyncio.ensure_future(hold("blocker", 0.5))
+            await asyncio.sleep(0)
+            try:
+                async with pool.lease("student_services"):
+                    pass
+                assert False, "Lease did not time out"
+            except AgentPoolExhausted:
+                pass
+            await blocker
+            async with pool.lease("student_services"):
+                pass
+
+            metrics = pool.get_status()
+            assert metrics["leases"] == 6 and metrics["waited"] == 4 and metrics["timeouts"] == 1
+            assert metrics["p99_wait_time"] >= metrics["p50_wait_time"] > 0
+            assert metrics["agents"]["student_services"]["peak_in_use"] == 1
+            assert metrics["agents"]["student_services"]["idle"] == 1
+
+            self.log_test(test_name, True, f"p50 wait {metrics['p50_wait_time'] * 1000:.1f} ms, "
+                          f"p99 wait {metrics['p99_wait_time'] * 1000:.1f} ms")
+            return True
+
+        except Exception as e:
+            self.log_test(test_name, False, f"Pool checkout error: {e!r}")
+            return False
+
+    async def test_streamed_agent_response(self):
+        """Test streamed events reproduce the response and slow clients get merged tokens"""
+        test_name = "Streamed Agent Response"
+
+        try:
+            agent = default_agent_factories(make_context())["academic_advisor"]("advisor_stream")
+            query = "Which courses should I take next semester?"
+
+            start = time.perf_counter()
+            first_event_at = None
+            events = []
+            async for event in AgentEventStream(agent.process_query_stream(query, {"user_id": "student1"})):
+                if first_event_at is None:
+                    first_event_at = time.perf_counter() - start
+                events.append(event)
+            total = time.perf_counter() - start
+
+            types = [event.event_type for event in events]
+            assert types[0] == "thought" and types[-1] == "final"
+            assert types.index("action") < types.index("compliance") < types.index("token")
+            response = events[-1].data
+            tokens = "".join(event.data for event in events if event.event_type == "token")
+            assert tokens == response.final_response and len(response.final_response) > 0
+            assert first_event_at < total
+            assert all(isinstance(event.to_dict()["data"], (dict, str)) for event in events)
+
+            # process_query returns the same response the stream ends with
+            response = await agent.process_query(query, {"user_id": "student1"})
+            assert response.final_response == tokens
+
+            # A client slower than the agent receives fewer, larger token chunks
+            async def fast_tokens():
+                for i in range(200):
+                    yield AgentEvent("token", f"word{i} ")
+                yield AgentEvent("final", None)
+
+            stream = AgentEventStream(fast_tokens(), max_buffered=4)
+            chunks = []
+            async for event in stream:
+                await asyncio.sleep(0.001)
+                chunks.append(event)
+            text = "".join(event.data for event in chunks if event.event_type == "token")
+            assert text == "".join(f"word{i} " for i in range(200))
+            assert chunks[-1].event_type == "final"
+            assert len(chunks) < 100 and stream.metrics["coalesced_tokens"] > 100
+
+            # A client that stops reading ends the stream after the send timeout
+            async def steps():
+                for i in range(20):
+                    yield AgentEvent("thought", i)
+
+            stream = AgentEventStream(steps(), max_buffered=2, send_timeout=0.05)
+            received = 0
+            try:
+                async for _ in stream:
+                    received += 1
+                    if received == 1:
+                        await asyncio.sleep(0.3)
+                assert False, "Stalled client was not timed out"
+            except AgentStreamTimeout:
+                pass
+            assert received < 20 and stream.metrics["blocked_sends"] > 0
+
+            self.log_test(test_name, True, f"first event after {first_event_at * 1000:.0f} ms of {total * 1000:.0f} ms, "
+                          f"{len(chunks)} chunks for 200 tokens to a slow client")
+            return True
+
+        except Exception as e:
+            self.log_test(test_name, False, f"Streaming error: {e!r}")
+            return False
+
+    async def test_interaction_broadcast(self):
+        """Test subscribers receive published interactions and slow ones lose the oldest"""
+        test_name = "Interaction Broadcast"
+
+        try:
+            broadcaster = InteractionBroadcaster(max_buffered=3)
+            received = []
+
+            async def listen(count):
+                async with broadcaster.subscribe() as updates:
+                    async for update in updates:
+                        received.append(update)
+                        if len(received) == count:
+                            break
+
+            listener = asyncio.ensure_future(listen(2))
+            await asyncio.sleep(0)
+            assert broadcaster.get_status()["subscribers"] == 1
+            broadcaster.publish("first")
+            broadcaster.publish("second")
+            await listener
+            assert received == ["first", "second"]
+            assert broadcaster.get_status()["subscribers"] == 0
+
+            # Publishing never waits on a subscriber that is not reading
+            async with broadcaster.subscribe() as updates:
+                for i in range(6):
+                    broadcaster.publish(i)
+                assert [await updates.__anext__() for _ in range(3)] == [3, 4, 5]
+            assert broadcaster.metrics["dropped"] == 3
+            assert broadcaster.get_status()["subscribers"] == 0
+
+            self.log_test(test_name, True, "Updates delivered in order, oldest dropped for slow subscribers")
+            return True
+
+        except Exception as e:
+            self.log_test(test_name, False, f"Broadcast error: {e!r}")
+            return False
+
+    async def run_all_tests(self):
+        """Run all tests"""
+        print("🧪 CollegiumAI Agent Pool and Streaming Test Suite")
+        print("=" * 50)
+        print()
+
+        if not FRAMEWORK_AVAILABLE:
+            self.log_test("Framework Imports", False, "Framework modules not available")
+            return self.print_summary()
+
+        async_tests = [
+            self.test_shared_tables_and_isolation,
+            self.test_fair_checkout_and_metrics,
+            self.test_streamed_agent_response,
+            self.test_interaction_broadcast
+        ]
+
+        for test in async_tests:
+            await test()
+
+        print()
+        return self.print_summary()
+
+    def print_summary(self):
+        """Print test summary"""
+        print("📊 TEST SUMMARY")
+        print("=" * 30)
+        print(f"Total Tests: {self.total_tests}")
+        print(f"Passed: {self.passed_tests}")
+        print(f"Failed: {self.failed_tests}")
+
+        if self.failed_tests == 0:
+            print("\n🎉 All agent tests passed!")
+        else:
+            failed_tests = [name for name, result in self.test_results.items() if not result['passed']]
+            print("\nFailed Tests:")
+            for test_name in failed_tests:
+                print(f"  - {test_name}: {self.test_results[test_name]['details']}")
+
+        print()
+        return self.failed_tests == 0
+
+def main():
+    """Main test entry point"""
+    tester = AgentPoolTester()
+    success = asyncio.run(tester.run_all_tests())
+    return 0 if success else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
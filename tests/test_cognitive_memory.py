@@ -0,0 +1,834 @@
+#!/usr/bin/env python3
+"""
+CollegiumAI Cognitive Memory Test Suite
+=======================================
+
+Validates the indexed retrieval paths of the cognitive memory systems
+against their straightforward reference behaviour.
+
+Run with: python tests/test_cognitive_memory.py
+"""
+
+import asyncio
+import random
+import math
+import os
+import sys
+import tempfile
+import numpy as np
+from collections import defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add framework to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+try:
+    from framework.cognitive.memory import (WorkingMemory, EpisodicMemory, Episode, LongTermMemory, CognitiveMemory,
+                                            SemanticActivationGraph)
+    from framework.cognitive.memory_snapshot import MemorySnapshot
+    from framework.cognitive.cognitive_core import CognitiveEngine, CognitivePhase, PhaseGraph
+    from framework.cognitive.request_batching import RequestBatcher
+    from framework.cognitive.persona_cognition import PersonaCognitiveAgent, PersonaType
+    FRAMEWORK_AVAILABLE = True
+except ImportError as e:
+    print(f"❌ Framework import failed: {e}")
+    FRAMEWORK_AVAILABLE = False
+
+class CognitiveMemoryTester:
+    """Test suite for cognitive memory systems"""
+    
+    def __init__(self):
+        self.test_results = {}
+        self.passed_tests = 0
+        self.failed_tests = 0
+        self.total_tests = 0
+    
+    def log_test(self, test_name: str, passed: bool, details: str = ""):
+        """Log test result"""
+        self.total_tests += 1
+        if passed:
+            self.passed_tests += 1
+            status = "✅ PASS"
+        else:
+            self.failed_tests += 1
+            status = "❌ FAIL"
+        
+        print(f"{status} {test_name}")
+        if details:
+            print(f"    {details}")
+        
+        self.test_results[test_name] = {
+            'passed': passed,
+            'details': details
+        }
+    
+    async def test_working_memory_index(self):
+        """Test indexed working memory retrieval matches a linear scan"""
+        test_name = "Working Memory Inverted Index"
+        
+        try:
+            rng = random.Random(7)
+            vocabulary = [f"word{i}" for i in range(60)]
+            memory = WorkingMemory("student")
+            memory.capacity = 50
+            
+            for _ in range(80):
+                await memory.store(" ".join(rng.sample(vocabulary, 5)), {"type": "test"}, rng.sample(vocabulary, 1))
+            
+            # Evicted traces must leave the index
+            assert len(memory.memories) == 50
+            assert set(memory.trace_tokens) == set(memory.memories)
+            indexed_ids = set().union(*memory.token_index.values())
+            assert indexed_ids == set(memory.memories)
+            
+            for _ in range(20):
+                query = " ".join(rng.sample(vocabulary, 4))
+                expected = {tid for tid, trace in memory.memories.items()
+                            if memory._calculate_similarity(query, trace) >= 0.1}
+                retrieved = await memory.retrieve(query, 0.1)
+                assert {t.trace_id for t in retrieved} == expected
+            
+            await memory.clear_related_items(["word1", "word2"])
+            assert set(memory.trace_tokens) == set(memory.memories)
+            
+            self.log_test(test_name, True, "Indexed retrieval matches linear scan")
+            return True
+            
+        except Exception as e:
+            self.log_test(test_name, False, f"Working memory index error: {e}")
+            return False
+    
+    async def test_episodic_candidate_retrieval(self):
+        """Test candidate-based episode retrieval matches a full scan"""
+        test_name = "Episodic Candidate Retrieval"
+        
+        try:
+            rng = random.Random(11)
+            vocabulary = [f"topic{i}" for i in range(30)]
+            memory = EpisodicMemory("student")
+            
+            for _ in range(300):
+                context = {"type": rng.choice(["academic", "social"]), "situation": rng.choice(["a", "b"])}
+                await memory.store_episode(
+                    {"events": [{"action": rng.choice(vocabulary)}]}, context, rng.sample(vocabulary, 2)
+                )
+            
+            for threshold in [0.2, 0.5, 0.7]:
+                query = {"context": {"type": "academic", "situation": "a"}, "tags": rng.sample(vocabulary, 2)}
+                expected = {e.episode_id for e in memory.episodes.values()
+                            if memory._calculate_episode_similarity_sync(query, e) >= threshold}
+                retrieved = await memory.retrieve_similar_episodes(query, threshold)
+                assert {e.episode_id for e in retrieved} == expected
+                
+                top = await memory.retrieve_similar_episodes(query, threshold, max_results=3)
+                assert [e.episode_id for e in top] == [e.episode_id for e in retrieved[:3]]
+            
+            self.log_test(test_name, True, "Candidate retrieval matches full scan")
+            return True
+            
+        except Exception as e:
+            self.log_test(test_name, False, f"Episodic retrieval error: {e}")
+            return False
+    
+    async def test_episodic_temporal_index(self):
+        """Test sorted temporal index range queries and capacity eviction"""
+        test_name = "Episodic Temporal Index"
+        
+        try:
+            rng = random.Random(5)
+            memory = EpisodicMemory("student")
+            memory.max_episodes = 200
+            memory.temporal_index.min_compaction = 16
+            base_time = datetime(2026, 1, 1)
+            
+            for _ in range(500):
+                episode = Episode(timestamp=base_time + timedelta(minutes=rng.randint(0, 1000)),
+                                  importance=rng.random())
+                await memory.store_episode(episode)
+            
+            # Capacity keeps the most important episodes
+            assert len(memory.episodes) == 200
+            assert len(memory.temporal_index) == 200
+            
+            start, end = base_time + timedelta(minutes=200), base_time + timedelta(minutes=600)
+            expected = sorted((e.timestamp, e.episode_id) for e in memory.episodes.values()
+                              if start <= e.timestamp <= end)
+            retrieved = await memory.retrieve_by_timeframe(start, end)
+            assert [e.timestamp for e in retrieved] == [t for t, _ in expected]
+            assert {e.episode_id for e in retrieved} == {eid for _, eid in expected}
+            assert memory.temporal_index.compactions > 0
+            
+            self.log_test(test_name, True, "Range queries and eviction consistent")
+            return True
+            
+        except Exception as e:
+            self.log_test(test_name, False, f"Temporal index error: {e}")
+            return False
+    
+    async def test_semantic_association_candidates(self):
+        """Test prefix-filtered associations match an all-pairs comparison"""
+        test_name = "Semantic Association Candidates"
+        
+        try:
+            rng = random.Random(9)
+            # Skewed vocabulary so some keywords are far more common than others
+            vocabulary = [f"keyword{i}" for i in range(80)]
+            weights = [1.0 / (i + 1) for i in range(80)]
+            memory = LongTermMemory("faculty")
+            
+            for _ in range(250):
+                words = rng.choices(vocabulary, weights=weights, k=rng.randint(2, 12))
+                await memory.store_semantic(" ".join(words))
+            
+            for concept_id, concept in memory.semantic_network.items():
+                keywords = set(concept["keywords"])
+                expected = set()
+                for other_id, other in memory.semantic_network.items():
+                    other_keywords = set(other["keywords"])
+                    if other_id != concept_id and keywords & other_keywords:
+                        if len(keywords & other_keywords) / len(keywords | other_keywords) > 0.2:
+                            expected.add(other_id)
+                assert {a["target_id"] for a in concept["associations"]} == expected
+            
+            self.log_test(test_name, True, "Associations match all-pairs comparison")
+            return True
+            
+        except Exception as e:
+            self.log_test(test_name, False, f"Semantic association error: {e}")
+            return False
+    
+    async def test_compiled_spreading_activation(self):
+        """Test CSR spreading activation matches the association-list walk"""
+        test_name = "Compiled Spreading Activation"
+        
+        try:
+            rng = random.Random(13)
+            vocabulary = [f"idea{i}" for i in range(40)]
+            memory = LongTermMemory("faculty")
+            memory.activation_graph.min_merge = 32  # Exercise CSR merges and compaction
+            
+            concept_ids = []
+            for _ in range(200):
+                concept_ids.append(await memory.store_semantic(" ".join(rng.sample(vocabulary, rng.randint(2, 6)))))
+            for concept_id in rng.sample(concept_ids, 80):
+                await memory._remove_concept(concept_id)
+            for _ in range(20):
+                await memory.store_semantic(" ".join(rng.sample(vocabulary, 4)))
+            
+            def walk_associations(query):
+                activated = defaultdict(float)
+                for keyword in memory._extract_keywords(str(query)):
+                    for concept_id in memory.concept_index.get(keyword, {}):
+                        activated[concept_id] += 0.3
+                for _ in range(3):
+                    new_activations = dict(activated)
+                    for concept_id, activation in activated.items():
+                        if activation > 0.1:
+                            for association in memory.semantic_network[concept_id]["associations"]:
+                                new_activations[association["target_id"]] = (
+                                    new_activations.get(association["target_id"], 0.0)
+                                    + activation * association["strength"] * 0.5)
+                    activated = new_activations
+                return activated
+            
+            assert memory.activation_graph.compilations > 0
+            for _ in range(20):
+                query = {"topic": " ".join(rng.sample(vocabulary, 3))}
+                expected = walk_associations(query)
+                retrieved = await memory.retrieve_relevant_knowledge(query, 0.5)
+                retrieved_ids = {c["concept_id"] for c in retrieved}
+                assert {cid for cid, value in expected.items() if value >= 0.5 + 1e-9} <= retrieved_ids
+                assert retrieved_ids <= {cid for cid, value in expected.items() if value >= 0.5 - 1e-9}
+                for concept in retrieved:
+                    assert abs(concept["activation"] - expected[concept["concept_id"]]) < 1e-9
+                
+                top = await memory.retrieve_relevant_knowledge(query, 0.5, max_results=2)
+                assert [c["concept_id"] for c in top] == [c["concept_id"] for c in retrieved[:2]]
+            
+            self.log_test(test_name, True, "CSR activation matches association walk")
+            return True
+            
+        except Exception as e:
+            self.log_test(test_name, False, f"Spreading activation error: {e!r}")
+            return False
+    
+    async def test_pending_edge_spreading(self):
+        """Test spreading activation over edges that have not been compiled yet"""
+        test_name = "Pending Edge Spreading"
+        
+        try:
+            edges = [("a", "b", 0.8), ("b", "c", 0.6), ("c", "d", 0.4)]
+            graph = SemanticActivationGraph()  # Default min_merge keeps every edge pending
+            for concept_id in ("a", "b", "c", "d"):
+                graph.add_node(concept_id)
+            for source, target, strength in edges:
+                graph.add_edge(source, target, strength)
+            assert graph.compilations == 0
+            
+            expected = {"a": 1.0}
+            for _ in range(3):
+                spread = dict(expected)
+                for source, target, strength in edges:
+                    if expected.get(source, 0.0) > 0.1:
+                        spread[target] = spread.get(target, 0.0) + expected[source] * strength * 0.5
+                expected = spread
+            
+            # Only the pending edge lists are gathered, so bincount sees no CSR edges
+            activation = graph.spread({"a": 1.0})
+            assert activation.dtype == np.float64
+            for concept_id, value in expected.items():
+                assert abs(activation[graph.node_index[concept_id]] - value) < 1e-9
+            
+            memory = LongTermMemory("faculty")
+            for content in ("algebra geometry", "geometry topology", "topology analysis"):
+                await memory.store_semantic(content)
+            assert memory.activation_graph.compilations == 0
+            retrieved = await memory.retrieve_relevant_knowledge("algebra", 0.1)
+            assert retrieved and retrieved[0]["content"] == "algebra geometry"
+            
+            self.log_test(test_name, True, "Uncompiled edges spread like compiled ones")
+            return True
+            
+        except Exception as e:
+            self.log_test(test_name, False, f"Pending edge spreading error: {e!r}")
+            return False
+    
+    async def test_columnar_trace_decay(self):
+        """Test vectorized working memory decay against per-trace decay"""
+        test_name = "Columnar Trace Decay"
+        
+        try:
+            memory = WorkingMemory("faculty")
+            trace_ids = [await memory.store(f"item {i}", {"type": "test"}, ["decay"]) for i in range(9)]
+            for offset, trace_id in enumerate(trace_ids):
+                memory.memories[trace_id].strength = 0.1 + offset * 0.1
+            
+            await memory.apply_decay(1.0)
+            
+            # Strength s survives when s * exp(-0.3) >= 0.1
+            survivors = [trace_ids[i] for i in range(9) if (0.1 + i * 0.1) * math.exp(-0.3) >= 0.1 + 1e-6]
+            assert set(memory.memories) == set(survivors)
+            assert len(memory.trace_store) == len(survivors)
+            
+            detached = memory.memories[survivors[0]]
+            expected_strength = detached.strength
+            await memory.clear_related_items(["decay"])
+            assert detached._store is None and abs(detached.strength - expected_strength) < 1e-9
+            assert len(memory.trace_store) == 0
+            
+            self.log_test(test_name, True, "Vectorized decay and eviction consistent")
+            return True
+            
+        except Exception as e:
+            self.log_test(test_name, False, f"Columnar trace error: {e!r}")
+            return False
+    
+    async def test_memory_snapshot_roundtrip(self):
+        """Test snapshot, incremental checkpoint and restore of CognitiveMemory"""
+        test_name = "Memory Snapshot Round Trip"
+        
+        try:
+            rng = random.Random(21)
+            vocabulary = [f"subject{i}" for i in range(40)]
+            memory = CognitiveMemory("student")
+            
+            await memory.working_memory.store("advising notes", {"type": "test"}, ["notes"])
+            for _ in range(100):
+                await memory.episodic_memory.store_episode(
+                    {"events": [{"action": rng.choice(vocabulary)}], "importance": rng.random()},
+                    {"type": "academic"}, [rng.choice(vocabulary)]
+                )
+                await memory.long_term_memory.store_semantic(" ".join(rng.sample(vocabulary, 5)))
+            
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, "memory.snap")
+                await memory.save_snapshot(path)
+                
+                await memory.long_term_memory.store_semantic(" ".join(rng.sample(vocabulary, 5)))
+                await memory.long_term_memory._remove_concept(next(iter(memory.long_term_memory.semantic_network)))
+                result = await memory.checkpoint(path)
+                assert result["kind"] == "delta" and result["new_records"]["semantic"] == 1
+                
+                with MemorySnapshot(path) as snapshot:
+                    assert len(snapshot.segments) == 2
+                
+                restored = CognitiveMemory("student")
+                await restored.load_snapshot(path)
+            
+            assert set(restored.long_term_memory.semantic_network) == set(memory.long_term_memory.semantic_network)
+            assert set(restored.episodic_memory.episodes) == set(memory.episodic_memory.episodes)
+            assert list(restored.working_memory.memories) == list(memory.working_memory.memories)
+            
+            query = " ".join(vocabulary[:8])
+            original = await memory.long_term_memory.retrieve_relevant_knowledge(query, 0.3)
+            reloaded = await restored.long_term_memory.retrieve_relevant_knowledge(query, 0.3)
+            assert [c["concept_id"] for c in original] == [c["concept_id"] for c in reloaded]
+            
+            self.log_test(test_name, True, "Snapshot restore reproduces memory state")
+            return True
+            
+        except Exception as e:
+            self.log_test(test_name, False, f"Memory snapshot error: {e!r}")
+            return False
+    
+    async def test_background_consolidation(self):
+        """Test queued consolidation, backpressure and the decay timer"""
+        test_name = "Background Consolidation"
+        
+        try:
+            memory = CognitiveMemory("student")
+            memory.last_decay_update = datetime.now() - timedelta(hours=2)
+            scheduler = await memory.start_consolidation_scheduler(
+                max_queue_size=4, max_per_wakeup=3, decay_interval=0.01
+            )
+            
+            for i in range(20):
+                episode_id = await memory.schedule_consolidation({
+                    "context": {"type": "academic", "situation": f"case {i}"},
+                    "events": [{"action": f"step {i}"}],
+                    "importance": 0.5
+                })
+                assert episode_id is None
+            
+            await scheduler.flush()
+            await asyncio.sleep(0.05)
+            metrics = scheduler.get_metrics()
+            await memory.stop_consolidation_scheduler()
+            
+            assert len(memory.episodic_memory.episodes) == 20
+            assert metrics["consolidated"] == 20 and metrics["queue_depth"] == 0
+            assert metrics["backpressure_waits"] > 0 and metrics["average_per_wakeup"] > 1
+            assert metrics["decay_runs"] >= 1 and not scheduler.running
+            
+            # Without a running scheduler consolidation happens inline
+            assert await memory.schedule_consolidation({"context": {}, "events": []}) is not None
+            
+            self.log_test(test_name, True, f"{metrics['wakeups']} wakeups, max lag {metrics['max_lag'] * 1000:.1f} ms")
+            return True
+            
+        except Exception as e:
+            self.log_test(test_name, False, f"Background consolidation error: {e!r}")
+            return False
+    
+    async def test_consolidation_stop_and_cancel(self):
+        """Test the scheduler stops promptly while idle, mid-episode and when cancelled"""
+        test_name = "Consolidation Stop and Cancel"
+        
+        try:
+            # Idle worker with a busy decay timer
+            memory = CognitiveMemory("student")
+            scheduler = await memory.start_consolidation_scheduler(decay_interval=0.001)
+            await asyncio.sleep(0.02)
+            await asyncio.wait_for(memory.stop_consolidation_scheduler(), 1.0)
+            decay_runs = scheduler.metrics["decay_runs"]
+            await asyncio.sleep(0.02)
+            assert decay_runs > 0 and scheduler.metrics["decay_runs"] == decay_runs
+            assert scheduler.worker_task is None and scheduler.decay_task is None
+            
+            # Stopping without draining interrupts a slow consolidation
+            memory = CognitiveMemory("student")
+            started = asyncio.Event()
+            
+            async def slow_consolidate(episode_data):
+                started.set()
+                await asyncio.sleep(10)
+            
+            memory.consolidate_episode = slow_consolidate
+            scheduler = await memory.start_consolidation_scheduler(decay_interval=60, max_per_wakeup=2)
+            for i in range(4):
+                await memory.schedule_consolidation({"context": {}, "events": [{"action": f"step {i}"}]})
+            await asyncio.wait_for(started.wait(), 1.0)
+            await asyncio.wait_for(memory.stop_consolidation_scheduler(drain=False), 1.0)
+            assert not scheduler.running and scheduler.metrics["consolidated"] == 0
+            
+            # Discarded episodes are neither pending nor awaited after a restart
+            metrics = scheduler.get_metrics()
+            assert metrics["discarded"] == 4 and metrics["queue_depth"] == 0
+            assert metrics["oldest_pending_age"] == 0.0 and not scheduler.pending_since
+            del memory.consolidate_episode
+            await scheduler.start()
+            await memory.schedule_consolidation({"context": {}, "events": []})
+            await asyncio.wait_for(scheduler.flush(), 1.0)
+            assert scheduler.metrics["consolidated"] == 1 and not scheduler.pending_since
+            await scheduler.stop()
+            
+            # Cancelling the owner of the worker still propagates through a running consolidation
+            scheduler = await memory.start_consolidation_scheduler(decay_interval=60)
+            await memory.schedule_consolidation({"context": {}, "events": []})
+            await asyncio.sleep(0.01)
+            worker = scheduler.worker_task
+            worker.cancel()
+            try:
+                await asyncio.wait_for(worker, 1.0)
+            except asyncio.CancelledError:
+                pass
+            assert worker.cancelled() and not scheduler.running
+            await asyncio.wait_for(scheduler.stop(drain=False), 1.0)
+            assert scheduler.decay_task is None
+            
+            self.log_test(test_name, True, "Scheduler stopped within timeout in all cases")
+            return True
+            
+        except Exception as e:
+            self.log_test(test_name, False, f"Consolidation stop error: {e!r}")
+            return False
+    
+    async def test_batched_knowledge_retrieval(self):
+        """Test batched spreading activation and working memory updates against per-query processing"""
+        test_name = "Batched Knowledge Retrieval"
+        
+        try:
+            rng = random.Random(17)
+            vocabulary = [f"topic{i}" for i in range(60)]
+            memory = LongTermMemory("faculty")
+            for _ in range(400):
+                await memory.store_semantic(" ".join(rng.sample(vocabulary, 6)))
+            await memory._remove_concept(next(iter(memory.semantic_network)))
+            
+            queries = [" ".join(rng.sample(vocabulary, rng.randint(0, 4))) for _ in range(25)]
+            batched = await memory.retrieve_relevant_knowledge_batch(queries, 0.4, max_batch_cells=4000)
+            for query, batch_result in zip(queries, batched):
+                single = await memory.retrieve_relevant_knowledge(query, 0.4)
+                assert [c["concept_id"] for c in single] == [c["concept_id"] for c in batch_result]
+            
+            initials = [memory._initial_activation(query) for query in queries]
+            matrix = memory.activation_graph.spread_batch(initials)
+            for row, initial in enumerate(initials):
+                assert (matrix[row] == memory.activation_graph.spread(initial)).all()
+            
+            sequential, batch = WorkingMemory("student"), WorkingMemory("student")
+            updates = [({"query": f"request {i}"}, [f"episode {i}"] if i % 2 else [], [f"concept {i}"])
+                       for i in range(6)]
+            for update in updates:
+                await sequential.update(*update)
+            await batch.update_batch(updates)
+            contents = lambda wm: [str(wm.memories[tid].content) for tid in wm.active_chunk_ids]
+            assert contents(sequential) == contents(batch)
+            
+            self.log_test(test_name, True, "Batched retrieval matches per-query retrieval")
+            return True
+            
+        except Exception as e:
+            self.log_test(test_name, False, f"Batched retrieval error: {e!r}")
+            return False
+    
+    async def test_phase_graph_scheduling(self):
+        """Test phase graph validation, wave ordering, concurrency and deferred phases"""
+        test_name = "Phase Graph Scheduling"
+        
+        try:
+            calls = []
+            
+            def handler(name, delay=0.0):
+                async def run(*dependencies):
+                    calls.append(name)
+                    await asyncio.sleep(delay)
+                    return (name, dependencies)
+                return run
+            
+            for phases, error in [
+                ([CognitivePhase("a", handler("a"), ("b",)), CognitivePhase("b", handler("b"), ("a",))], "Cyclic"),
+                ([CognitivePhase("a", handler("a"), ("missing",))], "unknown"),
+                ([CognitivePhase("a", handler("a"), ("input",), deferred=True),
+                  CognitivePhase("b", handler("b"), ("a",))], "deferred")
+            ]:
+                try:
+                    PhaseGraph(phases, inputs=("input",))
+                    raise AssertionError(f"{error} dependency accepted")
+                except ValueError as e:
+                    assert error in str(e)
+            
+            graph = PhaseGraph([
+                CognitivePhase("log", handler("log"), ("root", "left"), deferred=True),
+                CognitivePhase("join", handler("join"), ("left", "right")),
+                CognitivePhase("left", handler("left", 0.05), ("root",)),
+                CognitivePhase("right", handler("right", 0.05), ("root",)),
+                CognitivePhase("root", handler("root"), ("input",)),
+                CognitivePhase("audit", handler("audit"), ("log",), deferred=True)
+            ], inputs=("input",))
+            assert [[phase.name for phase in wave] for wave in graph.waves] == [
+                ["root"], ["left", "right"], ["log", "join"], ["audit"]]
+            
+            results, timings = {"input": 1}, {}
+            start = asyncio.get_running_loop().time()
+            await graph.run(results, timings)
+            elapsed = asyncio.get_running_loop().time() - start
+            assert calls == ["root", "left", "right", "join"] and elapsed < 0.09  # left and right overlap
+            assert results["join"] == ("join", (results["left"], results["right"]))
+            assert "log" not in results and set(timings) == {"root", "left", "right", "join"}
+            assert timings["left"] >= 0.04
+            
+            await graph.run(results, timings, deferred=True)
+            assert calls[4:] == ["log", "audit"] and results["audit"] == ("audit", (results["log"],))
+            
+            calls.clear()
+            await graph.run({"input": 1}, {}, concurrent=False)
+            assert calls == ["root", "left", "right", "join"]
+            
+            self.log_test(test_name, True, f"{len(graph.waves)} waves, concurrent wave in {elapsed * 1000:.0f} ms")
+            return True
+            
+        except Exception as e:
+            self.log_test(test_name, False, f"Phase graph error: {e!r}")
+            return False
+    
+    async def test_cognitive_batch_processing(self):
+        """Test batched cognitive cycles against per-input cycles and deferred learning"""
+        test_name = "Cognitive Batch Processing"
+        
+        try:
+            class AdaptiveLearning:
+                def __init__(self):
+                    self.episodes = []
+                
+                async def update_from_episode(self, episode):
+                    await asyncio.sleep(0.01)
+                    self.episodes.append(episode["cycle_id"])
+            
+            class LearningSystem:
+                def __init__(self):
+                    self.adaptive_learning = AdaptiveLearning()
+            
+            rng = random.Random(29)
+            vocabulary = [f"course{i}" for i in range(30)]
+            memory = CognitiveMemory("student")
+            for _ in range(150):
+                await memory.long_term_memory.store_semantic(" ".join(rng.sample(vocabulary, 4)))
+            
+            engine = CognitiveEngine("student")
+            engine.memory_system = memory
+            engine.learning_system = LearningSystem()
+            inputs = [{"query": " ".join(rng.sample(vocabulary, 3))} for _ in range(8)]
+            
+            batched = await engine.process_cognitive_batch(inputs)
+            # Learning is deferred until after the responses are returned
+            assert engine.learning_system.adaptive_learning.episodes == []
+            assert engine.deferred_phase_tasks
+            await engine.drain_deferred_phases()
+            assert not engine.deferred_phase_tasks
+            assert engine.learning_system.adaptive_learning.episodes == [r["cycle_id"] for r in batched]
+            
+            engine.defer_post_response_phases = False
+            retrieved = 0
+            for input_data, batch_result in zip(inputs, batched):
+                single = await engine.process_cognitive_cycle(input_data)
+                assert "error" not in single and batch_result["batch_size"] == len(inputs)
+                concepts = lambda result: [c["concept_id"] for c in result["reasoning_output"]["semantic_context"]]
+                assert concepts(single) == concepts(batch_result)
+                retrieved += len(concepts(single))
+                assert "learning" in single["phase_timings"] and "perception" in single["phase_timings"]
+            
+            assert retrieved > 0
+            stats = engine.phase_statistics
+            assert stats["semantic_retrieval"]["count"] == 1 + len(inputs)
+            assert stats["learning"]["count"] == 1 + len(inputs)
+            assert stats["learning"]["max_time"] >= 0.01
+            
+            # A failed batch finishes each cycle on its own, without repeating the phases it completed
+            perceived = []
+            perception = engine.phase_graph.phases["perception"]
+            perceive = perception.handler
+            async def counting_perception(input_data):
+                perceived.append(input_data["query"])
+                return await perceive(input_data)
+            perception.handler = counting_perception
+            
+            async def failing_batch(*_):
+                raise RuntimeError("batch retrieval failed")
+            
+            engine.phase_graph.phases["semantic_retrieval"].batch_handler = failing_batch
+            fallback = await engine.process_cognitive_batch(inputs[:3])
+            assert len(fallback) == 3 and all("error" not in r and "batch_size" not in r for r in fallback)
+            assert perceived == [input_data["query"] for input_data in inputs[:3]]
+            for single, resumed in zip(batched, fallback):
+                assert concepts(single) == concepts(resumed)
+            
+            # A phase failing for one input leaves the others' results intact; only that input errors
+            engine.phase_graph.phases["semantic_retrieval"].batch_handler = None
+            causal = engine.phase_graph.phases["causal_reasoning"]
+            reason_causally = causal.handler
+            async def failing_causal(memory_context):
+                if memory_context["perceived"].get("query") == inputs[1]["query"]:
+                    raise RuntimeError("causal model unavailable")
+                return await reason_causally(memory_context)
+            causal.handler = failing_causal
+            perceived.clear()
+            partial_failure = await engine.process_cognitive_batch(inputs[:3])
+            assert [("error" in r) for r in partial_failure] == [False, True, False]
+            assert len(perceived) == 3
+            causal.handler, perception.handler = reason_causally, perceive
+            assert await engine.process_cognitive_batch([]) == []
+            
+            self.log_test(test_name, True, f"{len(inputs)} inputs batched, deferred learning drained")
+            return True
+            
+        except Exception as e:
+            self.log_test(test_name, False, f"Cognitive batch error: {e!r}")
+            return False
+    
+    async def test_request_micro_batching(self):
+        """Test size- and window-triggered dispatch, result fan-out and failed batches"""
+        test_name = "Request Micro-Batching"
+        
+        try:
+            batches = []
+            
+            async def process_batch(requests):
+                batches.append(list(requests))
+                if "fail" in requests:
+                    raise RuntimeError("batch failed")
+                await asyncio.sleep(0.01)
+                return [request * 2 for request in requests]
+            
+            batcher = RequestBatcher(process_batch, max_batch_size=4, batch_window=0.05)
+            
+            # A full batch is dispatched without waiting for the window
+            start = asyncio.get_running_loop().time()
+            results = await asyncio.gather(*(batcher.submit(i) for i in range(4)))
+            assert results == [0, 2, 4, 6] and batches == [[0, 1, 2, 3]]
+            assert asyncio.get_running_loop().time() - start < 0.04
+            assert batcher.window_timer is None
+            
+            # A partial batch waits for the window, then results go back to their callers
+            start = asyncio.get_running_loop().time()
+            results = await asyncio.gather(*(batcher.submit(i) for i in range(10, 16)))
+            assert results == [20, 22, 24, 26, 28, 30]
+            assert batches[1:] == [[10, 11, 12, 13], [14, 15]]
+            assert asyncio.get_running_loop().time() - start >= 0.045
+            
+            # Every caller in a failed batch receives the error
+            outcomes = await asyncio.gather(batcher.submit(1), batcher.submit("fail"), return_exceptions=True)
+            assert all(isinstance(outcome, RuntimeError) for outcome in outcomes)
+            
+            pending = asyncio.ensure_future(batcher.submit(7))
+            await asyncio.sleep(0)
+            await batcher.close()
+            assert await pending == 14
+            
+            metrics = batcher.get_metrics()
+            assert metrics["size_triggered"] == 2 and metrics["window_triggered"] == 2
+            assert metrics["batches"] == 5 and metrics["failed_batches"] == 1
+            assert metrics["batched_requests"] == metrics["requests"] == 13 and metrics["largest_batch"] == 4
+            
+            self.log_test(test_name, True, f"{metrics['batches']} batches, average size {metrics['average_batch_size']:.1f}")
+            return True
+            
+        except Exception as e:
+            self.log_test(test_name, False, f"Request batching error: {e!r}")
+            return False
+    
+    async def test_batched_request_processing(self):
+        """Test batched persona scoring and request processing against per-request processing"""
+        test_name = "Batched Request Processing"
+        
+        try:
+            requests = [
+                {"query": "I feel stressed about my course deadline"},
+                {"query": "help with research funding and my thesis advisor", "type": "academic"},
+                {"query": "where is the library"},
+                {"query": "I am overwhelmed and anxious about tuition and financial aid " * 4},
+                {}
+            ]
+            
+            scored = 0
+            for persona_type in PersonaType:
+                agent = PersonaCognitiveAgent(persona_type)
+                batch_scores = agent._score_request_batch(requests)
+                for request, scores in zip(requests, batch_scores):
+                    support_indicators = scores.pop("support_indicators")
+                    assert scores == agent._score_request(request)
+                    assert support_indicators == await agent._identify_support_indicators(request)
+                    scored += 1
+            
+            agent = PersonaCognitiveAgent(PersonaType.TRADITIONAL_STUDENT)
+            batched = await agent.process_request_batch(requests)
+            assert len(batched) == len(requests) and not agent.active_sessions
+            for request, batch_result in zip(requests, batched):
+                single = await agent.process_intelligent_request(request)
+                for key in ("intelligent_response", "proactive_support"):
+                    assert batch_result[key] == single[key]
+            
+            # Requests submitted concurrently are served from one batch
+            await agent.start_request_batching(max_batch_size=len(requests), batch_window=1.0)
+            submitted = await asyncio.gather(*(agent.submit_request(request) for request in requests))
+            assert [r["proactive_support"] for r in submitted] == [r["proactive_support"] for r in batched]
+            metrics = agent.request_batcher.get_metrics()
+            assert metrics["batches"] == 1 and metrics["size_triggered"] == 1
+            
+            # Shutdown finishes the deferred learning and metacognition of answered requests
+            engine = agent.cognitive_engine
+            pending = len(engine.deferred_phase_tasks)
+            learned = engine.phase_statistics["learning"]["count"]
+            await agent.shutdown()
+            assert pending > 0 and not engine.deferred_phase_tasks
+            assert engine.phase_statistics["learning"]["count"] > learned
+            
+            self.log_test(test_name, True, f"{scored} batch scores match per-request scoring")
+            return True
+            
+        except Exception as e:
+            self.log_test(test_name, False, f"Batched request error: {e!r}")
+            return False
+    
+    async def run_all_tests(self):
+        """Run all tests"""
+        print("🧪 CollegiumAI Cognitive Memory Test Suite")
+        print("=" * 50)
+        print()
+        
+        if not FRAMEWORK_AVAILABLE:
+            self.log_test("Framework Imports", False, "Framework modules not available")
+            return self.print_summary()
+        
+        async_tests = [
+            self.test_working_memory_index,
+            self.test_episodic_candidate_retrieval,
+            self.test_episodic_temporal_index,
+            self.test_semantic_association_candidates,
+            self.test_compiled_spreading_activation,
+            self.test_pending_edge_spreading,
+            self.test_columnar_trace_decay,
+            self.test_memory_snapshot_roundtrip,
+            self.test_background_consolidation,
+            self.test_consolidation_stop_and_cancel,
+            self.test_batched_knowledge_retrieval,
+            self.test_phase_graph_scheduling,
+            self.test_cognitive_batch_processing,
+            self.test_request_micro_batching,
+            self.test_batched_request_processing
+        ]
+        
+        for test in async_tests:
+            await test()
+        
+        print()
+        return self.print_summary()
+    
+    def print_summary(self):
+        """Print test summary"""
+        print("📊 TEST SUMMARY")
+        print("=" * 30)
+        print(f"Total Tests: {self.total_tests}")
+        print(f"Passed: {self.passed_tests}")
+        print(f"Failed: {self.failed_tests}")
+        
+        if self.failed_tests == 0:
+            print("\n🎉 All memory tests passed!")
+        else:
+            failed_tests = [name for name, result in self.test_results.items() if not result['passed']]
+            print("\nFailed Tests:")
+            for test_name in failed_tests:
+                print(f"  - {test_name}: {self.test_results[test_name]['details']}")
+        
+        print()
+        return self.failed_tests == 0
+
+def main():
+    """Main test entry point"""
+    tester = CognitiveMemoryTester()
+    success = asyncio.run(tester.run_all_tests())
+    return 0 if success else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
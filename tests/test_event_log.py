@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+CollegiumAI Event Log Pipeline Test Suite
+=========================================
+
+Validates write-behind logging of interactions, metrics and audit events:
+batching by size and by time, spooling while the database is unreachable,
+replay of the spool after recovery, queue overflow and rejected rows, the
+spool writer and its limits, and logging from the GraphQL resolvers.
+
+Run with: python tests/test_event_log.py
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Add framework to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+try:
+    from framework.database.event_log import EventLogPipeline, EventLogConfig, EVENT_COLUMNS
+    FRAMEWORK_AVAILABLE = True
+except ImportError as e:
+    print(f"❌ Framework import failed: {e}")
+    FRAMEWORK_AVAILABLE = False
+
+class FakeDatabase:
+    """Records COPY calls; can be switched offline or made to refuse rows"""
+
+    def __init__(self):
+        self.copies = []  # (table, columns, records) per COPY
+        self.agent_lookups = 0
+        self.online = True
+        self.refuse = set()  # Queries whose rows are refused
+        self.copy_delay = 0.0
+
+    async def copy_records(self, table, columns, records):
+        await asyncio.sleep(self.copy_delay)
+        if not self.online:
+            raise ConnectionError("Database service not available")
+        if table == "agent_interactions" and any(record[4] in self.refuse for record in records):
+            raise ValueError("invalid input syntax for type uuid")
+        self.copies.append((table, columns, records))
+        return len(records)
+
+    async def get_agent_uuids(self, agent_ids):
+        self.agent_lookups += 1
+        if not self.online:
+            raise ConnectionError("Database service not available")
+        return {agent_id: f"uuid-{agent_id}" for agent_id in agent_ids if agent_id != "unknown_agent"}
+
+    def rows(self, table):
+        return [record for copied, _, records in self.copies if copied == table for record in records]
+
+def make_pipeline(database, spool_dir, **config):
+    return EventLogPipeline(database, EventLogConfig(spool_path=os.path.join(spool_dir, "spool.jsonl"), **config))
+
+class EventLogTester:
+    """Test suite for the event log pipeline"""
+
+    def __init__(self):
+        self.test_results = {}
+        self.passed_tests = 0
+        self.failed_tests = 0
+        self.total_tests = 0
+
+    def log_test(self, test_name: str, passed: bool, details: str = ""):
+        """Log test result"""
+        self.total_tests += 1
+        if passed:
+            self.passed_tests += 1
+            status = "✅ PASS"
+        else:
+            self.failed_tests += 1
+            status = "❌ FAIL"
+
+        print(f"{status} {test_name}")
+        if details:
+            print(f"    {details}")
+
+        self.test_results[test_name] = {
+            'passed': passed,
+            'details': details
+        }
+
+    async def test_batched_writes(self):
+        """Test events are written in batches by size and by time, one COPY per table"""
+        test_name = "Batched Writes"
+
+        try:
+            with tempfile.TemporaryDirectory() as spool_dir:
+                database = FakeDatabase()
+                pipeline = make_pipeline(database, spool_dir, batch_size=100, flush_interval=0.05)
+                await pipeline.start()
+
+                start = time.perf_counter()
+                for i in range(250):
+                    pipeline.log_agent_interaction(f"advisor_{i % 2}", "student1", f"query {i}", "response",
+                                                   confidence=0.9, processing_time=0.01)
+                enqueue_time = time.perf_counter() - start
+                pipeline.log_system_metric("agent_query_time", 0.01, "performance", "api")
+                pipeline.log_audit_event("admin", "login", "session")
+
+                await asyncio.sleep(0.01)
+                # Two full batches go out immediately; the remainder waits for the interval
+                assert len(database.rows("agent_interactions")) == 200
+                await asyncio.sleep(0.1)
+                assert len(database.rows("agent_interactions")) == 250
+                assert [table for table, _, _ in database.copies[-3:]] == ["agent_interactions", "system_metrics", "audit_logs"]
+
+                table, columns, records = database.copies[0]
+                assert columns == list(EVENT_COLUMNS[table]) and len(records[0]) == len(columns)
+                assert records[0][0] == "uuid-advisor_0" and records[0][-1].tzinfo is not None
+                assert database.agent_lookups == 1  # Agent ids are cached after the first batch
+
+                await pipeline.close()
+                status = pipeline.get_status()
+                assert status["written"] == 252 and status["batches"] == 3 and status["spooled"] == 0
+                assert status["state"] == "operational" and status["queue_depth"] == 0
+
+            self.log_test(test_name, True, f"250 interactions queued in {enqueue_time * 1000:.2f} ms, "
+                          f"written in {status['batches']} batches")
+            return True
+
+        except Exception as e:
+            self.log_test(test_name, False, f"Batching error: {e!r}")
+            return False
+
+    async def test_spool_and_replay(self):
+        """Test events are spooled while the database is down and replayed afterwards"""
+        test_name = "Spool and Replay"
+
+        try:
+            with tempfile.TemporaryDirectory() as spool_dir:
+                database = FakeDatabase()
+                database.online = False
+                pipeline = make_pipeline(database, spool_dir, batch_size=10, flush_interval=0.01, replay_interval=60)
+                await pipeline.start()
+
+                for i in range(25):
+                    pipeline.log_agent_interaction("advisor", "student1", f"query {i}", "response")
+                pipeline.log_system_metric("queue_depth", 3.0)
+                await asyncio.sleep(0.05)
+                status = pipeline.get_status()
+                assert database.copies == [] and status["spooled"] == 26
+                assert status["state"] == "spooling" and status["spool_bytes"] > 0
+                assert "ConnectionError" in status["last_error"]
+
+                database.online = True
+                assert await pipeline.replay_spool() == 26
+                queries = [record[4] for record in database.rows("agent_interactions")]
+                assert queries == [f"query {i}" for i in range(25)]
+                assert len(database.rows("system_metrics")) == 1
+                assert pipeline.get_status()["spool_bytes"] == 0
+                await pipeline.close()
+
+                # Events spooled by a previous process are replayed at start-up
+                database = FakeDatabase()
+                database.online = False
+                pipeline = make_pipeline(database, spool_dir)
+                pipeline.log_audit_event("admin", "delete", "course", "CS101")
+                await pipeline.close()  # Never started: flushed straight to the spool
+                assert os.path.exists(pipeline.spool_path)
+
+                database.online = True
+                restarted = make_pipeline(database, spool_dir, replay_interval=60)
+                await restarted.start()
+                await asyncio.sleep(0.01)
+                assert [record[3] for record in database.rows("audit_logs")] == ["CS101"]
+                assert restarted.get_status()["replayed"] == 1
+                await restarted.close()
+
+            self.log_test(test_name, True, "26 events spooled while offline and replayed in order")
+            return True
+
+        except Exception as e:
+            self.log_test(test_name, False, f"Spool error: {e!r}")
+            return False
+
+    async def test_torn_spool_line(self):
+        """Test a line torn by a crash mid-append is skipped instead of blocking replay"""
+        test_name = "Torn Spool Line"
+
+        try:
+            with tempfile.TemporaryDirectory() as spool_dir:
+                database = FakeDatabase()
+                database.online = False
+                pipeline = make_pipeline(database, spool_dir, flush_interval=0.01, replay_interval=60)
+                await pipeline.start()
+                pipeline.log_audit_event("admin", "create", "course", "CS101")
+                await asyncio.sleep(0.05)
+                await pipeline._drain_spool()
+                with open(pipeline.spool_path, "a", encoding="utf-8") as spool:
+                    spool.write('{"table": "audit_logs", "record": ["admin", "upd')  # No newline: torn
+                pipeline.log_audit_event("admin", "delete", "course", "CS102")
+                await asyncio.sleep(0.05)
+                await pipeline._drain_spool()
+
+                database.online = True
+                assert await pipeline.replay_spool() == 2
+                assert [record[3] for record in database.rows("audit_logs")] == ["CS101", "CS102"]
+                status = pipeline.get_status()
+                assert status["dropped"] == 1 and status["spool_bytes"] == 0
+                assert not os.path.exists(pipeline.spool_path + ".replay")
+
+                # A torn line in a replay file left by an earlier run does not block it either
+                with open(pipeline.spool_path + ".replay", "w", encoding="utf-8") as spool:
+                    spool.write('{"table": "audit_lo')
+                assert await pipeline.replay_spool() == 0
+                assert not os.path.exists(pipeline.spool_path + ".replay")
+                await pipeline.close()
+
+            self.log_test(test_name, True, "Torn line skipped and counted; the events around it replayed")
+            return True
+
+        except Exception as e:
+            self.log_test(test_name, False, f"Torn spool error: {e!r}")
+            return False
+
+    async def test_overflow_and_rejected_rows(self):
+        """Test a full queue spools instead of blocking and refused rows do not sink their batch"""
+        test_name = "Overflow and Rejected Rows"
+
+        try:
+            with tempfile.TemporaryDirectory() as spool_dir:
+                database = FakeDatabase()
+                database.copy_delay = 0.05
+                pipeline = make_pipeline(database, spool_dir, max_queue_size=5, batch_size=5, flush_interval=0.01)
+                await pipeline.start()
+
+                for i in range(20):
+                    pipeline.log_system_metric("requests", float(i))
+                status = pipeline.get_status()
+                assert status["overflowed"] == 15 and status["queue_depth"] == 5
+                await pipeline.close()
+                assert len(database.rows("system_metrics")) == 5
+                assert pipeline.get_status()["spooled"] == 15
+
+                database = FakeDatabase()
+                database.refuse = {"bad query"}
+                pipeline = make_pipeline(database, spool_dir, flush_interval=0.01)
+                await pipeline.start()
+                pipeline.log_agent_interaction("advisor", "student1", "good query", "response")
+                pipeline.log_agent_interaction("advisor", "not-a-uuid", "bad query", "response")
+                pipeline.log_agent_interaction("unknown_agent", "student1", "orphan query", "response")
+                pipeline.log_agent_interaction("advisor", "student2", "another query", "response")
+                await pipeline.close()
+
+                queries = [record[4] for record in database.rows("agent_interactions")]
+                assert queries == ["good query", "another query"]
+                status = pipeline.get_status()
+                assert status["rejected"] == 2 and status["written"] == 2
+
+            self.log_test(test_name, True, "Overflow spooled without blocking, 2 bad rows rejected individually")
+            return True
+
+        except Exception as e:
+            self.log_test(test_name, False, f"Overflow error: {e!r}")
+            return False
+
+    async def test_spool_writer(self):
+        """Test spool writes are batched off the event loop, capped, and only made when configured"""
+        test_name = "Spool Writer"
+
+        try:
+            with tempfile.TemporaryDirectory() as spool_dir:
+                database = FakeDatabase()
+                database.online = False
+                pipeline = make_pipeline(database, spool_dir, max_queue_size=1, flush_interval=60)
+                await pipeline.start()
+
+                writer_threads = []
+                fsyncs = []
+                write_spool = pipeline._write_spool
+                def recording_write_spool(events):
+                    writer_threads.append(threading.current_thread())
+                    return write_spool(events)
+                pipeline._write_spool = recording_write_spool
+                real_fsync = os.fsync
+                os.fsync = lambda fd: (fsyncs.append(fd), real_fsync(fd))
+                try:
+                    for i in range(50):
+                        pipeline.log_system_metric("requests", float(i))
+                    # Overflowing events are handed off; nothing has touched the disk yet
+                    assert writer_threads == [] and pipeline.get_status()["overflowed"] == 49
+                    await pipeline.close()
+                finally:
+                    os.fsync = real_fsync
+
+                assert writer_threads and threading.main_thread() not in writer_threads
+                assert len(fsyncs) == len(writer_threads) < 50  # One sync per batch, not per event
+                assert pipeline.get_status()["spooled"] == 50
+
+                # The spool stops growing at max_spool_bytes
+                capped = make_pipeline(FakeDatabase(), os.path.join(spool_dir, "capped"), max_queue_size=1, max_spool_bytes=1024)
+                for i in range(50):
+                    capped.log_system_metric("requests", float(i))
+                await capped.close()
+                status = capped.get_status()
+                assert 0 < status["spool_bytes"] <= 1024
+                assert status["spooled"] + status["dropped"] == 49 and status["dropped"] > 0
+
+                # No spool unless a path is configured, and nothing is kept without a database
+                database = FakeDatabase()
+                database.online = False
+                unspooled = EventLogPipeline(database, EventLogConfig(flush_interval=0.01))
+                unspooled.log_audit_event("admin", "login", "session")
+                await unspooled.close()
+                assert unspooled.spool_path is None and unspooled.get_status()["dropped"] == 1
+
+                offline = make_pipeline(None, os.path.join(spool_dir, "offline"))
+                offline.log_audit_event("admin", "login", "session")
+                await offline.close()
+                status = offline.get_status()
+                assert status["state"] == "disabled" and status["dropped"] == 1
+                assert not os.path.exists(offline.spool_path)
+
+            self.log_test(test_name, True, f"50 events spooled in {len(fsyncs)} thread writes, "
+                          f"{status['dropped']} dropped without a database")
+            return True
+
+        except Exception as e:
+            self.log_test(test_name, False, f"Spool writer error: {e!r}")
+            return False
+
+    async def test_graphql_resolver_logging(self):
+        """Test an agent query through the GraphQL schema is logged through the shared pipeline"""
+        test_name = "GraphQL Resolver Logging"
+
+        try:
+            from api import graphql_server
+            from api.server import auth_handler
+        except ImportError as e:
+            print(f"⏭️  SKIP {test_name}")
+            print(f"    API dependencies not installed: {e}")
+            return True
+
+        try:
+            from contextlib import asynccontextmanager
+            from framework.core import AgentResponse
+
+            class FakeAgent:
+                collaborators = []
+
+                async def process_query(self, message, context, collaborative=False):
+                    return AgentResponse(agent_id="advisor_1", final_response=f"Answer to {message}", confidence=0.8)
+
+            class FakeAgentPool:
+                agent_types = ["academic_advisor"]
+
+                @asynccontextmanager
+                async def lease(self, agent_type):
+                    yield FakeAgent()
+
+            class FakeRequest:
+                def __init__(self, token):
+                    self.headers = {"Authorization": f"Bearer {token}"}
+
+            with tempfile.TemporaryDirectory() as spool_dir:
+                database = FakeDatabase()
+                pipeline = make_pipeline(database, spool_dir, flush_interval=0.01)
+                await pipeline.start()
+                await graphql_server.initialize_graphql_components(object(), None, FakeAgentPool(), pipeline)
+
+                token = auth_handler.encode_token({"user_id": "student1", "permissions": ["agent_query"]})
+                result = await graphql_server.schema.execute(
+                    'mutation { queryAgent(agentType: "academic_advisor", '
+                    'queryInput: {message: "Which courses next term?", userId: "student1"}) { success finalResponse } }',
+                    context_value={"request": FakeRequest(token)}
+                )
+                assert result.errors is None, result.errors
+                assert result.data["queryAgent"]["finalResponse"] == "Answer to Which courses next term?"
+                await pipeline.close()
+                await graphql_server.initialize_graphql_components(None, None)
+
+                interactions = database.rows("agent_interactions")
+                assert len(interactions) == 1
+                assert interactions[0][0] == "uuid-academic_advisor_001" and interactions[0][1] == "student1"
+                assert interactions[0][4] == "Which courses next term?"
+                assert [record[0] for record in database.rows("system_metrics")] == ["agent_query_time"]
+
+            self.log_test(test_name, True, "queryAgent mutation logged one interaction and one metric")
+            return True
+
+        except Exception as e:
+            self.log_test(test_name, False, f"GraphQL logging error: {e!r}")
+            return False
+
+    async def run_all_tests(self):
+        """Run all tests"""
+        print("🧪 CollegiumAI Event Log Pipeline Test Suite")
+        print("=" * 50)
+        print()
+
+        if not FRAMEWORK_AVAILABLE:
+            self.log_test("Framework Imports", False, "Framework modules not available")
+            return self.print_summary()
+
+        async_tests = [
+            self.test_batched_writes,
+            self.test_spool_and_replay,
+            self.test_torn_spool_line,
+            self.test_overflow_and_rejected_rows,
+            self.test_spool_writer,
+            self.test_graphql_resolver_logging
+        ]
+
+        for test in async_tests:
+            await test()
+
+        print()
+        return self.print_summary()
+
+    def print_summary(self):
+        """Print test summary"""
+        print("📊 TEST SUMMARY")
+        print("=" * 30)
+        print(f"Total Tests: {self.total_tests}")
+        print(f"Passed: {self.passed_tests}")
+        print(f"Failed: {self.failed_tests}")
+
+        if self.failed_tests == 0:
+            print("\n🎉 All event log tests passed!")
+        else:
+            failed_tests = [name for name, result in self.test_results.items() if not result['passed']]
+            print("\nFailed Tests:")
+            for test_name in failed_tests:
+                print(f"  - {test_name}: {self.test_results[test_name]['details']}")
+
+        print()
+        return self.failed_tests == 0
+
+def main():
+    """Main test entry point"""
+    tester = EventLogTester()
+    success = asyncio.run(tester.run_all_tests())
+    return 0 if success else 1
+
+if __name__ == "__main__":
+    sys.exit(main())